@@ -4,12 +4,18 @@ from __future__ import annotations
 import asyncio
 from collections import OrderedDict
 from datetime import timedelta
+import hashlib
+import time
 from typing import Any, Dict, List, Optional, Tuple, cast
 
 import jwt
 
 from homeassistant import data_entry_flow
-from homeassistant.auth.const import ACCESS_TOKEN_EXPIRATION
+from homeassistant.auth.const import (
+    ACCESS_TOKEN_CACHE_SIZE,
+    ACCESS_TOKEN_CACHE_TTL,
+    ACCESS_TOKEN_EXPIRATION,
+)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.util import dt as dt_util
 
@@ -155,6 +161,11 @@ class AuthManager:
         self._providers = providers
         self._mfa_modules = mfa_modules
         self.login_flow = AuthManagerFlowManager(hass, self)
+        # Hash of a validated access token -> its refresh token and the time
+        # the validation expires
+        self._access_token_cache: OrderedDict[
+            bytes, Tuple[models.RefreshToken, float]
+        ] = OrderedDict()
 
     @property
     def auth_providers(self) -> List[AuthProvider]:
@@ -288,6 +299,7 @@ class AuthManager:
             await asyncio.wait(tasks)
 
         await self._store.async_remove_user(user)
+        self._access_token_cache.clear()
 
         self.hass.bus.async_fire(EVENT_USER_REMOVED, {"user_id": user.id})
 
@@ -321,6 +333,7 @@ class AuthManager:
         if user.is_owner:
             raise ValueError("Unable to deactivate the owner")
         await self._store.async_deactivate_user(user)
+        self._access_token_cache.clear()
 
     async def async_remove_credentials(self, credentials: models.Credentials) -> None:
         """Remove credentials."""
@@ -447,6 +460,7 @@ class AuthManager:
     ) -> None:
         """Delete a refresh token."""
         await self._store.async_remove_refresh_token(refresh_token)
+        self._access_token_cache.clear()
 
     @callback
     def async_create_access_token(
@@ -505,7 +519,19 @@ class AuthManager:
     async def async_validate_access_token(
         self, token: str
     ) -> Optional[models.RefreshToken]:
-        """Return refresh token if an access token is valid."""
+        """Return refresh token if an access token is valid.
+
+        Validated tokens are cached for a short time, so clients making many
+        requests don't have their token decoded and verified every time.
+        """
+        token_hash = hashlib.sha256(token.encode()).digest()
+        cached = self._access_token_cache.get(token_hash)
+        if cached is not None:
+            refresh_token, expires_at = cached
+            if time.time() < expires_at and refresh_token.user.is_active:
+                return refresh_token
+            del self._access_token_cache[token_hash]
+
         try:
             unverif_claims = jwt.decode(token, verify=False)
         except jwt.InvalidTokenError:
@@ -530,6 +556,16 @@ class AuthManager:
         if refresh_token is None or not refresh_token.user.is_active:
             return None
 
+        if len(self._access_token_cache) >= ACCESS_TOKEN_CACHE_SIZE:
+            self._access_token_cache.popitem(last=False)
+        self._access_token_cache[token_hash] = (
+            refresh_token,
+            min(
+                time.time() + ACCESS_TOKEN_CACHE_TTL.total_seconds(),
+                unverif_claims.get("exp", 0),
+            ),
+        )
+
         return refresh_token
 
     @callback
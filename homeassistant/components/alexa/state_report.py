@@ -1,14 +1,23 @@
 """Alexa state report code."""
 import asyncio
+from functools import partial
 import json
 import logging
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Set, Tuple, cast
 
 import aiohttp
 import async_timeout
 
-from homeassistant.const import HTTP_ACCEPTED, MATCH_ALL, STATE_ON
-from homeassistant.core import HomeAssistant, State, callback
+from homeassistant.const import (
+    HTTP_ACCEPTED,
+    HTTP_INTERNAL_SERVER_ERROR,
+    HTTP_TOO_MANY_REQUESTS,
+    MATCH_ALL,
+    STATE_ON,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, State, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.significant_change import create_checker
 import homeassistant.util.dt as dt_util
 
@@ -18,6 +27,235 @@ from .messages import AlexaResponse
 
 _LOGGER = logging.getLogger(__name__)
 DEFAULT_TIMEOUT = 10
+# Seconds an entity has to be quiet before its latest change is reported
+CHANGE_REPORT_QUIET = 0.5
+# Max number of change reports sent at the same time
+CHANGE_REPORT_PARALLEL = 4
+# Number of times a failed change report is retried
+CHANGE_REPORT_RETRIES = 3
+# Seconds to wait before the first retry, doubled on every retry
+CHANGE_REPORT_BACKOFF = 2
+
+_MISSING = object()
+
+
+class ChangeReportSender:
+    """Send the ChangeReports of entities once they stop changing.
+
+    A change only starts a quiet window for its entity. Changes during the
+    window replace the pending report, so an entity that changes rapidly is
+    reported once with its latest properties. Reports are sent with limited
+    concurrency and retried with an exponential backoff.
+    """
+
+    def __init__(self, hass: HomeAssistant, config) -> None:
+        """Initialize the sender."""
+        self._hass = hass
+        self._config = config
+        self._pending: Dict[str, Tuple[AlexaEntity, List[dict]]] = {}
+        self._timers: Dict[str, CALLBACK_TYPE] = {}
+        # Latest serialized properties of every reported entity
+        self._properties: Dict[str, List[dict]] = {}
+        # Latest serialized properties of every entity, with the state and the
+        # attributes they were serialized from
+        self._serialized: Dict[str, Tuple[str, Mapping[str, Any], List[dict]]] = {}
+        self._semaphore = asyncio.Semaphore(CHANGE_REPORT_PARALLEL)
+        self.sent = 0
+        self.suppressed = 0
+        self.failed = 0
+
+    @callback
+    def async_serialize_properties(self, alexa_entity: AlexaEntity) -> List[dict]:
+        """Serialize the properties, reusing the unchanged ones.
+
+        The properties are only serialized again when the state or one of
+        the attributes read while serializing them changed. Properties of
+        which the value didn't change since the last report keep their
+        serialized form, including their time of sample.
+        """
+        state = alexa_entity.entity
+        serialized = self._serialized.get(state.entity_id)
+        if serialized is not None:
+            old_state, old_attributes, properties = serialized
+            if state.state == old_state and (
+                state.attributes == old_attributes
+                if isinstance(old_attributes, MappingProxyType)
+                else all(
+                    state.attributes.get(name, _MISSING) == value
+                    for name, value in old_attributes.items()
+                )
+            ):
+                return properties
+
+        attributes = _RecordingAttributes(state.attributes)
+        recording_entity = ENTITY_ADAPTERS[state.domain](
+            self._hass,
+            self._config,
+            State(
+                state.entity_id,
+                state.state,
+                attributes,
+                state.last_changed,
+                state.last_updated,
+                state.context,
+            ),
+        )
+        previous = {
+            _property_key(prop): prop
+            for prop in self._properties.get(state.entity_id, ())
+        }
+        properties = []
+        for prop in recording_entity.serialize_properties():
+            old = previous.get(_property_key(prop))
+            if old is not None and old.get("value") == prop.get("value"):
+                prop = old
+            properties.append(prop)
+
+        self._serialized[state.entity_id] = (
+            state.state,
+            # All attributes when they were iterated, or when there were none
+            # and State didn't keep the recording mapping
+            state.attributes
+            if attributes.read is None or not attributes
+            else attributes.read_values(),
+            properties,
+        )
+        return properties
+
+    @callback
+    def async_remove(self, entity_id: str) -> None:
+        """Forget the properties of a removed entity."""
+        self._properties.pop(entity_id, None)
+        self._serialized.pop(entity_id, None)
+
+    @callback
+    def async_schedule(self, alexa_entity: AlexaEntity, properties: List[dict]):
+        """Report the properties of an entity once it is quiet."""
+        entity_id = alexa_entity.entity_id
+        self._properties[entity_id] = properties
+        if entity_id in self._pending:
+            self.suppressed += 1
+            self._timers.pop(entity_id)()
+        self._pending[entity_id] = (alexa_entity, properties)
+        self._timers[entity_id] = async_call_later(
+            self._hass, CHANGE_REPORT_QUIET, partial(self._async_quiet, entity_id)
+        )
+
+    @callback
+    def async_suppress(self) -> None:
+        """Count a change that doesn't need to be reported."""
+        self.suppressed += 1
+
+    @callback
+    def _async_quiet(self, entity_id: str, _now) -> None:
+        """Report an entity after its quiet window."""
+        del self._timers[entity_id]
+        alexa_entity, properties = self._pending.pop(entity_id)
+        self._hass.async_create_task(self._async_send(alexa_entity, properties))
+
+    async def _async_send(
+        self, alexa_entity: AlexaEntity, properties: List[dict]
+    ) -> None:
+        """Send a ChangeReport, retrying while Alexa is unavailable."""
+        async with self._semaphore:
+            for attempt in range(CHANGE_REPORT_RETRIES + 1):
+                if attempt:
+                    await asyncio.sleep(CHANGE_REPORT_BACKOFF * 2 ** (attempt - 1))
+                    if alexa_entity.entity_id in self._pending:
+                        # A newer report replaces this one
+                        self.suppressed += 1
+                        return
+
+                status = await async_send_changereport_message(
+                    self._hass, self._config, alexa_entity, properties
+                )
+                if not _should_retry(status):
+                    if status == HTTP_ACCEPTED:
+                        self.sent += 1
+                    else:
+                        self.failed += 1
+                    return
+
+        self.failed += 1
+        _LOGGER.warning(
+            "Unable to send ChangeReport for %s after %d retries",
+            alexa_entity.entity_id,
+            CHANGE_REPORT_RETRIES,
+        )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop the pending reports."""
+        for unsub in self._timers.values():
+            unsub()
+        self._timers.clear()
+        self._pending.clear()
+
+
+class _RecordingAttributes(dict):
+    """Attributes of a state that record which of them are read."""
+
+    def __init__(self, attributes: Mapping[str, Any]) -> None:
+        """Initialize the attributes."""
+        super().__init__(attributes)
+        # Names of the read attributes, None once all of them were read
+        self.read: Optional[Set[str]] = set()
+
+    def __getitem__(self, name: str) -> Any:
+        """Return an attribute."""
+        self._record(name)
+        return super().__getitem__(name)
+
+    def __contains__(self, name: object) -> bool:
+        """Return if an attribute is set."""
+        self._record(name)
+        return super().__contains__(name)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the attribute names."""
+        self.read = None
+        return super().__iter__()
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Return an attribute or a default."""
+        self._record(name)
+        return super().get(name, default)
+
+    def keys(self):  # type: ignore
+        """Return the attribute names."""
+        self.read = None
+        return super().keys()
+
+    def values(self):  # type: ignore
+        """Return the attribute values."""
+        self.read = None
+        return super().values()
+
+    def items(self):  # type: ignore
+        """Return the attributes."""
+        self.read = None
+        return super().items()
+
+    def _record(self, name: object) -> None:
+        """Record reading an attribute."""
+        if self.read is not None:
+            self.read.add(cast(str, name))
+
+    def read_values(self) -> Dict[str, Any]:
+        """Return the read attributes, _MISSING for those that are not set."""
+        return {name: dict.get(self, name, _MISSING) for name in self.read or ()}
+
+
+def _property_key(prop: dict) -> tuple:
+    """Return the key of a serialized property."""
+    return (prop.get("namespace"), prop.get("name"), prop.get("instance"))
+
+
+def _should_retry(status: Optional[int]) -> bool:
+    """Return if a report that ended with a HTTP status should be retried."""
+    return status is None or (
+        status == HTTP_TOO_MANY_REQUESTS or status >= HTTP_INTERNAL_SERVER_ERROR
+    )
 
 
 async def async_enable_proactive_mode(hass, smart_home_config):
@@ -42,6 +280,7 @@ async def async_enable_proactive_mode(hass, smart_home_config):
         return old_extra_arg is not None and old_extra_arg != new_extra_arg
 
     checker = await create_checker(hass, DOMAIN, extra_significant_check)
+    sender = ChangeReportSender(hass, smart_home_config)
 
     async def async_entity_state_listener(
         changed_entity: str,
@@ -52,6 +291,7 @@ async def async_enable_proactive_mode(hass, smart_home_config):
             return
 
         if not new_state:
+            sender.async_remove(changed_entity)
             return
 
         if new_state.domain not in ENTITY_ADAPTERS:
@@ -87,27 +327,37 @@ async def async_enable_proactive_mode(hass, smart_home_config):
                 )
             return
 
-        alexa_properties = list(alexa_changed_entity.serialize_properties())
+        alexa_properties = sender.async_serialize_properties(alexa_changed_entity)
 
         if not checker.async_is_significant_change(
             new_state, extra_arg=alexa_properties
         ):
+            sender.async_suppress()
             return
 
-        await async_send_changereport_message(
-            hass, smart_home_config, alexa_changed_entity, alexa_properties
-        )
+        sender.async_schedule(alexa_changed_entity, alexa_properties)
 
-    return hass.helpers.event.async_track_state_change(
+    unsub = hass.helpers.event.async_track_state_change(
         MATCH_ALL, async_entity_state_listener
     )
 
+    @callback
+    def async_disable():
+        """Stop reporting states."""
+        unsub()
+        sender.async_cancel()
+
+    return async_disable
+
 
 async def async_send_changereport_message(
     hass, config, alexa_entity, alexa_properties, *, invalidate_access_token=True
 ):
     """Send a ChangeReport message for an Alexa entity.
 
+    Return value is the HTTP status code of the report, or None if Alexa
+    couldn't be reached.
+
     https://developer.amazon.com/docs/smarthome/state-reporting-for-a-smart-home-skill.html#report-state-with-changereport-events
     """
     token = await config.async_get_access_token()
@@ -140,7 +390,7 @@ async def async_send_changereport_message(
 
     except (asyncio.TimeoutError, aiohttp.ClientError):
         _LOGGER.error("Timeout sending report to Alexa")
-        return
+        return None
 
     response_text = await response.text()
 
@@ -148,9 +398,13 @@ async def async_send_changereport_message(
     _LOGGER.debug("Received (%s): %s", response.status, response_text)
 
     if response.status == HTTP_ACCEPTED:
-        return
+        return response.status
 
-    response_json = json.loads(response_text)
+    try:
+        response_json = json.loads(response_text)
+    except ValueError:
+        _LOGGER.error("Error when sending ChangeReport to Alexa: %s", response.status)
+        return response.status
 
     if (
         response_json["payload"]["code"] == "INVALID_ACCESS_TOKEN_EXCEPTION"
@@ -166,6 +420,7 @@ async def async_send_changereport_message(
         response_json["payload"]["code"],
         response_json["payload"]["description"],
     )
+    return response.status
 
 
 async def async_send_add_or_update_message(hass, config, entity_ids):
@@ -1,6 +1,18 @@
 """Allow to set up simple automation rules via the config file."""
+import asyncio
 import logging
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Union, cast
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 import voluptuous as vol
 from voluptuous.humanize import humanize_error
@@ -42,6 +54,8 @@ from homeassistant.helpers import condition, extract_domain_configs, template
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.helpers.reference_index import ReferenceIndex
+from homeassistant.helpers.reload import async_config_unchanged
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.script import (
     ATTR_CUR,
@@ -82,6 +96,9 @@ CONF_SKIP_CONDITION = "skip_condition"
 CONF_STOP_ACTIONS = "stop_actions"
 DEFAULT_STOP_ACTIONS = True
 
+DATA_DEVICE_REFERENCES = "automation_device_references"
+DATA_ENTITY_REFERENCES = "automation_entity_references"
+
 EVENT_AUTOMATION_RELOADED = "automation_reloaded"
 EVENT_AUTOMATION_TRIGGERED = "automation_triggered"
 
@@ -109,13 +126,7 @@ def automations_with_entity(hass: HomeAssistant, entity_id: str) -> List[str]:
     if DOMAIN not in hass.data:
         return []
 
-    component = hass.data[DOMAIN]
-
-    return [
-        automation_entity.entity_id
-        for automation_entity in component.entities
-        if entity_id in automation_entity.referenced_entities
-    ]
+    return hass.data[DATA_ENTITY_REFERENCES].async_get(entity_id)
 
 
 @callback
@@ -140,13 +151,7 @@ def automations_with_device(hass: HomeAssistant, device_id: str) -> List[str]:
     if DOMAIN not in hass.data:
         return []
 
-    component = hass.data[DOMAIN]
-
-    return [
-        automation_entity.entity_id
-        for automation_entity in component.entities
-        if device_id in automation_entity.referenced_devices
-    ]
+    return hass.data[DATA_DEVICE_REFERENCES].async_get(device_id)
 
 
 @callback
@@ -168,6 +173,8 @@ def devices_in_automation(hass: HomeAssistant, entity_id: str) -> List[str]:
 async def async_setup(hass, config):
     """Set up the automation."""
     hass.data[DOMAIN] = component = EntityComponent(LOGGER, DOMAIN, hass)
+    hass.data[DATA_ENTITY_REFERENCES] = ReferenceIndex()
+    hass.data[DATA_DEVICE_REFERENCES] = ReferenceIndex()
 
     # To register the automation blueprints
     async_get_blueprints(hass)
@@ -200,8 +207,8 @@ async def async_setup(hass, config):
     )
 
     async def reload_service_handler(service_call):
-        """Remove all automations and load new ones from config."""
-        conf = await component.async_prepare_reload()
+        """Replace the automations that changed in config."""
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
         async_get_blueprints(hass).async_reset_cache()
@@ -228,6 +235,7 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
         initial_state,
         variables,
         trigger_variables,
+        raw_config=None,
     ):
         """Initialize an automation entity."""
         self._id = automation_id
@@ -244,6 +252,7 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
         self._logger = LOGGER
         self._variables: ScriptVariables = variables
         self._trigger_variables: ScriptVariables = trigger_variables
+        self.raw_config = raw_config
 
     @property
     def name(self):
@@ -325,6 +334,13 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
         )
         self.action_script.update_logger(self._logger)
 
+        self.hass.data[DATA_ENTITY_REFERENCES].async_set(
+            self.entity_id, self.referenced_entities
+        )
+        self.hass.data[DATA_DEVICE_REFERENCES].async_set(
+            self.entity_id, self.referenced_devices
+        )
+
         state = await self.async_get_last_state()
         if state:
             enable_automation = state.state == STATE_ON
@@ -424,6 +440,8 @@ class AutomationEntity(ToggleEntity, RestoreEntity):
     async def async_will_remove_from_hass(self):
         """Remove listeners when removing automation from Home Assistant."""
         await super().async_will_remove_from_hass()
+        self.hass.data[DATA_ENTITY_REFERENCES].async_remove(self.entity_id)
+        self.hass.data[DATA_DEVICE_REFERENCES].async_remove(self.entity_id)
         await self.async_disable()
 
     async def async_enable(self):
@@ -521,6 +539,12 @@ async def _async_process_config(
     entities = []
     blueprints_used = False
 
+    # Automations that are still in the configuration unchanged are kept
+    # running, all others are replaced.
+    existing: Dict[Tuple[Optional[str], str], List[AutomationEntity]] = {}
+    for entity in component.entities:
+        existing.setdefault((entity.unique_id, entity.name), []).append(entity)
+
     for config_key in extract_domain_configs(config, DOMAIN):
         conf: List[Union[Dict[str, Any], blueprint.BlueprintInputs]] = config[  # type: ignore
             config_key
@@ -550,6 +574,19 @@ async def _async_process_config(
             automation_id = config_block.get(CONF_ID)
             name = config_block.get(CONF_ALIAS) or f"{config_key} {list_no}"
 
+            candidates = existing.get((automation_id, name), [])
+            unchanged = next(
+                (
+                    entity
+                    for entity in candidates
+                    if async_config_unchanged(hass, entity.raw_config, config_block)
+                ),
+                None,
+            )
+            if unchanged is not None:
+                candidates.remove(unchanged)
+                continue
+
             initial_state = config_block.get(CONF_INITIAL_STATE)
 
             action_script = Script(
@@ -596,10 +633,17 @@ async def _async_process_config(
                 initial_state,
                 variables,
                 config_block.get(CONF_TRIGGER_VARIABLES),
+                config_block,
             )
 
             entities.append(entity)
 
+    stale = [entity for candidates in existing.values() for entity in candidates]
+    if stale:
+        await asyncio.gather(
+            *[component.async_remove_entity(entity.entity_id) for entity in stale]
+        )
+
     if entities:
         await component.async_add_entities(entities)
 
@@ -611,17 +655,22 @@ async def _async_process_if(hass, name, config, p_config):
     if_configs = p_config[CONF_CONDITION]
 
     checks = []
-    for if_config in if_configs:
+    for index, if_config in enumerate(if_configs):
         try:
-            checks.append(await condition.async_from_config(hass, if_config, False))
+            checks.append(
+                (index, await condition.async_from_config(hass, if_config, False))
+            )
         except HomeAssistantError as ex:
             LOGGER.warning("Invalid condition: %s", ex)
             return None
 
+    # Run cheap checks first, the result doesn't depend on the order
+    checks.sort(key=lambda check: condition.condition_cost(if_configs[check[0]]))
+
     def if_action(variables=None):
         """AND all conditions."""
         errors = []
-        for index, check in enumerate(checks):
+        for index, check in checks:
             try:
                 if not check(hass, variables):
                     return False
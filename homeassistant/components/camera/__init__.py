@@ -54,6 +54,7 @@ from .const import (
     DOMAIN,
     SERVICE_RECORD,
 )
+from .fetcher import CameraImageFetcher, frame_key
 from .prefs import CameraPreferences
 
 # mypy: allow-untyped-calls, allow-untyped-defs
@@ -140,7 +141,7 @@ async def async_get_image(hass, entity_id, timeout=10):
 
     with suppress(asyncio.CancelledError, asyncio.TimeoutError):
         async with async_timeout.timeout(timeout):
-            image = await camera.async_camera_image()
+            image = await camera.image_fetcher.async_get_image()
 
             if image:
                 return Image(camera.content_type, image)
@@ -169,6 +170,27 @@ async def async_get_still_stream(request, image_cb, content_type, interval):
 
     This method must be run in the event loop.
     """
+
+    async def frames():
+        """Yield the images that changed."""
+        last_key = None
+        while True:
+            img_bytes = await image_cb()
+            if not img_bytes:
+                return
+
+            key = frame_key(img_bytes)
+            if key != last_key:
+                last_key = key
+                yield img_bytes
+
+            await asyncio.sleep(interval)
+
+    return await _async_write_still_stream(request, frames(), content_type)
+
+
+async def _async_write_still_stream(request, frames, content_type):
+    """Write frames to an HTTP MJPEG stream until they run out."""
     response = web.StreamResponse()
     response.content_type = CONTENT_TYPE_MULTIPART.format("--frameboundary")
     await response.prepare(request)
@@ -186,23 +208,20 @@ async def async_get_still_stream(request, image_cb, content_type, interval):
             + b"\r\n"
         )
 
-    last_image = None
+    first_image = True
 
-    while True:
-        img_bytes = await image_cb()
-        if not img_bytes:
-            break
-
-        if img_bytes != last_image:
+    try:
+        async for img_bytes in frames:
             await write_to_mjpeg_stream(img_bytes)
 
             # Chrome seems to always ignore first picture,
             # print it twice.
-            if last_image is None:
+            if first_image:
                 await write_to_mjpeg_stream(img_bytes)
-            last_image = img_bytes
-
-        await asyncio.sleep(interval)
+                first_image = False
+    finally:
+        # Stop receiving frames when the client went away
+        await frames.aclose()
 
     return response
 
@@ -241,6 +260,7 @@ async def async_setup(hass, config):
         WS_TYPE_CAMERA_THUMBNAIL, websocket_camera_thumbnail, SCHEMA_WS_CAMERA_THUMBNAIL
     )
     hass.components.websocket_api.async_register_command(ws_camera_stream)
+    hass.components.websocket_api.async_register_command(ws_camera_stream_metrics)
     hass.components.websocket_api.async_register_command(websocket_get_prefs)
     hass.components.websocket_api.async_register_command(websocket_update_prefs)
 
@@ -317,6 +337,7 @@ class Camera(Entity):
         self.content_type = DEFAULT_CONTENT_TYPE
         self.access_tokens: collections.deque = collections.deque([], 2)
         self.async_update_token()
+        self.image_fetcher = CameraImageFetcher(self)
 
     @property
     def should_poll(self):
@@ -358,6 +379,15 @@ class Camera(Entity):
         """Return the interval between frames of the mjpeg stream."""
         return 0.5
 
+    @property
+    def use_stream_for_stills(self):
+        """Return if images may be taken from the stream while it runs.
+
+        Images from the stream can be as old as the last keyframe, so this is
+        only enabled by integrations or the stream_stills preference.
+        """
+        return False
+
     async def create_stream(self) -> Stream:
         """Create a Stream for stream_source."""
         # There is at most one stream (a decode worker) per camera
@@ -381,10 +411,24 @@ class Camera(Entity):
         """Return bytes of camera image."""
         return await self.hass.async_add_executor_job(self.camera_image)
 
+    async def async_stream_image(self):
+        """Return an image from the running stream of the camera, if any."""
+        if self.stream is None or self.content_type != DEFAULT_CONTENT_TYPE:
+            return None
+        if not (
+            self.use_stream_for_stills
+            or self.hass.data[DATA_CAMERA_PREFS].get(self.entity_id).stream_stills
+        ):
+            return None
+        return await self.stream.async_get_image()
+
     async def handle_async_still_stream(self, request, interval):
-        """Generate an HTTP MJPEG stream from camera images."""
-        return await async_get_still_stream(
-            request, self.async_camera_image, self.content_type, interval
+        """Generate an HTTP MJPEG stream from camera images.
+
+        Viewers of the same camera share the images fetched from it.
+        """
+        return await _async_write_still_stream(
+            request, self.image_fetcher.async_frames(interval), self.content_type
         )
 
     async def handle_async_mjpeg_stream(self, request):
@@ -510,7 +554,7 @@ class CameraImageView(CameraView):
         """Serve camera image."""
         with suppress(asyncio.CancelledError, asyncio.TimeoutError):
             async with async_timeout.timeout(CAMERA_IMAGE_TIMEOUT):
-                image = await camera.async_camera_image()
+                image = await camera.image_fetcher.async_get_image()
 
             if image:
                 return web.Response(body=image, content_type=camera.content_type)
@@ -592,6 +636,29 @@ async def ws_camera_stream(hass, connection, msg):
         )
 
 
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "camera/stream_metrics",
+        vol.Required("entity_id"): cv.entity_id,
+    }
+)
+@callback
+def ws_camera_stream_metrics(hass, connection, msg):
+    """Handle get camera stream metrics websocket command."""
+    try:
+        camera = _get_camera_from_entity_id(hass, msg["entity_id"])
+    except HomeAssistantError as ex:
+        connection.send_error(msg["id"], websocket_api.ERR_NOT_FOUND, str(ex))
+        return
+    if camera.stream is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Camera has no stream"
+        )
+        return
+    connection.send_result(msg["id"], camera.stream.metrics())
+
+
 @websocket_api.async_response
 @websocket_api.websocket_command(
     {vol.Required("type"): "camera/get_prefs", vol.Required("entity_id"): cv.entity_id}
@@ -608,6 +675,7 @@ async def websocket_get_prefs(hass, connection, msg):
         vol.Required("type"): "camera/update_prefs",
         vol.Required("entity_id"): cv.entity_id,
         vol.Optional("preload_stream"): bool,
+        vol.Optional("stream_stills"): bool,
     }
 )
 async def websocket_update_prefs(hass, connection, msg):
@@ -4,6 +4,7 @@ DOMAIN = "camera"
 DATA_CAMERA_PREFS = "camera_prefs"
 
 PREF_PRELOAD_STREAM = "preload_stream"
+PREF_STREAM_STILLS = "stream_stills"
 
 SERVICE_RECORD = "record"
 
@@ -0,0 +1,148 @@
+"""Share camera image fetches between concurrent viewers."""
+import asyncio
+import logging
+from typing import TYPE_CHECKING, AsyncIterator, Optional, Set
+
+if TYPE_CHECKING:
+    from . import Camera
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def frame_key(image: bytes) -> tuple:
+    """Return a key to tell frames apart without comparing all their bytes.
+
+    Bytes objects cache their hash, so a frame shared between viewers is
+    only hashed once.
+    """
+    return (len(image), hash(image))
+
+
+class _Subscriber:
+    """A viewer of the still stream of a camera."""
+
+    __slots__ = ("interval", "frame", "event")
+
+    def __init__(self, interval: float) -> None:
+        """Initialize the subscriber."""
+        self.interval = interval
+        self.frame: Optional[bytes] = None
+        self.event = asyncio.Event()
+
+
+class CameraImageFetcher:
+    """Coalesce image requests for a camera into a single upstream fetch.
+
+    Requests that arrive while a fetch is running wait for its result instead
+    of starting another one. Still streams subscribe to a single producer that
+    polls the camera at the shortest interval any viewer asked for and hands
+    every changed frame to all of them. While the producer runs, snapshot
+    requests are served its latest frame if it isn't older than the interval.
+    """
+
+    def __init__(self, camera: "Camera") -> None:
+        """Initialize the fetcher."""
+        self._camera = camera
+        self._fetch: Optional[asyncio.Future] = None
+        self._image: Optional[bytes] = None
+        self._fetched_at = 0.0
+        self._subscribers: Set[_Subscriber] = set()
+        self._producer: Optional[asyncio.Task] = None
+        self.fetch_count = 0
+
+    @property
+    def _interval(self) -> float:
+        """Return the interval the producer polls the camera at."""
+        return min(subscriber.interval for subscriber in self._subscribers)
+
+    async def async_get_image(self) -> Optional[bytes]:
+        """Return a recent image of the camera."""
+        loop = self._camera.hass.loop
+        if (
+            self._producer is not None
+            and self._subscribers
+            and self._image is not None
+            and loop.time() - self._fetched_at < self._interval
+        ):
+            return self._image
+        return await self._async_fetch_image()
+
+    async def _async_fetch_image(self) -> Optional[bytes]:
+        """Fetch an image, sharing the fetch that is already running."""
+        if self._fetch is None:
+            self._fetch = self._camera.hass.loop.create_task(self._async_fetch())
+        # A waiter that gives up must not cancel the fetch for the others
+        return await asyncio.shield(self._fetch)
+
+    async def _async_fetch(self) -> Optional[bytes]:
+        """Fetch an image from the camera."""
+        try:
+            self.fetch_count += 1
+            # A running stream already receives the images of the camera
+            image = await self._camera.async_stream_image()
+            if not image:
+                image = await self._camera.async_camera_image()
+        finally:
+            self._fetch = None
+        self._image = image or None
+        self._fetched_at = self._camera.hass.loop.time()
+        return image
+
+    async def async_frames(self, interval: float) -> AsyncIterator[bytes]:
+        """Yield the frames of the camera at most once per interval.
+
+        A frame is only yielded when it differs from the previous one, and the
+        iteration ends when the camera stops returning images.
+        """
+        subscriber = _Subscriber(interval)
+        if self._image is not None and self._producer is not None:
+            subscriber.frame = self._image
+            subscriber.event.set()
+        self._subscribers.add(subscriber)
+        if self._producer is None:
+            self._producer = self._camera.hass.loop.create_task(self._async_produce())
+
+        try:
+            while True:
+                await subscriber.event.wait()
+                subscriber.event.clear()
+                if subscriber.frame is None:
+                    return
+                yield subscriber.frame
+                await asyncio.sleep(interval)
+        finally:
+            self._subscribers.discard(subscriber)
+
+    async def _async_produce(self) -> None:
+        """Poll the camera and hand changed frames to the subscribers."""
+        last_key = None
+        try:
+            while self._subscribers:
+                try:
+                    image = await self._async_fetch_image()
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Error fetching image from %s", self._camera.entity_id
+                    )
+                    image = None
+
+                if not image:
+                    break
+
+                key = frame_key(image)
+                if key != last_key:
+                    last_key = key
+                    for subscriber in self._subscribers:
+                        subscriber.frame = image
+                        subscriber.event.set()
+
+                if not self._subscribers:
+                    break
+                await asyncio.sleep(self._interval)
+        finally:
+            self._producer = None
+            # Ends the still streams of the remaining subscribers
+            for subscriber in self._subscribers:
+                subscriber.frame = None
+                subscriber.event.set()
+            self._subscribers.clear()
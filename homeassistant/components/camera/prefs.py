@@ -1,7 +1,7 @@
 """Preference management for camera component."""
 from homeassistant.helpers.typing import UNDEFINED
 
-from .const import DOMAIN, PREF_PRELOAD_STREAM
+from .const import DOMAIN, PREF_PRELOAD_STREAM, PREF_STREAM_STILLS
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
 
@@ -25,6 +25,11 @@ class CameraEntityPreferences:
         """Return if stream is loaded on hass start."""
         return self._prefs.get(PREF_PRELOAD_STREAM, False)
 
+    @property
+    def stream_stills(self):
+        """Return if images may be taken from the running stream."""
+        return self._prefs.get(PREF_STREAM_STILLS, False)
+
 
 class CameraPreferences:
     """Handle camera preferences."""
@@ -45,13 +50,21 @@ class CameraPreferences:
         self._prefs = prefs
 
     async def async_update(
-        self, entity_id, *, preload_stream=UNDEFINED, stream_options=UNDEFINED
+        self,
+        entity_id,
+        *,
+        preload_stream=UNDEFINED,
+        stream_stills=UNDEFINED,
+        stream_options=UNDEFINED,
     ):
         """Update camera preferences."""
         if not self._prefs.get(entity_id):
             self._prefs[entity_id] = {}
 
-        for key, value in ((PREF_PRELOAD_STREAM, preload_stream),):
+        for key, value in (
+            (PREF_PRELOAD_STREAM, preload_stream),
+            (PREF_STREAM_STILLS, stream_stills),
+        ):
             if value is not UNDEFINED:
                 self._prefs[entity_id][key] = value
 
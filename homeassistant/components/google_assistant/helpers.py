@@ -160,16 +160,25 @@ class AbstractConfig(ABC):
         return True
 
     async def async_report_state(self, message, agent_user_id: str):
-        """Send a state report to Google."""
+        """Send a state report to Google.
+
+        Return value is the HTTP status code of the report, if known.
+        """
         raise NotImplementedError
 
-    async def async_report_state_all(self, message):
-        """Send a state report to Google for all previously synced users."""
+    async def async_report_state_all(self, message, agent_user_ids=None):
+        """Send a state report to Google for all previously synced users.
+
+        Pass agent_user_ids to only report to some of the users. Return value
+        is a dictionary with the result of the report of each user.
+        """
+        if agent_user_ids is None:
+            agent_user_ids = list(self._store.agent_user_ids)
         jobs = [
             self.async_report_state(message, agent_user_id)
-            for agent_user_id in self._store.agent_user_ids
+            for agent_user_id in agent_user_ids
         ]
-        await gather(*jobs)
+        return dict(zip(agent_user_ids, await gather(*jobs)))
 
     @callback
     def async_enable_report_state(self):
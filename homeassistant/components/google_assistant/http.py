@@ -201,7 +201,7 @@ class GoogleConfig(AbstractConfig):
             "agentUserId": agent_user_id,
             "payload": message,
         }
-        await self.async_call_homegraph_api(REPORT_STATE_BASE_URL, data)
+        return await self.async_call_homegraph_api(REPORT_STATE_BASE_URL, data)
 
 
 class GoogleAssistantView(HomeAssistantView):
@@ -1,7 +1,15 @@
 """Google Report State implementation."""
+import asyncio
+from collections import deque
+from functools import partial
 import logging
+from typing import Callable, Deque, Dict, List, Optional
 
-from homeassistant.const import MATCH_ALL
+from homeassistant.const import (
+    HTTP_INTERNAL_SERVER_ERROR,
+    HTTP_TOO_MANY_REQUESTS,
+    MATCH_ALL,
+)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.significant_change import create_checker
@@ -14,16 +22,205 @@ from .helpers import AbstractConfig, GoogleEntity, async_get_entities
 # https://github.com/actions-on-google/smart-home-nodejs/issues/196#issuecomment-439156639
 INITIAL_REPORT_DELAY = 60
 
+# Seconds to coalesce state changes into a single report
+REPORT_STATE_WINDOW = 1
+# Max number of entities in a single report
+REPORT_STATE_MAX_ENTITIES = 100
+# Number of times a failed report is retried
+REPORT_STATE_RETRIES = 3
+# Seconds to wait before the first retry, doubled on every retry
+REPORT_STATE_BACKOFF = 2
+# Number of reports kept for the batch size and latency samples
+REPORT_STATE_SAMPLES = 100
+
 
 _LOGGER = logging.getLogger(__name__)
 
 
+class _Retry:
+    """States to report again to an agent user."""
+
+    __slots__ = ("attempt", "since", "states", "unsub")
+
+    def __init__(self, attempt: int, since: float) -> None:
+        """Initialize the retry."""
+        self.attempt = attempt
+        self.since = since
+        self.states: Dict[str, dict] = {}
+        self.unsub: Optional[Callable[[], None]] = None
+
+
+class ReportStateBatcher:
+    """Coalesce state reports to Google into batches.
+
+    The latest serialized state of every changed entity is kept for a short
+    window and then reported in a single devices.states payload, so a scene
+    that changes many entities at once doesn't cause a burst of requests.
+    Reports are sent one after another. The states of a report that failed
+    for an agent user are reported again to only that user, after an
+    exponential backoff.
+    """
+
+    def __init__(self, hass: HomeAssistant, google_config: AbstractConfig) -> None:
+        """Initialize the batcher."""
+        self._hass = hass
+        self._google_config = google_config
+        self._pending: Dict[str, dict] = {}
+        # Loop time of the oldest pending state change
+        self._pending_since: Optional[float] = None
+        self._unsub_window = None
+        self._retries: Dict[str, _Retry] = {}
+        self._lock = asyncio.Lock()
+        self.batch_sizes: Deque[int] = deque(maxlen=REPORT_STATE_SAMPLES)
+        self.latencies: Deque[float] = deque(maxlen=REPORT_STATE_SAMPLES)
+        self.retries = 0
+        self.failures = 0
+
+    @callback
+    def async_schedule(self, entity_id: str, entity_data: dict) -> None:
+        """Schedule reporting the state of an entity."""
+        self._pending[entity_id] = entity_data
+        if self._pending_since is None:
+            self._pending_since = self._hass.loop.time()
+        if self._unsub_window is None:
+            self._unsub_window = async_call_later(
+                self._hass, REPORT_STATE_WINDOW, self._async_window_closed
+            )
+
+    @callback
+    def _async_window_closed(self, _now) -> None:
+        """Report the states changed during the window."""
+        self._unsub_window = None
+        self._hass.async_create_task(self.async_flush())
+
+    async def async_flush(self) -> None:
+        """Report all pending states."""
+        async with self._lock:
+            if self._unsub_window is not None:
+                self._unsub_window()
+                self._unsub_window = None
+            pending, self._pending = self._pending, {}
+            since, self._pending_since = self._pending_since, None
+            await self._async_report(pending, since)
+
+    async def async_report(self, states: Dict[str, dict]) -> None:
+        """Report states right away, after the reports already in progress."""
+        async with self._lock:
+            await self._async_report(states, self._hass.loop.time())
+
+    async def _async_report(
+        self,
+        states: Dict[str, dict],
+        since: float,
+        agent_user_ids: Optional[List[str]] = None,
+        attempt: int = 0,
+    ) -> None:
+        """Report states in batches of the max size."""
+        entity_ids = list(states)
+        for start in range(0, len(entity_ids), REPORT_STATE_MAX_ENTITIES):
+            batch = {
+                entity_id: states[entity_id]
+                for entity_id in entity_ids[start : start + REPORT_STATE_MAX_ENTITIES]
+            }
+            results = await self._google_config.async_report_state_all(
+                {"devices": {"states": batch}}, agent_user_ids
+            )
+            failed = [
+                agent_user_id
+                for agent_user_id, result in (results or {}).items()
+                if _should_retry(result)
+            ]
+            for agent_user_id in failed:
+                self._async_schedule_retry(agent_user_id, batch, since, attempt + 1)
+
+            if failed:
+                continue
+
+            self.batch_sizes.append(len(batch))
+            self.latencies.append(self._hass.loop.time() - since)
+            _LOGGER.debug(
+                "Reported state of %d entities after %.3fs",
+                len(batch),
+                self.latencies[-1],
+            )
+
+    @callback
+    def _async_schedule_retry(
+        self, agent_user_id: str, batch: Dict[str, dict], since: float, attempt: int
+    ) -> None:
+        """Schedule reporting a failed batch again to an agent user."""
+        if attempt > REPORT_STATE_RETRIES:
+            self.failures += 1
+            _LOGGER.warning(
+                "Unable to report state of %d entities after %d retries",
+                len(batch),
+                REPORT_STATE_RETRIES,
+            )
+            return
+
+        retry = self._retries.get(agent_user_id)
+        if retry is None:
+            retry = self._retries[agent_user_id] = _Retry(attempt, since)
+            retry.unsub = async_call_later(
+                self._hass,
+                REPORT_STATE_BACKOFF * 2 ** (attempt - 1),
+                partial(self._async_retry_due, agent_user_id),
+            )
+        else:
+            retry.attempt = max(retry.attempt, attempt)
+            retry.since = min(retry.since, since)
+        retry.states.update(batch)
+
+    @callback
+    def _async_retry_due(self, agent_user_id: str, _now) -> None:
+        """Report the failed states of an agent user again."""
+        self._hass.async_create_task(self._async_retry(agent_user_id))
+
+    async def _async_retry(self, agent_user_id: str) -> None:
+        """Report the failed states of an agent user again."""
+        async with self._lock:
+            retry = self._retries.pop(agent_user_id, None)
+            if retry is None:
+                return
+            self.retries += 1
+            # States that changed in the meantime go out with the next flush
+            states = {
+                entity_id: entity_data
+                for entity_id, entity_data in retry.states.items()
+                if entity_id not in self._pending
+            }
+            await self._async_report(
+                states, retry.since, [agent_user_id], retry.attempt
+            )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop the pending states."""
+        if self._unsub_window is not None:
+            self._unsub_window()
+            self._unsub_window = None
+        self._pending.clear()
+        self._pending_since = None
+        for retry in self._retries.values():
+            retry.unsub()
+        self._retries.clear()
+
+
+def _should_retry(status: Optional[int]) -> bool:
+    """Return if a report that ended with a HTTP status should be retried."""
+    return status is not None and (
+        status == HTTP_TOO_MANY_REQUESTS or status >= HTTP_INTERNAL_SERVER_ERROR
+    )
+
+
 @callback
 def async_enable_report_state(hass: HomeAssistant, google_config: AbstractConfig):
     """Enable state reporting."""
     checker = None
+    batcher = ReportStateBatcher(hass, google_config)
 
-    async def async_entity_state_listener(changed_entity, old_state, new_state):
+    @callback
+    def async_entity_state_listener(changed_entity, old_state, new_state):
         if not hass.is_running:
             return
 
@@ -49,9 +246,7 @@ def async_enable_report_state(hass: HomeAssistant, google_config: AbstractConfig
 
         _LOGGER.debug("Reporting state for %s: %s", changed_entity, entity_data)
 
-        await google_config.async_report_state_all(
-            {"devices": {"states": {changed_entity: entity_data}}}
-        )
+        batcher.async_schedule(changed_entity, entity_data)
 
     @callback
     def extra_significant_check(
@@ -94,7 +289,7 @@ def async_enable_report_state(hass: HomeAssistant, google_config: AbstractConfig
         if not entities:
             return
 
-        await google_config.async_report_state_all({"devices": {"states": entities}})
+        await batcher.async_report(entities)
 
         unsub = hass.helpers.event.async_track_state_change(
             MATCH_ALL, async_entity_state_listener
@@ -102,5 +297,10 @@ def async_enable_report_state(hass: HomeAssistant, google_config: AbstractConfig
 
     unsub = async_call_later(hass, INITIAL_REPORT_DELAY, inital_report)
 
-    # pylint: disable=unnecessary-lambda
-    return lambda: unsub()
+    @callback
+    def async_disable():
+        """Stop reporting states."""
+        unsub()
+        batcher.async_cancel()
+
+    return async_disable
@@ -3,7 +3,7 @@ from abc import abstractmethod
 import asyncio
 from contextvars import ContextVar
 import logging
-from typing import Any, Dict, Iterable, List, Optional, Set, cast
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, cast
 
 import voluptuous as vol
 
@@ -19,11 +19,12 @@ from homeassistant.const import (
     ENTITY_MATCH_ALL,
     ENTITY_MATCH_NONE,
     EVENT_HOMEASSISTANT_START,
+    EVENT_STATE_CHANGED,
     SERVICE_RELOAD,
     STATE_OFF,
     STATE_ON,
 )
-from homeassistant.core import CoreState, callback, split_entity_id
+from homeassistant.core import CoreState, Event, callback, split_entity_id
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
 from homeassistant.helpers.entity_component import EntityComponent
@@ -31,6 +32,7 @@ from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.helpers.integration_platform import (
     async_process_integration_platforms,
 )
+from homeassistant.helpers.reference_index import ReferenceIndex
 from homeassistant.helpers.reload import async_reload_integration_platforms
 from homeassistant.helpers.typing import HomeAssistantType
 from homeassistant.loader import bind_hass
@@ -39,6 +41,9 @@ from homeassistant.loader import bind_hass
 
 DOMAIN = "group"
 GROUP_ORDER = "group_order"
+GROUP_PREFIX = f"{DOMAIN}."
+DATA_EXPANDED_GROUPS = "group_expanded"
+DATA_ENTITY_REFERENCES = "group_entity_references"
 
 ENTITY_ID_FORMAT = DOMAIN + ".{}"
 
@@ -60,6 +65,8 @@ REG_KEY = f"{DOMAIN}_registry"
 
 _LOGGER = logging.getLogger(__name__)
 
+_END_OF_GROUP = object()
+
 current_domain: ContextVar[str] = ContextVar("current_domain")
 
 
@@ -133,7 +140,8 @@ def expand_entity_ids(hass: HomeAssistantType, entity_ids: Iterable[Any]) -> Lis
 
     Async friendly.
     """
-    found_ids: List[str] = []
+    # A dict is used as an ordered set
+    found_ids: Dict[str, None] = {}
     for entity_id in entity_ids:
         if not isinstance(entity_id, str) or entity_id in (
             ENTITY_MATCH_NONE,
@@ -148,25 +156,106 @@ def expand_entity_ids(hass: HomeAssistantType, entity_ids: Iterable[Any]) -> Lis
             domain, _ = ha.split_entity_id(entity_id)
 
             if domain == DOMAIN:
-                child_entities = get_entity_ids(hass, entity_id)
-                if entity_id in child_entities:
-                    child_entities = list(child_entities)
-                    child_entities.remove(entity_id)
-                found_ids.extend(
-                    ent_id
-                    for ent_id in expand_entity_ids(hass, child_entities)
-                    if ent_id not in found_ids
-                )
-
+                found_ids.update(dict.fromkeys(_expand_group(hass, entity_id)))
             else:
-                if entity_id not in found_ids:
-                    found_ids.append(entity_id)
+                found_ids[entity_id] = None
 
         except AttributeError:
             # Raised by split_entity_id if entity_id is not a string
             pass
 
-    return found_ids
+    return list(found_ids)
+
+
+def _group_members(hass: HomeAssistantType, entity_id: str) -> Tuple[Any, ...]:
+    """Return the members of a group from its state."""
+    group = hass.states.get(entity_id)
+
+    if not group or not group.attributes.get(ATTR_ENTITY_ID):
+        return ()
+
+    return tuple(group.attributes[ATTR_ENTITY_ID])
+
+
+def _expand_group(hass: HomeAssistantType, group_id: str) -> Tuple[str, ...]:
+    """Return the entities in a group, expanding nested groups.
+
+    Once the group integration is set up the expansion is cached until one of
+    the groups it went through changes its members or is removed.
+    """
+    cache: Optional[Tuple[Dict[str, Tuple[str, ...]], ReferenceIndex]]
+    cache = hass.data.get(DATA_EXPANDED_GROUPS)
+
+    if cache is not None:
+        entity_ids = cache[0].get(group_id)
+        if entity_ids is not None:
+            return entity_ids
+
+    # A dict is used as an ordered set
+    groups: Dict[str, None] = {group_id: None}
+    found_ids: Dict[str, None] = {}
+    # Walk the members depth first without recursion, deep nesting is allowed
+    stack = [iter(_group_members(hass, group_id))]
+    while stack:
+        entity_id = next(stack[-1], _END_OF_GROUP)
+        if entity_id is _END_OF_GROUP:
+            stack.pop()
+            continue
+
+        if not isinstance(entity_id, str) or entity_id in (
+            ENTITY_MATCH_NONE,
+            ENTITY_MATCH_ALL,
+        ):
+            continue
+
+        entity_id = entity_id.lower()
+
+        if not entity_id.startswith(GROUP_PREFIX):
+            found_ids[entity_id] = None
+        elif entity_id not in groups:
+            # Groups that are already expanded are skipped, which also stops
+            # groups that contain themselves from looping forever
+            groups[entity_id] = None
+            stack.append(iter(_group_members(hass, entity_id)))
+
+    entity_ids = tuple(found_ids)
+    if cache is not None:
+        expanded, dependencies = cache
+        expanded[group_id] = entity_ids
+        dependencies.async_set(group_id, groups)
+    return entity_ids
+
+
+@callback
+def _async_setup_expanded_groups(hass: HomeAssistantType) -> None:
+    """Set up the cache of group expansions."""
+    expanded: Dict[str, Tuple[str, ...]] = {}
+    # Expanded group -> the groups its expansion went through
+    dependencies = ReferenceIndex()
+    hass.data[DATA_EXPANDED_GROUPS] = (expanded, dependencies)
+
+    @callback
+    def _members_changed(event: Event) -> bool:
+        """Return if a group was added, removed or changed its members."""
+        if not event.data[ATTR_ENTITY_ID].startswith(GROUP_PREFIX):
+            return False
+        old_state = event.data["old_state"]
+        new_state = event.data["new_state"]
+        return (
+            old_state is None
+            or new_state is None
+            or old_state.attributes.get(ATTR_ENTITY_ID)
+            != new_state.attributes.get(ATTR_ENTITY_ID)
+        )
+
+    @callback
+    def _async_invalidate(event: Event) -> None:
+        """Drop the expansions that went through the changed group."""
+        for group_id in dependencies.async_get(event.data[ATTR_ENTITY_ID]):
+            del expanded[group_id]
+            dependencies.async_remove(group_id)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _async_invalidate, _members_changed)
 
 
 @bind_hass
@@ -200,13 +289,16 @@ def groups_with_entity(hass: HomeAssistantType, entity_id: str) -> List[str]:
     if DOMAIN not in hass.data:
         return []
 
-    groups = []
+    return _async_get_references(hass).async_get(entity_id)
 
-    for group in hass.data[DOMAIN].entities:
-        if entity_id in group.tracking:
-            groups.append(group.entity_id)
 
-    return groups
+@callback
+def _async_get_references(hass: HomeAssistantType) -> ReferenceIndex:
+    """Return the index of the groups containing an entity."""
+    references = hass.data.get(DATA_ENTITY_REFERENCES)
+    if references is None:
+        references = hass.data[DATA_ENTITY_REFERENCES] = ReferenceIndex()
+    return references
 
 
 async def async_setup(hass, config):
@@ -217,21 +309,33 @@ async def async_setup(hass, config):
         component = hass.data[DOMAIN] = EntityComponent(_LOGGER, DOMAIN, hass)
 
     hass.data[REG_KEY] = GroupIntegrationRegistry()
+    _async_setup_expanded_groups(hass)
 
     await async_process_integration_platforms(hass, DOMAIN, _process_group_platform)
 
     await _async_process_config(hass, config, component)
 
     async def reload_service_handler(service):
-        """Remove all user-defined groups and load new ones from config."""
-        auto = list(filter(lambda e: not e.user_defined, component.entities))
-
-        conf = await component.async_prepare_reload()
+        """Replace the user-defined groups that changed in config."""
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
-        await _async_process_config(hass, conf, component)
 
-        await component.async_add_entities(auto)
+        configs = {
+            ENTITY_ID_FORMAT.format(object_id): group_conf
+            for object_id, group_conf in conf.get(DOMAIN, {}).items()
+        }
+        stale = [
+            group.entity_id
+            for group in component.entities
+            if group.user_defined and configs.get(group.entity_id) != group.config
+        ]
+        if stale:
+            await asyncio.gather(
+                *[component.async_remove_entity(entity_id) for entity_id in stale]
+            )
+
+        await _async_process_config(hass, conf, component)
 
         await async_reload_integration_platforms(hass, DOMAIN, PLATFORMS)
 
@@ -309,6 +413,9 @@ async def async_setup(hass, config):
             if need_update:
                 group.async_write_ha_state()
 
+            # The group no longer matches its configuration
+            group.config = None
+
             return
 
         # remove group
@@ -354,8 +461,14 @@ async def _async_process_config(hass, config, component):
     hass.data.setdefault(GROUP_ORDER, 0)
 
     tasks = []
+    configs = []
 
     for object_id, conf in config.get(DOMAIN, {}).items():
+        group = component.get_entity(ENTITY_ID_FORMAT.format(object_id))
+        if group is not None and group.user_defined and group.config == conf:
+            # Unchanged since the last reload
+            continue
+
         name = conf.get(CONF_NAME, object_id)
         entity_ids = conf.get(CONF_ENTITIES) or []
         icon = conf.get(CONF_ICON)
@@ -376,13 +489,17 @@ async def _async_process_config(hass, config, component):
                 order=hass.data[GROUP_ORDER],
             )
         )
+        configs.append(conf)
 
         # Keep track of the group order without iterating
         # every state in the state machine every time
         # we setup a new group
         hass.data[GROUP_ORDER] += 1
 
-    await asyncio.gather(*tasks)
+    groups = await asyncio.gather(*tasks)
+
+    for group, conf in zip(groups, configs):
+        group.config = conf
 
 
 class GroupEntity(Entity):
@@ -444,6 +561,8 @@ class Group(Entity):
         self._assumed = None
         self._on_states = None
         self.user_defined = user_defined
+        # Configuration the group was created from, used to detect changes
+        self.config = None
         self.mode = any
         if mode:
             self.mode = all
@@ -574,6 +693,7 @@ class Group(Entity):
         """
         self._async_stop()
         self._set_tracked(entity_ids)
+        _async_get_references(self.hass).async_set(self.entity_id, self.tracking)
         self._reset_tracked_state()
         self._async_start()
 
@@ -638,6 +758,8 @@ class Group(Entity):
 
     async def async_added_to_hass(self):
         """Handle addition to Home Assistant."""
+        _async_get_references(self.hass).async_set(self.entity_id, self.tracking)
+
         if self.hass.state != CoreState.running:
             self.hass.bus.async_listen_once(
                 EVENT_HOMEASSISTANT_START, self._async_start
@@ -650,6 +772,7 @@ class Group(Entity):
 
     async def async_will_remove_from_hass(self):
         """Handle removal from Home Assistant."""
+        _async_get_references(self.hass).async_remove(self.entity_id)
         self._async_stop()
 
     async def _async_state_changed_listener(self, event):
@@ -27,7 +27,7 @@ from homeassistant.const import (
     CONF_INCLUDE,
     HTTP_BAD_REQUEST,
 )
-from homeassistant.core import Context, State, split_entity_id
+from homeassistant.core import EXECUTOR_POOL_DB_READ, Context, State, split_entity_id
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
     CONF_ENTITY_GLOBS,
@@ -513,7 +513,8 @@ class HistoryPeriodView(HomeAssistantView):
 
         return cast(
             web.Response,
-            await hass.async_add_executor_job(
+            await hass.async_add_pool_executor_job(
+                EXECUTOR_POOL_DB_READ,
                 self._sorted_significant_states_json,
                 hass,
                 start_time,
@@ -1,7 +1,9 @@
 """Offer state listening automation rules."""
 from datetime import timedelta
+import itertools
 import logging
-from typing import Any, Dict, Optional
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import voluptuous as vol
 
@@ -21,6 +23,8 @@ from homeassistant.helpers.event import (
 
 _LOGGER = logging.getLogger(__name__)
 
+DATA_STATE_TRIGGER_INDEX = "homeassistant_state_trigger_index"
+
 CONF_ENTITY_ID = "entity_id"
 CONF_FROM = "from"
 CONF_TO = "to"
@@ -63,6 +67,165 @@ def TRIGGER_SCHEMA(value: Any) -> dict:  # pylint: disable=invalid-name
     return TRIGGER_STATE_SCHEMA(value)
 
 
+_TriggerHandler = Tuple[int, Callable[[Event], None]]
+
+
+class _EntityTriggers:
+    """State triggers of a single entity."""
+
+    __slots__ = ("by_to", "any_to", "unsub")
+
+    def __init__(self) -> None:
+        """Initialize the entity triggers."""
+        # attribute -> value the trigger changes to -> handlers
+        self.by_to: Dict[Optional[str], Dict[Any, List[_TriggerHandler]]] = {}
+        # Handlers that can match any new value
+        self.any_to: List[_TriggerHandler] = []
+        self.unsub: Optional[CALLBACK_TYPE] = None
+
+
+class StateTriggerIndex:
+    """Shared dispatch table for state triggers.
+
+    A state change only runs the handlers of triggers whose "to" value can
+    match the new state, instead of every state trigger of the entity.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the index."""
+        self.hass = hass
+        self._entities: Dict[str, _EntityTriggers] = {}
+        self._sequence = itertools.count()
+
+    @callback
+    def async_add(
+        self,
+        entity_ids: Iterable[str],
+        attribute: Optional[str],
+        to_values: Optional[List[Any]],
+        handler: Callable[[Event], None],
+    ) -> CALLBACK_TYPE:
+        """Add a trigger handler, to_values of None matches any new value."""
+        trigger: _TriggerHandler = (next(self._sequence), handler)
+        handler_lists: List[Tuple[str, List[_TriggerHandler]]] = []
+
+        for entity_id in entity_ids:
+            entity_triggers = self._entities.get(entity_id)
+            if entity_triggers is None:
+                entity_triggers = self._entities[entity_id] = _EntityTriggers()
+                entity_triggers.unsub = async_track_state_change_event(
+                    self.hass, entity_id, self._async_dispatch
+                )
+
+            if to_values is None:
+                handler_lists.append((entity_id, entity_triggers.any_to))
+                continue
+
+            by_value = entity_triggers.by_to.setdefault(attribute, {})
+            for value in to_values:
+                handler_lists.append((entity_id, by_value.setdefault(value, [])))
+
+        for _, handlers in handler_lists:
+            handlers.append(trigger)
+
+        @callback
+        def async_remove() -> None:
+            """Remove the trigger handler."""
+            for entity_id, handlers in handler_lists:
+                handlers.remove(trigger)
+                self._async_cleanup(entity_id)
+
+        return async_remove
+
+    @callback
+    def _async_cleanup(self, entity_id: str) -> None:
+        """Stop tracking an entity when it has no triggers left."""
+        entity_triggers = self._entities.get(entity_id)
+        if entity_triggers is None:
+            return
+
+        for attribute, by_value in list(entity_triggers.by_to.items()):
+            for value, handlers in list(by_value.items()):
+                if not handlers:
+                    del by_value[value]
+            if not by_value:
+                del entity_triggers.by_to[attribute]
+
+        if entity_triggers.any_to or entity_triggers.by_to:
+            return
+
+        del self._entities[entity_id]
+        assert entity_triggers.unsub is not None
+        entity_triggers.unsub()
+
+    @callback
+    def _async_dispatch(self, event: Event) -> None:
+        """Run the handlers of the triggers that can match a state change."""
+        entity_id = event.data["entity_id"]
+        entity_triggers = self._entities.get(entity_id)
+        if entity_triggers is None:
+            return
+
+        candidates = list(entity_triggers.any_to)
+        new_state: Optional[State] = event.data.get("new_state")
+        sources = 1 if candidates else 0
+
+        if new_state is not None:
+            for attribute, by_value in entity_triggers.by_to.items():
+                if attribute is None:
+                    value = new_state.state
+                else:
+                    value = new_state.attributes.get(attribute)
+                try:
+                    handlers = by_value.get(value)
+                except TypeError:
+                    # Unhashable attribute values can't match a "to" value
+                    continue
+                if handlers:
+                    candidates.extend(handlers)
+                    sources += 1
+
+        # Keep the order in which the triggers were attached
+        if sources > 1:
+            candidates.sort(key=itemgetter(0))
+
+        for _, handler in candidates:
+            try:
+                handler(event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception(
+                    "Error while processing state trigger for %s", entity_id
+                )
+
+
+@callback
+def _async_get_index(hass: HomeAssistant) -> StateTriggerIndex:
+    """Return the shared state trigger index."""
+    index: Optional[StateTriggerIndex] = hass.data.get(DATA_STATE_TRIGGER_INDEX)
+    if index is None:
+        index = hass.data[DATA_STATE_TRIGGER_INDEX] = StateTriggerIndex(hass)
+    return index
+
+
+def _indexable_values(to_state: Any) -> Optional[List[Any]]:
+    """Return the values a "to" option matches, or None if it can't be indexed."""
+    if to_state is None or to_state == MATCH_ALL:
+        return None
+
+    if isinstance(to_state, str) or not hasattr(to_state, "__iter__"):
+        to_values = [to_state]
+    else:
+        to_values = list(to_state)
+
+    try:
+        for value in to_values:
+            hash(value)
+    except TypeError:
+        return None
+
+    return to_values
+
+
 async def async_attach_trigger(
     hass: HomeAssistant,
     config,
@@ -189,7 +352,14 @@ async def async_attach_trigger(
             entity_ids=entity,
         )
 
-    unsub = async_track_state_change_event(hass, entity_id, state_automation_listener)
+    unsub = _async_get_index(hass).async_add(
+        [entity_id.lower()]
+        if isinstance(entity_id, str)
+        else [entity.lower() for entity in entity_id],
+        attribute,
+        _indexable_values(to_state),
+        state_automation_listener,
+    )
 
     @callback
     def async_remove():
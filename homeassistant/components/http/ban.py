@@ -1,10 +1,10 @@
 """Ban logic for HTTP component."""
 from collections import defaultdict
 from datetime import datetime
-from ipaddress import ip_address
+from ipaddress import IPv4Address, IPv6Address, ip_address, ip_network
 import logging
 from socket import gethostbyaddr, herror
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
 
 from aiohttp.web import middleware
 from aiohttp.web_exceptions import HTTPForbidden, HTTPUnauthorized
@@ -45,8 +45,8 @@ def setup_bans(hass, app, login_threshold):
 
     async def ban_startup(app):
         """Initialize bans when app starts up."""
-        app[KEY_BANNED_IPS] = await async_load_ip_bans_config(
-            hass, hass.config.path(IP_BANS_FILE)
+        app[KEY_BANNED_IPS] = IpBans(
+            await async_load_ip_bans_config(hass, hass.config.path(IP_BANS_FILE))
         )
 
     app.on_startup.append(ban_startup)
@@ -60,12 +60,7 @@ async def ban_middleware(request, handler):
         return await handler(request)
 
     # Verify if IP is not banned
-    ip_address_ = ip_address(request.remote)
-    is_banned = any(
-        ip_ban.ip_address == ip_address_ for ip_ban in request.app[KEY_BANNED_IPS]
-    )
-
-    if is_banned:
+    if request.app[KEY_BANNED_IPS].is_banned(ip_address(request.remote)):
         raise HTTPForbidden()
 
     try:
@@ -137,7 +132,7 @@ async def process_wrong_login(request):
         >= request.app[KEY_LOGIN_THRESHOLD]
     ):
         new_ban = IpBan(remote_addr)
-        request.app[KEY_BANNED_IPS].append(new_ban)
+        request.app[KEY_BANNED_IPS].add(new_ban)
 
         await hass.async_add_executor_job(
             update_ip_bans_config, hass.config.path(IP_BANS_FILE), new_ban
@@ -176,13 +171,75 @@ async def process_success_login(request):
 
 
 class IpBan:
-    """Represents banned IP address."""
+    """Represents banned IP address or network."""
 
-    def __init__(self, ip_ban: str, banned_at: Optional[datetime] = None) -> None:
+    def __init__(
+        self,
+        ip_ban: Union[str, IPv4Address, IPv6Address],
+        banned_at: Optional[datetime] = None,
+    ) -> None:
         """Initialize IP Ban object."""
-        self.ip_address = ip_address(ip_ban)
+        self.ip_network = ip_network(ip_ban)
         self.banned_at = banned_at or dt_util.utcnow()
 
+    def __str__(self) -> str:
+        """Return the banned IP address or network."""
+        if self.ip_network.num_addresses == 1:
+            return str(self.ip_network.network_address)
+        return str(self.ip_network)
+
+
+class IpBans:
+    """Banned IP addresses and networks, indexed to check an address quickly.
+
+    Banned addresses are kept in a set. Banned networks are kept per IP version
+    and prefix length as the integer of their prefix, so checking an address
+    takes a set lookup per prefix length in use instead of comparing it with
+    every ban.
+    """
+
+    def __init__(self, ip_bans: Iterable[IpBan] = ()) -> None:
+        """Initialize the banned IPs."""
+        self._ip_bans: List[IpBan] = []
+        self._addresses: Set[Union[IPv4Address, IPv6Address]] = set()
+        # IP version -> prefix length -> prefixes of the banned networks
+        self._networks: Dict[int, Dict[int, Set[int]]] = {}
+        for ip_ban in ip_bans:
+            self.add(ip_ban)
+
+    def __len__(self) -> int:
+        """Return the number of bans."""
+        return len(self._ip_bans)
+
+    def __iter__(self) -> Iterator[IpBan]:
+        """Iterate over the bans."""
+        return iter(self._ip_bans)
+
+    def add(self, ip_ban: IpBan) -> None:
+        """Add a ban."""
+        self._ip_bans.append(ip_ban)
+        network = ip_ban.ip_network
+        if network.num_addresses == 1:
+            self._addresses.add(network.network_address)
+            return
+        host_bits = network.max_prefixlen - network.prefixlen
+        self._networks.setdefault(network.version, {}).setdefault(
+            network.prefixlen, set()
+        ).add(int(network.network_address) >> host_bits)
+
+    def is_banned(self, address: Union[IPv4Address, IPv6Address]) -> bool:
+        """Return if an IP address is banned."""
+        if address in self._addresses:
+            return True
+        prefixes = self._networks.get(address.version)
+        if not prefixes:
+            return False
+        value = int(address)
+        return any(
+            value >> (address.max_prefixlen - prefixlen) in networks
+            for prefixlen, networks in prefixes.items()
+        )
+
 
 async def async_load_ip_bans_config(hass: HomeAssistant, path: str) -> List[IpBan]:
     """Load list of banned IPs from config file."""
@@ -199,8 +256,8 @@ async def async_load_ip_bans_config(hass: HomeAssistant, path: str) -> List[IpBa
     for ip_ban, ip_info in list_.items():
         try:
             ip_info = SCHEMA_IP_BAN_ENTRY(ip_info)
-            ip_list.append(IpBan(ip_ban, ip_info["banned_at"]))
-        except vol.Invalid as err:
+            ip_list.append(IpBan(ip_ban, ip_info.get("banned_at")))
+        except (vol.Invalid, ValueError) as err:
             _LOGGER.error("Failed to load IP ban %s: %s", ip_info, err)
             continue
 
@@ -210,6 +267,6 @@ async def async_load_ip_bans_config(hass: HomeAssistant, path: str) -> List[IpBa
 def update_ip_bans_config(path: str, ip_ban: IpBan) -> None:
     """Update config file with new banned IP address."""
     with open(path, "a") as out:
-        ip_ = {str(ip_ban.ip_address): {ATTR_BANNED_AT: ip_ban.banned_at.isoformat()}}
+        ip_ = {str(ip_ban): {ATTR_BANNED_AT: ip_ban.banned_at.isoformat()}}
         out.write("\n")
         out.write(yaml.dump(ip_))
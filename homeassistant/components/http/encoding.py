@@ -0,0 +1,32 @@
+"""Negotiate the content encoding of responses."""
+from typing import Dict, Optional
+
+
+def parse_accept_encoding(accept_encoding: Optional[str]) -> Dict[str, float]:
+    """Return the quality values of the encodings in an Accept-Encoding header.
+
+    Encodings refused by the client are kept with a quality value of 0, as
+    they override the * wildcard.
+    """
+    encodings: Dict[str, float] = {}
+    for item in (accept_encoding or "").split(","):
+        encoding, *params = item.split(";")
+        encoding = encoding.strip().lower()
+        if not encoding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() != "q":
+                continue
+            try:
+                quality = min(max(float(value), 0.0), 1.0)
+            except ValueError:
+                quality = 0.0
+        encodings[encoding] = quality
+    return encodings
+
+
+def encoding_quality(encodings: Dict[str, float], encoding: str) -> float:
+    """Return the quality value of an encoding, 0 if it is not accepted."""
+    return encodings.get(encoding, encodings.get("*", 0.0))
@@ -1,32 +1,137 @@
 """Static file handling for HTTP component."""
+import asyncio
+from collections import OrderedDict
+import mimetypes
+import os
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 from aiohttp import hdrs
-from aiohttp.web import FileResponse
+from aiohttp.web import FileResponse, Response
 from aiohttp.web_exceptions import HTTPForbidden, HTTPNotFound
 from aiohttp.web_urldispatcher import StaticResource
 
+from .encoding import encoding_quality, parse_accept_encoding
+
 # mypy: allow-untyped-defs
 
 CACHE_TIME = 31 * 86400  # = 1 month
 CACHE_HEADERS = {hdrs.CACHE_CONTROL: f"public, max-age={CACHE_TIME}"}
 
+# Precompressed variants of a file, in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+# Files up to this size are served from memory
+MEMORY_CACHE_MAX_FILE_SIZE = 1024 * 1024
+# Memory used to cache the files of a static directory
+MEMORY_CACHE_MAX_SIZE = 16 * 1024 * 1024
+# Seconds after which a file of the index is checked for changes
+CHECK_INTERVAL = 60
+
+
+class _Variant:
+    """A representation of a static file as stored on disk."""
+
+    __slots__ = ("path", "encoding", "size", "mtime", "etag")
+
+    def __init__(
+        self, path: Path, encoding: Optional[str], stat: os.stat_result
+    ) -> None:
+        """Initialize the variant."""
+        self.path = path
+        self.encoding = encoding
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}-{encoding or "identity"}"'
+
+
+class _StaticFile:
+    """A static file and its precompressed variants."""
+
+    __slots__ = ("content_type", "identity", "variants", "checked_at")
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the file, this does I/O."""
+        content_type, encoding = mimetypes.guess_type(path.name)
+        self.content_type = content_type or "application/octet-stream"
+        self.identity = _Variant(path, encoding, path.stat())
+        self.variants: Dict[str, _Variant] = {}
+        for variant_encoding, suffix in ENCODINGS:
+            variant_path = path.with_name(path.name + suffix)
+            try:
+                stat = variant_path.stat()
+            except OSError:
+                continue
+            self.variants[variant_encoding] = _Variant(
+                variant_path, variant_encoding, stat
+            )
+        self.checked_at = 0.0
+
+    def negotiate(self, accept_encoding: Optional[str]) -> _Variant:
+        """Return the variant to serve for the accepted encodings.
+
+        The variant with the highest quality value is served, the order of
+        ENCODINGS breaks ties.
+        """
+        encodings = parse_accept_encoding(accept_encoding)
+        best, best_quality = self.identity, 0.0
+        for encoding, variant in self.variants.items():
+            quality = encoding_quality(encodings, encoding)
+            if quality > best_quality:
+                best, best_quality = variant, quality
+        return best
+
 
 class CachingStaticResource(StaticResource):
-    """Static Resource handler that will add cache headers."""
+    """Static Resource handler that will add cache headers.
+
+    Files are looked up in an index of the directory that is built in the
+    executor on the first request, and checked for changes at most once per
+    CHECK_INTERVAL. Precompressed variants are served to clients accepting
+    their encoding and small files are served from memory.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the resource."""
+        super().__init__(*args, **kwargs)
+        self._index: Optional[Dict[str, _StaticFile]] = None
+        self._index_task: Optional[asyncio.Future] = None
+        # Path of a variant -> its ETag and content
+        self._memory_cache: "OrderedDict[Path, Tuple[str, bytes]]" = OrderedDict()
+        self._memory_cache_size = 0
+        self._reads: Dict[Path, asyncio.Future] = {}
 
     async def _handle(self, request):
         rel_url = request.match_info["filename"]
+        loop = asyncio.get_running_loop()
+        index = await self._async_get_index()
+        static_file = index.get(rel_url)
+
         try:
-            filename = Path(rel_url)
-            if filename.anchor:
-                # rel_url is an absolute name like
-                # /static/\\machine_name\c$ or /static/D:\path
-                # where the static dir is totally different
-                raise HTTPForbidden()
-            filepath = self._directory.joinpath(filename).resolve()
-            if not self._follow_symlinks:
-                filepath.relative_to(self._directory)
+            if (
+                static_file is not None
+                and loop.time() - static_file.checked_at > CHECK_INTERVAL
+            ):
+                static_file = await loop.run_in_executor(
+                    None, _reload, static_file.identity.path
+                )
+                if static_file is None:
+                    del index[rel_url]
+                else:
+                    static_file.checked_at = loop.time()
+                    index[rel_url] = static_file
+
+            if static_file is None:
+                filepath = await loop.run_in_executor(None, self._resolve, rel_url)
+                # on opening a dir, load its contents if allowed
+                if filepath is None:
+                    return await super()._handle(request)
+                static_file = await loop.run_in_executor(None, _StaticFile, filepath)
+                static_file.checked_at = loop.time()
+                # Only index the canonical path of a file
+                if filepath.relative_to(self._directory).as_posix() == rel_url:
+                    index[rel_url] = static_file
+        except (HTTPForbidden, HTTPNotFound):
+            raise
         except (ValueError, FileNotFoundError) as error:
             # relatively safe
             raise HTTPNotFound() from error
@@ -35,14 +140,125 @@ class CachingStaticResource(StaticResource):
             request.app.logger.exception(error)
             raise HTTPNotFound() from error
 
-        # on opening a dir, load its contents if allowed
+        return await self._async_respond(request, static_file)
+
+    async def _async_get_index(self) -> Dict[str, _StaticFile]:
+        """Return the index of the directory, building it on first use."""
+        if self._index is not None:
+            return self._index
+        if self._index_task is None:
+            self._index_task = asyncio.get_running_loop().run_in_executor(
+                None, self._build_index
+            )
+        index = await asyncio.shield(self._index_task)
+        if self._index is None:
+            now = asyncio.get_running_loop().time()
+            for static_file in index.values():
+                static_file.checked_at = now
+            self._index = index
+        return self._index
+
+    def _build_index(self) -> Dict[str, _StaticFile]:
+        """Index the files of the directory, this does I/O."""
+        index: Dict[str, _StaticFile] = {}
+        for root, _, filenames in os.walk(
+            self._directory, followlinks=self._follow_symlinks
+        ):
+            for filename in filenames:
+                filepath = Path(root, filename)
+                try:
+                    if not self._follow_symlinks:
+                        filepath.resolve().relative_to(self._directory)
+                    static_file = _StaticFile(filepath)
+                except (OSError, ValueError):
+                    continue
+                index[filepath.relative_to(self._directory).as_posix()] = static_file
+        return index
+
+    def _resolve(self, rel_url: str) -> Optional[Path]:
+        """Return the file of a relative URL or None for a dir, this does I/O."""
+        filename = Path(rel_url)
+        if filename.anchor:
+            # rel_url is an absolute name like
+            # /static/\\machine_name\c$ or /static/D:\path
+            # where the static dir is totally different
+            raise HTTPForbidden()
+        filepath = self._directory.joinpath(filename).resolve()
+        if not self._follow_symlinks:
+            filepath.relative_to(self._directory)
         if filepath.is_dir():
-            return await super()._handle(request)
+            return None
         if filepath.is_file():
+            return filepath
+        raise HTTPNotFound()
+
+    async def _async_respond(self, request, static_file: _StaticFile):
+        """Respond with the variant of a file the client accepts."""
+        variant = static_file.negotiate(request.headers.get(hdrs.ACCEPT_ENCODING))
+        headers = {**CACHE_HEADERS, hdrs.ETAG: variant.etag}
+        if static_file.variants:
+            headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
+
+        if_none_match = request.headers.get(hdrs.IF_NONE_MATCH)
+        if if_none_match is not None and (
+            if_none_match == "*" or variant.etag in if_none_match
+        ):
+            return Response(status=304, headers=headers)
+
+        headers[hdrs.CONTENT_TYPE] = static_file.content_type
+        if variant.encoding:
+            headers[hdrs.CONTENT_ENCODING] = variant.encoding
+
+        if variant.size > MEMORY_CACHE_MAX_FILE_SIZE or hdrs.RANGE in request.headers:
             return FileResponse(
-                filepath,
+                variant.path,
                 chunk_size=self._chunk_size,
                 # type ignore: https://github.com/aio-libs/aiohttp/pull/3976
-                headers=CACHE_HEADERS,  # type: ignore
+                headers=headers,  # type: ignore
             )
-        raise HTTPNotFound
+
+        response = Response(body=await self._async_read(variant), headers=headers)
+        response.last_modified = variant.mtime  # type: ignore
+        return response
+
+    async def _async_read(self, variant: _Variant) -> bytes:
+        """Return the content of a variant, reading it once for all requests."""
+        cached = self._memory_cache.get(variant.path)
+        if cached is not None and cached[0] == variant.etag:
+            self._memory_cache.move_to_end(variant.path)
+            return cached[1]
+
+        read = self._reads.get(variant.path)
+        if read is None:
+            read = self._reads[
+                variant.path
+            ] = asyncio.get_running_loop().run_in_executor(
+                None, variant.path.read_bytes
+            )
+            try:
+                body = await asyncio.shield(read)
+            finally:
+                del self._reads[variant.path]
+            self._cache(variant, body)
+            return body
+
+        return await asyncio.shield(read)
+
+    def _cache(self, variant: _Variant, body: bytes) -> None:
+        """Keep the content of a variant in memory."""
+        previous = self._memory_cache.pop(variant.path, None)
+        if previous is not None:
+            self._memory_cache_size -= len(previous[1])
+        self._memory_cache[variant.path] = (variant.etag, body)
+        self._memory_cache_size += len(body)
+        while self._memory_cache_size > MEMORY_CACHE_MAX_SIZE:
+            _, (_, evicted) = self._memory_cache.popitem(last=False)
+            self._memory_cache_size -= len(evicted)
+
+
+def _reload(path: Path) -> Optional[_StaticFile]:
+    """Load a static file again or return None if it is gone, this does I/O."""
+    try:
+        return _StaticFile(path)
+    except FileNotFoundError:
+        return None
@@ -1,11 +1,13 @@
 """Support for sending data to an Influx database."""
 from dataclasses import dataclass
+from datetime import datetime
+import gzip
 import logging
 import math
 import queue
 import threading
 import time
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from influxdb import InfluxDBClient, exceptions
 from influxdb_client import InfluxDBClient as InfluxDBClientV2
@@ -26,7 +28,7 @@ from homeassistant.const import (
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
 )
-from homeassistant.core import callback
+from homeassistant.core import Event, callback
 from homeassistant.helpers import event as event_helper, state as state_helper
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity_values import EntityValues
@@ -34,11 +36,16 @@ from homeassistant.helpers.entityfilter import (
     INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA,
     convert_include_exclude_filter,
 )
+from homeassistant.util import dt as dt_util
 
+from .buffer import WriteBuffer
 from .const import (
     API_VERSION_2,
     BATCH_BUFFER_SIZE,
     BATCH_TIMEOUT,
+    BUFFER_DIR,
+    BUFFER_FULL_MESSAGE,
+    BUFFERING_MESSAGE,
     CATCHING_UP_MESSAGE,
     CLIENT_ERROR_V1,
     CLIENT_ERROR_V2,
@@ -46,6 +53,7 @@ from .const import (
     COMPONENT_CONFIG_SCHEMA_CONNECTION,
     CONF_API_VERSION,
     CONF_BUCKET,
+    CONF_BUFFER,
     CONF_COMPONENT_CONFIG,
     CONF_COMPONENT_CONFIG_DOMAIN,
     CONF_COMPONENT_CONFIG_GLOB,
@@ -53,6 +61,7 @@ from .const import (
     CONF_DEFAULT_MEASUREMENT,
     CONF_HOST,
     CONF_IGNORE_ATTRIBUTES,
+    CONF_MAX_SIZE,
     CONF_MEASUREMENT_ATTR,
     CONF_ORG,
     CONF_OVERRIDE_MEASUREMENT,
@@ -60,6 +69,7 @@ from .const import (
     CONF_PATH,
     CONF_PORT,
     CONF_PRECISION,
+    CONF_REPLAY_RATE,
     CONF_RETRY_COUNT,
     CONF_SSL,
     CONF_SSL_CA_CERT,
@@ -70,22 +80,24 @@ from .const import (
     CONF_VERIFY_SSL,
     CONNECTION_ERROR,
     DEFAULT_API_VERSION,
+    DEFAULT_BUFFER_MAX_SIZE,
     DEFAULT_HOST_V2,
     DEFAULT_MEASUREMENT_ATTR,
+    DEFAULT_REPLAY_RATE,
     DEFAULT_SSL_V2,
     DOMAIN,
     EVENT_NEW_STATE,
-    INFLUX_CONF_FIELDS,
-    INFLUX_CONF_MEASUREMENT,
+    GZIP_LEVEL,
     INFLUX_CONF_ORG,
     INFLUX_CONF_STATE,
-    INFLUX_CONF_TAGS,
-    INFLUX_CONF_TIME,
     INFLUX_CONF_VALUE,
+    PRECISION_DIVISORS,
+    PRECISIONS_V1,
     QUERY_ERROR,
     QUEUE_BACKLOG_SECONDS,
     RE_DECIMAL,
     RE_DIGIT_TAIL,
+    REPLAYED_MESSAGE,
     RESUMED_MESSAGE,
     RETRY_DELAY,
     RETRY_INTERVAL,
@@ -99,6 +111,12 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+WRITE_HEADERS_V1 = {
+    "Content-Type": "application/octet-stream",
+    "Content-Encoding": "gzip",
+    "Accept": "text/plain",
+}
+
 
 def create_influx_url(conf: Dict) -> Dict:
     """Build URL used from config inputs and default when necessary."""
@@ -154,9 +172,21 @@ _CUSTOMIZE_ENTITY_SCHEMA = vol.Schema(
     }
 )
 
+_BUFFER_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_MAX_SIZE, default=DEFAULT_BUFFER_MAX_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(CONF_REPLAY_RATE, default=DEFAULT_REPLAY_RATE): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+    }
+)
+
 _INFLUX_BASE_SCHEMA = INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.extend(
     {
         vol.Optional(CONF_RETRY_COUNT, default=0): cv.positive_int,
+        vol.Optional(CONF_BUFFER): _BUFFER_SCHEMA,
         vol.Optional(CONF_DEFAULT_MEASUREMENT): cv.string,
         vol.Optional(CONF_MEASUREMENT_ATTR, default=DEFAULT_MEASUREMENT_ATTR): vol.In(
             ["unit_of_measurement", "domain__device_class", "entity_id"]
@@ -193,8 +223,137 @@ CONFIG_SCHEMA = vol.Schema(
 )
 
 
-def _generate_event_to_json(conf: Dict) -> Callable[[Dict], str]:
-    """Build event to json converter and add to config."""
+_TAG_ESCAPES = str.maketrans(
+    {"\\": "\\\\", " ": "\\ ", ",": "\\,", "=": "\\=", "\n": "\\n"}
+)
+_STRING_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n"})
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_util.UTC)
+
+# Field keys and their encoded fields, None for fields that must be removed
+FieldItems = List[Tuple[str, Optional[str]]]
+
+
+def _escape_tag(value: Any) -> str:
+    """Escape a measurement, tag key or field key for the line protocol."""
+    if value is None:
+        return ""
+    if isinstance(value, bytes):
+        value = value.decode()
+    return str(value).translate(_TAG_ESCAPES)
+
+
+def _escape_tag_value(value: Any) -> str:
+    """Escape a tag value for the line protocol."""
+    value = _escape_tag(value)
+    if value.endswith("\\"):
+        value += " "
+    return value
+
+
+def _field_value(value: Any) -> str:
+    """Encode a field value for the line protocol."""
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, bytes):
+        value = value.decode()
+    if isinstance(value, str):
+        return f'"{value.translate(_STRING_ESCAPES)}"' if value else ""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return f"{value}i"
+    if value is None:
+        return ""
+    try:
+        return repr(float(value))
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def _timestamp(time_fired: Any, divisor: int) -> Any:
+    """Return the timestamp of an event in the configured precision."""
+    if not isinstance(time_fired, datetime):
+        # Assume the precision is correct, like the client libraries do
+        return time_fired
+    if time_fired.tzinfo is None:
+        time_fired = time_fired.replace(tzinfo=dt_util.UTC)
+    delta = time_fired - _EPOCH
+    nanoseconds = (delta.days * 86400 + delta.seconds) * 10 ** 9
+    return (nanoseconds + delta.microseconds * 1000) // divisor
+
+
+def _field(key: str, value: Any) -> Optional[str]:
+    """Encode a field for the line protocol, None if it can't be written."""
+    key = _escape_tag(key)
+    value = _field_value(value)
+    if key and value:
+        return f"{key}={value}"
+    return None
+
+
+def _number_fields(key: str, value: Any) -> FieldItems:
+    """Return the field of a number attribute."""
+    value = float(value)
+    # Infinity and NaN are not valid floats in InfluxDB
+    if math.isfinite(value):
+        return [(key, _field(key, value))]
+    return [(key, None)]
+
+
+def _text_fields(key: str, value: str) -> FieldItems:
+    """Return the fields of an attribute that isn't a number."""
+    # Prevent column data errors in influxDB.
+    # We store the value as string add "_str" postfix to the field key,
+    # and as number if the digits of the string form one.
+    items = [(f"{key}_str", _field(f"{key}_str", value))]
+    if RE_DIGIT_TAIL.match(value):
+        items.append((key, _field(key, float(RE_DECIMAL.sub("", value)))))
+    return items
+
+
+def _string_fields(key: str, value: str) -> FieldItems:
+    """Return the fields of a string attribute."""
+    try:
+        number = float(value)
+    except ValueError:
+        return _text_fields(key, value)
+    return _number_fields(key, number)
+
+
+def _other_fields(key: str, value: Any) -> FieldItems:
+    """Return the fields of an attribute of another type."""
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        return _text_fields(key, str(value))
+    return _number_fields(key, number)
+
+
+# Attribute value type -> converter returning the fields of the attribute
+_FIELD_CONVERTERS: Dict[type, Callable[[str, Any], FieldItems]] = {
+    bool: _number_fields,
+    float: _number_fields,
+    int: _number_fields,
+    str: _string_fields,
+}
+
+
+def _series_key(
+    measurement: Any, domain: str, object_id: str, tag_values: tuple, tags: Dict
+) -> str:
+    """Return the measurement and tag set of a point in line protocol."""
+    tag_set = {CONF_DOMAIN: domain, CONF_ENTITY_ID: object_id}
+    tag_set.update(tag_values)
+    tag_set.update(tags)
+    key_values = [_escape_tag(measurement)]
+    for key, value in sorted(tag_set.items()):
+        key = _escape_tag(key)
+        value = _escape_tag_value(value)
+        if key and value:
+            key_values.append(f"{key}={value}")
+    return ",".join(key_values)
+
+
+def _generate_event_to_line(conf: Dict) -> Callable[[Event], Optional[str]]:
+    """Build event to line protocol encoder and add to config."""
     entity_filter = convert_include_exclude_filter(conf)
     tags = conf.get(CONF_TAGS)
     tags_attributes = conf.get(CONF_TAGS_ATTRIBUTES)
@@ -207,16 +366,22 @@ def _generate_event_to_json(conf: Dict) -> Callable[[Dict], str]:
         conf[CONF_COMPONENT_CONFIG_DOMAIN],
         conf[CONF_COMPONENT_CONFIG_GLOB],
     )
-
-    def event_to_json(event: Dict) -> str:
-        """Convert event into json in format Influx expects."""
+    divisor = PRECISION_DIVISORS[conf.get(CONF_PRECISION)]
+    # Entity id -> customization, ignored attributes and attribute fields of
+    # the entity, the fields keyed by field key with the value they encode
+    entity_configs: Dict[str, Tuple[Dict, Set[str], Dict[str, Tuple[Any, Any]]]] = {}
+    # Entity id -> measurement, tag attributes and series key of the entity
+    series_keys: Dict[str, Tuple[Any, tuple, str]] = {}
+
+    def event_to_line(event: Event) -> Optional[str]:
+        """Convert event into a line of the line protocol Influx expects."""
         state = event.data.get(EVENT_NEW_STATE)
         if (
             state is None
             or state.state in (STATE_UNKNOWN, "", STATE_UNAVAILABLE)
             or not entity_filter(state.entity_id)
         ):
-            return
+            return None
 
         try:
             _include_state = _include_value = False
@@ -230,16 +395,24 @@ def _generate_event_to_json(conf: Dict) -> Callable[[Dict], str]:
             except ValueError:
                 _include_state = True
 
+        entity_id = state.entity_id
+        config = entity_configs.get(entity_id)
+        if config is None:
+            entity_config = component_config.get(entity_id)
+            ignore_attributes = set(entity_config.get(CONF_IGNORE_ATTRIBUTES, []))
+            ignore_attributes.update(global_ignore_attributes)
+            config = entity_configs[entity_id] = (entity_config, ignore_attributes, {})
+        entity_config, ignore_attributes, attribute_fields = config
+
         include_uom = True
         include_dc = True
-        entity_config = component_config.get(state.entity_id)
         measurement = entity_config.get(CONF_OVERRIDE_MEASUREMENT)
         if measurement in (None, ""):
             if override_measurement:
                 measurement = override_measurement
             else:
                 if measurement_attr == "entity_id":
-                    measurement = state.entity_id
+                    measurement = entity_id
                 elif measurement_attr == "domain__device_class":
                     device_class = state.attributes.get("device_class")
                     if device_class is None:
@@ -254,65 +427,58 @@ def _generate_event_to_json(conf: Dict) -> Callable[[Dict], str]:
                     if default_measurement:
                         measurement = default_measurement
                     else:
-                        measurement = state.entity_id
+                        measurement = entity_id
                 else:
                     include_uom = measurement_attr != "unit_of_measurement"
 
-        json = {
-            INFLUX_CONF_MEASUREMENT: measurement,
-            INFLUX_CONF_TAGS: {
-                CONF_DOMAIN: state.domain,
-                CONF_ENTITY_ID: state.object_id,
-            },
-            INFLUX_CONF_TIME: event.time_fired,
-            INFLUX_CONF_FIELDS: {},
-        }
+        fields: Dict[str, Optional[str]] = {}
         if _include_state:
-            json[INFLUX_CONF_FIELDS][INFLUX_CONF_STATE] = state.state
+            fields[INFLUX_CONF_STATE] = _field(INFLUX_CONF_STATE, state.state)
         if _include_value:
-            json[INFLUX_CONF_FIELDS][INFLUX_CONF_VALUE] = _state_as_value
+            fields[INFLUX_CONF_VALUE] = _field(INFLUX_CONF_VALUE, _state_as_value)
 
-        ignore_attributes = set(entity_config.get(CONF_IGNORE_ATTRIBUTES, []))
-        ignore_attributes.update(global_ignore_attributes)
+        tag_values = []
         for key, value in state.attributes.items():
             if key in tags_attributes:
-                json[INFLUX_CONF_TAGS][key] = value
+                tag_values.append((key, value))
             elif (
                 (key != CONF_UNIT_OF_MEASUREMENT or include_uom)
                 and (key != "device_class" or include_dc)
                 and key not in ignore_attributes
             ):
                 # If the key is already in fields
-                if key in json[INFLUX_CONF_FIELDS]:
+                if key in fields:
                     key = f"{key}_"
-                # Prevent column data errors in influxDB.
-                # For each value we try to cast it as float
-                # But if we can not do it we store the value
-                # as string add "_str" postfix to the field key
-                try:
-                    json[INFLUX_CONF_FIELDS][key] = float(value)
-                except (ValueError, TypeError):
-                    new_key = f"{key}_str"
-                    new_value = str(value)
-                    json[INFLUX_CONF_FIELDS][new_key] = new_value
-
-                    if RE_DIGIT_TAIL.match(new_value):
-                        json[INFLUX_CONF_FIELDS][key] = float(
-                            RE_DECIMAL.sub("", new_value)
-                        )
-
-                # Infinity and NaN are not valid floats in InfluxDB
-                try:
-                    if not math.isfinite(json[INFLUX_CONF_FIELDS][key]):
-                        del json[INFLUX_CONF_FIELDS][key]
-                except (KeyError, TypeError):
-                    pass
+                # Attributes mostly keep their value between state changes
+                cached = attribute_fields.get(key)
+                if cached is not None and cached[0] == value:
+                    items = cached[1]
+                else:
+                    items = _FIELD_CONVERTERS.get(type(value), _other_fields)(
+                        key, value
+                    )
+                    attribute_fields[key] = (value, items)
+                for field_key, field in items:
+                    if field is None:
+                        fields.pop(field_key, None)
+                    else:
+                        fields[field_key] = field
 
-        json[INFLUX_CONF_TAGS].update(tags)
+        cached = series_keys.get(entity_id)
+        tag_values = tuple(tag_values)
+        if cached is None or cached[0] != measurement or cached[1] != tag_values:
+            series_key = _series_key(
+                measurement, state.domain, state.object_id, tag_values, tags
+            )
+            series_keys[entity_id] = (measurement, tag_values, series_key)
+        else:
+            series_key = cached[2]
 
-        return json
+        field_set = ",".join(field for _, field in sorted(fields.items()) if field)
+        timestamp = _timestamp(event.time_fired, divisor)
+        return f"{series_key} {field_set} {timestamp}"
 
-    return event_to_json
+    return event_to_line
 
 
 @dataclass
@@ -320,7 +486,7 @@ class InfluxClient:
     """An InfluxDB client wrapper for V1 or V2."""
 
     data_repositories: List[str]
-    write: Callable[[str], None]
+    write: Callable[[List[str]], None]
     query: Callable[[str, str], List[Any]]
     close: Callable[[], None]
 
@@ -337,6 +503,7 @@ def get_influx_connection(conf, test_write=False, test_read=False):
         kwargs[CONF_TOKEN] = conf[CONF_TOKEN]
         kwargs[INFLUX_CONF_ORG] = conf[CONF_ORG]
         kwargs[CONF_VERIFY_SSL] = conf[CONF_VERIFY_SSL]
+        kwargs["enable_gzip"] = True
         if CONF_SSL_CA_CERT in conf:
             kwargs[CONF_SSL_CA_CERT] = conf[CONF_SSL_CA_CERT]
         bucket = conf.get(CONF_BUCKET)
@@ -345,9 +512,9 @@ def get_influx_connection(conf, test_write=False, test_read=False):
         initial_write_mode = SYNCHRONOUS if test_write else ASYNCHRONOUS
         write_api = influx.write_api(write_options=initial_write_mode)
 
-        def write_v2(json):
-            """Write data to V2 influx."""
-            data = {"bucket": bucket, "record": json}
+        def write_v2(lines):
+            """Write lines of line protocol to V2 influx."""
+            data = {"bucket": bucket, "record": "\n".join(lines)}
 
             if precision is not None:
                 data["write_precision"] = precision
@@ -358,7 +525,7 @@ def get_influx_connection(conf, test_write=False, test_read=False):
                 raise ConnectionError(CONNECTION_ERROR % exc) from exc
             except ApiException as exc:
                 if exc.status == CODE_INVALID_INPUTS:
-                    raise ValueError(WRITE_ERROR % (json, exc)) from exc
+                    raise ValueError(WRITE_ERROR % (data["record"], exc)) from exc
                 raise ConnectionError(CLIENT_ERROR_V2 % exc) from exc
 
         def query_v2(query, _=None):
@@ -381,10 +548,12 @@ def get_influx_connection(conf, test_write=False, test_read=False):
             # Try to write b"" to influx. If we can connect and creds are valid
             # Then invalid inputs is returned. Anything else is a broken config
             try:
-                write_v2(b"")
+                write_v2([])
             except ValueError:
                 pass
-            write_api = influx.write_api(write_options=ASYNCHRONOUS)
+            # Failed writes can only be buffered when they are synchronous
+            if CONF_BUFFER not in conf:
+                write_api = influx.write_api(write_options=ASYNCHRONOUS)
 
         if test_read:
             tables = query_v2(TEST_QUERY_V2)
@@ -423,11 +592,22 @@ def get_influx_connection(conf, test_write=False, test_read=False):
         kwargs[CONF_SSL] = conf[CONF_SSL]
 
     influx = InfluxDBClient(**kwargs)
+    write_params = {"db": conf.get(CONF_DB_NAME)}
+    if precision is not None:
+        write_params["precision"] = PRECISIONS_V1[precision]
 
-    def write_v1(json):
-        """Write data to V1 influx."""
+    def write_v1(lines):
+        """Write lines of line protocol to V1 influx, compressed with gzip."""
+        body = "\n".join(lines)
         try:
-            influx.write_points(json, time_precision=precision)
+            influx.request(
+                url="write",
+                method="POST",
+                params=write_params,
+                data=gzip.compress(body.encode(), GZIP_LEVEL),
+                expected_response_code=204,
+                headers=WRITE_HEADERS_V1,
+            )
         except (
             requests.exceptions.RequestException,
             exceptions.InfluxDBServerError,
@@ -436,7 +616,7 @@ def get_influx_connection(conf, test_write=False, test_read=False):
             raise ConnectionError(CONNECTION_ERROR % exc) from exc
         except exceptions.InfluxDBClientError as exc:
             if exc.code == CODE_INVALID_INPUTS:
-                raise ValueError(WRITE_ERROR % (json, exc)) from exc
+                raise ValueError(WRITE_ERROR % (body, exc)) from exc
             raise ConnectionError(CLIENT_ERROR_V1 % exc) from exc
 
     def query_v1(query, database=None):
@@ -478,9 +658,18 @@ def setup(hass, config):
         event_helper.call_later(hass, RETRY_INTERVAL, lambda _: setup(hass, config))
         return True
 
-    event_to_json = _generate_event_to_json(conf)
+    event_to_line = _generate_event_to_line(conf)
     max_tries = conf.get(CONF_RETRY_COUNT)
-    instance = hass.data[DOMAIN] = InfluxThread(hass, influx, event_to_json, max_tries)
+    buffer = replay_rate = None
+    if CONF_BUFFER in conf:
+        buffer = WriteBuffer(
+            hass.config.path(BUFFER_DIR), conf[CONF_BUFFER][CONF_MAX_SIZE] * 1024 ** 2
+        )
+        buffer.load()
+        replay_rate = conf[CONF_BUFFER][CONF_REPLAY_RATE]
+    instance = hass.data[DOMAIN] = InfluxThread(
+        hass, influx, event_to_line, max_tries, buffer, replay_rate
+    )
     instance.start()
 
     def shutdown(event):
@@ -497,15 +686,21 @@ def setup(hass, config):
 class InfluxThread(threading.Thread):
     """A threaded event handler class."""
 
-    def __init__(self, hass, influx, event_to_json, max_tries):
+    def __init__(
+        self, hass, influx, event_to_line, max_tries, buffer=None, replay_rate=None
+    ):
         """Initialize the listener."""
         threading.Thread.__init__(self, name=DOMAIN)
         self.queue = queue.Queue()
         self.influx = influx
-        self.event_to_json = event_to_json
+        self.event_to_line = event_to_line
         self.max_tries = max_tries
+        self.buffer = buffer
+        self.replay_rate = replay_rate
         self.write_errors = 0
+        self.replayed = 0
         self.shutdown = False
+        self._replay_at = 0.0
         hass.bus.listen(EVENT_STATE_CHANGED, self._event_listener)
 
     @callback
@@ -519,18 +714,24 @@ class InfluxThread(threading.Thread):
         """Return number of seconds to wait for more events."""
         return BATCH_TIMEOUT
 
-    def get_events_json(self):
+    def replay_timeout(self):
+        """Return number of seconds to wait for events before replaying."""
+        if self.buffer is None or not self.buffer.points:
+            return None
+        return max(self._replay_at - time.monotonic(), 0)
+
+    def get_events_lines(self):
         """Return a batch of events formatted for writing."""
         queue_seconds = QUEUE_BACKLOG_SECONDS + self.max_tries * RETRY_DELAY
 
         count = 0
-        json = []
+        lines = []
 
         dropped = 0
 
         try:
-            while len(json) < BATCH_BUFFER_SIZE and not self.shutdown:
-                timeout = None if count == 0 else self.batch_timeout()
+            while len(lines) < BATCH_BUFFER_SIZE and not self.shutdown:
+                timeout = self.replay_timeout() if count == 0 else self.batch_timeout()
                 item = self.queue.get(timeout=timeout)
                 count += 1
 
@@ -540,10 +741,11 @@ class InfluxThread(threading.Thread):
                     timestamp, event = item
                     age = time.monotonic() - timestamp
 
-                    if age < queue_seconds:
-                        event_json = self.event_to_json(event)
-                        if event_json:
-                            json.append(event_json)
+                    # Events that are behind are buffered instead of dropped
+                    if age < queue_seconds or self.buffer is not None:
+                        line = self.event_to_line(event)
+                        if line:
+                            lines.append(line)
                     else:
                         dropped += 1
 
@@ -553,39 +755,82 @@ class InfluxThread(threading.Thread):
         if dropped:
             _LOGGER.warning(CATCHING_UP_MESSAGE, dropped)
 
-        return count, json
+        return count, lines
 
-    def write_to_influxdb(self, json):
+    def write_to_influxdb(self, lines):
         """Write preprocessed events to influxdb, with retry."""
+        if self.buffer is not None and self.buffer.points:
+            # Queue up behind the backlog to keep the events in order
+            self.buffer_lines(lines)
+            return
+
         for retry in range(self.max_tries + 1):
             try:
-                self.influx.write(json)
+                self.influx.write(lines)
 
                 if self.write_errors:
                     _LOGGER.error(RESUMED_MESSAGE, self.write_errors)
                     self.write_errors = 0
 
-                _LOGGER.debug(WROTE_MESSAGE, len(json))
+                _LOGGER.debug(WROTE_MESSAGE, len(lines))
                 break
             except ValueError as err:
                 _LOGGER.error(err)
                 break
             except ConnectionError as err:
+                if self.buffer is not None:
+                    _LOGGER.warning(BUFFERING_MESSAGE, err)
+                    self.buffer_lines(lines)
+                    break
                 if retry < self.max_tries:
                     time.sleep(RETRY_DELAY)
                 else:
                     if not self.write_errors:
                         _LOGGER.error(err)
-                    self.write_errors += len(json)
+                    self.write_errors += len(lines)
+
+    def buffer_lines(self, lines):
+        """Append preprocessed events to the write buffer."""
+        dropped = self.buffer.dropped
+        try:
+            self.buffer.append(lines)
+        except OSError as err:
+            _LOGGER.error("Could not buffer %d events: %s", len(lines), err)
+            return
+        if self.buffer.dropped > dropped:
+            _LOGGER.warning(BUFFER_FULL_MESSAGE, self.buffer.dropped - dropped)
+
+    def replay_buffer(self):
+        """Write the oldest buffered batch to influxdb when it is due."""
+        if not self.buffer.points or time.monotonic() < self._replay_at:
+            return
+
+        lines = self.buffer.peek()
+        try:
+            self.influx.write(lines)
+        except ValueError as err:
+            _LOGGER.error(err)
+        except ConnectionError:
+            self._replay_at = time.monotonic() + RETRY_DELAY
+            return
+
+        self.buffer.pop()
+        self.replayed += len(lines)
+        self._replay_at = time.monotonic() + len(lines) / self.replay_rate
+        if not self.buffer.points:
+            _LOGGER.warning(REPLAYED_MESSAGE, self.replayed)
+            self.replayed = 0
 
     def run(self):
         """Process incoming events."""
         while not self.shutdown:
-            count, json = self.get_events_json()
-            if json:
-                self.write_to_influxdb(json)
+            count, lines = self.get_events_lines()
+            if lines:
+                self.write_to_influxdb(lines)
             for _ in range(count):
                 self.queue.task_done()
+            if self.buffer is not None and not self.shutdown:
+                self.replay_buffer()
 
     def block_till_done(self):
         """Block till all events processed."""
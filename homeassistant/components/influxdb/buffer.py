@@ -0,0 +1,182 @@
+"""Disk-backed write buffer for InfluxDB."""
+from collections import deque
+from dataclasses import dataclass, replace
+import logging
+import os
+import time
+from typing import Deque, List, Optional, Tuple
+
+from .const import BUFFER_SEGMENT_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".lp"
+POSITION_FILE = "position"
+
+
+@dataclass(frozen=True)
+class _Batch:
+    """A batch of points stored in a segment file."""
+
+    segment: int
+    offset: int
+    size: int
+    points: int
+    created: float
+
+
+class WriteBuffer:
+    """Bounded buffer of line protocol batches kept in segment files.
+
+    Batches are appended to the newest segment file and taken from the oldest
+    one, so they are replayed in the order they were buffered. The position of
+    the oldest batch is saved whenever a batch is taken, which lets the backlog
+    survive restarts. Once the buffer grows beyond its maximum size the oldest
+    batches are dropped.
+
+    A batch is stored as a header line with the time it was buffered and its
+    number of points, followed by one line of line protocol per point.
+    """
+
+    def __init__(
+        self, directory: str, max_size: int, segment_size: int = BUFFER_SEGMENT_SIZE
+    ) -> None:
+        """Initialize the buffer."""
+        self.directory = directory
+        self.max_size = max_size
+        self.segment_size = segment_size
+        self.size = 0
+        self.points = 0
+        self.dropped = 0
+        self._batches: Deque[_Batch] = deque()
+        self._head = 0
+        self._head_size = 0
+
+    @property
+    def age(self) -> float:
+        """Return how many seconds ago the oldest batch was buffered."""
+        try:
+            # Also read from the event loop while the influx thread pops
+            oldest = self._batches[0]
+        except IndexError:
+            return 0.0
+        return max(time.time() - oldest.created, 0.0)
+
+    def _path(self, segment: int) -> str:
+        """Return the path of a segment file."""
+        return os.path.join(self.directory, f"{segment:08d}{SEGMENT_SUFFIX}")
+
+    def load(self) -> None:
+        """Index the batches left in the buffer by a previous run."""
+        os.makedirs(self.directory, exist_ok=True)
+        segments = sorted(
+            int(name[: -len(SEGMENT_SUFFIX)])
+            for name in os.listdir(self.directory)
+            if name.endswith(SEGMENT_SUFFIX)
+        )
+        position = self._load_position()
+        self._head = position[0]
+        for segment in segments:
+            if segment < position[0]:
+                os.remove(self._path(segment))
+                continue
+            offset = position[1] if segment == position[0] else 0
+            self._head = segment
+            self._head_size = self._scan(segment, offset)
+
+    def _load_position(self) -> Tuple[int, int]:
+        """Return the segment and offset of the oldest batch."""
+        try:
+            with open(os.path.join(self.directory, POSITION_FILE)) as file:
+                segment, offset = (int(value) for value in file.read().split())
+        except (OSError, ValueError):
+            return (0, 0)
+        return (segment, offset)
+
+    def _save_position(self, segment: int, offset: int) -> None:
+        """Save the segment and offset of the oldest batch."""
+        path = os.path.join(self.directory, POSITION_FILE)
+        with open(f"{path}.tmp", "w") as file:
+            file.write(f"{segment} {offset}")
+        os.replace(f"{path}.tmp", path)
+
+    def _scan(self, segment: int, offset: int) -> int:
+        """Index the batches of a segment and return its size."""
+        path = self._path(segment)
+        with open(path, "rb+") as file:
+            file.seek(offset)
+            while True:
+                header = file.readline()
+                if not header:
+                    break
+                try:
+                    if header[:1] != b"#":
+                        raise ValueError
+                    created, points = header[1:].split()
+                    batch = _Batch(segment, offset, 0, int(points), float(created))
+                    for _ in range(batch.points):
+                        if not file.readline().endswith(b"\n"):
+                            raise ValueError
+                except ValueError:
+                    # A write interrupted by a crash, the batch is lost
+                    _LOGGER.warning("Discarding the incomplete end of %s", path)
+                    file.truncate(offset)
+                    break
+                end = file.tell()
+                self._add(replace(batch, size=end - offset))
+                offset = end
+        return offset
+
+    def _add(self, batch: _Batch) -> None:
+        """Add a batch to the index."""
+        self._batches.append(batch)
+        self.size += batch.size
+        self.points += batch.points
+
+    def append(self, lines: List[str], created: Optional[float] = None) -> None:
+        """Append a batch of lines to the buffer."""
+        if created is None:
+            created = time.time()
+        if self._head_size >= self.segment_size:
+            self._head += 1
+            self._head_size = 0
+        data = "".join(
+            [f"#{created} {len(lines)}\n", *(f"{line}\n" for line in lines)]
+        ).encode()
+        with open(self._path(self._head), "ab") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        self._add(_Batch(self._head, self._head_size, len(data), len(lines), created))
+        self._head_size += len(data)
+
+        # Keep at least the batch just appended
+        while self.size > self.max_size and len(self._batches) > 1:
+            self.dropped += self._batches[0].points
+            self.pop()
+
+    def peek(self) -> Optional[List[str]]:
+        """Return the lines of the oldest batch."""
+        if not self._batches:
+            return None
+        batch = self._batches[0]
+        with open(self._path(batch.segment), "rb") as file:
+            file.seek(batch.offset)
+            file.readline()
+            return [file.readline().decode().rstrip("\n") for _ in range(batch.points)]
+
+    def pop(self) -> None:
+        """Remove the oldest batch from the buffer."""
+        batch = self._batches.popleft()
+        self.size -= batch.size
+        self.points -= batch.points
+        if not self._batches:
+            os.remove(self._path(batch.segment))
+            self._head += 1
+            self._head_size = 0
+            self._save_position(self._head, 0)
+            return
+        oldest = self._batches[0]
+        if oldest.segment != batch.segment:
+            os.remove(self._path(batch.segment))
+        self._save_position(oldest.segment, oldest.offset)
@@ -32,6 +32,9 @@ CONF_RETRY_COUNT = "max_retries"
 CONF_IGNORE_ATTRIBUTES = "ignore_attributes"
 CONF_PRECISION = "precision"
 CONF_SSL_CA_CERT = "ssl_ca_cert"
+CONF_BUFFER = "buffer"
+CONF_MAX_SIZE = "max_size"
+CONF_REPLAY_RATE = "replay_rate"
 
 CONF_LANGUAGE = "language"
 CONF_QUERIES = "queries"
@@ -59,6 +62,8 @@ DEFAULT_RANGE_START = "-15m"
 DEFAULT_RANGE_STOP = "now()"
 DEFAULT_FUNCTION_FLUX = "|> limit(n: 1)"
 DEFAULT_MEASUREMENT_ATTR = "unit_of_measurement"
+DEFAULT_BUFFER_MAX_SIZE = 50  # MiB
+DEFAULT_REPLAY_RATE = 1000  # points per second
 
 INFLUX_CONF_MEASUREMENT = "measurement"
 INFLUX_CONF_TAGS = "tags"
@@ -83,6 +88,13 @@ LANGUAGE_FLUX = "flux"
 TEST_QUERY_V1 = "SHOW DATABASES;"
 TEST_QUERY_V2 = "buckets()"
 CODE_INVALID_INPUTS = 400
+BUFFER_DIR = ".influxdb_buffer"
+BUFFER_SEGMENT_SIZE = 1024 * 1024
+GZIP_LEVEL = 1
+# Precision -> nanoseconds per unit of the timestamps written with it
+PRECISION_DIVISORS = {None: 1, "ns": 1, "us": 10 ** 3, "ms": 10 ** 6, "s": 10 ** 9}
+# Precision -> name of the precision in the V1 API
+PRECISIONS_V1 = {None: None, "ns": "n", "us": "u", "ms": "ms", "s": "s"}
 
 MIN_TIME_BETWEEN_UPDATES = timedelta(seconds=60)
 
@@ -120,6 +132,9 @@ RETRY_MESSAGE = f"%s Retrying in {RETRY_INTERVAL} seconds."
 CATCHING_UP_MESSAGE = "Catching up, dropped %d old events."
 RESUMED_MESSAGE = "Resumed, lost %d events."
 WROTE_MESSAGE = "Wrote %d events."
+BUFFERING_MESSAGE = "%s Buffering events on disk until InfluxDB is back."
+BUFFER_FULL_MESSAGE = "Write buffer is full, dropped %d old events."
+REPLAYED_MESSAGE = "Resumed, replayed %d buffered events."
 RUNNING_QUERY_MESSAGE = "Running query: %s."
 QUERY_NO_RESULTS_MESSAGE = "Query returned no results, sensor state set to UNKNOWN: %s."
 QUERY_MULTIPLE_RESULTS_MESSAGE = (
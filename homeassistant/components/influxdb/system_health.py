@@ -0,0 +1,26 @@
+"""Provide info to system health."""
+from homeassistant.components import system_health
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+
+@callback
+def async_register(
+    hass: HomeAssistant, register: system_health.SystemHealthRegistration
+) -> None:
+    """Register system health callbacks."""
+    register.async_register_info(system_health_info)
+
+
+async def system_health_info(hass: HomeAssistant):
+    """Get info for the info page."""
+    instance = hass.data.get(DOMAIN)
+    buffer = instance.buffer if instance is not None else None
+    info = {"write_buffer": buffer is not None}
+    if buffer is not None:
+        info["buffered_events"] = buffer.points
+        info["buffer_size"] = f"{buffer.size / 1024 ** 2:.1f} MiB"
+        info["buffer_age"] = f"{round(buffer.age)} s"
+        info["dropped_events"] = buffer.dropped
+    return info
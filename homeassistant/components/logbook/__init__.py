@@ -33,7 +33,12 @@ from homeassistant.const import (
     EVENT_STATE_CHANGED,
     HTTP_BAD_REQUEST,
 )
-from homeassistant.core import DOMAIN as HA_DOMAIN, callback, split_entity_id
+from homeassistant.core import (
+    DOMAIN as HA_DOMAIN,
+    EXECUTOR_POOL_DB_READ,
+    callback,
+    split_entity_id,
+)
 from homeassistant.exceptions import InvalidEntityFormatError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entityfilter import (
@@ -246,7 +251,9 @@ class LogbookView(HomeAssistantView):
                 )
             )
 
-        return await hass.async_add_executor_job(json_events)
+        return await hass.async_add_pool_executor_job(
+            EXECUTOR_POOL_DB_READ, json_events
+        )
 
 
 def humanify(hass, events, entity_attr_cache, context_lookup):
@@ -1,6 +1,7 @@
 """The profiler integration."""
 import asyncio
 import cProfile
+from dataclasses import asdict
 from datetime import timedelta
 import logging
 import time
@@ -10,20 +11,28 @@ import objgraph
 from pyprof2calltree import convert
 import voluptuous as vol
 
+from homeassistant.components import websocket_api
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import HomeAssistant, JobAccounting, ServiceCall, callback
+from homeassistant.helpers import condition, storage
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.entity_platform import async_get_poll_durations
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.service import async_register_admin_service
 from homeassistant.helpers.typing import ConfigType
 
 from .const import DOMAIN
+from .loop_monitor import LoopMonitor
 
 SERVICE_START = "start"
 SERVICE_MEMORY = "memory"
 SERVICE_START_LOG_OBJECTS = "start_log_objects"
 SERVICE_STOP_LOG_OBJECTS = "stop_log_objects"
 SERVICE_DUMP_LOG_OBJECTS = "dump_log_objects"
+SERVICE_START_LOOP_MONITOR = "start_loop_monitor"
+SERVICE_STOP_LOOP_MONITOR = "stop_loop_monitor"
+SERVICE_START_JOB_ACCOUNTING = "start_job_accounting"
+SERVICE_STOP_JOB_ACCOUNTING = "stop_job_accounting"
 
 SERVICES = (
     SERVICE_START,
@@ -31,21 +40,33 @@ SERVICES = (
     SERVICE_START_LOG_OBJECTS,
     SERVICE_STOP_LOG_OBJECTS,
     SERVICE_DUMP_LOG_OBJECTS,
+    SERVICE_START_LOOP_MONITOR,
+    SERVICE_STOP_LOOP_MONITOR,
+    SERVICE_START_JOB_ACCOUNTING,
+    SERVICE_STOP_JOB_ACCOUNTING,
 )
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
+DEFAULT_SLOW_THRESHOLD = 0.1
 
 CONF_SECONDS = "seconds"
 CONF_SCAN_INTERVAL = "scan_interval"
 CONF_TYPE = "type"
+CONF_SLOW_THRESHOLD = "slow_threshold"
 
 LOG_INTERVAL_SUB = "log_interval_subscription"
+LOOP_MONITOR = "loop_monitor"
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the profiler component."""
+    websocket_api.async_register_command(hass, websocket_loop_monitor)
+    websocket_api.async_register_command(hass, websocket_job_accounting)
+    websocket_api.async_register_command(hass, websocket_condition_stats)
+    websocket_api.async_register_command(hass, websocket_storage_writes)
+    websocket_api.async_register_command(hass, websocket_poll_durations)
     return True
 
 
@@ -84,6 +105,27 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         hass.components.persistent_notification.async_dismiss("profile_object_logging")
         domain_data.pop(LOG_INTERVAL_SUB)()
 
+    @callback
+    def _async_start_loop_monitor(call: ServiceCall):
+        _async_stop_loop_monitor(call)
+        monitor = domain_data[LOOP_MONITOR] = LoopMonitor(
+            hass, call.data[CONF_SLOW_THRESHOLD]
+        )
+        monitor.async_start()
+
+    @callback
+    def _async_stop_loop_monitor(call: ServiceCall):
+        if LOOP_MONITOR in domain_data:
+            domain_data.pop(LOOP_MONITOR).async_stop()
+
+    @callback
+    def _async_start_job_accounting(call: ServiceCall):
+        hass.job_accounting = JobAccounting()
+
+    @callback
+    def _async_stop_job_accounting(call: ServiceCall):
+        hass.job_accounting = None
+
     def _dump_log_objects(call: ServiceCall):
         obj_type = call.data[CONF_TYPE]
 
@@ -149,6 +191,44 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         schema=vol.Schema({vol.Required(CONF_TYPE): str}),
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_START_LOOP_MONITOR,
+        _async_start_loop_monitor,
+        schema=vol.Schema(
+            {
+                vol.Optional(
+                    CONF_SLOW_THRESHOLD, default=DEFAULT_SLOW_THRESHOLD
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.01))
+            }
+        ),
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_STOP_LOOP_MONITOR,
+        _async_stop_loop_monitor,
+        schema=vol.Schema({}),
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_START_JOB_ACCOUNTING,
+        _async_start_job_accounting,
+        schema=vol.Schema({}),
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_STOP_JOB_ACCOUNTING,
+        _async_stop_job_accounting,
+        schema=vol.Schema({}),
+    )
+
     return True
 
 
@@ -158,10 +238,27 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
         hass.services.async_remove(domain=DOMAIN, service=service)
     if LOG_INTERVAL_SUB in hass.data[DOMAIN]:
         hass.data[DOMAIN][LOG_INTERVAL_SUB]()
+    if LOOP_MONITOR in hass.data[DOMAIN]:
+        hass.data[DOMAIN][LOOP_MONITOR].async_stop()
+    hass.job_accounting = None
     hass.data.pop(DOMAIN)
     return True
 
 
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "profiler/loop_monitor"})
+@callback
+def websocket_loop_monitor(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+):
+    """Return the statistics of the event loop monitor."""
+    monitor = hass.data.get(DOMAIN, {}).get(LOOP_MONITOR)
+    if monitor is None:
+        connection.send_result(msg["id"], {"running": False})
+        return
+    connection.send_result(msg["id"], monitor.async_as_dict())
+
+
 async def _async_generate_profile(hass: HomeAssistant, call: ServiceCall):
     start_time = int(time.time() * 1000000)
     hass.components.persistent_notification.async_create(
@@ -219,3 +316,81 @@ def _write_memory_profile(heap, heap_path):
 
 def _log_objects(*_):
     _LOGGER.critical("Memory Growth: %s", objgraph.growth(limit=100))
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "profiler/job_accounting",
+        vol.Optional("limit", default=20): vol.All(int, vol.Range(min=1)),
+    }
+)
+@callback
+def websocket_job_accounting(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+):
+    """Return the events and event loop time accounted per integration."""
+    if hass.job_accounting is None:
+        connection.send_result(msg["id"], {"running": False})
+        return
+    connection.send_result(
+        msg["id"], {"running": True, **hass.job_accounting.as_dict(msg["limit"])}
+    )
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "profiler/condition_stats",
+        vol.Optional("limit", default=20): vol.All(int, vol.Range(min=1)),
+    }
+)
+@callback
+def websocket_condition_stats(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+):
+    """Return the conditions that took the most time to evaluate."""
+    connection.send_result(
+        msg["id"],
+        [
+            stats.as_dict()
+            for stats in condition.async_get_condition_stats(hass)[: msg["limit"]]
+        ],
+    )
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "profiler/storage_writes"})
+@callback
+def websocket_storage_writes(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+):
+    """Return the write statistics of the stores, most bytes written first."""
+    connection.send_result(
+        msg["id"],
+        [
+            {"key": key, **asdict(stats)}
+            for key, stats in sorted(
+                storage.async_get_write_stats(hass).items(),
+                key=lambda item: item[1].write_bytes,
+                reverse=True,
+            )
+        ],
+    )
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "profiler/poll_durations"})
+@callback
+def websocket_poll_durations(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+):
+    """Return the poll duration histograms of the platforms, most time first."""
+    connection.send_result(
+        msg["id"],
+        sorted(
+            async_get_poll_durations(hass),
+            key=lambda durations: durations["total"],
+            reverse=True,
+        ),
+    )
@@ -0,0 +1,227 @@
+"""Continuous event loop latency monitor for the profiler integration."""
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Any, Dict, List, Optional, Tuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+# How often the loop is checked for lag
+HEARTBEAT_INTERVAL = 0.5
+
+# Upper bounds in seconds of the loop lag histogram buckets
+LAG_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+COMPONENTS_PATH = os.path.join("homeassistant", "components") + os.sep
+CUSTOM_COMPONENTS_PATH = "custom_components" + os.sep
+
+
+def _integration_from_filename(filename: str) -> Optional[str]:
+    """Return the integration a source file belongs to."""
+    for path in (COMPONENTS_PATH, CUSTOM_COMPONENTS_PATH):
+        index = filename.rfind(path)
+        if index != -1:
+            return filename[index + len(path) :].split(os.sep, 1)[0]
+    return None
+
+
+def _attribute_frame(frame: Optional[FrameType]) -> Tuple[str, str]:
+    """Return the integration and function a blocked loop is running.
+
+    The innermost frame that belongs to an integration wins, falling back to
+    the innermost frame of the stack.
+    """
+    fallback: Optional[Tuple[str, str]] = None
+    while frame is not None:
+        code = frame.f_code
+        function = f"{frame.f_globals.get('__name__', '?')}.{code.co_name}"
+        if fallback is None:
+            fallback = ("unknown", function)
+        integration = _integration_from_filename(code.co_filename)
+        if integration is not None and integration != "profiler":
+            return integration, function
+        frame = frame.f_back
+    return fallback or ("unknown", "unknown")
+
+
+class SlowCallback:
+    """Statistics of code that blocked the event loop."""
+
+    __slots__ = ("integration", "function", "count", "total", "max")
+
+    def __init__(self, integration: str, function: str) -> None:
+        """Initialize the statistics."""
+        self.integration = integration
+        self.function = function
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dictionary representation of the statistics."""
+        return {
+            "integration": self.integration,
+            "function": self.function,
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+        }
+
+
+class LoopMonitor:
+    """Measure event loop lag and attribute stalls to the code that caused them.
+
+    A callback scheduled on the loop every HEARTBEAT_INTERVAL records how late
+    it runs. A watchdog thread samples the stack of the event loop thread when
+    the heartbeat is late by more than the slow threshold, so the code that
+    blocks the loop is known without instrumenting every job.
+    """
+
+    def __init__(self, hass: HomeAssistant, slow_threshold: float) -> None:
+        """Initialize the monitor."""
+        self.hass = hass
+        self.slow_threshold = slow_threshold
+        self.histogram = [0] * (len(LAG_BUCKETS) + 1)
+        self.max_lag = 0.0
+        self.slow_callbacks: Dict[Tuple[str, str], SlowCallback] = {}
+        self._last_beat = time.monotonic()
+        self._expected = 0.0
+        # The code sampled by the watchdog and the beat it was late after
+        self._culprit: Optional[Tuple[float, SlowCallback]] = None
+        self._loop_thread_id: Optional[int] = None
+        self._cancel_heartbeat: Optional[CALLBACK_TYPE] = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        """Return if the monitor is running."""
+        return self._thread is not None
+
+    @callback
+    def async_start(self) -> None:
+        """Start monitoring the event loop."""
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop_event = threading.Event()
+        self._schedule_heartbeat()
+        self._thread = threading.Thread(
+            target=self._watch,
+            args=(self._stop_event,),
+            name="LoopMonitor",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop monitoring the event loop."""
+        if self._cancel_heartbeat is not None:
+            self._cancel_heartbeat()
+            self._cancel_heartbeat = None
+        self._stop_event.set()
+        self._thread = None
+
+    @callback
+    def _schedule_heartbeat(self) -> None:
+        """Schedule the next heartbeat."""
+        loop = self.hass.loop
+        self._expected = loop.time() + HEARTBEAT_INTERVAL
+        handle = loop.call_at(self._expected, self._async_heartbeat)
+        self._cancel_heartbeat = handle.cancel
+
+    @callback
+    def _async_heartbeat(self) -> None:
+        """Record how late the heartbeat ran."""
+        lag = max(0.0, self.hass.loop.time() - self._expected)
+        beat = self._last_beat
+        self._last_beat = time.monotonic()
+        self.async_record_lag(lag, beat)
+        self._schedule_heartbeat()
+
+    @callback
+    def async_record_lag(self, lag: float, beat: float) -> None:
+        """Add a lag measurement and charge it to the code that caused it.
+
+        Only a culprit sampled while waiting for the heartbeat after beat is
+        charged, a sample taken for another stall is dropped.
+        """
+        for index, bucket in enumerate(LAG_BUCKETS):
+            if lag <= bucket:
+                break
+        else:
+            index = len(LAG_BUCKETS)
+        self.histogram[index] += 1
+        self.max_lag = max(self.max_lag, lag)
+
+        with self._lock:
+            sample, self._culprit = self._culprit, None
+        if sample is None or sample[0] != beat or lag < self.slow_threshold:
+            return
+        culprit = sample[1]
+
+        if not culprit.count:
+            _LOGGER.warning(
+                "Event loop blocked for %.3f seconds by %s (integration: %s)",
+                lag,
+                culprit.function,
+                culprit.integration,
+            )
+        culprit.count += 1
+        culprit.total += lag
+        culprit.max = max(culprit.max, lag)
+
+    def _watch(self, stop_event: threading.Event) -> None:
+        """Sample the event loop stack while the heartbeat is late."""
+        check_interval = max(self.slow_threshold / 2, 0.01)
+        sampled_beat = None
+        while not stop_event.wait(check_interval):
+            last_beat = self._last_beat
+            late = time.monotonic() - last_beat - HEARTBEAT_INTERVAL
+            # Sample each stall once, the first time it exceeds the threshold
+            if late < self.slow_threshold or sampled_beat == last_beat:
+                continue
+            sampled_beat = last_beat
+            assert self._loop_thread_id is not None
+            # pylint: disable=protected-access
+            frame = sys._current_frames().get(self._loop_thread_id)
+            key = _attribute_frame(frame)
+            with self._lock:
+                slow_callback = self.slow_callbacks.get(key)
+                if slow_callback is None:
+                    slow_callback = self.slow_callbacks[key] = SlowCallback(*key)
+                self._culprit = (last_beat, slow_callback)
+
+    @callback
+    def async_as_dict(self) -> Dict[str, Any]:
+        """Return the collected statistics."""
+        buckets: List[Dict[str, Any]] = [
+            {"le": bucket, "count": count}
+            for bucket, count in zip(LAG_BUCKETS, self.histogram)
+        ]
+        buckets.append({"le": None, "count": self.histogram[-1]})
+        with self._lock:
+            slow_callbacks = list(self.slow_callbacks.values())
+        return {
+            "running": self.running,
+            "slow_threshold": self.slow_threshold,
+            "max_lag": self.max_lag,
+            "lag_histogram": buckets,
+            "slow_callbacks": [
+                slow_callback.as_dict()
+                for slow_callback in sorted(
+                    slow_callbacks,
+                    key=lambda slow_callback: slow_callback.total,
+                    reverse=True,
+                )
+                if slow_callback.count
+            ],
+        }
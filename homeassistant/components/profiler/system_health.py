@@ -0,0 +1,73 @@
+"""Provide info to system health."""
+from homeassistant.components import system_health
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import storage
+from homeassistant.helpers.entity_platform import async_get_poll_durations
+
+from .const import DOMAIN
+
+TOP_ENTRIES = 5
+
+
+@callback
+def async_register(
+    hass: HomeAssistant, register: system_health.SystemHealthRegistration
+) -> None:
+    """Register system health callbacks."""
+    register.async_register_info(system_health_info)
+
+
+def _format_top(values: dict) -> str:
+    """Format the top entries of an accounting table."""
+    return ", ".join(f"{key} ({value})" for key, value in values.items()) or "-"
+
+
+async def system_health_info(hass: HomeAssistant):
+    """Get info for the info page."""
+    info = {}
+
+    monitor = hass.data.get(DOMAIN, {}).get("loop_monitor")
+    info["loop_monitor"] = monitor is not None
+    if monitor is not None:
+        info["max_loop_lag"] = round(monitor.max_lag, 3)
+
+    accounting = hass.job_accounting
+    info["job_accounting"] = accounting is not None
+    if accounting is not None:
+        top = accounting.as_dict(TOP_ENTRIES)
+        info["top_events"] = _format_top(top["events"])
+        info["top_state_writes_per_minute"] = _format_top(
+            top["state_writes_per_minute"]
+        )
+        info["top_callback_time"] = _format_top(top["callback_time"])
+
+    write_stats = sorted(
+        storage.async_get_write_stats(hass).items(),
+        key=lambda item: item[1].write_bytes,
+        reverse=True,
+    )[:TOP_ENTRIES]
+    if write_stats:
+        info["top_storage_writes"] = _format_top(
+            {
+                key: f"{stats.write_count} writes, {stats.write_bytes} bytes"
+                for key, stats in write_stats
+            }
+        )
+
+    poll_durations = sorted(
+        async_get_poll_durations(hass),
+        key=lambda durations: durations["max"],
+        reverse=True,
+    )[:TOP_ENTRIES]
+    if poll_durations:
+        info["slowest_polls"] = _format_top(
+            {
+                f"{durations['domain']}.{durations['platform']}": (
+                    f"max {durations['max']:.1f} s, "
+                    f"mean {durations['total'] / durations['count']:.1f} s"
+                )
+                for durations in poll_durations
+            }
+        )
+
+    return info
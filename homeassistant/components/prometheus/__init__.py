@@ -1,8 +1,9 @@
 """Support for Prometheus metrics export."""
+import gzip
 import logging
 import string
 
-from aiohttp import web
+from aiohttp import hdrs, web
 import prometheus_client
 import voluptuous as vol
 
@@ -13,6 +14,10 @@ from homeassistant.components.climate.const import (
     CURRENT_HVAC_ACTIONS,
 )
 from homeassistant.components.http import HomeAssistantView
+from homeassistant.components.http.encoding import (
+    encoding_quality,
+    parse_accept_encoding,
+)
 from homeassistant.components.humidifier.const import (
     ATTR_AVAILABLE_MODES,
     ATTR_HUMIDITY,
@@ -40,6 +45,8 @@ from homeassistant.util.temperature import fahrenheit_to_celsius
 _LOGGER = logging.getLogger(__name__)
 
 API_ENDPOINT = "/api/prometheus"
+# Fast compression, the metrics are rendered for every scrape
+GZIP_LEVEL = 1
 
 DOMAIN = "prometheus"
 CONF_FILTER = "filter"
@@ -139,12 +146,15 @@ class PrometheusMetrics:
         else:
             self.metrics_prefix = ""
         self._metrics = {}
+        # Entity id -> (friendly name, labels, metric and extra labels -> child)
+        self._entities = {}
         self._climate_units = climate_units
 
     def handle_event(self, event):
         """Listen for new messages on the bus, and add them to Prometheus."""
         state = event.data.get("new_state")
         if state is None:
+            self._entities.pop(event.data.get("entity_id"), None)
             return
 
         entity_id = state.entity_id
@@ -159,25 +169,28 @@ class PrometheusMetrics:
         if hasattr(self, handler) and state.state != STATE_UNAVAILABLE:
             getattr(self, handler)(state)
 
-        labels = self._labels(state)
         state_change = self._metric(
             "state_change", self.prometheus_cli.Counter, "The number of state changes"
         )
-        state_change.labels(**labels).inc()
+        self._child(state_change, state).inc()
 
         entity_available = self._metric(
             "entity_available",
             self.prometheus_cli.Gauge,
             "Entity is available (not in the unavailable state)",
         )
-        entity_available.labels(**labels).set(float(state.state != STATE_UNAVAILABLE))
+        self._child(entity_available, state).set(
+            float(state.state != STATE_UNAVAILABLE)
+        )
 
         last_updated_time_seconds = self._metric(
             "last_updated_time_seconds",
             self.prometheus_cli.Gauge,
             "The last_updated timestamp",
         )
-        last_updated_time_seconds.labels(**labels).set(state.last_updated.timestamp())
+        self._child(last_updated_time_seconds, state).set(
+            state.last_updated.timestamp()
+        )
 
     def _handle_attributes(self, state):
         for key, value in state.attributes.items():
@@ -189,18 +202,17 @@ class PrometheusMetrics:
 
             try:
                 value = float(value)
-                metric.labels(**self._labels(state)).set(value)
+                self._child(metric, state).set(value)
             except (ValueError, TypeError):
                 pass
 
     def _metric(self, metric, factory, documentation, extra_labels=None):
-        labels = ["entity", "friendly_name", "domain"]
-        if extra_labels is not None:
-            labels.extend(extra_labels)
-
         try:
             return self._metrics[metric]
         except KeyError:
+            labels = ["entity", "friendly_name", "domain"]
+            if extra_labels is not None:
+                labels.extend(extra_labels)
             full_metric_name = self._sanitize_metric_name(
                 f"{self.metrics_prefix}{metric}"
             )
@@ -239,6 +251,25 @@ class PrometheusMetrics:
             "friendly_name": state.attributes.get(ATTR_FRIENDLY_NAME),
         }
 
+    def _child(self, metric, state, **extra_labels):
+        """Return the child of a metric for an entity.
+
+        The children of the metrics of an entity are kept until its friendly
+        name changes, which labels the samples of the entity differently.
+        """
+        friendly_name = state.attributes.get(ATTR_FRIENDLY_NAME)
+        entity = self._entities.get(state.entity_id)
+        if entity is None or entity[0] != friendly_name:
+            entity = (friendly_name, self._labels(state), {})
+            self._entities[state.entity_id] = entity
+
+        key = (metric, tuple(extra_labels.items())) if extra_labels else metric
+        child = entity[2].get(key)
+        if child is None:
+            child = metric.labels(**entity[1], **extra_labels)
+            entity[2][key] = child
+        return child
+
     def _battery(self, state):
         if "battery_level" in state.attributes:
             metric = self._metric(
@@ -248,7 +279,7 @@ class PrometheusMetrics:
             )
             try:
                 value = float(state.attributes[ATTR_BATTERY_LEVEL])
-                metric.labels(**self._labels(state)).set(value)
+                self._child(metric, state).set(value)
             except ValueError:
                 pass
 
@@ -259,7 +290,7 @@ class PrometheusMetrics:
             "State of the binary sensor (0/1)",
         )
         value = self.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        self._child(metric, state).set(value)
 
     def _handle_input_boolean(self, state):
         metric = self._metric(
@@ -268,7 +299,7 @@ class PrometheusMetrics:
             "State of the input boolean (0/1)",
         )
         value = self.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        self._child(metric, state).set(value)
 
     def _handle_device_tracker(self, state):
         metric = self._metric(
@@ -277,14 +308,14 @@ class PrometheusMetrics:
             "State of the device tracker (0/1)",
         )
         value = self.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        self._child(metric, state).set(value)
 
     def _handle_person(self, state):
         metric = self._metric(
             "person_state", self.prometheus_cli.Gauge, "State of the person (0/1)"
         )
         value = self.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        self._child(metric, state).set(value)
 
     def _handle_light(self, state):
         metric = self._metric(
@@ -297,7 +328,7 @@ class PrometheusMetrics:
             else:
                 value = self.state_as_number(state)
             value = value * 100
-            metric.labels(**self._labels(state)).set(value)
+            self._child(metric, state).set(value)
         except ValueError:
             pass
 
@@ -306,7 +337,7 @@ class PrometheusMetrics:
             "lock_state", self.prometheus_cli.Gauge, "State of the lock (0/1)"
         )
         value = self.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        self._child(metric, state).set(value)
 
     def _handle_climate(self, state):
         temp = state.attributes.get(ATTR_TEMPERATURE)
@@ -318,7 +349,7 @@ class PrometheusMetrics:
                 self.prometheus_cli.Gauge,
                 "Temperature in degrees Celsius",
             )
-            metric.labels(**self._labels(state)).set(temp)
+            self._child(metric, state).set(temp)
 
         current_temp = state.attributes.get(ATTR_CURRENT_TEMPERATURE)
         if current_temp:
@@ -329,7 +360,7 @@ class PrometheusMetrics:
                 self.prometheus_cli.Gauge,
                 "Current Temperature in degrees Celsius",
             )
-            metric.labels(**self._labels(state)).set(current_temp)
+            self._child(metric, state).set(current_temp)
 
         current_action = state.attributes.get(ATTR_HVAC_ACTION)
         if current_action:
@@ -340,7 +371,7 @@ class PrometheusMetrics:
                 ["action"],
             )
             for action in CURRENT_HVAC_ACTIONS:
-                metric.labels(**dict(self._labels(state), action=action)).set(
+                self._child(metric, state, action=action).set(
                     float(action == current_action)
                 )
 
@@ -352,7 +383,7 @@ class PrometheusMetrics:
                 self.prometheus_cli.Gauge,
                 "Target Relative Humidity",
             )
-            metric.labels(**self._labels(state)).set(humidifier_target_humidity_percent)
+            self._child(metric, state).set(humidifier_target_humidity_percent)
 
         metric = self._metric(
             "humidifier_state",
@@ -361,7 +392,7 @@ class PrometheusMetrics:
         )
         try:
             value = self.state_as_number(state)
-            metric.labels(**self._labels(state)).set(value)
+            self._child(metric, state).set(value)
         except ValueError:
             pass
 
@@ -375,9 +406,7 @@ class PrometheusMetrics:
                 ["mode"],
             )
             for mode in available_modes:
-                metric.labels(**dict(self._labels(state), mode=mode)).set(
-                    float(mode == current_mode)
-                )
+                self._child(metric, state, mode=mode).set(float(mode == current_mode))
 
     def _handle_sensor(self, state):
         unit = self._unit_string(state.attributes.get(ATTR_UNIT_OF_MEASUREMENT))
@@ -396,7 +425,7 @@ class PrometheusMetrics:
                 value = self.state_as_number(state)
                 if unit == TEMP_FAHRENHEIT:
                     value = fahrenheit_to_celsius(value)
-                _metric.labels(**self._labels(state)).set(value)
+                self._child(_metric, state).set(value)
             except ValueError:
                 pass
 
@@ -454,7 +483,7 @@ class PrometheusMetrics:
 
         try:
             value = self.state_as_number(state)
-            metric.labels(**self._labels(state)).set(value)
+            self._child(metric, state).set(value)
         except ValueError:
             pass
 
@@ -470,7 +499,7 @@ class PrometheusMetrics:
             "Count of times an automation has been triggered",
         )
 
-        metric.labels(**self._labels(state)).inc()
+        self._child(metric, state).inc()
 
 
 class PrometheusView(HomeAssistantView):
@@ -487,7 +516,24 @@ class PrometheusView(HomeAssistantView):
         """Handle request for Prometheus metrics."""
         _LOGGER.debug("Received Prometheus metrics request")
 
-        return web.Response(
-            body=self.prometheus_cli.generate_latest(),
-            content_type=CONTENT_TYPE_TEXT_PLAIN,
+        hass = request.app["hass"]
+        encodings = parse_accept_encoding(request.headers.get(hdrs.ACCEPT_ENCODING))
+        # Rendering the metrics of thousands of entities takes a while
+        body, headers = await hass.async_add_executor_job(
+            self._render,
+            request.headers.get(hdrs.ACCEPT),
+            encoding_quality(encodings, "gzip") > 0,
         )
+        return web.Response(body=body, headers=headers)
+
+    def _render(self, accept, compress):
+        """Render the metrics in the format the client accepts."""
+        encoder, content_type = self.prometheus_cli.exposition.choose_encoder(accept)
+        if encoder is self.prometheus_cli.exposition.generate_latest:
+            content_type = CONTENT_TYPE_TEXT_PLAIN
+        body = encoder(self.prometheus_cli.REGISTRY)
+        headers = {hdrs.CONTENT_TYPE: content_type}
+        if compress:
+            body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+            headers[hdrs.CONTENT_ENCODING] = "gzip"
+        return body, headers
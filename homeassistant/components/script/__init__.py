@@ -24,6 +24,8 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.config_validation import make_entity_service_schema
 from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.helpers.reference_index import ReferenceIndex
+from homeassistant.helpers.reload import async_config_unchanged
 from homeassistant.helpers.script import (
     ATTR_CUR,
     ATTR_MAX,
@@ -49,6 +51,9 @@ CONF_DESCRIPTION = "description"
 CONF_EXAMPLE = "example"
 CONF_FIELDS = "fields"
 
+DATA_DEVICE_REFERENCES = "script_device_references"
+DATA_ENTITY_REFERENCES = "script_entity_references"
+
 ENTITY_ID_FORMAT = DOMAIN + ".{}"
 
 EVENT_SCRIPT_STARTED = "script_started"
@@ -94,13 +99,7 @@ def scripts_with_entity(hass: HomeAssistant, entity_id: str) -> List[str]:
     if DOMAIN not in hass.data:
         return []
 
-    component = hass.data[DOMAIN]
-
-    return [
-        script_entity.entity_id
-        for script_entity in component.entities
-        if entity_id in script_entity.script.referenced_entities
-    ]
+    return hass.data[DATA_ENTITY_REFERENCES].async_get(entity_id)
 
 
 @callback
@@ -125,13 +124,7 @@ def scripts_with_device(hass: HomeAssistant, device_id: str) -> List[str]:
     if DOMAIN not in hass.data:
         return []
 
-    component = hass.data[DOMAIN]
-
-    return [
-        script_entity.entity_id
-        for script_entity in component.entities
-        if device_id in script_entity.script.referenced_devices
-    ]
+    return hass.data[DATA_DEVICE_REFERENCES].async_get(device_id)
 
 
 @callback
@@ -153,12 +146,14 @@ def devices_in_script(hass: HomeAssistant, entity_id: str) -> List[str]:
 async def async_setup(hass, config):
     """Load the scripts from the configuration."""
     hass.data[DOMAIN] = component = EntityComponent(_LOGGER, DOMAIN, hass)
+    hass.data[DATA_ENTITY_REFERENCES] = ReferenceIndex()
+    hass.data[DATA_DEVICE_REFERENCES] = ReferenceIndex()
 
     await _async_process_config(hass, config, component)
 
     async def reload_service(service):
         """Call a service to reload scripts."""
-        conf = await component.async_prepare_reload()
+        conf = await component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
 
@@ -219,9 +214,29 @@ async def _async_process_config(hass, config, component):
             variables=service.data, context=service.context
         )
 
+    configs = config.get(DOMAIN, {})
+
+    # Scripts that are still in the configuration unchanged are kept, so their
+    # runs are not interrupted, all others are replaced.
+    unchanged = set()
+    stale = []
+    for script_entity in component.entities:
+        if script_entity.object_id in configs and async_config_unchanged(
+            hass, script_entity.raw_config, configs[script_entity.object_id]
+        ):
+            unchanged.add(script_entity.object_id)
+        else:
+            stale.append(script_entity.entity_id)
+
+    if stale:
+        await asyncio.gather(
+            *[component.async_remove_entity(entity_id) for entity_id in stale]
+        )
+
     script_entities = [
         ScriptEntity(hass, object_id, cfg)
-        for object_id, cfg in config.get(DOMAIN, {}).items()
+        for object_id, cfg in configs.items()
+        if object_id not in unchanged
     ]
 
     await component.async_add_entities(script_entities)
@@ -255,6 +270,7 @@ class ScriptEntity(ToggleEntity):
     def __init__(self, hass, object_id, cfg):
         """Initialize the script."""
         self.object_id = object_id
+        self.raw_config = cfg
         self.icon = cfg.get(CONF_ICON)
         self.entity_id = ENTITY_ID_FORMAT.format(object_id)
         self.script = Script(
@@ -334,8 +350,19 @@ class ScriptEntity(ToggleEntity):
         """Turn script off."""
         await self.script.async_stop()
 
+    async def async_added_to_hass(self):
+        """Index the entities and devices the script references."""
+        self.hass.data[DATA_ENTITY_REFERENCES].async_set(
+            self.entity_id, self.script.referenced_entities
+        )
+        self.hass.data[DATA_DEVICE_REFERENCES].async_set(
+            self.entity_id, self.script.referenced_devices
+        )
+
     async def async_will_remove_from_hass(self):
         """Stop script and remove service when it will be removed from Home Assistant."""
+        self.hass.data[DATA_ENTITY_REFERENCES].async_remove(self.entity_id)
+        self.hass.data[DATA_DEVICE_REFERENCES].async_remove(self.entity_id)
         await self.script.async_stop()
 
         # remove service
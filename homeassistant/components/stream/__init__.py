@@ -16,28 +16,70 @@ to always keep workers active.
 """
 import logging
 import secrets
+import shutil
 import threading
 import time
 from types import MappingProxyType
 
+import voluptuous as vol
+
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
 
 from .const import (
     ATTR_ENDPOINTS,
+    ATTR_SEGMENT_STORE,
+    ATTR_SETTINGS,
     ATTR_STREAMS,
+    CONF_LL_HLS,
+    CONF_LOOKBACK,
+    CONF_PART_DURATION,
+    CONF_SEGMENT_MEMORY,
     DOMAIN,
+    LOOKBACK_DIR,
+    MAX_LOOKBACK,
     MAX_SEGMENTS,
+    MIN_SEGMENT_DURATION,
     OUTPUT_IDLE_TIMEOUT,
+    SEGMENT_MEMORY,
     STREAM_RESTART_INCREMENT,
     STREAM_RESTART_RESET_TIME,
+    TARGET_PART_DURATION,
+)
+from .core import (
+    PROVIDERS,
+    STREAM_SETTINGS_NON_LL_HLS,
+    IdleTimer,
+    KeyFrameConverter,
+    SegmentStore,
+    StreamSettings,
 )
-from .core import PROVIDERS, IdleTimer
 from .hls import async_setup_hls
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = vol.Schema(
+    {
+        DOMAIN: vol.Schema(
+            {
+                vol.Optional(CONF_LL_HLS, default=False): cv.boolean,
+                vol.Optional(CONF_PART_DURATION, default=TARGET_PART_DURATION): vol.All(
+                    vol.Coerce(float), vol.Range(min=0.2, max=MIN_SEGMENT_DURATION)
+                ),
+                vol.Optional(CONF_SEGMENT_MEMORY, default=SEGMENT_MEMORY): vol.All(
+                    vol.Coerce(int), vol.Range(min=1)
+                ),
+                vol.Optional(CONF_LOOKBACK, default=0): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=MAX_LOOKBACK)
+                ),
+            }
+        )
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
 
 def create_stream(hass, stream_source, options=None):
     """Create a stream with the specified identfier based on the source url.
@@ -77,6 +119,15 @@ async def async_setup(hass, config):
     hass.data[DOMAIN] = {}
     hass.data[DOMAIN][ATTR_ENDPOINTS] = {}
     hass.data[DOMAIN][ATTR_STREAMS] = []
+    conf = config.get(DOMAIN, {})
+    hass.data[DOMAIN][ATTR_SETTINGS] = StreamSettings(
+        ll_hls=conf.get(CONF_LL_HLS, False),
+        part_target_duration=conf.get(CONF_PART_DURATION, TARGET_PART_DURATION),
+        lookback=conf.get(CONF_LOOKBACK, 0),
+    )
+    hass.data[DOMAIN][ATTR_SEGMENT_STORE] = SegmentStore(
+        conf.get(CONF_SEGMENT_MEMORY, SEGMENT_MEMORY) * 1024 * 1024
+    )
 
     # Setup HLS
     hls_endpoint = async_setup_hls(hass)
@@ -84,6 +135,10 @@ async def async_setup(hass, config):
 
     # Setup Recorder
     async_setup_recorder(hass)
+    # Lookback buffers left behind by the previous run are of no use
+    await hass.async_add_executor_job(
+        shutil.rmtree, hass.config.path(LOOKBACK_DIR), True
+    )
 
     @callback
     def shutdown(event):
@@ -112,6 +167,10 @@ class Stream:
         self._thread_quit = threading.Event()
         self._outputs = {}
         self._fast_restart_once = False
+        self._keyframe_converter = KeyFrameConverter(hass)
+        self._settings = hass.data.get(DOMAIN, {}).get(
+            ATTR_SETTINGS, STREAM_SETTINGS_NON_LL_HLS
+        )
 
         if self.options is None:
             self.options = {}
@@ -130,7 +189,7 @@ class Stream:
         # without concern about self._outputs being modified from another thread.
         return MappingProxyType(self._outputs.copy())
 
-    def add_provider(self, fmt, timeout=OUTPUT_IDLE_TIMEOUT):
+    def add_provider(self, fmt, timeout=OUTPUT_IDLE_TIMEOUT, **kwargs):
         """Add provider output stream."""
         if not self._outputs.get(fmt):
 
@@ -141,7 +200,10 @@ class Stream:
                 self.check_idle()
 
             provider = PROVIDERS[fmt](
-                self.hass, IdleTimer(self.hass, timeout, idle_callback)
+                self.hass,
+                IdleTimer(self.hass, timeout, idle_callback),
+                self._settings,
+                **kwargs,
             )
             self._outputs[fmt] = provider
         return self._outputs[fmt]
@@ -157,11 +219,22 @@ class Stream:
 
     def check_idle(self):
         """Reset access token if all providers are idle."""
-        if all([p.idle for p in self._outputs.values()]):
+        # The lookback buffer is written without anyone watching the stream
+        if all([p.idle for p in self._outputs.values() if p.name != "lookback"]):
             self.access_token = None
 
     def start(self):
         """Start a stream."""
+        if (
+            self.keepalive
+            and self._settings.lookback
+            and not self._outputs.get("lookback")
+        ):
+            # Only streams that are kept alive are continuously recorded
+            self.add_provider(
+                "lookback",
+                directory=self.hass.config.path(LOOKBACK_DIR, secrets.token_hex(8)),
+            )
         if self._thread is None or not self._thread.is_alive():
             if self._thread is not None:
                 # The thread must have crashed/exited. Join to clean up the
@@ -188,7 +261,9 @@ class Stream:
         # pylint: disable=import-outside-toplevel
         from .worker import SegmentBuffer, stream_worker
 
-        segment_buffer = SegmentBuffer(self.outputs)
+        segment_buffer = SegmentBuffer(
+            self.outputs, self._keyframe_converter, self._settings
+        )
         wait_timeout = 0
         while not self._thread_quit.wait(timeout=wait_timeout):
             start_time = time.time()
@@ -227,6 +302,9 @@ class Stream:
 
     def stop(self):
         """Remove outputs and access token."""
+        # Releases the memory budget of HLS and removes the lookback buffer
+        for provider in self._outputs.values():
+            provider.release()
         self._outputs = {}
         self.access_token = None
 
@@ -241,6 +319,23 @@ class Stream:
             self._thread = None
             _LOGGER.info("Stopped stream: %s", self.source)
 
+    def metrics(self):
+        """Return the metrics of the HLS output of the stream."""
+        hls = self._outputs.get("hls")
+        if hls is None:
+            return {"segments": 0, "bytes_held": 0, "viewers": 0}
+        return hls.metrics()
+
+    async def async_get_image(self):
+        """Return a JPEG image of the latest keyframe of a running stream.
+
+        Returns None when the worker isn't running or hasn't received a
+        recent keyframe, in which case the image has to come from elsewhere.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return None
+        return await self._keyframe_converter.async_get_image()
+
     async def async_record(self, video_path, duration=30, lookback=5):
         """Make a .mp4 recording from a provided stream."""
 
@@ -260,9 +355,13 @@ class Stream:
         self.start()
 
         # Take advantage of lookback
+        lookback_buffer = self.outputs().get("lookback")
         hls = self.outputs().get("hls")
-        if lookback > 0 and hls:
+        if lookback > 0 and lookback_buffer:
+            recorder.prepend_lookback(lookback_buffer, lookback)
+        elif lookback > 0 and hls:
             num_segments = min(int(lookback // hls.target_duration), MAX_SEGMENTS)
             # Wait for latest segment, then add the lookback
             await hls.recv()
-            recorder.prepend(list(hls.get_segment())[-num_segments:])
+            segments = [segment for segment in hls.get_segment() if segment.complete]
+            recorder.prepend(segments[-num_segments:])
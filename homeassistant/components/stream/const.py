@@ -3,6 +3,13 @@ DOMAIN = "stream"
 
 ATTR_ENDPOINTS = "endpoints"
 ATTR_STREAMS = "streams"
+ATTR_SETTINGS = "settings"
+ATTR_SEGMENT_STORE = "segment_store"
+
+CONF_LL_HLS = "ll_hls"
+CONF_LOOKBACK = "lookback"
+CONF_PART_DURATION = "part_duration"
+CONF_SEGMENT_MEMORY = "segment_memory"
 
 OUTPUT_FORMATS = ["hls"]
 
@@ -17,6 +24,14 @@ OUTPUT_IDLE_TIMEOUT = 300  # Idle timeout due to inactivity
 NUM_PLAYLIST_SEGMENTS = 3  # Number of segments to use in HLS playlist
 MAX_SEGMENTS = 4  # Max number of segments to keep around
 MIN_SEGMENT_DURATION = 1.5  # Each segment is at least this many seconds
+TARGET_PART_DURATION = 0.5  # Low latency HLS parts are about this many seconds
+PART_PLAYLIST_SEGMENTS = 2  # Number of complete segments to list parts for
+SEGMENT_MEMORY = 128  # MiB of HLS segments kept in memory across all streams
+VIEWER_TIMEOUT = 30  # seconds - a viewer is gone when it stops fetching playlists
+MAX_LOOKBACK = 300  # seconds - longest lookback kept on disk for recordings
+LOOKBACK_DIR = ".stream_lookback"  # Directory of the lookback buffers in the config
+LOOKBACK_INDEX = "index.json"  # Index of the segments in a lookback buffer
+LOOKBACK_INDEX_INTERVAL = 10  # seconds - of new segments before rewriting the index
 
 PACKETS_TO_WAIT_FOR_AUDIO = 20  # Some streams have an audio stream with no audio
 MAX_TIMESTAMP_GAP = 10000  # seconds - anything from 10 to 50000 is probably reasonable
@@ -24,5 +39,8 @@ MAX_TIMESTAMP_GAP = 10000  # seconds - anything from 10 to 50000 is probably rea
 MAX_MISSING_DTS = 6  # Number of packets missing DTS to allow
 STREAM_TIMEOUT = 30  # Timeout for reading stream
 
+KEYFRAME_MAX_AGE = 10  # seconds - older keyframes are not used for snapshots
+SNAPSHOT_MIN_INTERVAL = 0.5  # Decode a keyframe to a snapshot at most this often
+
 STREAM_RESTART_INCREMENT = 10  # Increase wait_timeout by this amount each retry
 STREAM_RESTART_RESET_TIME = 300  # Reset wait_timeout after this many seconds
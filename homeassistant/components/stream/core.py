@@ -1,8 +1,11 @@
 """Provides core stream functionality."""
 import asyncio
 from collections import deque
+from fractions import Fraction
 import io
-from typing import Any, Callable, List
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from aiohttp import web
 import attr
@@ -12,7 +15,15 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.event import async_call_later
 from homeassistant.util.decorator import Registry
 
-from .const import ATTR_STREAMS, DOMAIN
+from .const import (
+    ATTR_STREAMS,
+    DOMAIN,
+    KEYFRAME_MAX_AGE,
+    SNAPSHOT_MIN_INTERVAL,
+    TARGET_PART_DURATION,
+)
+
+_LOGGER = logging.getLogger(__name__)
 
 PROVIDERS = Registry()
 
@@ -27,6 +38,30 @@ class StreamBuffer:
     astream = attr.ib(default=None)  # type=Optional[av.AudioStream]
 
 
+@attr.s(frozen=True)
+class StreamSettings:
+    """Represent the settings of the stream integration."""
+
+    ll_hls: bool = attr.ib()
+    part_target_duration: float = attr.ib()
+    # Seconds of segments kept on disk for the lookback of recordings
+    lookback: float = attr.ib(default=0)
+
+
+STREAM_SETTINGS_NON_LL_HLS = StreamSettings(
+    ll_hls=False, part_target_duration=TARGET_PART_DURATION
+)
+
+
+@attr.s(frozen=True)
+class Part:
+    """Represent a part of a segment, published before the segment completes."""
+
+    duration: float = attr.ib()
+    has_keyframe: bool = attr.ib()
+    data: bytes = attr.ib()
+
+
 @attr.s
 class Segment:
     """Represent a segment."""
@@ -36,6 +71,110 @@ class Segment:
     duration: float = attr.ib()
     # For detecting discontinuities across stream restarts
     stream_id: int = attr.ib(default=0)
+    # Only collected in low latency HLS mode
+    parts: List[Part] = attr.ib(factory=list)
+    # Low latency HLS publishes a segment while its parts are still muxed
+    complete: bool = attr.ib(default=True)
+    # Init section, read by the worker so the buffer of an incomplete segment
+    # is never read from the event loop
+    init: Optional[bytes] = attr.ib(default=None)
+
+
+@attr.s(frozen=True)
+class KeyFrame:
+    """Represent a video keyframe demuxed by the stream worker."""
+
+    data: bytes = attr.ib()
+    codec_name: str = attr.ib()
+    extradata: Optional[bytes] = attr.ib()
+    received: float = attr.ib()
+
+
+class KeyFrameConverter:
+    """Convert the latest video keyframe of a stream to a JPEG image.
+
+    The worker hands over every keyframe it demuxes, which only costs a copy
+    of the packet. A keyframe is only decoded when someone asks for an image,
+    and at most once per SNAPSHOT_MIN_INTERVAL, so a stream nobody takes
+    snapshots of doesn't decode anything.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the converter."""
+        self._hass = hass
+        self._keyframe: Optional[KeyFrame] = None
+        self._lock = asyncio.Lock()
+        self._image: Optional[bytes] = None
+        self._image_keyframe: Optional[KeyFrame] = None
+        self._decoded_at = 0.0
+        # Only used from the executor, serialized by the lock
+        self._decoder = None
+        self._decoder_key = None
+
+    def put(self, packet) -> None:
+        """Store a video keyframe, called from the worker thread."""
+        codec_context = packet.stream.codec_context
+        # The packet is reset when it is muxed, keep a copy of its data
+        self._keyframe = KeyFrame(
+            bytes(packet),
+            codec_context.name,
+            codec_context.extradata,
+            time.monotonic(),
+        )
+
+    async def async_get_image(self) -> Optional[bytes]:
+        """Return a JPEG image of the latest keyframe, if it is recent."""
+        async with self._lock:
+            keyframe = self._keyframe
+            now = time.monotonic()
+            if keyframe is None or now - keyframe.received > KEYFRAME_MAX_AGE:
+                return None
+            if self._image is not None and (
+                keyframe is self._image_keyframe
+                or now - self._decoded_at < SNAPSHOT_MIN_INTERVAL
+            ):
+                return self._image
+
+            image = await self._hass.async_add_executor_job(self._convert, keyframe)
+            self._decoded_at = time.monotonic()
+            self._image_keyframe = keyframe
+            if image is not None:
+                self._image = image
+            return self._image
+
+    def _convert(self, keyframe: KeyFrame) -> Optional[bytes]:
+        """Decode a keyframe and encode it as a JPEG image."""
+        # Keep import here so that we can import stream integration without installing reqs
+        import av  # pylint: disable=import-outside-toplevel
+
+        decoder_key = (keyframe.codec_name, keyframe.extradata)
+        if self._decoder is None or self._decoder_key != decoder_key:
+            self._decoder = av.CodecContext.create(keyframe.codec_name, "r")
+            self._decoder.extradata = keyframe.extradata
+            self._decoder_key = decoder_key
+
+        try:
+            frames = self._decoder.decode(av.Packet(keyframe.data))
+            if not frames:
+                # The decoder holds on to frames it may have to reorder, flush
+                # it and start with a new one for the next keyframe
+                frames = self._decoder.decode(None)
+                self._decoder = None
+        except (av.AVError, EOFError) as err:
+            _LOGGER.debug("Error decoding keyframe: %s", err)
+            self._decoder = None
+            return None
+
+        if not frames:
+            return None
+
+        frame = frames[0].reformat(format="yuvj420p")
+        encoder = av.CodecContext.create("mjpeg", "w")
+        encoder.width = frame.width
+        encoder.height = frame.height
+        encoder.pix_fmt = "yuvj420p"
+        encoder.time_base = Fraction(1, 1)
+        return b"".join(bytes(packet) for packet in encoder.encode(frame))
 
 
 class IdleTimer:
@@ -80,18 +219,90 @@ class IdleTimer:
         self._callback()
 
 
+def segment_size(segment: Segment) -> int:
+    """Return the number of bytes held by a segment."""
+    with segment.segment.getbuffer() as view:
+        size = view.nbytes
+    return size + sum(len(part.data) for part in segment.parts)
+
+
+class SegmentStore:
+    """Keep the memory held by the segments of all streams within a budget.
+
+    Outputs add the complete segments they keep and discard the ones they let
+    go. When the segments add up to more than the budget, the oldest ones are
+    evicted from their outputs, whichever stream they belong to. The latest
+    segment of an output is never evicted as players are about to fetch it.
+    """
+
+    def __init__(self, budget: int) -> None:
+        """Initialize the store."""
+        self.budget = budget
+        self.bytes_held = 0
+        self.evicted = 0
+        # (output id, segment id) -> (output, segment, size), oldest first
+        self._entries: Dict[Tuple[int, int], Tuple["StreamOutput", Segment, int]] = {}
+
+    @callback
+    def async_add(self, output: "StreamOutput", segment: Segment) -> None:
+        """Add a segment kept by an output and evict segments over budget."""
+        key = (id(output), id(segment))
+        if key in self._entries:
+            return
+        size = segment_size(segment)
+        self._entries[key] = (output, segment, size)
+        self.bytes_held += size
+        output.bytes_held += size
+        if self.bytes_held > self.budget:
+            self._async_evict()
+
+    @callback
+    def async_discard(self, output: "StreamOutput", segment: Segment) -> None:
+        """Discard a segment an output no longer keeps."""
+        entry = self._entries.pop((id(output), id(segment)), None)
+        if entry is not None:
+            self.bytes_held -= entry[2]
+            output.bytes_held -= entry[2]
+
+    @callback
+    def _async_evict(self) -> None:
+        """Evict the oldest segments until the store is within budget."""
+        for key, (output, segment, size) in list(self._entries.items()):
+            if self.bytes_held <= self.budget:
+                break
+            if output.is_latest_segment(segment):
+                continue
+            del self._entries[key]
+            self.bytes_held -= size
+            output.bytes_held -= size
+            self.evicted += 1
+            output.evict(segment)
+        _LOGGER.debug(
+            "Evicted segments to keep %d bytes within budget of %d bytes",
+            self.bytes_held,
+            self.budget,
+        )
+
+
 class StreamOutput:
     """Represents a stream output."""
 
     def __init__(
-        self, hass: HomeAssistant, idle_timer: IdleTimer, deque_maxlen: int = None
+        self,
+        hass: HomeAssistant,
+        idle_timer: IdleTimer,
+        stream_settings: StreamSettings = STREAM_SETTINGS_NON_LL_HLS,
+        deque_maxlen: int = None,
     ) -> None:
         """Initialize a stream output."""
         self._hass = hass
         self._idle_timer = idle_timer
+        self.stream_settings = stream_settings
         self._cursor = None
         self._event = asyncio.Event()
         self._segments = deque(maxlen=deque_maxlen)
+        # Bytes of segments accounted for in the segment store
+        self.bytes_held = 0
 
     @property
     def name(self) -> str:
@@ -151,10 +362,40 @@ class StreamOutput:
         """Store output from event loop."""
         # Start idle timeout when we start receiving data
         self._idle_timer.start()
-        self._segments.append(segment)
+        self._async_append(segment)
         self._event.set()
         self._event.clear()
 
+    @callback
+    def _async_append(self, segment: Segment) -> None:
+        """Append a segment unless it is already the latest one."""
+        # The segment may already be stored when its parts were published
+        if not self._segments or self._segments[-1] is not segment:
+            self._segments.append(segment)
+
+    @property
+    def last_complete_segment(self) -> Optional[Segment]:
+        """Return the latest complete segment."""
+        for segment in reversed(self._segments):
+            if segment.complete:
+                return segment
+        return None
+
+    def is_latest_segment(self, segment: Segment) -> bool:
+        """Return if a segment is the latest complete segment of the output."""
+        return self.last_complete_segment is segment
+
+    def release(self) -> None:
+        """Release the segments accounted for in the segment store."""
+
+    @callback
+    def evict(self, segment: Segment) -> None:
+        """Stop keeping a segment to free memory."""
+        self._segments.remove(segment)
+
+    def part_added(self, segment: Segment) -> None:
+        """Handle a part added to an incomplete segment."""
+
     def cleanup(self):
         """Handle cleanup."""
         self._event.set()
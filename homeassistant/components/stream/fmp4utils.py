@@ -30,12 +30,15 @@ def get_init(segment: io.BytesIO) -> bytes:
     return segment.read(moof_location)
 
 
-def get_m4s(segment: io.BytesIO, sequence: int) -> bytes:
-    """Get m4s section from fragmented mp4."""
+def get_m4s(segment: io.BytesIO, sequence: int) -> memoryview:
+    """Get m4s section from fragmented mp4.
+
+    The section is a view of the buffer of the complete segment, so serving
+    it doesn't copy the segment.
+    """
     moof_location = next(find_box(segment, b"moof"))
     mfra_location = next(find_box(segment, b"mfra"))
-    segment.seek(moof_location)
-    return segment.read(mfra_location - moof_location)
+    return segment.getbuffer()[moof_location:mfra_location]
 
 
 def get_codec_string(segment: io.BytesIO) -> str:
@@ -1,12 +1,33 @@
 """Provide functionality to stream HLS."""
+import asyncio
 import io
+from typing import Dict, Optional, Tuple
 
 from aiohttp import web
+import async_timeout
 
 from homeassistant.core import callback
 
-from .const import FORMAT_CONTENT_TYPE, MAX_SEGMENTS, NUM_PLAYLIST_SEGMENTS
-from .core import PROVIDERS, HomeAssistant, IdleTimer, StreamOutput, StreamView
+from .const import (
+    ATTR_SEGMENT_STORE,
+    DOMAIN,
+    FORMAT_CONTENT_TYPE,
+    MAX_SEGMENTS,
+    NUM_PLAYLIST_SEGMENTS,
+    PART_PLAYLIST_SEGMENTS,
+    VIEWER_TIMEOUT,
+)
+from .core import (
+    PROVIDERS,
+    HomeAssistant,
+    IdleTimer,
+    Part,
+    Segment,
+    SegmentStore,
+    StreamOutput,
+    StreamSettings,
+    StreamView,
+)
 from .fmp4utils import get_codec_string, get_init, get_m4s
 
 
@@ -16,6 +37,7 @@ def async_setup_hls(hass):
     hass.http.register_view(HlsPlaylistView())
     hass.http.register_view(HlsSegmentView())
     hass.http.register_view(HlsInitView())
+    hass.http.register_view(HlsPartView())
     hass.http.register_view(HlsMasterPlaylistView())
     return "/api/hls/{}/master_playlist.m3u8"
 
@@ -33,7 +55,7 @@ class HlsMasterPlaylistView(StreamView):
         # Need to calculate max bandwidth as input_container.bit_rate doesn't seem to work
         # Calculate file size / duration and use a small multiplier to account for variation
         # hls spec already allows for 25% variation
-        segment = track.get_segment(track.segments[-1])
+        segment = track.last_complete_segment
         bandwidth = round(
             segment.segment.seek(0, io.SEEK_END) * 8 / segment.duration * 1.2
         )
@@ -50,7 +72,7 @@ class HlsMasterPlaylistView(StreamView):
         track = stream.add_provider("hls")
         stream.start()
         # Wait for a segment to be ready
-        if not track.segments:
+        if not track.last_complete_segment:
             if not await track.recv():
                 return web.HTTPNotFound()
         headers = {"Content-Type": FORMAT_CONTENT_TYPE["hls"]}
@@ -67,29 +89,58 @@ class HlsPlaylistView(StreamView):
     @staticmethod
     def render_preamble(track):
         """Render preamble."""
-        return [
+        preamble = [
             "#EXT-X-VERSION:7",
             f"#EXT-X-TARGETDURATION:{track.target_duration}",
             '#EXT-X-MAP:URI="init.mp4"',
         ]
+        if track.stream_settings.ll_hls:
+            part_target = track.stream_settings.part_target_duration
+            preamble.extend(
+                [
+                    f"#EXT-X-PART-INF:PART-TARGET={part_target:.3f}",
+                    "#EXT-X-SERVER-CONTROL:CAN-BLOCK-RELOAD=YES,"
+                    f"PART-HOLD-BACK={3 * part_target:.3f}",
+                ]
+            )
+        return preamble
 
     @staticmethod
-    def render_playlist(track):
-        """Render playlist."""
-        segments = list(track.get_segment())[-NUM_PLAYLIST_SEGMENTS:]
+    def render_parts(segment):
+        """Render the parts of a segment."""
+        return [
+            f"#EXT-X-PART:DURATION={part.duration:.3f},"
+            f'URI="./part/{segment.sequence}.{index}.m4s"'
+            + (",INDEPENDENT=YES" if part.has_keyframe else "")
+            for index, part in enumerate(segment.parts)
+        ]
 
-        if not segments:
+    @classmethod
+    def render_playlist(cls, track):
+        """Render playlist."""
+        all_segments = list(track.get_segment())
+        # Low latency HLS lists the parts of the segment being muxed
+        current = None
+        if all_segments and not all_segments[-1].complete:
+            current = all_segments.pop()
+        segments = all_segments[-NUM_PLAYLIST_SEGMENTS:]
+
+        if not segments and not current:
             return []
 
+        first = segments[0] if segments else current
         playlist = [
-            "#EXT-X-MEDIA-SEQUENCE:{}".format(segments[0].sequence),
-            "#EXT-X-DISCONTINUITY-SEQUENCE:{}".format(segments[0].stream_id),
+            "#EXT-X-MEDIA-SEQUENCE:{}".format(first.sequence),
+            "#EXT-X-DISCONTINUITY-SEQUENCE:{}".format(first.stream_id),
         ]
 
-        last_stream_id = segments[0].stream_id
-        for segment in segments:
+        ll_hls = track.stream_settings.ll_hls
+        last_stream_id = first.stream_id
+        for index, segment in enumerate(segments):
             if last_stream_id != segment.stream_id:
                 playlist.append("#EXT-X-DISCONTINUITY")
+            if ll_hls and len(segments) - index <= PART_PLAYLIST_SEGMENTS:
+                playlist.extend(cls.render_parts(segment))
             playlist.extend(
                 [
                     "#EXTINF:{:.04f},".format(float(segment.duration)),
@@ -98,6 +149,18 @@ class HlsPlaylistView(StreamView):
             )
             last_stream_id = segment.stream_id
 
+        if not ll_hls:
+            return playlist
+
+        if current:
+            if last_stream_id != current.stream_id:
+                playlist.append("#EXT-X-DISCONTINUITY")
+            playlist.extend(cls.render_parts(current))
+            next_part = f"{current.sequence}.{len(current.parts)}"
+        else:
+            next_part = f"{segments[-1].sequence + 1}.0"
+        playlist.append(f'#EXT-X-PRELOAD-HINT:TYPE=PART,URI="./part/{next_part}.m4s"')
+
         return playlist
 
     def render(self, track):
@@ -113,6 +176,22 @@ class HlsPlaylistView(StreamView):
         if not track.segments:
             if not await track.recv():
                 return web.HTTPNotFound()
+
+        track.async_viewer_seen(request.remote)
+
+        # Blocking playlist reload, wait for the segment or part asked for
+        if track.stream_settings.ll_hls and "_HLS_msn" in request.query:
+            try:
+                msn = int(request.query["_HLS_msn"])
+                part = request.query.get("_HLS_part")
+                part = None if part is None else int(part)
+            except ValueError:
+                return web.HTTPBadRequest()
+            if msn > track.segments[-1] + 2:
+                return web.HTTPBadRequest()
+            if not await track.async_wait_for_part(msn, part):
+                return web.HTTPServiceUnavailable()
+
         headers = {"Content-Type": FORMAT_CONTENT_TYPE["hls"]}
         return web.Response(body=self.render(track).encode("utf-8"), headers=headers)
 
@@ -127,11 +206,11 @@ class HlsInitView(StreamView):
     async def handle(self, request, stream, sequence):
         """Return init.mp4."""
         track = stream.add_provider("hls")
-        segments = track.get_segment()
-        if not segments:
+        init = track.get_init()
+        if init is None:
             return web.HTTPNotFound()
         headers = {"Content-Type": "video/mp4"}
-        return web.Response(body=get_init(segments[0].segment), headers=headers)
+        return web.Response(body=init, headers=headers)
 
 
 class HlsSegmentView(StreamView):
@@ -145,7 +224,7 @@ class HlsSegmentView(StreamView):
         """Return fmp4 segment."""
         track = stream.add_provider("hls")
         segment = track.get_segment(int(sequence))
-        if not segment:
+        if not segment or not segment.complete:
             return web.HTTPNotFound()
         headers = {"Content-Type": "video/iso.segment"}
         return web.Response(
@@ -154,15 +233,174 @@ class HlsSegmentView(StreamView):
         )
 
 
+class HlsPartView(StreamView):
+    """Stream view to serve a low latency HLS part of a fmp4 segment."""
+
+    url = r"/api/hls/{token:[a-f0-9]+}/part/{sequence:\d+\.\d+}.m4s"
+    name = "api:stream:hls:part"
+    cors_allowed = True
+
+    async def handle(self, request, stream, sequence):
+        """Return the part, waiting for it if it was hinted but isn't muxed yet."""
+        track = stream.add_provider("hls")
+        if not track.stream_settings.ll_hls or not track.segments:
+            return web.HTTPNotFound()
+        sequence, part_index = (int(number) for number in sequence.split("."))
+        if sequence > track.segments[-1] + 1:
+            return web.HTTPNotFound()
+        if not await track.async_wait_for_part(sequence, part_index):
+            return web.HTTPNotFound()
+        part = track.get_part(sequence, part_index)
+        if not part:
+            return web.HTTPNotFound()
+        headers = {"Content-Type": "video/iso.segment"}
+        return web.Response(body=memoryview(part.data), headers=headers)
+
+
 @PROVIDERS.register("hls")
 class HlsStreamOutput(StreamOutput):
     """Represents HLS Output formats."""
 
-    def __init__(self, hass: HomeAssistant, idle_timer: IdleTimer) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        idle_timer: IdleTimer,
+        stream_settings: StreamSettings,
+    ) -> None:
         """Initialize recorder output."""
-        super().__init__(hass, idle_timer, deque_maxlen=MAX_SEGMENTS)
+        # Keep room for the segment whose parts are being published
+        super().__init__(
+            hass,
+            idle_timer,
+            stream_settings,
+            deque_maxlen=MAX_SEGMENTS + 1 if stream_settings.ll_hls else MAX_SEGMENTS,
+        )
+        self._part_event = asyncio.Event()
+        self._store: Optional[SegmentStore] = hass.data.get(DOMAIN, {}).get(
+            ATTR_SEGMENT_STORE
+        )
+        # Stream id and init section of the first segment
+        self._init: Optional[Tuple[int, bytes]] = None
+        # Remote address of viewers -> when they last fetched the playlist
+        self._viewers: Dict[str, float] = {}
 
     @property
     def name(self) -> str:
         """Return provider name."""
         return "hls"
+
+    @property
+    def viewers(self) -> int:
+        """Return the number of clients that recently fetched the playlist."""
+        cutoff = self._hass.loop.time() - VIEWER_TIMEOUT
+        for remote, last_seen in list(self._viewers.items()):
+            if last_seen < cutoff:
+                del self._viewers[remote]
+        return len(self._viewers)
+
+    @callback
+    def async_viewer_seen(self, remote: str) -> None:
+        """Record a playlist fetch by a viewer."""
+        self._viewers[remote] = self._hass.loop.time()
+
+    def get_init(self) -> Optional[bytes]:
+        """Return the init section of the stream, extracted once per stream.
+
+        Only complete segments are read, the buffer of a segment still being
+        muxed is only used through the init section the worker read from it.
+        """
+        self._idle_timer.awake()
+        segment = next(
+            (
+                segment
+                for segment in self._segments
+                if segment.complete or segment.init is not None
+            ),
+            None,
+        )
+        if segment is None:
+            return None
+        if self._init is None or self._init[0] != segment.stream_id:
+            init = segment.init
+            if init is None:
+                init = get_init(segment.segment)
+            self._init = (segment.stream_id, init)
+        return self._init[1]
+
+    def metrics(self) -> Dict[str, int]:
+        """Return the metrics of the output."""
+        return {
+            "segments": len(self._segments),
+            "bytes_held": self.bytes_held,
+            "viewers": self.viewers,
+        }
+
+    def get_part(self, sequence: int, index: int) -> Optional[Part]:
+        """Retrieve a part of a segment."""
+        segment = self.get_segment(sequence)
+        if not segment or index >= len(segment.parts):
+            return None
+        return segment.parts[index]
+
+    def part_added(self, segment: Segment) -> None:
+        """Handle a part added to an incomplete segment."""
+        self._hass.loop.call_soon_threadsafe(self._async_part_added, segment)
+
+    @callback
+    def _async_part_added(self, segment: Segment) -> None:
+        """Publish the segment and wake up blocked requests from event loop."""
+        self._idle_timer.start()
+        self._async_append(segment)
+        self._part_event.set()
+        self._part_event.clear()
+
+    @callback
+    def _async_put(self, segment: Segment) -> None:
+        """Store output from event loop."""
+        super()._async_put(segment)
+        if self._store is not None:
+            self._store.async_add(self, segment)
+        self._part_event.set()
+        self._part_event.clear()
+
+    @callback
+    def _async_append(self, segment: Segment) -> None:
+        """Append a segment, releasing the one that falls off the buffer."""
+        if self._segments and self._segments[-1] is segment:
+            return
+        if self._store is not None and len(self._segments) == self._segments.maxlen:
+            self._store.async_discard(self, self._segments[0])
+        self._segments.append(segment)
+
+    def _has_part(self, sequence: int, index: Optional[int]) -> bool:
+        """Return if a part, or a complete segment if index is None, is there."""
+        last = self._segments[-1]
+        if sequence != last.sequence:
+            return sequence < last.sequence
+        return last.complete or (index is not None and index < len(last.parts))
+
+    async def async_wait_for_part(self, sequence: int, index: Optional[int]) -> bool:
+        """Wait for a part or a complete segment to be published.
+
+        Gives up after three target durations, as blocking playlist reloads do.
+        """
+        try:
+            async with async_timeout.timeout(3 * self.target_duration):
+                while self._segments and not self._has_part(sequence, index):
+                    await self._part_event.wait()
+        except asyncio.TimeoutError:
+            return False
+        return bool(self._segments)
+
+    def release(self) -> None:
+        """Release the segments accounted for in the segment store."""
+        if self._store is not None:
+            for segment in self._segments:
+                self._store.async_discard(self, segment)
+
+    def cleanup(self):
+        """Handle cleanup."""
+        self.release()
+        super().cleanup()
+        self._init = None
+        self._part_event.set()
@@ -1,15 +1,26 @@
 """Provide functionality to record stream."""
+from collections import deque
+import io
 import logging
 import os
+import shutil
 import threading
-from typing import Deque, List
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
 
+import attr
 import av
 
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.json import save_json
 
-from .const import RECORDER_CONTAINER_FORMAT, SEGMENT_CONTAINER_FORMAT
-from .core import PROVIDERS, IdleTimer, Segment, StreamOutput
+from .const import (
+    LOOKBACK_INDEX,
+    LOOKBACK_INDEX_INTERVAL,
+    RECORDER_CONTAINER_FORMAT,
+    SEGMENT_CONTAINER_FORMAT,
+)
+from .core import PROVIDERS, IdleTimer, Segment, StreamOutput, StreamSettings
+from .fmp4utils import find_box, get_init, get_m4s
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,11 +30,50 @@ def async_setup_recorder(hass):
     """Only here so Provider Registry works."""
 
 
-def recorder_save_worker(file_out: str, segments: Deque[Segment]):
+def recorder_save_worker(file_out: str, segments: Iterable[Segment]):
     """Handle saving stream."""
     if not os.path.exists(os.path.dirname(file_out)):
         os.makedirs(os.path.dirname(file_out), exist_ok=True)
 
+    # Because the stream_worker is in a different thread from the record service,
+    # the lookback segments may still have some overlap with the recorder segments
+    ordered = []
+    last_sequence = float("-inf")
+    for segment in segments:
+        if segment.sequence <= last_sequence:
+            continue
+        last_sequence = segment.sequence
+        ordered.append(segment)
+    if not ordered:
+        return
+
+    if len({segment.stream_id for segment in ordered}) == 1 and all(
+        _is_fragmented(segment) for segment in ordered
+    ):
+        _concatenate(file_out, ordered)
+    else:
+        _remux(file_out, ordered)
+
+
+def _is_fragmented(segment: Segment) -> bool:
+    """Return if a segment is a fragmented mp4 from the stream worker."""
+    return next(find_box(segment.segment, b"moof"), None) is not None
+
+
+def _concatenate(file_out: str, segments: List[Segment]) -> None:
+    """Save segments of a single stream by writing their fragments in a row.
+
+    The segments share the init section and their fragments carry their
+    decode times, so they make up a fragmented mp4 without remuxing.
+    """
+    with open(file_out, "wb") as output:
+        output.write(get_init(segments[0].segment))
+        for segment in segments:
+            output.write(get_m4s(segment.segment, segment.sequence))
+
+
+def _remux(file_out: str, segments: List[Segment]) -> None:
+    """Save segments across discontinuities by remuxing their packets."""
     pts_adjuster = {"video": None, "audio": None}
     output = None
     output_v = None
@@ -34,14 +84,7 @@ def recorder_save_worker(file_out: str, segments: Deque[Segment]):
     # units which seem to be defined inversely to how stream time_bases are defined
     running_duration = 0
 
-    last_sequence = float("-inf")
     for segment in segments:
-        # Because the stream_worker is in a different thread from the record service,
-        # the lookback segments may still have some overlap with the recorder segments
-        if segment.sequence <= last_sequence:
-            continue
-        last_sequence = segment.sequence
-
         # Open segment
         source = av.open(segment.segment, "r", format=SEGMENT_CONTAINER_FORMAT)
         source_v = source.streams.video[0]
@@ -96,14 +139,192 @@ def recorder_save_worker(file_out: str, segments: Deque[Segment]):
     output.close()
 
 
+@attr.s(frozen=True)
+class LookbackSegment:
+    """Represent a segment written to a lookback buffer."""
+
+    sequence: int = attr.ib()
+    duration: float = attr.ib()
+    stream_id: int = attr.ib()
+    path: str = attr.ib()
+
+
+@PROVIDERS.register("lookback")
+class LookbackOutput(StreamOutput):
+    """Keep the latest segments of a stream on disk for the lookback of recordings.
+
+    Complete segments are written to files in the directory of the buffer by
+    the stream worker, next to an index of the segments in the buffer. The
+    oldest segments leave the buffer once the remaining ones cover the lookback
+    duration. The index is rewritten after every LOOKBACK_INDEX_INTERVAL of new
+    segments, and only then are the files of the segments that left the buffer
+    removed, unless a recording still has to save them.
+
+    The buffer is not part of the idle check of the stream, it is written for
+    as long as the stream is kept alive.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        idle_timer: IdleTimer,
+        stream_settings: StreamSettings,
+        directory: str,
+    ) -> None:
+        """Initialize lookback output."""
+        super().__init__(hass, idle_timer, stream_settings)
+        self.directory = directory
+        self.duration = stream_settings.lookback
+        self._lock = threading.Lock()
+        self._entries: Deque[LookbackSegment] = deque()
+        # Sequence -> number of recordings that still have to save the segment
+        self._pinned: Dict[int, int] = {}
+        # Seconds of segments added since the index was written
+        self._unindexed = 0.0
+        # Files of the segments that left the buffer since the index was written
+        self._expired: List[str] = []
+        self._closed = False
+
+    @property
+    def name(self) -> str:
+        """Return provider name."""
+        return "lookback"
+
+    @property
+    def segments(self) -> List[int]:
+        """Return the sequences of the segments in the buffer."""
+        with self._lock:
+            return [entry.sequence for entry in self._entries]
+
+    def put(self, segment: Segment) -> None:
+        """Write a segment to the buffer, called from the stream worker."""
+        if self._closed:
+            return
+        path = os.path.join(self.directory, f"{segment.sequence}.mp4")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "wb") as file:
+                file.write(segment.segment.getbuffer())
+        except OSError as err:
+            _LOGGER.error("Unable to write lookback segment %s: %s", path, err)
+            return
+
+        with self._lock:
+            if self._closed:
+                # The buffer was removed while the segment was written
+                _remove(path)
+                return
+            self._entries.append(
+                LookbackSegment(
+                    segment.sequence, float(segment.duration), segment.stream_id, path
+                )
+            )
+            total = sum(entry.duration for entry in self._entries)
+            while total - self._entries[0].duration >= self.duration:
+                entry = self._entries.popleft()
+                total -= entry.duration
+                if entry.sequence not in self._pinned:
+                    self._expired.append(entry.path)
+            self._unindexed += float(segment.duration)
+            if self._unindexed < LOOKBACK_INDEX_INTERVAL:
+                return
+            self._unindexed = 0.0
+            index = [attr.asdict(entry) for entry in self._entries]
+            expired, self._expired = self._expired, []
+
+        save_json(os.path.join(self.directory, LOOKBACK_INDEX), index)
+        for expired_path in expired:
+            _remove(expired_path)
+
+    def pin(self, lookback: float) -> List[LookbackSegment]:
+        """Return the latest segments covering the lookback, kept until unpinned."""
+        entries: List[LookbackSegment] = []
+        with self._lock:
+            total = 0.0
+            for entry in reversed(self._entries):
+                if total >= lookback:
+                    break
+                entries.insert(0, entry)
+                total += entry.duration
+            for entry in entries:
+                self._pinned[entry.sequence] = self._pinned.get(entry.sequence, 0) + 1
+        return entries
+
+    def unpin(self, entries: List[LookbackSegment]) -> None:
+        """Release pinned segments, removing those that left the buffer."""
+        expired = []
+        with self._lock:
+            for entry in entries:
+                self._pinned[entry.sequence] -= 1
+                if self._pinned[entry.sequence]:
+                    continue
+                del self._pinned[entry.sequence]
+                if self._closed:
+                    expired.append(entry.path)
+                elif entry not in self._entries:
+                    # Removed once the index no longer lists it
+                    self._expired.append(entry.path)
+        for path in expired:
+            _remove(path)
+
+    @staticmethod
+    def load(entry: LookbackSegment) -> Segment:
+        """Read a segment of the buffer back from disk."""
+        with open(entry.path, "rb") as file:
+            data = io.BytesIO(file.read())
+        return Segment(entry.sequence, data, entry.duration, entry.stream_id)
+
+    def release(self) -> None:
+        """Remove the buffer from disk."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._entries.clear()
+            pinned = bool(self._pinned)
+            expired, self._expired = self._expired, []
+        if pinned:
+            # The last recording to unpin its segments removes them
+            self._hass.async_add_executor_job(
+                _remove_all, [os.path.join(self.directory, LOOKBACK_INDEX), *expired]
+            )
+        else:
+            self._hass.async_add_executor_job(shutil.rmtree, self.directory, True)
+
+    def cleanup(self):
+        """Handle cleanup."""
+        self.release()
+        super().cleanup()
+
+
+def _remove(path: str) -> None:
+    """Remove a file of a lookback buffer."""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _remove_all(paths: List[str]) -> None:
+    """Remove files of a lookback buffer."""
+    for path in paths:
+        _remove(path)
+
+
 @PROVIDERS.register("recorder")
 class RecorderOutput(StreamOutput):
     """Represents HLS Output formats."""
 
-    def __init__(self, hass: HomeAssistant, idle_timer: IdleTimer) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        idle_timer: IdleTimer,
+        stream_settings: StreamSettings,
+    ) -> None:
         """Initialize recorder output."""
-        super().__init__(hass, idle_timer)
+        super().__init__(hass, idle_timer, stream_settings)
         self.video_path = None
+        self._lookback: Optional[Tuple[LookbackOutput, List[LookbackSegment]]] = None
 
     @property
     def name(self) -> str:
@@ -114,13 +335,29 @@ class RecorderOutput(StreamOutput):
         """Prepend segments to existing list."""
         self._segments.extendleft(reversed(segments))
 
+    def prepend_lookback(self, lookback: LookbackOutput, duration: float) -> None:
+        """Prepend the latest segments of a lookback buffer when saving."""
+        self._lookback = (lookback, lookback.pin(duration))
+
+    def _save(self, segments: List[Segment]) -> None:
+        """Read back the lookback segments and save the recording."""
+        if self._lookback is not None:
+            lookback, entries = self._lookback
+            try:
+                segments = [lookback.load(entry) for entry in entries] + segments
+            except OSError as err:
+                _LOGGER.error("Unable to read lookback segments: %s", err)
+            finally:
+                lookback.unpin(entries)
+        recorder_save_worker(self.video_path, segments)
+
     def cleanup(self):
         """Write recording and clean up."""
         _LOGGER.debug("Starting recorder worker thread")
         thread = threading.Thread(
             name="recorder_save_worker",
-            target=recorder_save_worker,
-            args=(self.video_path, self._segments),
+            target=self._save,
+            args=(list(self._segments),),
         )
         thread.start()
 
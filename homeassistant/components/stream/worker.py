@@ -14,12 +14,13 @@ from .const import (
     SEGMENT_CONTAINER_FORMAT,
     STREAM_TIMEOUT,
 )
-from .core import Segment, StreamBuffer
+from .core import Part, Segment, StreamBuffer
+from .fmp4utils import find_box
 
 _LOGGER = logging.getLogger(__name__)
 
 
-def create_stream_buffer(video_stream, audio_stream, sequence):
+def create_stream_buffer(video_stream, audio_stream, sequence, part_duration=None):
     """Create a new StreamBuffer."""
 
     segment = io.BytesIO()
@@ -29,6 +30,13 @@ def create_stream_buffer(video_stream, audio_stream, sequence):
         "avoid_negative_ts": "disabled",
         "fragment_index": str(sequence),
     }
+    if part_duration is not None:
+        # Let the muxer write a fragment, which becomes a part, each time it
+        # holds enough media instead of only when it is closed. The muxer
+        # treats frag_duration as a minimum while the playlist advertises the
+        # part duration as a maximum, so aim a bit lower.
+        container_options["movflags"] = "empty_moov+default_base_moof+frag_discont"
+        container_options["frag_duration"] = str(int(part_duration * 0.85 * 1e6))
     output = av.open(
         segment,
         mode="w",
@@ -49,9 +57,15 @@ def create_stream_buffer(video_stream, audio_stream, sequence):
 class SegmentBuffer:
     """Buffer for writing a sequence of packets to the output as a segment."""
 
-    def __init__(self, outputs_callback) -> None:
+    def __init__(
+        self, outputs_callback, keyframe_converter=None, stream_settings=None
+    ) -> None:
         """Initialize SegmentBuffer."""
         self._stream_id = 0
+        self._keyframe_converter = keyframe_converter
+        self._part_duration = None
+        if stream_settings is not None and stream_settings.ll_hls:
+            self._part_duration = stream_settings.part_target_duration
         self._video_stream = None
         self._audio_stream = None
         self._outputs_callback = outputs_callback
@@ -60,6 +74,11 @@ class SegmentBuffer:
         self._sequence = 0
         self._segment_start_pts = None
         self._stream_buffer = None
+        # Low latency HLS state of the segment being muxed
+        self._segment = None
+        self._part_start_pts = None
+        self._part_has_keyframe = False
+        self._part_position = 0
 
     def set_streams(self, video_stream, audio_stream):
         """Initialize output buffer with streams from container."""
@@ -71,12 +90,16 @@ class SegmentBuffer:
         # Keep track of the number of segments we've processed
         self._sequence += 1
         self._segment_start_pts = video_pts
+        self._segment = None
+        self._part_start_pts = video_pts
+        self._part_has_keyframe = False
+        self._part_position = 0
 
         # Fetch the latest StreamOutputs, which may have changed since the
         # worker started.
         self._outputs = self._outputs_callback().values()
         self._stream_buffer = create_stream_buffer(
-            self._video_stream, self._audio_stream, self._sequence
+            self._video_stream, self._audio_stream, self._sequence, self._part_duration
         )
 
     def mux_packet(self, packet):
@@ -84,6 +107,9 @@ class SegmentBuffer:
 
         # Check for end of segment
         if packet.stream == self._video_stream and packet.is_keyframe:
+            if self._keyframe_converter is not None:
+                self._keyframe_converter.put(packet)
+
             duration = (packet.pts - self._segment_start_pts) * packet.time_base
             if duration >= MIN_SEGMENT_DURATION:
                 # Save segment to outputs
@@ -94,18 +120,78 @@ class SegmentBuffer:
 
         # Mux the packet
         if packet.stream == self._video_stream:
+            pts, time_base = packet.pts, packet.time_base
+            is_keyframe = packet.is_keyframe
             packet.stream = self._stream_buffer.vstream
             self._stream_buffer.output.mux(packet)
+            if self._part_duration is not None:
+                self._check_part(pts, time_base)
+                self._part_has_keyframe |= is_keyframe
         elif packet.stream == self._audio_stream:
             packet.stream = self._stream_buffer.astream
             self._stream_buffer.output.mux(packet)
 
+    def _check_part(self, pts, time_base):
+        """Publish the fragment the muxer wrote, if any, as a part.
+
+        The muxer writes the pending fragment before the packet that takes it
+        over the fragment duration, so that packet starts the next part.
+        """
+        memory_file = self._stream_buffer.segment
+        position = memory_file.tell()
+        if position == self._part_position:
+            return
+        if self._segment is None:
+            # The muxer writes the init section with the first packet
+            self._segment = Segment(
+                self._sequence,
+                memory_file,
+                0,
+                self._stream_id,
+                complete=False,
+                init=self._read(0, position),
+            )
+        else:
+            self._add_part(
+                (pts - self._part_start_pts) * time_base,
+                self._read(self._part_position, position),
+            )
+            self._part_start_pts = pts
+            self._part_has_keyframe = False
+        self._part_position = position
+
+    def _read(self, start, end):
+        """Read data written by the muxer, leaving the position at the end."""
+        memory_file = self._stream_buffer.segment
+        memory_file.seek(start)
+        data = memory_file.read(end - start)
+        memory_file.seek(end)
+        return data
+
+    def _add_part(self, duration, data):
+        """Add a part to the segment and tell the outputs about it."""
+        self._segment.parts.append(Part(float(duration), self._part_has_keyframe, data))
+        for stream_output in self._outputs:
+            stream_output.part_added(self._segment)
+
     def flush(self, duration):
         """Create a segment from the buffered packets and write to output."""
         self._stream_buffer.output.close()
-        segment = Segment(
-            self._sequence, self._stream_buffer.segment, duration, self._stream_id
-        )
+        segment = self._segment
+        if segment is None:
+            segment = Segment(
+                self._sequence, self._stream_buffer.segment, duration, self._stream_id
+            )
+        else:
+            # Closing the output wrote the last fragment before the trailer
+            end = next(find_box(segment.segment, b"mfra"))
+            if end > self._part_position:
+                self._add_part(
+                    duration - sum(part.duration for part in segment.parts),
+                    self._read(self._part_position, end),
+                )
+            segment.duration = duration
+            segment.complete = True
         for stream_output in self._outputs:
             stream_output.put(segment)
 
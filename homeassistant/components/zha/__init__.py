@@ -18,6 +18,7 @@ from .core.const import (
     BAUD_RATES,
     COMPONENTS,
     CONF_BAUDRATE,
+    CONF_CACHED_STARTUP,
     CONF_DATABASE,
     CONF_DEVICE_CONFIG,
     CONF_ENABLE_QUIRKS,
@@ -38,6 +39,7 @@ from .core.discovery import GROUP_PROBE
 DEVICE_CONFIG_SCHEMA_ENTRY = vol.Schema({vol.Optional(ha_const.CONF_TYPE): cv.string})
 ZHA_CONFIG_SCHEMA = {
     vol.Optional(CONF_BAUDRATE): cv.positive_int,
+    vol.Optional(CONF_CACHED_STARTUP, default=True): cv.boolean,
     vol.Optional(CONF_DATABASE): cv.string,
     vol.Optional(CONF_DEVICE_CONFIG, default={}): vol.Schema(
         {cv.string: DEVICE_CONFIG_SCHEMA_ENTRY}
@@ -153,6 +155,7 @@ async def async_load_entities(hass: HomeAssistantType) -> None:
         if isinstance(res, Exception):
             _LOGGER.warning("Couldn't setup zha platform: %s", res)
     async_dispatcher_send(hass, SIGNAL_ADD_ENTITIES)
+    hass.data[DATA_ZHA][DATA_ZHA_GATEWAY].async_refresh_devices()
 
 
 async def async_migrate_entry(
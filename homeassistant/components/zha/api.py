@@ -28,6 +28,7 @@ from .core.const import (
     ATTR_MANUFACTURER,
     ATTR_MEMBERS,
     ATTR_NAME,
+    ATTR_TYPE,
     ATTR_VALUE,
     ATTR_WARNING_DEVICE_DURATION,
     ATTR_WARNING_DEVICE_MODE,
@@ -53,6 +54,9 @@ from .core.const import (
     WARNING_DEVICE_SQUAWK_MODE_ARMED,
     WARNING_DEVICE_STROBE_HIGH,
     WARNING_DEVICE_STROBE_YES,
+    ZHA_GW_MSG,
+    ZHA_GW_MSG_REFRESH_PROGRESS,
+    ZHA_GW_MSG_REFRESH_STATUS,
 )
 from .core.group import GroupMember
 from .core.helpers import (
@@ -243,6 +247,28 @@ async def websocket_get_devices(hass, connection, msg):
     connection.send_result(msg[ID], devices)
 
 
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required(TYPE): "zha/devices/refresh"})
+@callback
+def websocket_subscribe_device_refresh(hass, connection, msg):
+    """Subscribe to the progress of the background refresh of ZHA devices."""
+    zha_gateway = hass.data[DATA_ZHA][DATA_ZHA_GATEWAY]
+
+    @callback
+    def forward_progress(data):
+        """Forward the refresh progress to websocket."""
+        if data[ATTR_TYPE] == ZHA_GW_MSG_REFRESH_PROGRESS:
+            connection.send_message(
+                websocket_api.event_message(msg[ID], data[ZHA_GW_MSG_REFRESH_STATUS])
+            )
+
+    connection.subscriptions[msg[ID]] = async_dispatcher_connect(
+        hass, ZHA_GW_MSG, forward_progress
+    )
+    refresh = zha_gateway.device_refresh
+    connection.send_result(msg[ID], refresh.status if refresh is not None else None)
+
+
 @websocket_api.require_admin
 @websocket_api.async_response
 @websocket_api.websocket_command({vol.Required(TYPE): "zha/devices/groupable"})
@@ -1138,6 +1164,7 @@ def async_load_api(hass):
 
     websocket_api.async_register_command(hass, websocket_permit_devices)
     websocket_api.async_register_command(hass, websocket_get_devices)
+    websocket_api.async_register_command(hass, websocket_subscribe_device_refresh)
     websocket_api.async_register_command(hass, websocket_get_groupable_devices)
     websocket_api.async_register_command(hass, websocket_get_groups)
     websocket_api.async_register_command(hass, websocket_get_device)
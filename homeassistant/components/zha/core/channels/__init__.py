@@ -8,7 +8,6 @@ import zigpy.zcl.clusters.closures
 
 from homeassistant.const import ATTR_DEVICE_ID
 from homeassistant.core import callback
-from homeassistant.helpers.dispatcher import async_dispatcher_send
 
 from . import (  # noqa: F401 # pylint: disable=unused-import
     base,
@@ -150,7 +149,10 @@ class Channels:
     @callback
     def async_send_signal(self, signal: str, *args: Any) -> None:
         """Send a signal through hass dispatcher."""
-        async_dispatcher_send(self.zha_device.hass, signal, *args)
+        # In order with the attribute updates of the channels
+        self.zha_device.gateway.async_send_channel_signal(
+            self.zha_device.ieee, signal, *args
+        )
 
     @callback
     def zha_send_event(self, event_data: Dict[str, Union[str, int]]) -> None:
@@ -352,6 +354,11 @@ class ChannelPool:
         """Send a signal through hass dispatcher."""
         self._channels.async_send_signal(signal, *args)
 
+    @callback
+    def async_send_attribute_updated(self, reports_key: Tuple, *args: Any) -> None:
+        """Send an attribute update to the entities listening to a channel."""
+        self._channels.zha_device.gateway.async_attribute_updated(reports_key, *args)
+
     @callback
     def claim_channels(self, channels: List[zha_typing.ChannelType]) -> None:
         """Claim a channel."""
@@ -4,9 +4,10 @@ import asyncio
 from enum import Enum
 from functools import wraps
 import logging
-from typing import Any, Union
+from typing import Any, Tuple, Union
 
 import zigpy.exceptions
+from zigpy.types.named import EUI64
 
 from homeassistant.core import callback
 
@@ -93,6 +94,11 @@ class ZigbeeChannel(LogMixin):
         self._id = f"{ch_pool.id}:0x{cluster.cluster_id:04x}"
         unique_id = ch_pool.unique_id.replace("-", ":")
         self._unique_id = f"{unique_id}:0x{cluster.cluster_id:04x}"
+        self._reports_key = (
+            cluster.endpoint.device.ieee,
+            cluster.endpoint.endpoint_id,
+            cluster.cluster_id,
+        )
         self._report_config = self.REPORT_CONFIG
         if not hasattr(self, "_value_attribute") and len(self._report_config) > 0:
             attr = self._report_config[0].get("attr")
@@ -118,6 +124,11 @@ class ZigbeeChannel(LogMixin):
         """Return the unique id for this channel."""
         return self._unique_id
 
+    @property
+    def reports_key(self) -> Tuple[EUI64, int, int]:
+        """Return the key of the attribute reports of this channel."""
+        return self._reports_key
+
     @property
     def cluster(self):
         """Return the zigpy cluster for this channel."""
@@ -138,6 +149,11 @@ class ZigbeeChannel(LogMixin):
         """Send a signal through hass dispatcher."""
         self._ch_pool.async_send_signal(signal, *args)
 
+    @callback
+    def async_send_attribute_updated(self, *args: Any) -> None:
+        """Send an attribute update to the entities of this channel."""
+        self._ch_pool.async_send_attribute_updated(self._reports_key, *args)
+
     async def bind(self):
         """Bind a zigbee cluster.
 
@@ -226,8 +242,7 @@ class ZigbeeChannel(LogMixin):
     @callback
     def attribute_updated(self, attrid, value):
         """Handle attribute updates on this cluster."""
-        self.async_send_signal(
-            f"{self.unique_id}_{SIGNAL_ATTR_UPDATED}",
+        self.async_send_attribute_updated(
             attrid,
             self.cluster.attributes.get(attrid, [attrid])[0],
             value,
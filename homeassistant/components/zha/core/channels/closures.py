@@ -4,7 +4,7 @@ import zigpy.zcl.clusters.closures as closures
 from homeassistant.core import callback
 
 from .. import registries
-from ..const import REPORT_CONFIG_IMMEDIATE, SIGNAL_ATTR_UPDATED
+from ..const import REPORT_CONFIG_IMMEDIATE
 from .base import ClientChannel, ZigbeeChannel
 
 
@@ -19,9 +19,7 @@ class DoorLockChannel(ZigbeeChannel):
         """Retrieve latest state."""
         result = await self.get_attribute_value("lock_state", from_cache=True)
         if result is not None:
-            self.async_send_signal(
-                f"{self.unique_id}_{SIGNAL_ATTR_UPDATED}", 0, "lock_state", result
-            )
+            self.async_send_attribute_updated(0, "lock_state", result)
 
     @callback
     def attribute_updated(self, attrid, value):
@@ -31,9 +29,7 @@ class DoorLockChannel(ZigbeeChannel):
             "Attribute report '%s'[%s] = %s", self.cluster.name, attr_name, value
         )
         if attrid == self._value_attribute:
-            self.async_send_signal(
-                f"{self.unique_id}_{SIGNAL_ATTR_UPDATED}", attrid, attr_name, value
-            )
+            self.async_send_attribute_updated(attrid, attr_name, value)
 
 
 @registries.ZIGBEE_CHANNEL_REGISTRY.register(closures.Shade.cluster_id)
@@ -62,8 +58,7 @@ class WindowCovering(ZigbeeChannel):
         )
         self.debug("read current position: %s", result)
         if result is not None:
-            self.async_send_signal(
-                f"{self.unique_id}_{SIGNAL_ATTR_UPDATED}",
+            self.async_send_attribute_updated(
                 8,
                 "current_position_lift_percentage",
                 result,
@@ -77,6 +72,4 @@ class WindowCovering(ZigbeeChannel):
             "Attribute report '%s'[%s] = %s", self.cluster.name, attr_name, value
         )
         if attrid == self._value_attribute:
-            self.async_send_signal(
-                f"{self.unique_id}_{SIGNAL_ATTR_UPDATED}", attrid, attr_name, value
-            )
+            self.async_send_attribute_updated(attrid, attr_name, value)
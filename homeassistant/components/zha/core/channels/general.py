@@ -15,7 +15,6 @@ from ..const import (
     REPORT_CONFIG_BATTERY_SAVE,
     REPORT_CONFIG_DEFAULT,
     REPORT_CONFIG_IMMEDIATE,
-    SIGNAL_ATTR_UPDATED,
     SIGNAL_MOVE_LEVEL,
     SIGNAL_SET_LEVEL,
     SIGNAL_UPDATE_DEVICE,
@@ -334,9 +333,7 @@ class OnOffChannel(ZigbeeChannel):
     def attribute_updated(self, attrid, value):
         """Handle attribute updates on this cluster."""
         if attrid == self.ON_OFF:
-            self.async_send_signal(
-                f"{self.unique_id}_{SIGNAL_ATTR_UPDATED}", attrid, "on_off", value
-            )
+            self.async_send_attribute_updated(attrid, "on_off", value)
             self._state = bool(value)
 
     async def async_initialize_channel_specific(self, from_cache: bool) -> None:
@@ -4,11 +4,7 @@ from typing import Coroutine, Optional
 import zigpy.zcl.clusters.homeautomation as homeautomation
 
 from .. import registries
-from ..const import (
-    CHANNEL_ELECTRICAL_MEASUREMENT,
-    REPORT_CONFIG_DEFAULT,
-    SIGNAL_ATTR_UPDATED,
-)
+from ..const import CHANNEL_ELECTRICAL_MEASUREMENT, REPORT_CONFIG_DEFAULT
 from .base import ZigbeeChannel
 
 
@@ -55,8 +51,7 @@ class ElectricalMeasurementChannel(ZigbeeChannel):
         # This is a polling channel. Don't allow cache.
         result = await self.get_attribute_value("active_power", from_cache=False)
         if result is not None:
-            self.async_send_signal(
-                f"{self.unique_id}_{SIGNAL_ATTR_UPDATED}",
+            self.async_send_attribute_updated(
                 0x050B,
                 "active_power",
                 result,
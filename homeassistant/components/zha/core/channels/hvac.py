@@ -15,12 +15,7 @@ from zigpy.zcl.foundation import Status
 from homeassistant.core import callback
 
 from .. import registries, typing as zha_typing
-from ..const import (
-    REPORT_CONFIG_MAX_INT,
-    REPORT_CONFIG_MIN_INT,
-    REPORT_CONFIG_OP,
-    SIGNAL_ATTR_UPDATED,
-)
+from ..const import REPORT_CONFIG_MAX_INT, REPORT_CONFIG_MIN_INT, REPORT_CONFIG_OP
 from ..helpers import retryable_req
 from .base import ZigbeeChannel
 
@@ -69,9 +64,7 @@ class FanChannel(ZigbeeChannel):
             "Attribute report '%s'[%s] = %s", self.cluster.name, attr_name, value
         )
         if attr_name == "fan_mode":
-            self.async_send_signal(
-                f"{self.unique_id}_{SIGNAL_ATTR_UPDATED}", attrid, attr_name, value
-            )
+            self.async_send_attribute_updated(attrid, attr_name, value)
 
 
 @registries.ZIGBEE_CHANNEL_REGISTRY.register(hvac.Pump.cluster_id)
@@ -260,8 +253,7 @@ class ThermostatChannel(ZigbeeChannel):
             "Attribute report '%s'[%s] = %s", self.cluster.name, attr_name, value
         )
         setattr(self, f"_{attr_name}", value)
-        self.async_send_signal(
-            f"{self.unique_id}_{SIGNAL_ATTR_UPDATED}",
+        self.async_send_attribute_updated(
             AttributeUpdateRecord(attrid, attr_name, value),
         )
 
@@ -276,8 +268,7 @@ class ThermostatChannel(ZigbeeChannel):
                     continue
                 if isinstance(attr, str):
                     setattr(self, f"_{attr}", res[attr])
-                self.async_send_signal(
-                    f"{self.unique_id}_{SIGNAL_ATTR_UPDATED}",
+                self.async_send_attribute_updated(
                     AttributeUpdateRecord(None, attr, res[attr]),
                 )
 
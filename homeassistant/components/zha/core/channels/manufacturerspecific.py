@@ -68,8 +68,7 @@ class SmartThingsAcceleration(ZigbeeChannel):
     def attribute_updated(self, attrid, value):
         """Handle attribute updates on this cluster."""
         if attrid == self.value_attribute:
-            self.async_send_signal(
-                f"{self.unique_id}_{SIGNAL_ATTR_UPDATED}",
+            self.async_send_attribute_updated(
                 attrid,
                 self._cluster.attributes.get(attrid, [UNKNOWN])[0],
                 value,
@@ -14,7 +14,6 @@ from homeassistant.core import callback
 
 from .. import registries
 from ..const import (
-    SIGNAL_ATTR_UPDATED,
     WARNING_DEVICE_MODE_EMERGENCY,
     WARNING_DEVICE_SOUND_HIGH,
     WARNING_DEVICE_SQUAWK_MODE_ARMED,
@@ -119,9 +118,7 @@ class IASZoneChannel(ZigbeeChannel):
         """Handle commands received to this cluster."""
         if command_id == 0:
             state = args[0] & 3
-            self.async_send_signal(
-                f"{self.unique_id}_{SIGNAL_ATTR_UPDATED}", 2, "zone_status", state
-            )
+            self.async_send_attribute_updated(2, "zone_status", state)
             self.debug("Updated alarm state: %s", state)
         elif command_id == 1:
             self.debug("Enroll requested")
@@ -167,8 +164,7 @@ class IASZoneChannel(ZigbeeChannel):
         """Handle attribute updates on this cluster."""
         if attrid == 2:
             value = value & 3
-            self.async_send_signal(
-                f"{self.unique_id}_{SIGNAL_ATTR_UPDATED}",
+            self.async_send_attribute_updated(
                 attrid,
                 self.cluster.attributes.get(attrid, [attrid])[0],
                 value,
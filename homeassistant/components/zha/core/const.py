@@ -118,6 +118,7 @@ COMPONENTS = (
 )
 
 CONF_BAUDRATE = "baudrate"
+CONF_CACHED_STARTUP = "cached_startup"
 CONF_DATABASE = "database_path"
 CONF_DEVICE_CONFIG = "device_config"
 CONF_ENABLE_QUIRKS = "enable_quirks"
@@ -332,6 +333,15 @@ ZHA_GW_MSG_GROUP_REMOVED = "group_removed"
 ZHA_GW_MSG_LOG_ENTRY = "log_entry"
 ZHA_GW_MSG_LOG_OUTPUT = "log_output"
 ZHA_GW_MSG_RAW_INIT = "raw_device_initialized"
+ZHA_GW_MSG_REFRESH_PROGRESS = "device_refresh_progress"
+ZHA_GW_MSG_REFRESH_STATUS = "refresh_status"
+
+REFRESH_CONCURRENCY_INITIAL = 2
+REFRESH_CONCURRENCY_MAX = 8
+REFRESH_CONCURRENCY_MIN = 1
+# Response times this many times slower than the fastest seen mean the radio
+# is queueing requests
+REFRESH_SLOWDOWN = 2
 
 EFFECT_BLINK = 0x00
 EFFECT_BREATHE = 0x01
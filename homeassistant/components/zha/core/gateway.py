@@ -4,25 +4,25 @@ import asyncio
 import collections
 from datetime import timedelta
 from enum import Enum
-import itertools
 import logging
 import os
 import time
 import traceback
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from serial import SerialException
 from zigpy.config import CONF_DEVICE
 import zigpy.device as zigpy_dev
+from zigpy.types.named import EUI64
 
 from homeassistant.components.system_log import LogEntry, _figure_out_source
-from homeassistant.core import callback
+from homeassistant.core import CALLBACK_TYPE, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.device_registry import (
     CONNECTION_ZIGBEE,
     async_get_registry as get_dev_reg,
 )
-from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.dispatcher import DATA_DISPATCHER, async_dispatcher_send
 from homeassistant.helpers.entity_registry import (
     async_entries_for_device,
     async_get_registry as get_ent_reg,
@@ -37,6 +37,7 @@ from .const import (
     ATTR_NWK,
     ATTR_SIGNATURE,
     ATTR_TYPE,
+    CONF_CACHED_STARTUP,
     CONF_DATABASE,
     CONF_RADIO_TYPE,
     CONF_ZIGPY,
@@ -75,6 +76,8 @@ from .const import (
     ZHA_GW_MSG_LOG_ENTRY,
     ZHA_GW_MSG_LOG_OUTPUT,
     ZHA_GW_MSG_RAW_INIT,
+    ZHA_GW_MSG_REFRESH_PROGRESS,
+    ZHA_GW_MSG_REFRESH_STATUS,
     RadioType,
 )
 from .device import (
@@ -84,6 +87,7 @@ from .device import (
     ZHADevice,
 )
 from .group import GroupMember, ZHAGroup
+from .refresh import DeviceRefresh
 from .registries import GROUP_ENTITY_DOMAINS
 from .store import async_get_registry
 from .typing import ZhaGroupType, ZigpyEndpointType, ZigpyGroupType
@@ -116,6 +120,14 @@ class ZHAGateway:
         self._groups = {}
         self.coordinator_zha_device = None
         self._device_registry = collections.defaultdict(list)
+        self._entity_references: Dict[str, EntityReference] = {}
+        # (ieee, endpoint id, cluster id) -> entities and their handlers
+        self._attribute_listeners: Dict[
+            Tuple, List[Tuple[Any, Callable]]
+        ] = collections.defaultdict(list)
+        # Device ieee -> queued attribute updates of the device, and the
+        # channel signals it sent after them, which have None as key
+        self._attribute_updates: Dict[EUI64, List[Tuple[Optional[Tuple], Tuple]]] = {}
         self.zha_storage = None
         self.ha_device_registry = None
         self.ha_entity_registry = None
@@ -129,6 +141,8 @@ class ZHAGateway:
         self._log_relay_handler = LogRelayHandler(hass, self)
         self._config_entry = config_entry
         self._unsubs = []
+        self.device_refresh: Optional[DeviceRefresh] = None
+        self._refresh_task: Optional[asyncio.Task] = None
 
     async def async_initialize(self):
         """Initialize controller and connect radio."""
@@ -216,6 +230,16 @@ class ZHAGateway:
 
     async def async_initialize_devices_and_entities(self) -> None:
         """Initialize devices and load entities."""
+        if self._config.get(CONF_CACHED_STARTUP, True):
+            _LOGGER.debug("Loading devices from cache")
+            await asyncio.gather(
+                *[
+                    dev.async_initialize(from_cache=True)
+                    for dev in self.devices.values()
+                ]
+            )
+            return
+
         semaphore = asyncio.Semaphore(2)
 
         async def _throttle(zha_device: zha_typing.ZhaDeviceType, cached: bool):
@@ -240,6 +264,41 @@ class ZHAGateway:
             ]
         )
 
+    @callback
+    def async_refresh_devices(self) -> None:
+        """Refresh mains powered devices from the network in the background.
+
+        Only needed when the devices were brought up from cache.
+        """
+        if not self._config.get(CONF_CACHED_STARTUP, True):
+            return
+        self.device_refresh = DeviceRefresh(
+            self._hass,
+            [dev for dev in self.devices.values() if dev.is_mains_powered],
+            self._async_device_entity_ids,
+            self._async_send_refresh_progress,
+        )
+        self._refresh_task = self._hass.async_create_task(
+            self.device_refresh.async_run()
+        )
+
+    @callback
+    def _async_device_entity_ids(self, zha_device: zha_typing.ZhaDeviceType):
+        """Return the entity ids of a device."""
+        return [
+            entity_ref.reference_id
+            for entity_ref in self.device_registry.get(zha_device.ieee, [])
+        ]
+
+    @callback
+    def _async_send_refresh_progress(self, status) -> None:
+        """Send the progress of the device refresh."""
+        async_dispatcher_send(
+            self._hass,
+            ZHA_GW_MSG,
+            {ATTR_TYPE: ZHA_GW_MSG_REFRESH_PROGRESS, ZHA_GW_MSG_REFRESH_STATUS: status},
+        )
+
     def device_joined(self, device):
         """Handle device joined.
 
@@ -356,6 +415,8 @@ class ZHAGateway:
         """Handle device being removed from the network."""
         zha_device = self._devices.pop(device.ieee, None)
         entity_refs = self._device_registry.pop(device.ieee, None)
+        for entity_ref in entity_refs or ():
+            self._entity_references.pop(entity_ref.reference_id, None)
         if zha_device is not None:
             device_info = zha_device.zha_device_info
             zha_device.async_cleanup_handles()
@@ -391,14 +452,11 @@ class ZHAGateway:
 
     def get_entity_reference(self, entity_id):
         """Return entity reference for given entity_id if found."""
-        for entity_reference in itertools.chain.from_iterable(
-            self.device_registry.values()
-        ):
-            if entity_id == entity_reference.reference_id:
-                return entity_reference
+        return self._entity_references.get(entity_id)
 
     def remove_entity_reference(self, entity):
         """Remove entity reference for given entity_id if found."""
+        self._entity_references.pop(entity.entity_id, None)
         if entity.zha_device.ieee in self.device_registry:
             entity_refs = self.device_registry.get(entity.zha_device.ieee)
             self.device_registry[entity.zha_device.ieee] = [
@@ -461,15 +519,91 @@ class ZHAGateway:
         remove_future,
     ):
         """Record the creation of a hass entity associated with ieee."""
-        self._device_registry[ieee].append(
-            EntityReference(
-                reference_id=reference_id,
-                zha_device=zha_device,
-                cluster_channels=cluster_channels,
-                device_info=device_info,
-                remove_future=remove_future,
-            )
+        entity_reference = EntityReference(
+            reference_id=reference_id,
+            zha_device=zha_device,
+            cluster_channels=cluster_channels,
+            device_info=device_info,
+            remove_future=remove_future,
         )
+        self._device_registry[ieee].append(entity_reference)
+        self._entity_references[reference_id] = entity_reference
+
+    @callback
+    def async_add_attribute_listener(
+        self, reports_key: Tuple, entity, handler: Callable
+    ) -> CALLBACK_TYPE:
+        """Listen to the attribute updates of a channel."""
+        listener = (entity, handler)
+        self._attribute_listeners[reports_key].append(listener)
+
+        @callback
+        def async_remove_listener() -> None:
+            """Remove the attribute listener."""
+            listeners = self._attribute_listeners[reports_key]
+            listeners.remove(listener)
+            if not listeners:
+                del self._attribute_listeners[reports_key]
+
+        return async_remove_listener
+
+    @callback
+    def async_attribute_updated(self, reports_key: Tuple, *args: Any) -> None:
+        """Queue an attribute update for the entities listening to a channel.
+
+        The updates of a device are handed to the entities on the next
+        iteration of the event loop, so all attributes of a report are applied
+        before the entities write their state once. Signals the channels of the
+        device send in between are sent in order with the updates.
+        """
+        if reports_key not in self._attribute_listeners:
+            return
+        ieee = reports_key[0]
+        updates = self._attribute_updates.get(ieee)
+        if updates is None:
+            updates = self._attribute_updates[ieee] = []
+            self._hass.loop.call_soon(self._async_dispatch_attribute_updates, ieee)
+        updates.append((reports_key, args))
+
+    @callback
+    def async_send_channel_signal(self, ieee: EUI64, signal: str, *args: Any) -> None:
+        """Send a signal of a channel after the queued updates of its device."""
+        updates = self._attribute_updates.get(ieee)
+        if updates is None:
+            async_dispatcher_send(self._hass, signal, *args)
+            return
+        updates.append((None, (signal, *args)))
+
+    @callback
+    def _async_dispatch_attribute_updates(self, ieee: EUI64) -> None:
+        """Hand the queued attribute updates of a device to the entities."""
+        updates = self._attribute_updates.pop(ieee)
+        held = {}
+        try:
+            for reports_key, args in updates:
+                if reports_key is None:
+                    # Callback receivers run before the updates after it
+                    self._async_run_signal_receivers(*args)
+                    continue
+                for entity, handler in self._attribute_listeners.get(reports_key, ()):
+                    if entity not in held:
+                        held[entity] = None
+                        entity.async_hold_state_writes()
+                    try:
+                        handler(*args)
+                    except Exception:  # pylint: disable=broad-except
+                        _LOGGER.exception(
+                            "Error handling attribute update for %s", entity.entity_id
+                        )
+        finally:
+            for entity in held:
+                entity.async_release_state_writes()
+
+    @callback
+    def _async_run_signal_receivers(self, signal: str, *args: Any) -> None:
+        """Send a signal, running its callback receivers right away."""
+        for job in list(self._hass.data.get(DATA_DISPATCHER, {}).get(signal, ())):
+            self._hass.async_run_hass_job(job, *args)
 
     @callback
     def async_enable_debug_mode(self):
@@ -667,6 +801,8 @@ class ZHAGateway:
         _LOGGER.debug("Shutting down ZHA ControllerApplication")
         for unsubscribe in self._unsubs:
             unsubscribe()
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
         await self.application_controller.pre_shutdown()
 
     def handle_message(
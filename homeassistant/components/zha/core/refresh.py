@@ -0,0 +1,166 @@
+"""Refresh ZHA devices from the network in the background."""
+import asyncio
+from collections import deque
+import logging
+from typing import Callable, Deque, Dict, List, Optional, Set
+
+from homeassistant.components.automation import (
+    automations_with_device,
+    automations_with_entity,
+)
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    REFRESH_CONCURRENCY_INITIAL,
+    REFRESH_CONCURRENCY_MAX,
+    REFRESH_CONCURRENCY_MIN,
+    REFRESH_SLOWDOWN,
+)
+from .typing import ZhaDeviceType
+
+_LOGGER = logging.getLogger(__name__)
+
+# Smoothing factor of the moving average of the response times
+SMOOTHING = 0.2
+
+
+class AdaptiveConcurrency:
+    """Concurrency limit that adapts to the response times of the radio.
+
+    The limit grows by one while the response times stay close to the fastest
+    seen and shrinks by one when they slow down, which means the radio or the
+    mesh queues the requests. A failed request halves the limit.
+    """
+
+    def __init__(
+        self,
+        initial: int = REFRESH_CONCURRENCY_INITIAL,
+        minimum: int = REFRESH_CONCURRENCY_MIN,
+        maximum: int = REFRESH_CONCURRENCY_MAX,
+    ) -> None:
+        """Initialize the limit."""
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.average: Optional[float] = None
+        self.fastest: Optional[float] = None
+
+    @callback
+    def async_record(self, elapsed: float) -> None:
+        """Adapt the limit to the response time of a request."""
+        if self.average is None:
+            self.average = elapsed
+        else:
+            self.average += SMOOTHING * (elapsed - self.average)
+        if self.fastest is None or self.average < self.fastest:
+            self.fastest = self.average
+
+        if self.average > self.fastest * REFRESH_SLOWDOWN:
+            self.limit = max(self.limit - 1, self.minimum)
+        elif self.average < self.fastest * (1 + REFRESH_SLOWDOWN) / 2:
+            self.limit = min(self.limit + 1, self.maximum)
+
+    @callback
+    def async_record_failure(self) -> None:
+        """Back off after a failed request."""
+        self.limit = max(self.limit // 2, self.minimum)
+
+
+class DeviceRefresh:
+    """Initialize devices from the network after they came up from cache.
+
+    Devices referenced by automations, directly or by one of their entities,
+    are refreshed first. The references are checked once, when the refresh is
+    created.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        devices: List[ZhaDeviceType],
+        entity_ids: Callable[[ZhaDeviceType], List[str]],
+        progress_callback: Callable[[Dict], None],
+    ) -> None:
+        """Initialize the refresh."""
+        self.hass = hass
+        self.concurrency = AdaptiveConcurrency()
+        self.total = len(devices)
+        self.refreshed = 0
+        self.failed = 0
+        self.skipped = 0
+        self._entity_ids = entity_ids
+        self._progress_callback = progress_callback
+        self._referenced: Deque[ZhaDeviceType] = deque()
+        self._unreferenced: Deque[ZhaDeviceType] = deque()
+        for device in devices:
+            if self._is_referenced(device):
+                self._referenced.append(device)
+            else:
+                self._unreferenced.append(device)
+        self._running: Set[asyncio.Task] = set()
+
+    @property
+    def status(self) -> Dict:
+        """Return the progress of the refresh."""
+        return {
+            "total": self.total,
+            "refreshed": self.refreshed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "pending": self.pending,
+            "in_progress": len(self._running),
+            "concurrency": self.concurrency.limit,
+        }
+
+    @property
+    def pending(self) -> int:
+        """Return the number of devices left to refresh."""
+        return len(self._referenced) + len(self._unreferenced)
+
+    def _is_referenced(self, device: ZhaDeviceType) -> bool:
+        """Return if automations reference the device or its entities."""
+        return bool(automations_with_device(self.hass, device.device_id)) or any(
+            automations_with_entity(self.hass, entity_id)
+            for entity_id in self._entity_ids(device)
+        )
+
+    def _next_device(self) -> ZhaDeviceType:
+        """Take the next device to refresh from the pending devices."""
+        if self._referenced:
+            return self._referenced.popleft()
+        return self._unreferenced.popleft()
+
+    async def async_run(self) -> None:
+        """Refresh the devices."""
+        try:
+            while self.pending or self._running:
+                while self.pending and len(self._running) < self.concurrency.limit:
+                    device = self._next_device()
+                    if not device.available:
+                        # Initialized from the network when it becomes available
+                        self.skipped += 1
+                        continue
+                    self._running.add(
+                        self.hass.async_create_task(self._async_refresh(device))
+                    )
+                if self._running:
+                    _, self._running = await asyncio.wait(
+                        self._running, return_when=asyncio.FIRST_COMPLETED
+                    )
+                self._progress_callback(self.status)
+        finally:
+            for task in self._running:
+                task.cancel()
+
+    async def _async_refresh(self, device: ZhaDeviceType) -> None:
+        """Initialize a device from the network."""
+        start = self.hass.loop.time()
+        try:
+            await device.async_initialize(from_cache=False)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Failed to refresh %s", device.name)
+            self.failed += 1
+            self.concurrency.async_record_failure()
+            return
+        self.refreshed += 1
+        self.concurrency.async_record(self.hass.loop.time() - start)
@@ -22,6 +22,7 @@ from .core.const import (
     DATA_ZHA,
     DATA_ZHA_BRIDGE_ID,
     DOMAIN,
+    SIGNAL_ATTR_UPDATED,
     SIGNAL_GROUP_ENTITY_REMOVED,
     SIGNAL_GROUP_MEMBERSHIP_CHANGE,
     SIGNAL_REMOVE,
@@ -48,6 +49,8 @@ class BaseZhaEntity(LogMixin, entity.Entity):
         self._zha_device: ZhaDeviceType = zha_device
         self._unsubs: List[CALLABLE_T] = []
         self.remove_future: Awaitable[None] = None
+        self._hold_state_writes: bool = False
+        self._state_write_pending: bool = False
 
     @property
     def name(self) -> str:
@@ -108,6 +111,27 @@ class BaseZhaEntity(LogMixin, entity.Entity):
     def async_set_state(self, attr_id: int, attr_name: str, value: Any) -> None:
         """Set the entity state."""
 
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, unless state writes are held."""
+        if self._hold_state_writes:
+            self._state_write_pending = True
+            return
+        super().async_write_ha_state()
+
+    @callback
+    def async_hold_state_writes(self) -> None:
+        """Hold the state writes while a batch of attribute updates is applied."""
+        self._hold_state_writes = True
+
+    @callback
+    def async_release_state_writes(self) -> None:
+        """Write the state once if it changed while state writes were held."""
+        self._hold_state_writes = False
+        if self._state_write_pending:
+            self._state_write_pending = False
+            super().async_write_ha_state()
+
     async def async_will_remove_from_hass(self) -> None:
         """Disconnect entity object when removed."""
         for unsub in self._unsubs[:]:
@@ -122,6 +146,10 @@ class BaseZhaEntity(LogMixin, entity.Entity):
         unsub = None
         if signal_override:
             unsub = async_dispatcher_connect(self.hass, signal, func)
+        elif signal == SIGNAL_ATTR_UPDATED:
+            unsub = self._zha_device.gateway.async_add_attribute_listener(
+                channel.reports_key, self, func
+            )
         else:
             unsub = async_dispatcher_connect(
                 self.hass, f"{channel.unique_id}_{signal}", func
@@ -28,6 +28,7 @@ from homeassistant.const import (
     CONF_CUSTOMIZE_DOMAIN,
     CONF_CUSTOMIZE_GLOB,
     CONF_ELEVATION,
+    CONF_EXECUTOR_POOLS,
     CONF_EXTERNAL_URL,
     CONF_ID,
     CONF_INTERNAL_URL,
@@ -46,7 +47,13 @@ from homeassistant.const import (
     TEMP_CELSIUS,
     __version__,
 )
-from homeassistant.core import DOMAIN as CONF_CORE, SOURCE_YAML, HomeAssistant, callback
+from homeassistant.core import (
+    DOMAIN as CONF_CORE,
+    EXECUTOR_POOL_MAX_WORKERS,
+    SOURCE_YAML,
+    HomeAssistant,
+    callback,
+)
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_per_platform, extract_domain_configs
 import homeassistant.helpers.config_validation as cv
@@ -234,6 +241,11 @@ CORE_CONFIG_SCHEMA = CUSTOMIZE_CONFIG_SCHEMA.extend(
         # pylint: disable=no-value-for-parameter
         vol.Optional(CONF_MEDIA_DIRS): cv.schema_with_slug_keys(vol.IsDir()),
         vol.Optional(CONF_LEGACY_TEMPLATES): cv.boolean,
+        vol.Optional(CONF_EXECUTOR_POOLS): {
+            vol.In(EXECUTOR_POOL_MAX_WORKERS): vol.All(
+                vol.Coerce(int), vol.Range(min=1)
+            )
+        },
     }
 )
 
@@ -514,6 +526,7 @@ async def async_process_ha_core_config(hass: HomeAssistant, config: Dict) -> Non
         (CONF_EXTERNAL_URL, "external_url"),
         (CONF_MEDIA_DIRS, "media_dirs"),
         (CONF_LEGACY_TEMPLATES, "legacy_templates"),
+        (CONF_EXECUTOR_POOLS, "executor_pools"),
     ):
         if key in config:
             setattr(hac, attr, config[key])
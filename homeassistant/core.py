@@ -13,7 +13,7 @@ import os
 import pathlib
 import re
 import threading
-from time import monotonic
+from time import monotonic, thread_time
 from types import MappingProxyType
 from typing import (
     TYPE_CHECKING,
@@ -77,6 +77,7 @@ from homeassistant.util.async_ import (
     shutdown_run_callback_threadsafe,
 )
 import homeassistant.util.dt as dt_util
+from homeassistant.util.executor import ExecutorStats, InstrumentedThreadPoolExecutor
 from homeassistant.util.timeout import TimeoutManager
 from homeassistant.util.unit_system import IMPERIAL_SYSTEM, METRIC_SYSTEM, UnitSystem
 import homeassistant.util.uuid as uuid_util
@@ -116,6 +117,21 @@ SOURCE_YAML = "yaml"
 # How long to wait until things that run on startup have to finish.
 TIMEOUT_EVENT_START = 15
 
+# Named executor pools for async_add_pool_executor_job
+EXECUTOR_POOL_IO = "io"
+EXECUTOR_POOL_DB_READ = "db_read"
+EXECUTOR_POOL_POLLING = "polling"
+EXECUTOR_POOL_CPU = "cpu"
+
+# Default maximum number of workers of each named executor pool, configurable
+# with executor_pools in the core config
+EXECUTOR_POOL_MAX_WORKERS = {
+    EXECUTOR_POOL_IO: 8,
+    EXECUTOR_POOL_DB_READ: 4,
+    EXECUTOR_POOL_POLLING: 32,
+    EXECUTOR_POOL_CPU: min(4, os.cpu_count() or 1),
+}
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -183,6 +199,92 @@ class HassJob:
         return f"<Job {self.job_type} {self.target}>"
 
 
+class JobAccounting:
+    """Account events and event loop time to integrations.
+
+    Optional instrumentation, active while attached to
+    HomeAssistant.job_accounting.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the accounting."""
+        self.started = monotonic()
+        self.event_counts: Dict[str, int] = {}
+        self.state_writes: Dict[str, int] = {}
+        self.job_counts: Dict[str, int] = {}
+        self.callback_time: Dict[str, float] = {}
+        self._module_integrations: Dict[str, str] = {}
+
+    def integration(self, target: Callable) -> str:
+        """Return the integration a job target belongs to."""
+        while isinstance(target, functools.partial):
+            target = target.func
+        module = getattr(target, "__module__", None) or "unknown"
+        integration = self._module_integrations.get(module)
+        if integration is None:
+            parts = module.split(".")
+            if parts[:2] == ["homeassistant", "components"] and len(parts) > 2:
+                integration = parts[2]
+            elif parts[0] == "custom_components" and len(parts) > 1:
+                integration = parts[1]
+            elif parts[0] == "homeassistant":
+                integration = DOMAIN
+            else:
+                integration = module
+            self._module_integrations[module] = integration
+        return integration
+
+    @callback
+    def async_event_fired(
+        self, event_type: str, event_data: Optional[Dict[str, Any]]
+    ) -> None:
+        """Count a fired event."""
+        self.event_counts[event_type] = self.event_counts.get(event_type, 0) + 1
+        if event_type == EVENT_STATE_CHANGED and event_data:
+            entity_id = event_data["entity_id"]
+            self.state_writes[entity_id] = self.state_writes.get(entity_id, 0) + 1
+
+    @callback
+    def async_job_added(self, hassjob: HassJob) -> str:
+        """Count a scheduled job and return its integration."""
+        integration = self.integration(hassjob.target)
+        self.job_counts[integration] = self.job_counts.get(integration, 0) + 1
+        return integration
+
+    def run_callback(self, integration: str, target: Callable, *args: Any) -> None:
+        """Run a callback and account the CPU time it used."""
+        start = thread_time()
+        try:
+            target(*args)
+        finally:
+            self.callback_time[integration] = (
+                self.callback_time.get(integration, 0.0) + thread_time() - start
+            )
+
+    def as_dict(self, limit: int = 20) -> Dict[str, Any]:
+        """Return the top entries of the accounting."""
+        minutes = max((monotonic() - self.started) / 60, 1 / 60)
+
+        def _top(counts: Mapping[str, Union[int, float]]) -> List[Tuple[str, Any]]:
+            return sorted(counts.items(), key=lambda item: item[1], reverse=True)[
+                :limit
+            ]
+
+        return {
+            "duration": round(minutes * 60, 1),
+            "events": dict(_top(self.event_counts)),
+            "state_writes_per_minute": {
+                entity_id: round(count / minutes, 2)
+                for entity_id, count in _top(self.state_writes)
+            },
+            "jobs": dict(_top(self.job_counts)),
+            "callback_time": {
+                integration: round(seconds, 4)
+                for integration, seconds in _top(self.callback_time)
+            },
+        }
+
+
 def _get_callable_job_type(target: Callable) -> HassJobType:
     """Determine the job type from the callable."""
     # Check for partials to properly determine if coroutine function
@@ -238,6 +340,11 @@ class HomeAssistant:
         self._stopped: Optional[asyncio.Event] = None
         # Timeout handler for Core/Helper namespace
         self.timeout: TimeoutManager = TimeoutManager()
+        # Named executor pools, created on first use
+        self._executor_pools: Dict[str, InstrumentedThreadPoolExecutor] = {}
+        self._executor_pools_shutdown = False
+        # Optional accounting of events and jobs per integration
+        self.job_accounting: Optional[JobAccounting] = None
 
     @property
     def is_running(self) -> bool:
@@ -366,6 +473,15 @@ class HomeAssistant:
         hassjob: HassJob to call.
         args: parameters for method to call.
         """
+        accounting = self.job_accounting
+        if accounting is not None:
+            integration = accounting.async_job_added(hassjob)
+            if hassjob.job_type == HassJobType.Callback:
+                self.loop.call_soon(
+                    accounting.run_callback, integration, hassjob.target, *args
+                )
+                return None
+
         if hassjob.job_type == HassJobType.Coroutinefunction:
             task = self.loop.create_task(hassjob.target(*args))
         elif hassjob.job_type == HassJobType.Callback:
@@ -410,6 +526,41 @@ class HomeAssistant:
 
         return task
 
+    @callback
+    def async_add_pool_executor_job(
+        self, pool: str, target: Callable[..., T], *args: Any
+    ) -> Awaitable[T]:
+        """Add an executor job to a named executor pool.
+
+        Keeps slow jobs of one kind, like polling unresponsive devices, from
+        starving other kinds of jobs that share the default executor.
+        """
+        executor = self._executor_pools.get(pool)
+        if executor is None:
+            if pool not in EXECUTOR_POOL_MAX_WORKERS:
+                raise ValueError(f"Unknown executor pool {pool}")
+            if self._executor_pools_shutdown:
+                raise RuntimeError("Executor pools have been shut down")
+            executor = self._executor_pools[pool] = InstrumentedThreadPoolExecutor(
+                max_workers=self.config.executor_pools.get(
+                    pool, EXECUTOR_POOL_MAX_WORKERS[pool]
+                ),
+                thread_name_prefix=f"SyncWorker_{pool}",
+            )
+
+        task = self.loop.run_in_executor(executor, target, *args)
+
+        # If a task is scheduled
+        if self._track_task:
+            self._pending_tasks.append(task)
+
+        return task
+
+    @callback
+    def async_executor_pool_stats(self) -> Dict[str, ExecutorStats]:
+        """Return the statistics of the named executor pools in use."""
+        return {name: pool.stats() for name, pool in self._executor_pools.items()}
+
     @callback
     def async_track_tasks(self) -> None:
         """Track tasks so you can wait for all tasks to be done."""
@@ -568,6 +719,11 @@ class HomeAssistant:
                 "Timed out waiting for shutdown stage 3 to complete, the shutdown will continue"
             )
 
+        # Like the default executor, the pools refuse new jobs from now on
+        self._executor_pools_shutdown = True
+        for executor in self._executor_pools.values():
+            executor.shutdown(wait=False)
+
         self.exit_code = exit_code
         self.state = CoreState.stopped
 
@@ -712,6 +868,10 @@ class EventBus:
 
         event = Event(event_type, event_data, origin, time_fired, context)
 
+        accounting = self._hass.job_accounting
+        if accounting is not None:
+            accounting.async_event_fired(event_type, event_data)
+
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.debug("Bus:Handling %s", event)
 
@@ -1572,6 +1732,10 @@ class Config:
         # Use legacy template behavior
         self.legacy_templates: bool = False
 
+        # Maximum number of workers of named executor pools, overriding
+        # EXECUTOR_POOL_MAX_WORKERS
+        self.executor_pools: Dict[str, int] = {}
+
     def distance(self, lat: float, lon: float) -> Optional[float]:
         """Calculate distance from Home Assistant.
 
@@ -1,12 +1,26 @@
 """Offer reusable conditions."""
 import asyncio
 from collections import deque
-from datetime import datetime, timedelta
+from datetime import date as datetime_date, datetime, timedelta
 import functools as ft
 import logging
 import re
 import sys
-from typing import Any, Callable, Container, List, Optional, Set, Union, cast
+import time as time_util
+from typing import (
+    Any,
+    Callable,
+    Container,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
+import weakref
 
 from homeassistant.components import zone as zone_cmp
 from homeassistant.components.device_automation import (
@@ -45,7 +59,7 @@ from homeassistant.exceptions import (
     TemplateError,
 )
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.sun import get_astral_event_date
+from homeassistant.helpers.sun import get_astral_event_date, get_astral_location
 from homeassistant.helpers.template import Template
 from homeassistant.helpers.typing import ConfigType, TemplateVarsType
 from homeassistant.util.async_ import run_callback_threadsafe
@@ -62,6 +76,24 @@ INPUT_ENTITY_ID = re.compile(
 
 ConditionCheckerType = Callable[[HomeAssistant, TemplateVarsType], bool]
 
+DATA_CONDITION_STATS = "condition_stats"
+DATA_SUN_EVENT_CACHE = "condition_sun_event_cache"
+
+# Sun events of a few days are needed at most, the cache is reset beyond that
+SUN_EVENT_CACHE_SIZE = 16
+
+COST_CHEAP = 0
+COST_MODERATE = 1
+COST_EXPENSIVE = 2
+
+_CONDITION_COSTS = {
+    "numeric_state": COST_CHEAP,
+    "state": COST_CHEAP,
+    "time": COST_CHEAP,
+    "sun": COST_MODERATE,
+    "zone": COST_MODERATE,
+}
+
 
 async def async_from_config(
     hass: HomeAssistant,
@@ -95,10 +127,153 @@ async def async_from_config(
         check_factory = check_factory.func
 
     if asyncio.iscoroutinefunction(check_factory):
-        return cast(
+        check = cast(
             ConditionCheckerType, await factory(hass, config, config_validation)
         )
-    return cast(ConditionCheckerType, factory(config, config_validation))
+    else:
+        check = cast(ConditionCheckerType, factory(config, config_validation))
+
+    if condition in ("and", "or", "not"):
+        return check
+    return _async_track_stats(hass, config, check)
+
+
+@callback
+def _async_track_stats(
+    hass: HomeAssistant, config: ConfigType, check: ConditionCheckerType
+) -> ConditionCheckerType:
+    """Wrap a condition check to record how often it runs and how long it takes."""
+    stats = ConditionStats(config[CONF_CONDITION], _describe_condition(config))
+    hass.data.setdefault(DATA_CONDITION_STATS, weakref.WeakSet()).add(stats)
+
+    def tracked_check(hass: HomeAssistant, variables: TemplateVarsType = None) -> bool:
+        """Run the check and record its duration."""
+        start = time_util.perf_counter()
+        try:
+            return check(hass, variables)
+        finally:
+            duration = time_util.perf_counter() - start
+            stats.count += 1
+            stats.total_time += duration
+            if duration > stats.max_time:
+                stats.max_time = duration
+
+    # The stats are only collected while the check is in use
+    tracked_check.stats = stats  # type: ignore
+    return tracked_check
+
+
+def _describe_condition(config: ConfigType) -> str:
+    """Return a short description of a condition to identify it."""
+    for key in (CONF_ENTITY_ID, CONF_DEVICE_ID, CONF_ZONE):
+        value = config.get(key)
+        if value:
+            if not isinstance(value, str):
+                value = ", ".join(value)
+            return f"{config[CONF_CONDITION]} {value}"
+
+    value_template = config.get(CONF_VALUE_TEMPLATE)
+    if isinstance(value_template, Template):
+        return f"{config[CONF_CONDITION]} {value_template.template}"
+    if value_template is not None:
+        return f"{config[CONF_CONDITION]} {value_template}"
+
+    return cast(str, config[CONF_CONDITION])
+
+
+class ConditionStats:
+    """Evaluation statistics of a condition."""
+
+    __slots__ = (
+        "condition",
+        "description",
+        "count",
+        "total_time",
+        "max_time",
+        "__weakref__",
+    )
+
+    def __init__(self, condition: str, description: str) -> None:
+        """Initialize the statistics."""
+        self.condition = condition
+        self.description = description
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dictionary representation of the statistics."""
+        return {
+            "condition": self.condition,
+            "description": self.description,
+            "count": self.count,
+            "total_time": self.total_time,
+            "max_time": self.max_time,
+        }
+
+
+@callback
+def async_get_condition_stats(hass: HomeAssistant) -> List[ConditionStats]:
+    """Return the statistics of the conditions in use, most expensive first."""
+    return sorted(
+        hass.data.get(DATA_CONDITION_STATS, ()),
+        key=lambda stats: stats.total_time,
+        reverse=True,
+    )
+
+
+def condition_cost(config: Union[ConfigType, Template]) -> int:
+    """Return the relative cost of evaluating a condition.
+
+    Checks that only look at states or the time are cheap, sun and zone
+    checks need calculations and templates or device conditions can do
+    anything.
+    """
+    if isinstance(config, Template):
+        return COST_EXPENSIVE
+
+    condition = config.get(CONF_CONDITION)
+    if condition in ("and", "or", "not"):
+        return max(
+            (condition_cost(entry) for entry in config["conditions"]),
+            default=COST_CHEAP,
+        )
+
+    if condition == "numeric_state" and config.get(CONF_VALUE_TEMPLATE):
+        return COST_EXPENSIVE
+
+    return _CONDITION_COSTS.get(condition, COST_EXPENSIVE)
+
+
+async def _async_compile_conditions(
+    hass: HomeAssistant, conditions: List[ConfigType], flatten: str
+) -> List[Tuple[int, ConditionCheckerType]]:
+    """Compile the conditions of an and, or or not condition.
+
+    Nested conditions of the `flatten` type are merged into the list, and the
+    checks are ordered so cheap checks run before expensive ones. Every check
+    is returned together with the index of the condition it came from, which
+    is used when reporting errors.
+    """
+
+    def flattened(index: int, config: ConfigType) -> Iterator[Tuple[int, ConfigType]]:
+        if isinstance(config, dict) and config.get(CONF_CONDITION) == flatten:
+            for child in config["conditions"]:
+                yield from flattened(index, child)
+        else:
+            yield index, config
+
+    entries = [
+        entry
+        for index, config in enumerate(conditions)
+        for entry in flattened(index, config)
+    ]
+    entries.sort(key=lambda entry: condition_cost(entry[1]))
+
+    return [
+        (index, await async_from_config(hass, config, False))
+        for index, config in entries
+    ]
 
 
 async def async_and_from_config(
@@ -107,22 +282,21 @@ async def async_and_from_config(
     """Create multi condition matcher using 'AND'."""
     if config_validation:
         config = cv.AND_CONDITION_SCHEMA(config)
-    checks = [
-        await async_from_config(hass, entry, False) for entry in config["conditions"]
-    ]
+    total = len(config["conditions"])
+    checks = await _async_compile_conditions(hass, config["conditions"], "and")
 
     def if_and_condition(
         hass: HomeAssistant, variables: TemplateVarsType = None
     ) -> bool:
         """Test and condition."""
         errors = []
-        for index, check in enumerate(checks):
+        for index, check in checks:
             try:
                 if not check(hass, variables):
                     return False
             except ConditionError as ex:
                 errors.append(
-                    ConditionErrorIndex("and", index=index, total=len(checks), error=ex)
+                    ConditionErrorIndex("and", index=index, total=total, error=ex)
                 )
 
         # Raise the errors if no check was false
@@ -140,22 +314,21 @@ async def async_or_from_config(
     """Create multi condition matcher using 'OR'."""
     if config_validation:
         config = cv.OR_CONDITION_SCHEMA(config)
-    checks = [
-        await async_from_config(hass, entry, False) for entry in config["conditions"]
-    ]
+    total = len(config["conditions"])
+    checks = await _async_compile_conditions(hass, config["conditions"], "or")
 
     def if_or_condition(
         hass: HomeAssistant, variables: TemplateVarsType = None
     ) -> bool:
         """Test or condition."""
         errors = []
-        for index, check in enumerate(checks):
+        for index, check in checks:
             try:
                 if check(hass, variables):
                     return True
             except ConditionError as ex:
                 errors.append(
-                    ConditionErrorIndex("or", index=index, total=len(checks), error=ex)
+                    ConditionErrorIndex("or", index=index, total=total, error=ex)
                 )
 
         # Raise the errors if no check was true
@@ -173,22 +346,22 @@ async def async_not_from_config(
     """Create multi condition matcher using 'NOT'."""
     if config_validation:
         config = cv.NOT_CONDITION_SCHEMA(config)
-    checks = [
-        await async_from_config(hass, entry, False) for entry in config["conditions"]
-    ]
+    total = len(config["conditions"])
+    # Not any of (a or b) is the same as not any of a and b
+    checks = await _async_compile_conditions(hass, config["conditions"], "or")
 
     def if_not_condition(
         hass: HomeAssistant, variables: TemplateVarsType = None
     ) -> bool:
         """Test not condition."""
         errors = []
-        for index, check in enumerate(checks):
+        for index, check in checks:
             try:
                 if check(hass, variables):
                     return False
             except ConditionError as ex:
                 errors.append(
-                    ConditionErrorIndex("not", index=index, total=len(checks), error=ex)
+                    ConditionErrorIndex("not", index=index, total=total, error=ex)
                 )
 
         # Raise the errors if no check was true
@@ -466,6 +639,23 @@ def state_from_config(
     return if_state
 
 
+def _get_sun_event(
+    hass: HomeAssistant, event: str, date: datetime_date
+) -> Optional[datetime]:
+    """Return the time of a sun event on a date.
+
+    Sun events only change per day, so they are cached instead of being
+    calculated on every evaluation.
+    """
+    key = (get_astral_location(hass), event, date)
+    cache = hass.data.setdefault(DATA_SUN_EVENT_CACHE, {})
+    if key not in cache:
+        if len(cache) >= SUN_EVENT_CACHE_SIZE:
+            cache.clear()
+        cache[key] = get_astral_event_date(hass, event, date)
+    return cast(Optional[datetime], cache[key])
+
+
 def sun(
     hass: HomeAssistant,
     before: Optional[str] = None,
@@ -479,8 +669,8 @@ def sun(
     before_offset = before_offset or timedelta(0)
     after_offset = after_offset or timedelta(0)
 
-    sunrise_today = get_astral_event_date(hass, SUN_EVENT_SUNRISE, today)
-    sunset_today = get_astral_event_date(hass, SUN_EVENT_SUNSET, today)
+    sunrise_today = _get_sun_event(hass, SUN_EVENT_SUNRISE, today)
+    sunset_today = _get_sun_event(hass, SUN_EVENT_SUNSET, today)
 
     sunrise = sunrise_today
     sunset = sunset_today
@@ -488,14 +678,14 @@ def sun(
         cast(datetime, sunrise_today)
     ).date() and SUN_EVENT_SUNRISE in (before, after):
         tomorrow = dt_util.as_local(utcnow + timedelta(days=1)).date()
-        sunrise_tomorrow = get_astral_event_date(hass, SUN_EVENT_SUNRISE, tomorrow)
+        sunrise_tomorrow = _get_sun_event(hass, SUN_EVENT_SUNRISE, tomorrow)
         sunrise = sunrise_tomorrow
 
     if today > dt_util.as_local(
         cast(datetime, sunset_today)
     ).date() and SUN_EVENT_SUNSET in (before, after):
         tomorrow = dt_util.as_local(utcnow + timedelta(days=1)).date()
-        sunset_tomorrow = get_astral_event_date(hass, SUN_EVENT_SUNSET, tomorrow)
+        sunset_tomorrow = _get_sun_event(hass, SUN_EVENT_SUNSET, tomorrow)
         sunset = sunset_tomorrow
 
     if sunrise is None and SUN_EVENT_SUNRISE in (before, after):
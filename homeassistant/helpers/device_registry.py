@@ -526,11 +526,26 @@ class DeviceRegistry:
     @callback
     def async_schedule_save(self) -> None:
         """Schedule saving the device registry."""
-        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        self._store.async_delay_save(
+            self._entries_to_save, SAVE_DELAY, convert_func=self._data_to_save
+        )
 
     @callback
-    def _data_to_save(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Return data of device registry to store in a file."""
+    def _entries_to_save(
+        self,
+    ) -> Tuple[List[DeviceEntry], List[DeletedDeviceEntry]]:
+        """Return a snapshot of the entries, they are immutable."""
+        return list(self.devices.values()), list(self.deleted_devices.values())
+
+    @staticmethod
+    def _data_to_save(
+        entries: Tuple[List[DeviceEntry], List[DeletedDeviceEntry]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Return data of device registry to store in a file.
+
+        This runs in the executor.
+        """
+        devices, deleted_devices = entries
         data = {}
 
         data["devices"] = [
@@ -549,7 +564,7 @@ class DeviceRegistry:
                 "name_by_user": entry.name_by_user,
                 "disabled_by": entry.disabled_by,
             }
-            for entry in self.devices.values()
+            for entry in devices
         ]
         data["deleted_devices"] = [
             {
@@ -559,7 +574,7 @@ class DeviceRegistry:
                 "id": entry.id,
                 "orphaned_timestamp": entry.orphaned_timestamp,
             }
-            for entry in self.deleted_devices.values()
+            for entry in deleted_devices
         ]
 
         return data
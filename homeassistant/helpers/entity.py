@@ -24,7 +24,13 @@ from homeassistant.const import (
     TEMP_CELSIUS,
     TEMP_FAHRENHEIT,
 )
-from homeassistant.core import CALLBACK_TYPE, Context, HomeAssistant, callback
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    EXECUTOR_POOL_POLLING,
+    Context,
+    HomeAssistant,
+    callback,
+)
 from homeassistant.exceptions import HomeAssistantError, NoEntitySpecifiedError
 from homeassistant.helpers.entity_platform import EntityPlatform
 from homeassistant.helpers.entity_registry import RegistryEntry
@@ -106,6 +112,9 @@ class Entity(ABC):
     # Protect for multiple updates
     _update_staged = False
 
+    # Loop time the last update started at, after waiting for its turn
+    _update_started: Optional[float] = None
+
     # Process updates in parallel
     parallel_updates: Optional[asyncio.Semaphore] = None
 
@@ -451,13 +460,16 @@ class Entity(ABC):
         # Process update sequential
         if self.parallel_updates:
             await self.parallel_updates.acquire()
+        self._update_started = self.hass.loop.time()
 
         try:
             # pylint: disable=no-member
             if hasattr(self, "async_update"):
                 task = self.hass.async_create_task(self.async_update())  # type: ignore
             elif hasattr(self, "update"):
-                task = self.hass.async_add_executor_job(self.update)  # type: ignore
+                task = self.hass.async_add_pool_executor_job(
+                    EXECUTOR_POOL_POLLING, self.update  # type: ignore
+                )
             else:
                 return
 
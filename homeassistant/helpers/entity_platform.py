@@ -3,10 +3,19 @@ from __future__ import annotations
 
 import asyncio
 from contextvars import ContextVar
-from datetime import datetime, timedelta
+from datetime import timedelta
 from logging import Logger
 from types import ModuleType
-from typing import TYPE_CHECKING, Callable, Coroutine, Dict, Iterable, List, Optional
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+)
 
 from homeassistant import config_entries
 from homeassistant.const import ATTR_RESTORED, DEVICE_DEFAULT_NAME
@@ -23,7 +32,8 @@ from homeassistant.helpers.typing import HomeAssistantType
 from homeassistant.util.async_ import run_callback_threadsafe
 
 from .entity_registry import DISABLED_INTEGRATION
-from .event import async_call_later, async_track_time_interval
+from .event import async_call_later
+from .poll_scheduler import PollDurationHistogram, async_get_poll_scheduler
 
 if TYPE_CHECKING:
     from .entity import Entity
@@ -66,11 +76,11 @@ class EntityPlatform:
         self._tasks: List[asyncio.Future] = []
         # Stop tracking tasks after setup is completed
         self._setup_complete = False
-        # Method to cancel the state change listener
-        self._async_unsub_polling: Optional[CALLBACK_TYPE] = None
+        # If the entities are polled by the poll scheduler
+        self._polling = False
+        self.poll_durations = PollDurationHistogram()
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: Optional[CALLBACK_TYPE] = None
-        self._process_updates: Optional[asyncio.Lock] = None
 
         self.parallel_updates: Optional[asyncio.Semaphore] = None
 
@@ -330,16 +340,16 @@ class EntityPlatform:
             )
             raise
 
-        if self._async_unsub_polling is not None or not any(
-            entity.should_poll for entity in self.entities.values()
-        ):
-            return
+        if not self._polling:
+            if not any(entity.should_poll for entity in self.entities.values()):
+                return
+            self._polling = True
 
-        self._async_unsub_polling = async_track_time_interval(
-            self.hass,
-            self._update_entity_states,
-            self.scan_interval,
-        )
+        # Entities that don't poll now are scheduled too, they are only
+        # polled while should_poll returns True
+        poll_scheduler = async_get_poll_scheduler(hass)
+        for entity in self.entities.values():
+            poll_scheduler.async_add(self, entity)
 
     async def _async_add_entity(  # type: ignore[no-untyped-def]
         self, entity, update_before_add, entity_registry, device_registry
@@ -504,7 +514,13 @@ class EntityPlatform:
             # has a chance to finish.
             self.hass.states.async_reserve(entity.entity_id)
 
-        entity.async_on_remove(lambda: self.entities.pop(entity_id))
+        @callback
+        def remove_entity_cb() -> None:
+            """Remove entity from entities list and stop polling it."""
+            self.entities.pop(entity_id)
+            async_get_poll_scheduler(self.hass).async_remove(entity_id)
+
+        entity.async_on_remove(remove_entity_cb)
 
         await entity.add_to_platform_finish()
 
@@ -524,9 +540,7 @@ class EntityPlatform:
 
         await asyncio.gather(*tasks)
 
-        if self._async_unsub_polling is not None:
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
+        self._async_stop_polling()
         self._setup_complete = False
 
     async def async_destroy(self) -> None:
@@ -541,12 +555,18 @@ class EntityPlatform:
         """Remove entity id from platform."""
         await self.entities[entity_id].async_remove()
 
-        # Clean up polling job if no longer needed
-        if self._async_unsub_polling is not None and not any(
+        # Stop polling if no longer needed
+        if self._polling and not any(
             entity.should_poll for entity in self.entities.values()
         ):
-            self._async_unsub_polling()
-            self._async_unsub_polling = None
+            self._async_stop_polling()
+
+    @callback
+    def _async_stop_polling(self) -> None:
+        """Stop polling the entities."""
+        if self._polling:
+            async_get_poll_scheduler(self.hass).async_remove_platform(self)
+            self._polling = False
 
     async def async_extract_from_service(
         self, service_call: ServiceCall, expand_group: bool = True
@@ -591,35 +611,6 @@ class EntityPlatform:
             self.platform_name, name, handle_service, schema
         )
 
-    async def _update_entity_states(self, now: datetime) -> None:
-        """Update the states of all the polling entities.
-
-        To protect from flooding the executor, we will update async entities
-        in parallel and other entities sequential.
-
-        This method must be run in the event loop.
-        """
-        if self._process_updates is None:
-            self._process_updates = asyncio.Lock()
-        if self._process_updates.locked():
-            self.logger.warning(
-                "Updating %s %s took longer than the scheduled update interval %s",
-                self.platform_name,
-                self.domain,
-                self.scan_interval,
-            )
-            return
-
-        async with self._process_updates:
-            tasks = []
-            for entity in self.entities.values():
-                if not entity.should_poll:
-                    continue
-                tasks.append(entity.async_update_ha_state(True))
-
-            if tasks:
-                await asyncio.gather(*tasks)
-
 
 current_platform: ContextVar[Optional[EntityPlatform]] = ContextVar(
     "current_platform", default=None
@@ -640,3 +631,21 @@ def async_get_platforms(
     platforms: List[EntityPlatform] = hass.data[DATA_ENTITY_PLATFORM][integration_name]
 
     return platforms
+
+
+@callback
+def async_get_poll_durations(hass: HomeAssistantType) -> List[Dict[str, Any]]:
+    """Return the poll duration histograms of the platforms that polled."""
+    return [
+        {
+            "domain": platform.domain,
+            "platform": platform.platform_name,
+            "config_entry_id": platform.config_entry.entry_id
+            if platform.config_entry
+            else None,
+            **platform.poll_durations.as_dict(),
+        }
+        for platforms in hass.data.get(DATA_ENTITY_PLATFORM, {}).values()
+        for platform in platforms
+        if platform.poll_durations.count
+    ]
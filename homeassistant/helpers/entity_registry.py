@@ -513,11 +513,21 @@ class EntityRegistry:
     @callback
     def async_schedule_save(self) -> None:
         """Schedule saving the entity registry."""
-        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        self._store.async_delay_save(
+            self._entries_to_save, SAVE_DELAY, convert_func=self._data_to_save
+        )
 
     @callback
-    def _data_to_save(self) -> Dict[str, Any]:
-        """Return data of entity registry to store in a file."""
+    def _entries_to_save(self) -> List[RegistryEntry]:
+        """Return a snapshot of the entries, they are immutable."""
+        return list(self.entities.values())
+
+    @staticmethod
+    def _data_to_save(entries: List[RegistryEntry]) -> Dict[str, Any]:
+        """Return data of entity registry to store in a file.
+
+        This runs in the executor.
+        """
         data = {}
 
         data["entities"] = [
@@ -538,7 +548,7 @@ class EntityRegistry:
                 "original_name": entry.original_name,
                 "original_icon": entry.original_icon,
             }
-            for entry in self.entities.values()
+            for entry in entries
         ]
 
         return data
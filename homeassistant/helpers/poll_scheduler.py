@@ -0,0 +1,225 @@
+"""Schedule the polling of entities."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Optional
+import zlib
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+
+if TYPE_CHECKING:
+    from .entity import Entity
+    from .entity_platform import EntityPlatform
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_POLL_SCHEDULER = "poll_scheduler"
+
+# Upper bounds of the buckets of the poll duration histograms, in seconds
+POLL_DURATION_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# An overrunning entity is polled at this multiple of its poll duration
+OVERRUN_HEADROOM = 1.5
+# Limit to how far the interval of an entity is stretched
+MAX_INTERVAL_FACTOR = 10
+
+
+def poll_phase(entity_id: str) -> float:
+    """Return the fraction of the interval an entity is polled at.
+
+    The phase is derived from the entity id so an entity keeps its place in
+    the interval across restarts, and entities of all platforms are spread
+    over their intervals instead of being polled in the same tick.
+    """
+    return zlib.crc32(entity_id.encode()) / 2 ** 32
+
+
+class PollDurationHistogram:
+    """Histogram of the durations of the polls of a platform."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        # The last count is for the polls above the largest bucket
+        self.counts = [0] * (len(POLL_DURATION_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration: float) -> None:
+        """Add the duration of a poll."""
+        for index, bound in enumerate(POLL_DURATION_BUCKETS):
+            if duration <= bound:
+                break
+        else:
+            index = len(POLL_DURATION_BUCKETS)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the histogram as a dictionary."""
+        return {
+            "count": self.count,
+            "total": self.total,
+            "max": self.max,
+            "buckets": {
+                **{
+                    str(bound): count
+                    for bound, count in zip(POLL_DURATION_BUCKETS, self.counts)
+                },
+                "+Inf": self.counts[-1],
+            },
+        }
+
+
+class _EntityPoll:
+    """The polling of a single entity."""
+
+    __slots__ = ("platform", "entity", "scan_interval", "interval", "due", "handle")
+
+    def __init__(
+        self, platform: EntityPlatform, entity: Entity, scan_interval: float
+    ) -> None:
+        """Initialize the poll."""
+        self.platform = platform
+        self.entity = entity
+        self.scan_interval = scan_interval
+        self.interval = scan_interval
+        self.due = 0.0
+        self.handle: Optional[asyncio.TimerHandle] = None
+
+
+class PollScheduler:
+    """Poll the entities of all platforms, each at its own phase.
+
+    Every polling entity is polled once per scan interval of its platform at
+    the phase returned by poll_phase. An entity isn't polled again while its
+    previous poll is running, and an entity whose polls take longer than the
+    interval is polled less often until its polls speed up again. The
+    PARALLEL_UPDATES of a platform still limits how many of its entities
+    update at once.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        self._polls: Dict[str, _EntityPoll] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+
+    @callback
+    def async_add(self, platform: EntityPlatform, entity: Entity) -> None:
+        """Start polling an entity of a platform."""
+        assert entity.entity_id is not None
+        if entity.entity_id in self._polls:
+            return
+        scan_interval = platform.scan_interval.total_seconds()
+        poll = _EntityPoll(platform, entity, scan_interval)
+        poll.due = self.hass.loop.time() + poll_phase(entity.entity_id) * scan_interval
+        self._polls[entity.entity_id] = poll
+        self._async_schedule(poll)
+
+    @callback
+    def async_remove(self, entity_id: str) -> None:
+        """Stop polling an entity."""
+        poll = self._polls.pop(entity_id, None)
+        if poll is not None and poll.handle is not None:
+            poll.handle.cancel()
+
+    @callback
+    def async_remove_platform(self, platform: EntityPlatform) -> None:
+        """Stop polling the entities of a platform."""
+        for entity_id in list(platform.entities):
+            poll = self._polls.get(entity_id)
+            if poll is not None and poll.platform is platform:
+                self.async_remove(entity_id)
+
+    @callback
+    def _async_schedule(self, poll: _EntityPoll) -> None:
+        """Schedule the next poll of an entity after the current time."""
+        now = self.hass.loop.time()
+        if poll.due <= now:
+            # Skip the polls that were missed, keeping the phase
+            poll.due += (int((now - poll.due) / poll.interval) + 1) * poll.interval
+        poll.handle = self.hass.loop.call_at(poll.due, self._async_poll_due, poll)
+
+    @callback
+    def _async_poll_due(self, poll: _EntityPoll) -> None:
+        """Poll an entity when its previous poll is done."""
+        entity_id = poll.entity.entity_id
+        assert entity_id is not None
+        if self._polls.get(entity_id) is not poll:
+            return
+        if entity_id not in self._running and poll.entity.should_poll:
+            self._running[entity_id] = self.hass.async_create_task(
+                self._async_poll(poll)
+            )
+        poll.due += poll.interval
+        self._async_schedule(poll)
+
+    async def _async_poll(self, poll: _EntityPoll) -> None:
+        """Poll an entity and record how long its update took."""
+        entity_id = poll.entity.entity_id
+        assert entity_id is not None
+        start = self.hass.loop.time()
+        try:
+            await poll.entity.async_update_ha_state(True)
+        finally:
+            del self._running[entity_id]
+        # Leave out the wait for PARALLEL_UPDATES, an entity queued behind
+        # others of its platform isn't slow itself
+        update_started = poll.entity._update_started  # pylint: disable=protected-access
+        if update_started is None or update_started < start:
+            update_started = start
+        duration = self.hass.loop.time() - update_started
+        poll.platform.poll_durations.add(duration)
+        if self._polls.get(entity_id) is poll:
+            self._async_adapt_interval(poll, start, duration)
+
+    @callback
+    def _async_adapt_interval(
+        self, poll: _EntityPoll, start: float, duration: float
+    ) -> None:
+        """Stretch the interval of an overrunning entity or restore it."""
+        if duration > poll.interval:
+            interval = min(
+                duration * OVERRUN_HEADROOM, poll.scan_interval * MAX_INTERVAL_FACTOR
+            )
+        elif poll.interval > poll.scan_interval:
+            interval = max(
+                poll.scan_interval, poll.interval / 2, duration * OVERRUN_HEADROOM
+            )
+        else:
+            return
+
+        if interval == poll.interval:
+            return
+
+        if interval > poll.interval:
+            poll.platform.logger.warning(
+                "Updating %s took %.1f seconds, longer than its update interval "
+                "of %.1f seconds, polling it every %.1f seconds instead",
+                poll.entity.entity_id,
+                duration,
+                poll.interval,
+                interval,
+            )
+        else:
+            _LOGGER.debug(
+                "Polling %s every %.1f seconds", poll.entity.entity_id, interval
+            )
+
+        poll.interval = interval
+        if poll.handle is not None:
+            poll.handle.cancel()
+        poll.due = start + interval
+        self._async_schedule(poll)
+
+
+@singleton(DATA_POLL_SCHEDULER)
+def async_get_poll_scheduler(hass: HomeAssistant) -> PollScheduler:
+    """Return the poll scheduler."""
+    return PollScheduler(hass)
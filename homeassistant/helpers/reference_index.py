@@ -0,0 +1,44 @@
+"""Reverse index of the entities or devices referenced by other entities."""
+from typing import Dict, Iterable, List, Set
+
+from homeassistant.core import callback
+
+
+class ReferenceIndex:
+    """Map referenced ids to the entities referencing them.
+
+    Entities such as automations, scripts and groups register the ids they
+    reference when they are added and unregister when they are removed, so
+    looking up what references an entity or device doesn't need to walk the
+    configuration of every referencing entity.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the index."""
+        # Referenced id -> referencing entity ids, a dict to keep them ordered
+        self._referenced_by: Dict[str, Dict[str, None]] = {}
+        # Referencing entity id -> referenced ids
+        self._references: Dict[str, Set[str]] = {}
+
+    @callback
+    def async_set(self, entity_id: str, references: Iterable[str]) -> None:
+        """Set the ids referenced by an entity, replacing the previous ones."""
+        self.async_remove(entity_id)
+        references = set(references)
+        self._references[entity_id] = references
+        for reference in references:
+            self._referenced_by.setdefault(reference, {})[entity_id] = None
+
+    @callback
+    def async_remove(self, entity_id: str) -> None:
+        """Remove the references of an entity."""
+        for reference in self._references.pop(entity_id, ()):
+            referenced_by = self._referenced_by[reference]
+            del referenced_by[entity_id]
+            if not referenced_by:
+                del self._referenced_by[reference]
+
+    @callback
+    def async_get(self, reference: str) -> List[str]:
+        """Return the entities referencing an id."""
+        return list(self._referenced_by.get(reference, ()))
@@ -1,8 +1,9 @@
 """Class to reload platforms."""
 
 import asyncio
+from collections.abc import Mapping
 import logging
-from typing import Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from homeassistant import config as conf_util
 from homeassistant.const import SERVICE_RELOAD
@@ -10,6 +11,8 @@ from homeassistant.core import Event, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_per_platform
 from homeassistant.helpers.entity_platform import EntityPlatform, async_get_platforms
+from homeassistant.helpers.script_variables import ScriptVariables
+from homeassistant.helpers.template import Template
 from homeassistant.helpers.typing import ConfigType, HomeAssistantType
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import async_setup_component
@@ -45,6 +48,48 @@ async def async_reload_integration_platforms(
     await asyncio.gather(*tasks)
 
 
+def _attach_templates(hass: HomeAssistantType, obj: Any) -> None:
+    """Recursively attach hass to all templates, including script variables."""
+    if isinstance(obj, ScriptVariables):
+        _attach_templates(hass, obj.variables)
+    elif isinstance(obj, list):
+        for child in obj:
+            _attach_templates(hass, child)
+    elif isinstance(obj, Mapping):
+        for child_key, child_value in obj.items():
+            _attach_templates(hass, child_key)
+            _attach_templates(hass, child_value)
+    elif isinstance(obj, Template):
+        obj.hass = hass
+
+
+def _comparable(obj: Any) -> Any:
+    """Return a configuration item with script variables replaced by their config."""
+    if isinstance(obj, ScriptVariables):
+        return (ScriptVariables, _comparable(obj.variables))
+    if isinstance(obj, list):
+        return [_comparable(child) for child in obj]
+    if isinstance(obj, Mapping):
+        return {key: _comparable(value) for key, value in obj.items()}
+    return obj
+
+
+@callback
+def async_config_unchanged(
+    hass: HomeAssistantType, old_config: Any, new_config: Any
+) -> bool:
+    """Return if a validated configuration item is unchanged after a reload.
+
+    Templates only compare equal when they are attached to the same instance,
+    so both sides are attached first. Script variables are compared by their
+    config. Values that don't support comparison make the item count as
+    changed, which causes it to be replaced.
+    """
+    _attach_templates(hass, old_config)
+    _attach_templates(hass, new_config)
+    return bool(_comparable(old_config) == _comparable(new_config))
+
+
 async def _resetup_platform(
     hass: HomeAssistantType,
     integration_name: str,
@@ -3,7 +3,9 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timedelta
+import json
 import logging
+import os
 from typing import Any, Dict, List, Optional, Set, cast
 
 from homeassistant.const import EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP
@@ -36,6 +38,10 @@ STATE_DUMP_INTERVAL = timedelta(minutes=15)
 # How long should a saved state be preserved if the entity no longer exists
 STATE_EXPIRATION = timedelta(days=7)
 
+# How long changed states are appended to the journal before the store is
+# rewritten with all states
+STATE_COMPACT_INTERVAL = timedelta(days=1)
+
 
 class StoredState:
     """Object to represent a stored state."""
@@ -78,15 +84,24 @@ class RestoreStateData:
                 _LOGGER.error("Error loading last states", exc_info=exc)
                 stored_states = None
 
-            if stored_states is None:
+            try:
+                journal = await hass.async_add_executor_job(
+                    _load_journal, data.journal_path
+                )
+            except OSError as exc:
+                _LOGGER.error("Error loading changed states", exc_info=exc)
+                journal = []
+
+            if stored_states is None and not journal:
                 _LOGGER.debug("Not creating cache - no saved states found")
                 data.last_states = {}
             else:
                 data.last_states = {
                     item["state"]["entity_id"]: StoredState.from_dict(item)
-                    for item in stored_states
+                    for item in stored_states or []
                     if valid_entity_id(item["state"]["entity_id"])
                 }
+                data.async_apply_journal(journal)
                 _LOGGER.debug("Created cache with %s", list(data.last_states))
 
             if hass.state == CoreState.running:
@@ -108,6 +123,35 @@ class RestoreStateData:
         )
         self.last_states: Dict[str, StoredState] = {}
         self.entity_ids: Set[str] = set()
+        # The State objects on disk, in the store or the journal
+        self._dumped_states: Optional[Dict[str, State]] = None
+        self._journal_entries = 0
+        self._compacted_at: Optional[datetime] = None
+        self._dump_lock = asyncio.Lock()
+
+    @property
+    def journal_path(self) -> str:
+        """Return the path of the journal of changed states."""
+        return f"{self.store.path}.journal"
+
+    @callback
+    def async_apply_journal(self, journal: List[Dict[str, Any]]) -> None:
+        """Apply the states appended to the journal to the last states.
+
+        The journal is only emptied once the store holds its states, so a
+        journal left behind may be older than the store. An entry only
+        replaces a state that wasn't updated after it.
+        """
+        for item in journal:
+            if not valid_entity_id(item["state"]["entity_id"]):
+                continue
+            stored_state = StoredState.from_dict(item)
+            last_state = self.last_states.get(stored_state.state.entity_id)
+            if (
+                last_state is None
+                or stored_state.state.last_updated >= last_state.state.last_updated
+            ):
+                self.last_states[stored_state.state.entity_id] = stored_state
 
     @callback
     def async_get_stored_states(self) -> List[StoredState]:
@@ -118,22 +162,19 @@ class RestoreStateData:
         entities on this run, and have not expired.
         """
         now = dt_util.utcnow()
-        all_states = self.hass.states.async_all()
         # Entities currently backed by an entity object
-        current_entity_ids = {
-            state.entity_id
-            for state in all_states
-            if not state.attributes.get(entity_registry.ATTR_RESTORED)
-        }
+        current_entity_ids: Set[str] = set()
+        stored_states: List[StoredState] = []
 
         # Start with the currently registered states
-        stored_states = [
-            StoredState(state, now)
-            for state in all_states
-            if state.entity_id in self.entity_ids and
+        for state in self.hass.states.async_all():
             # Ignore all states that are entity registry placeholders
-            not state.attributes.get(entity_registry.ATTR_RESTORED)
-        ]
+            if state.attributes.get(entity_registry.ATTR_RESTORED):
+                continue
+            current_entity_ids.add(state.entity_id)
+            if state.entity_id in self.entity_ids:
+                stored_states.append(StoredState(state, now))
+
         expiration_time = now - STATE_EXPIRATION
 
         for entity_id, stored_state in self.last_states.items():
@@ -151,18 +192,86 @@ class RestoreStateData:
 
         return stored_states
 
-    async def async_dump_states(self) -> None:
-        """Save the current state machine to storage."""
-        _LOGGER.debug("Dumping states")
+    async def async_dump_states(self, incremental: bool = False) -> None:
+        """Save the current state machine to storage.
+
+        An incremental dump appends the states that changed since the last
+        dump to the journal. All states are written to the store instead when
+        there is no previous dump, the journal holds as many entries as there
+        are states, or STATE_COMPACT_INTERVAL passed since the store was
+        written.
+        """
+        async with self._dump_lock:
+            stored_states = self.async_get_stored_states()
+            now = dt_util.utcnow()
+
+            if (
+                incremental
+                and self._dumped_states is not None
+                and self._compacted_at is not None
+                and now - self._compacted_at < STATE_COMPACT_INTERVAL
+                and self._journal_entries < len(stored_states)
+            ):
+                await self._async_append_changed_states(stored_states)
+                return
+
+            _LOGGER.debug("Dumping states")
+            try:
+                await self.store.async_save(
+                    [stored_state.as_dict() for stored_state in stored_states]
+                )
+            except HomeAssistantError as exc:
+                _LOGGER.error("Error saving current states", exc_info=exc)
+                self._dumped_states = None
+                return
+
+            self._dumped_states = {
+                stored_state.state.entity_id: stored_state.state
+                for stored_state in stored_states
+            }
+            self._journal_entries = 0
+            self._compacted_at = now
+
+            # While stopping the store is written with the final write, the
+            # journal is kept until then
+            if self.hass.state == CoreState.stopping:
+                return
+            try:
+                await self.hass.async_add_executor_job(
+                    _remove_journal, self.journal_path
+                )
+            except OSError as exc:
+                _LOGGER.error("Error removing changed states", exc_info=exc)
+
+    async def _async_append_changed_states(
+        self, stored_states: List[StoredState]
+    ) -> None:
+        """Append the states that changed since the last dump to the journal."""
+        dumped_states = cast(Dict[str, State], self._dumped_states)
+        # State objects are replaced on every change, so identity is enough
+        changed_states = [
+            stored_state
+            for stored_state in stored_states
+            if dumped_states.get(stored_state.state.entity_id) is not stored_state.state
+        ]
+        if not changed_states:
+            _LOGGER.debug("Skipping dump - no states changed since last dump")
+            return
+
+        _LOGGER.debug("Dumping %s changed states", len(changed_states))
         try:
-            await self.store.async_save(
-                [
-                    stored_state.as_dict()
-                    for stored_state in self.async_get_stored_states()
-                ]
+            await self.hass.async_add_executor_job(
+                _append_journal,
+                self.journal_path,
+                [stored_state.as_dict() for stored_state in changed_states],
             )
-        except HomeAssistantError as exc:
-            _LOGGER.error("Error saving current states", exc_info=exc)
+        except (OSError, TypeError, ValueError) as exc:
+            _LOGGER.error("Error saving changed states", exc_info=exc)
+            return
+
+        self._journal_entries += len(changed_states)
+        for stored_state in changed_states:
+            dumped_states[stored_state.state.entity_id] = stored_state.state
 
     @callback
     def async_setup_dump(self, *args: Any) -> None:
@@ -171,13 +280,18 @@ class RestoreStateData:
         async def _async_dump_states(*_: Any) -> None:
             await self.async_dump_states()
 
+        async def _async_dump_changed_states(*_: Any) -> None:
+            await self.async_dump_states(incremental=True)
+
         # Dump the initial states now. This helps minimize the risk of having
         # old states loaded by overwriting the last states once Home Assistant
         # has started and the old states have been read.
         self.hass.async_create_task(_async_dump_states())
 
-        # Dump states periodically
-        async_track_time_interval(self.hass, _async_dump_states, STATE_DUMP_INTERVAL)
+        # Dump the states that changed periodically
+        async_track_time_interval(
+            self.hass, _async_dump_changed_states, STATE_DUMP_INTERVAL
+        )
 
         # Dump states when stopping hass
         self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _async_dump_states)
@@ -204,6 +318,38 @@ class RestoreStateData:
         self.entity_ids.remove(entity_id)
 
 
+def _load_journal(path: str) -> List[Dict[str, Any]]:
+    """Load the entries of the journal, this does I/O."""
+    entries = []
+    try:
+        with open(path, encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # An entry cut short by a crash while appending
+                    _LOGGER.warning("Ignoring invalid entry in %s", path)
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+def _append_journal(path: str, entries: List[Dict[str, Any]]) -> None:
+    """Append entries to the journal, this does I/O."""
+    lines = "".join(f"{json.dumps(entry, cls=JSONEncoder)}\n" for entry in entries)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a", encoding="utf-8") as journal:
+        journal.write(lines)
+
+
+def _remove_journal(path: str) -> None:
+    """Remove the journal, this does I/O."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
 def _encode(value: Any) -> Any:
     """Little helper to JSON encode a value."""
     try:
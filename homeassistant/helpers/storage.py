@@ -1,15 +1,24 @@
 """Helper to help store data."""
 import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 from json import JSONEncoder
 import logging
 import os
-from typing import Any, Callable, Dict, List, Optional, Type, Union
+import time
+from typing import Any, Callable, Dict, List, Optional, Type, Union, cast
 
 from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
-from homeassistant.core import CALLBACK_TYPE, CoreState, HomeAssistant, callback
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    EXECUTOR_POOL_IO,
+    CoreState,
+    HomeAssistant,
+    callback,
+)
 from homeassistant.helpers.event import async_call_later
 from homeassistant.loader import bind_hass
-from homeassistant.util import json as json_util
+from homeassistant.util import dt as dt_util, json as json_util
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-warn-return-any
 # mypy: no-check-untyped-defs
@@ -17,6 +26,35 @@ from homeassistant.util import json as json_util
 STORAGE_DIR = ".storage"
 _LOGGER = logging.getLogger(__name__)
 
+DATA_STORAGE_WRITE_STATS = "storage_write_stats"
+
+# Upper bound in seconds on how long repeated delayed saves can postpone a write.
+# Writes are bounded and coalesced per store rather than by a shared flush
+# scheduler: stores are written to separate files, so flushing them together
+# wouldn't save any I/O and would tie the latency of every store to the
+# busiest one. save_json replaces the file with a renamed temporary file and
+# doesn't fsync, so there are no fsyncs to batch either.
+MAX_WRITE_DELAY = 60
+
+
+@dataclass
+class StoreWriteStats:
+    """Write statistics of a store."""
+
+    write_count: int = 0
+    write_bytes: int = 0
+    write_duration: float = 0.0
+    last_write_bytes: int = 0
+    last_write_duration: float = 0.0
+
+
+@callback
+def async_get_write_stats(hass: HomeAssistant) -> Dict[str, StoreWriteStats]:
+    """Return the write statistics of all stores, keyed by storage key."""
+    return cast(
+        Dict[str, StoreWriteStats], hass.data.setdefault(DATA_STORAGE_WRITE_STATS, {})
+    )
+
 
 @bind_hass
 async def async_migrator(
@@ -80,6 +118,7 @@ class Store:
         self._private = private
         self._data: Optional[Dict[str, Any]] = None
         self._unsub_delay_listener: Optional[CALLBACK_TYPE] = None
+        self._delay_deadline: Optional[datetime] = None
         self._unsub_final_write_listener: Optional[CALLBACK_TYPE] = None
         self._write_lock = asyncio.Lock()
         self._load_task: Optional[asyncio.Future] = None
@@ -120,6 +159,10 @@ class Store:
             # If we didn't generate data yet, do it now.
             if "data_func" in data:
                 data["data"] = data.pop("data_func")()
+            if "convert_func" in data:
+                data["data"] = await self.hass.async_add_executor_job(
+                    data.pop("convert_func"), data["data"]
+                )
         else:
             data = await self.hass.async_add_executor_job(
                 json_util.load_json, self.path
@@ -151,9 +194,23 @@ class Store:
         await self._async_handle_write_data()
 
     @callback
-    def async_delay_save(self, data_func: Callable[[], Dict], delay: float = 0) -> None:
-        """Save data with an optional delay."""
+    def async_delay_save(
+        self,
+        data_func: Callable[[], Any],
+        delay: float = 0,
+        *,
+        convert_func: Optional[Callable[[Any], Union[Dict, List]]] = None,
+    ) -> None:
+        """Save data with an optional delay.
+
+        data_func is called in the event loop when the data is written. If
+        convert_func is given, data_func only has to return a snapshot that is
+        safe to read from another thread, like a list of immutable entries,
+        and convert_func turns it into the data to save in the executor.
+        """
         self._data = {"version": self.version, "key": self.key, "data_func": data_func}
+        if convert_func is not None:
+            self._data["convert_func"] = convert_func
 
         self._async_cleanup_delay_listener()
         self._async_ensure_final_write_listener()
@@ -161,6 +218,12 @@ class Store:
         if self.hass.state == CoreState.stopping:
             return
 
+        # Repeated delayed saves postpone the write, but never beyond a deadline
+        now = dt_util.utcnow()
+        if self._delay_deadline is None:
+            self._delay_deadline = now + timedelta(seconds=max(delay, MAX_WRITE_DELAY))
+        delay = max(0, min(delay, (self._delay_deadline - now).total_seconds()))
+
         self._unsub_delay_listener = async_call_later(
             self.hass, delay, self._async_callback_delayed_write
         )
@@ -216,21 +279,49 @@ class Store:
                 data["data"] = data.pop("data_func")()
 
             self._data = None
+            self._delay_deadline = None
 
+            start = time.monotonic()
             try:
-                await self.hass.async_add_executor_job(
-                    self._write_data, self.path, data
+                written = await self.hass.async_add_pool_executor_job(
+                    EXECUTOR_POOL_IO, self._convert_and_write_data, self.path, data
                 )
             except (json_util.SerializationError, json_util.WriteError) as err:
                 _LOGGER.error("Error writing config for %s: %s", self.key, err)
+            else:
+                self._async_record_write(written or 0, time.monotonic() - start)
+
+    @callback
+    def _async_record_write(self, written: int, duration: float) -> None:
+        """Record statistics of a finished write."""
+        stats = async_get_write_stats(self.hass).setdefault(self.key, StoreWriteStats())
+        stats.write_count += 1
+        stats.write_bytes += written
+        stats.write_duration += duration
+        stats.last_write_bytes = written
+        stats.last_write_duration = duration
+        _LOGGER.debug(
+            "Wrote %s bytes for %s in %.3f seconds (%s writes in total)",
+            written,
+            self.key,
+            duration,
+            stats.write_count,
+        )
+
+    def _convert_and_write_data(self, path: str, data: Dict) -> int:
+        """Convert a snapshot to the data to save and write it."""
+        if "convert_func" in data:
+            data["data"] = data.pop("convert_func")(data["data"])
+        return self._write_data(path, data)
 
-    def _write_data(self, path: str, data: Dict) -> None:
-        """Write the data."""
+    def _write_data(self, path: str, data: Dict) -> int:
+        """Write the data and return the size of the written file."""
         if not os.path.isdir(os.path.dirname(path)):
             os.makedirs(os.path.dirname(path))
 
         _LOGGER.debug("Writing data for %s to %s", self.key, path)
         json_util.save_json(path, data, self._private, encoder=self._encoder)
+        return os.path.getsize(path)
 
     async def _async_migrate_func(self, old_version, old_data):
         """Migrate to the new version."""
@@ -239,6 +330,7 @@ class Store:
     async def async_remove(self):
         """Remove all data."""
         self._async_cleanup_delay_listener()
+        self._delay_deadline = None
         self._async_cleanup_final_write_listener()
 
         try:
@@ -841,6 +841,7 @@ def expand(hass: HomeAssistantType, *args: Any) -> Iterable[State]:
     """Expand out any groups into entity states."""
     search = list(args)
     found = {}
+    expanded_groups = set()
     while search:
         entity = search.pop()
         if isinstance(entity, str):
@@ -858,6 +859,10 @@ def expand(hass: HomeAssistantType, *args: Any) -> Iterable[State]:
             continue
 
         if entity_id.startswith(_GROUP_DOMAIN_PREFIX):
+            # Groups that contain each other are only expanded once
+            if entity_id in expanded_groups:
+                continue
+            expanded_groups.add(entity_id)
             # Collect state will be called in here since it's wrapped
             group_entities = entity.attributes.get(ATTR_ENTITY_ID)
             if group_entities:
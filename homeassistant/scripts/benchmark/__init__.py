@@ -4,6 +4,7 @@ import asyncio
 import collections
 from contextlib import suppress
 from datetime import datetime
+import gzip
 import json
 import logging
 from timeit import default_timer as timer
@@ -11,8 +12,16 @@ from typing import Callable, Dict, TypeVar
 
 from homeassistant import core
 from homeassistant.components.websocket_api.const import JSON_DUMP
-from homeassistant.const import ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
-from homeassistant.helpers.entityfilter import convert_include_exclude_filter
+from homeassistant.const import (
+    ATTR_NOW,
+    EVENT_STATE_CHANGED,
+    EVENT_TIME_CHANGED,
+    TEMP_CELSIUS,
+)
+from homeassistant.helpers.entityfilter import (
+    convert_include_exclude_filter,
+    generate_filter,
+)
 from homeassistant.helpers.json import JSONEncoder
 from homeassistant.util import dt as dt_util
 
@@ -375,6 +384,82 @@ async def valid_entity_id(hass):
     return timer() - start
 
 
+@benchmark
+async def state_triggers(hass):
+    """Run 100k state changes through 1000 state triggers on 20 entities."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.homeassistant.triggers import state
+
+    count = 0
+    entity_ids = [f"binary_sensor.motion_{idx}" for idx in range(20)]
+    values = [f"value_{idx}" for idx in range(10)]
+    events_to_fire = 10 ** 5
+
+    @core.callback
+    def action(*args):
+        """Handle trigger."""
+        nonlocal count
+        count += 1
+
+    for idx in range(1000):
+        await state.async_attach_trigger(
+            hass,
+            state.TRIGGER_SCHEMA(
+                {
+                    "platform": "state",
+                    "entity_id": entity_ids[idx % len(entity_ids)],
+                    "to": values[idx // len(entity_ids) % len(values)],
+                }
+            ),
+            action,
+            {},
+        )
+
+    start = timer()
+
+    for idx in range(events_to_fire):
+        hass.states.async_set(
+            entity_ids[idx % len(entity_ids)],
+            values[idx // len(entity_ids) % len(values)],
+        )
+
+    await hass.async_block_till_done()
+
+    # Every state change matches the "to" of 5 of the 50 triggers of its entity
+    assert count == events_to_fire * 5
+
+    return timer() - start
+
+
+@benchmark
+async def expand_nested_groups(hass):
+    """Expand a group of 20 groups of 20 lights nested 10 levels deep 10k times."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components import group
+
+    for idx in range(20):
+        members = [f"light.light_{idx}_{light}" for light in range(20)]
+        # Every group also contains the lights of the next group in the chain
+        if idx % 10 != 9:
+            members.append(f"group.group_{idx + 1}")
+        hass.states.async_set(f"group.group_{idx}", "on", {"entity_id": members})
+
+    hass.states.async_set(
+        "group.all_lights",
+        "on",
+        {"entity_id": [f"group.group_{idx}" for idx in range(20)]},
+    )
+
+    start = timer()
+
+    for _ in range(10 ** 4):
+        entity_ids = group.expand_entity_ids(hass, ["group.all_lights"])
+
+    assert len(entity_ids) == 400
+
+    return timer() - start
+
+
 @benchmark
 async def json_serialize_states(hass):
     """Serialize million states with websocket default encoder."""
@@ -388,6 +473,252 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+def _prometheus_metrics(entities):
+    """Create Prometheus metrics of sensors and return them with their view."""
+    # pylint: disable=import-outside-toplevel
+    import prometheus_client
+
+    from homeassistant.components import prometheus
+    from homeassistant.helpers.entity_values import EntityValues
+
+    metrics = prometheus.PrometheusMetrics(
+        prometheus_client,
+        generate_filter([], [], [], []),
+        None,
+        TEMP_CELSIUS,
+        EntityValues({}, {}, {}),
+        None,
+        None,
+    )
+    events = [
+        core.Event(
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": f"sensor.sensor_{idx}",
+                "new_state": core.State(
+                    f"sensor.sensor_{idx}",
+                    str(idx),
+                    {
+                        "friendly_name": f"Sensor {idx}",
+                        "unit_of_measurement": TEMP_CELSIUS,
+                    },
+                ),
+            },
+        )
+        for idx in range(entities)
+    ]
+    return metrics, prometheus.PrometheusView(prometheus_client), events
+
+
+def _prometheus_unregister(metrics):
+    """Unregister the metrics from the Prometheus registry."""
+    # pylint: disable=import-outside-toplevel
+    import prometheus_client
+
+    # pylint: disable=protected-access
+    for metric in metrics._metrics.values():
+        prometheus_client.REGISTRY.unregister(metric)
+
+
+@benchmark
+async def prometheus_state_changes(hass):
+    """Handle 10 state changes of 10k entities for Prometheus."""
+    metrics, _, events = _prometheus_metrics(10 ** 4)
+
+    start = timer()
+
+    for _ in range(10):
+        for event in events:
+            metrics.handle_event(event)
+
+    elapsed = timer() - start
+    _prometheus_unregister(metrics)
+    return elapsed
+
+
+@benchmark
+async def prometheus_scrape(hass):
+    """Scrape the metrics of 10k entities from Prometheus 10 times."""
+    metrics, view, events = _prometheus_metrics(10 ** 4)
+    for event in events:
+        metrics.handle_event(event)
+
+    start = timer()
+
+    for _ in range(10):
+        # pylint: disable=protected-access
+        view._render(None, False)
+
+    elapsed = timer() - start
+    _prometheus_unregister(metrics)
+    return elapsed
+
+
+@benchmark
+async def influxdb_state_changes(hass):
+    """Encode 10 state changes of 10k entities into InfluxDB write batches."""
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components import influxdb
+    from homeassistant.components.influxdb.const import BATCH_BUFFER_SIZE, GZIP_LEVEL
+
+    # pylint: disable=protected-access
+    event_to_line = influxdb._generate_event_to_line(influxdb.INFLUX_SCHEMA({}))
+    now = dt_util.utcnow()
+    events = [
+        core.Event(
+            EVENT_STATE_CHANGED,
+            {
+                "entity_id": f"sensor.sensor_{idx}",
+                "new_state": core.State(
+                    f"sensor.sensor_{idx}",
+                    str(change + idx / 10),
+                    {
+                        "friendly_name": f"Sensor {idx}",
+                        "unit_of_measurement": TEMP_CELSIUS,
+                        "device_class": "temperature",
+                        "battery_level": 87,
+                        "last_seen": "Last seen 2 minutes ago",
+                    },
+                ),
+            },
+            time_fired=now,
+        )
+        for change in range(10)
+        for idx in range(10 ** 4)
+    ]
+
+    start = timer()
+
+    for idx in range(0, len(events), BATCH_BUFFER_SIZE):
+        lines = [
+            line
+            for line in map(event_to_line, events[idx : idx + BATCH_BUFFER_SIZE])
+            if line
+        ]
+        gzip.compress("\n".join(lines).encode(), GZIP_LEVEL)
+
+    return timer() - start
+
+
+@benchmark
+async def authenticated_requests(hass):
+    """Pass 100k authenticated requests through the ban and auth middlewares."""
+    # pylint: disable=import-outside-toplevel
+    from ipaddress import IPv4Address
+    import tempfile
+
+    from aiohttp import hdrs, web
+    from aiohttp.test_utils import make_mocked_request
+
+    from homeassistant import auth
+    from homeassistant.components.http.auth import setup_auth
+    from homeassistant.components.http.ban import (
+        KEY_BANNED_IPS,
+        IpBan,
+        IpBans,
+        setup_bans,
+    )
+    from homeassistant.components.http.const import KEY_AUTHENTICATED
+    from homeassistant.helpers import device_registry, entity_registry
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        await device_registry.async_load(hass)
+        await entity_registry.async_load(hass)
+        hass.auth = await auth.auth_manager_from_config(hass, [], [])
+        user = await hass.auth.async_create_system_user("Benchmark")
+        refresh_token = await hass.auth.async_create_refresh_token(user)
+        access_token = hass.auth.async_create_access_token(refresh_token)
+
+        app = web.Application()
+        app["hass"] = hass
+        setup_bans(hass, app, 5)
+        setup_auth(hass, app)
+        # A thousand banned addresses and a few banned networks
+        app[KEY_BANNED_IPS] = IpBans(
+            [IpBan(IPv4Address(0xC8000000 + idx)) for idx in range(1000)]
+            + [IpBan("100.64.0.0/10"), IpBan("198.18.0.0/15")]
+        )
+        ban_middleware, auth_middleware = app.middlewares
+
+        async def handler(request):
+            """Return if the request is authenticated."""
+            return request[KEY_AUTHENTICATED]
+
+        async def auth_handler(request):
+            """Pass the request through the auth middleware."""
+            return await auth_middleware(request, handler)
+
+        request = make_mocked_request(
+            "GET",
+            "/api/states",
+            headers={hdrs.AUTHORIZATION: f"Bearer {access_token}"},
+            app=app,
+        ).clone(remote="192.168.1.10")
+
+        start = timer()
+
+        for _ in range(10 ** 5):
+            assert await ban_middleware(request, auth_handler)
+
+        return timer() - start
+
+
+@benchmark
+async def zha_attribute_reports(hass):
+    """Handle 100 reports of 3 attributes from each of 300 ZHA devices."""
+    # pylint: disable=import-outside-toplevel
+    from types import SimpleNamespace
+
+    from homeassistant.components.zha.core.const import SIGNAL_ATTR_UPDATED
+    from homeassistant.components.zha.core.gateway import ZHAGateway
+    from homeassistant.components.zha.entity import BaseZhaEntity
+
+    class ReportingEntity(BaseZhaEntity):
+        """Entity keeping the reported attributes as state attributes."""
+
+        @core.callback
+        def async_set_state(self, attr_id, attr_name, value):
+            """Set the reported attribute."""
+            self._device_state_attributes[attr_name] = value
+            self.async_write_ha_state()
+
+    gateway = ZHAGateway(hass, {}, None)
+    attributes = (
+        (0x0000, "measured_value"),
+        (0x0001, "min_measured_value"),
+        (0x0002, "max_measured_value"),
+    )
+    reports_keys = []
+    for idx in range(300):
+        zha_device = SimpleNamespace(gateway=gateway)
+        channel = SimpleNamespace(reports_key=(idx, 1, 0x0402))
+        entity = ReportingEntity(f"zha_{idx}", zha_device)
+        entity.hass = hass
+        entity.entity_id = f"sensor.zha_{idx}"
+        entity.async_accept_signal(channel, SIGNAL_ATTR_UPDATED, entity.async_set_state)
+        reports_keys.append(channel.reports_key)
+        # Reports of a cluster no entity listens to
+        reports_keys.append((idx, 1, 0x0001))
+        gateway.register_entity_reference(
+            idx, entity.entity_id, zha_device, {}, {}, None
+        )
+
+    start = timer()
+
+    for report in range(100):
+        for reports_key in reports_keys:
+            for attr_id, attr_name in attributes:
+                gateway.async_attribute_updated(reports_key, attr_id, attr_name, report)
+        await asyncio.sleep(0)
+        for idx in range(0, 300, 10):
+            gateway.get_entity_reference(f"sensor.zha_{idx}")
+
+    assert hass.states.get("sensor.zha_0").attributes["measured_value"] == 99
+
+    return timer() - start
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -0,0 +1,118 @@
+"""Executor util helpers."""
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+@dataclass
+class ExecutorStats:
+    """Snapshot of the statistics of an instrumented executor."""
+
+    max_workers: int
+    queued: int
+    active: int
+    completed: int
+    total_wait: float
+    max_wait: float
+    longest_running: float
+    longest_running_job: Optional[str]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a dictionary representation of the stats."""
+        return {
+            "max_workers": self.max_workers,
+            "queued": self.queued,
+            "active": self.active,
+            "completed": self.completed,
+            "total_wait": self.total_wait,
+            "max_wait": self.max_wait,
+            "longest_running": self.longest_running,
+            "longest_running_job": self.longest_running_job,
+        }
+
+
+def _job_name(target: Callable[..., Any]) -> str:
+    """Return a readable name for an executor job."""
+    while isinstance(target, functools.partial):
+        target = target.func
+    return getattr(target, "__qualname__", None) or repr(target)
+
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor that tracks queue wait time and running jobs."""
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = "") -> None:
+        """Initialize the executor."""
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self.max_workers = max_workers
+        self._stats_lock = threading.Lock()
+        self._queued = 0
+        self._completed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        # Start time and name of the running jobs, keyed by a unique job id
+        self._running: Dict[int, Any] = {}
+        self._next_job_id = 0
+
+    def submit(  # type: ignore  # pylint: disable=arguments-differ
+        self, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Future:
+        """Submit a job and track its wait and run time."""
+        submitted = time.monotonic()
+        with self._stats_lock:
+            self._queued += 1
+            job_id = self._next_job_id
+            self._next_job_id += 1
+
+        def _run_job() -> Any:
+            started = time.monotonic()
+            wait = started - submitted
+            with self._stats_lock:
+                self._queued -= 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+                self._running[job_id] = (started, fn)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._stats_lock:
+                    del self._running[job_id]
+                    self._completed += 1
+
+        try:
+            return super().submit(_run_job)
+        except RuntimeError:
+            # Executor is shut down
+            with self._stats_lock:
+                self._queued -= 1
+            raise
+
+    def stats(self) -> ExecutorStats:
+        """Return a snapshot of the executor statistics."""
+        now = time.monotonic()
+        with self._stats_lock:
+            longest_running = 0.0
+            longest_running_job = None
+            for started, target in self._running.values():
+                if now - started >= longest_running:
+                    longest_running = now - started
+                    longest_running_job = target
+            return ExecutorStats(
+                max_workers=self.max_workers,
+                queued=self._queued,
+                active=len(self._running),
+                completed=self._completed,
+                total_wait=self._total_wait,
+                max_wait=self._max_wait,
+                longest_running=longest_running,
+                longest_running_job=(
+                    None
+                    if longest_running_job is None
+                    else _job_name(longest_running_job)
+                ),
+            )
@@ -1,5 +1,6 @@
 """Tests for the Home Assistant auth module."""
 from datetime import timedelta
+import time
 from unittest.mock import Mock, patch
 
 import jwt
@@ -13,7 +14,7 @@ from homeassistant.auth import (
     const as auth_const,
     models as auth_models,
 )
-from homeassistant.auth.const import MFA_SESSION_EXPIRATION
+from homeassistant.auth.const import ACCESS_TOKEN_CACHE_TTL, MFA_SESSION_EXPIRATION
 from homeassistant.core import callback
 from homeassistant.util import dt as dt_util
 
@@ -523,6 +524,7 @@ async def test_remove_refresh_token(mock_hass):
     user = MockUser().add_to_auth_manager(manager)
     refresh_token = await manager.async_create_refresh_token(user, CLIENT_ID)
     access_token = manager.async_create_access_token(refresh_token)
+    assert await manager.async_validate_access_token(access_token) is refresh_token
 
     await manager.async_remove_refresh_token(refresh_token)
 
@@ -530,6 +532,40 @@ async def test_remove_refresh_token(mock_hass):
     assert await manager.async_validate_access_token(access_token) is None
 
 
+async def test_validated_access_token_cache(mock_hass):
+    """Test validated access tokens are cached until they expire."""
+    manager = await auth.auth_manager_from_config(mock_hass, [], [])
+    user = MockUser().add_to_auth_manager(manager)
+    refresh_token = await manager.async_create_refresh_token(user, CLIENT_ID)
+    access_token = manager.async_create_access_token(refresh_token)
+
+    with patch("homeassistant.auth.jwt.decode", wraps=jwt.decode) as mock_decode:
+        assert await manager.async_validate_access_token(access_token) is refresh_token
+        assert await manager.async_validate_access_token(access_token) is refresh_token
+        assert mock_decode.call_count == 2
+
+        with patch(
+            "homeassistant.auth.time.time",
+            return_value=time.time() + ACCESS_TOKEN_CACHE_TTL.total_seconds(),
+        ):
+            assert (
+                await manager.async_validate_access_token(access_token) is refresh_token
+            )
+        assert mock_decode.call_count == 4
+
+
+async def test_deactivating_user_invalidates_access_token(mock_hass):
+    """Test the access tokens of a deactivated user are no longer valid."""
+    manager = await auth.auth_manager_from_config(mock_hass, [], [])
+    user = MockUser().add_to_auth_manager(manager)
+    refresh_token = await manager.async_create_refresh_token(user, CLIENT_ID)
+    access_token = manager.async_create_access_token(refresh_token)
+    assert await manager.async_validate_access_token(access_token) is refresh_token
+
+    await manager.async_deactivate_user(user)
+    assert await manager.async_validate_access_token(access_token) is None
+
+
 async def test_create_access_token(mock_hass):
     """Test normal refresh_token's jwt_key keep same after used."""
     manager = await auth.auth_manager_from_config(mock_hass, [], [])
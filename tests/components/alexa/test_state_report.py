@@ -1,11 +1,26 @@
 """Test report state."""
+from datetime import timedelta
 from unittest.mock import patch
 
 from homeassistant import core
 from homeassistant.components.alexa import state_report
+from homeassistant.components.alexa.entities import ENTITY_ADAPTERS, AlexaEntity
+from homeassistant.util.dt import utcnow
 
 from . import DEFAULT_CONFIG, TEST_URL
 
+from tests.common import async_fire_time_changed
+from tests.test_util.aiohttp import AiohttpClientMockResponse
+
+
+async def async_quiet_window(hass):
+    """Pass the window an entity has to be quiet for to be reported."""
+    await hass.async_block_till_done()
+    async_fire_time_changed(
+        hass, utcnow() + timedelta(seconds=state_report.CHANGE_REPORT_QUIET)
+    )
+    await hass.async_block_till_done()
+
 
 async def test_report_state(hass, aioclient_mock):
     """Test proactive state reports."""
@@ -26,7 +41,7 @@ async def test_report_state(hass, aioclient_mock):
     )
 
     # To trigger event listener
-    await hass.async_block_till_done()
+    await async_quiet_window(hass)
 
     assert len(aioclient_mock.mock_calls) == 1
     call = aioclient_mock.mock_calls
@@ -72,7 +87,7 @@ async def test_report_state_instance(hass, aioclient_mock):
     )
 
     # To trigger event listener
-    await hass.async_block_till_done()
+    await async_quiet_window(hass)
 
     assert len(aioclient_mock.mock_calls) == 1
     call = aioclient_mock.mock_calls
@@ -203,7 +218,7 @@ async def test_proactive_mode_filter_states(hass, aioclient_mock):
         "on",
         {"friendly_name": "Test Contact Sensor", "device_class": "door"},
     )
-    await hass.async_block_till_done()
+    await async_quiet_window(hass)
     assert len(aioclient_mock.mock_calls) == 1
 
     aioclient_mock.clear_requests()
@@ -268,12 +283,111 @@ async def test_proactive_mode_filter_states(hass, aioclient_mock):
             "off",
             {"friendly_name": "Test Contact Sensor", "device_class": "door"},
         )
-        await hass.async_block_till_done()
+        await async_quiet_window(hass)
         hass.states.async_set(
             "binary_sensor.same_serialize",
             "off",
             {"friendly_name": "Test Contact Sensor", "device_class": "door"},
         )
 
+        await async_quiet_window(hass)
+    assert len(aioclient_mock.mock_calls) == 1
+
+
+async def test_report_state_coalesced(hass, aioclient_mock):
+    """Test only the latest change of a rapidly changing entity is reported."""
+    aioclient_mock.post(TEST_URL, text="", status=202)
+
+    hass.states.async_set("light.kitchen", "on", {"supported_features": 1})
+    await state_report.async_enable_proactive_mode(hass, DEFAULT_CONFIG)
+
+    for brightness in range(10, 110, 10):
+        hass.states.async_set(
+            "light.kitchen", "on", {"supported_features": 1, "brightness": brightness}
+        )
         await hass.async_block_till_done()
+    assert len(aioclient_mock.mock_calls) == 0
+
+    await async_quiet_window(hass)
+
     assert len(aioclient_mock.mock_calls) == 1
+    properties = aioclient_mock.mock_calls[0][2]["event"]["payload"]["change"][
+        "properties"
+    ]
+    brightness = next(prop for prop in properties if prop["name"] == "brightness")
+    assert brightness["value"] == 39
+
+
+async def test_change_report_sender(hass, aioclient_mock):
+    """Test the sender counts and retries reports to a mock endpoint."""
+    responses = [503, 202]
+
+    async def endpoint(method, url, data):
+        """Stand in for the Alexa event gateway."""
+        return AiohttpClientMockResponse(method, url, status=responses.pop(0), text="")
+
+    aioclient_mock.post(TEST_URL, side_effect=endpoint)
+    sender = state_report.ChangeReportSender(hass, DEFAULT_CONFIG)
+
+    hass.states.async_set("binary_sensor.test_contact", "on", {"device_class": "door"})
+    entity = ENTITY_ADAPTERS["binary_sensor"](
+        hass, DEFAULT_CONFIG, hass.states.get("binary_sensor.test_contact")
+    )
+
+    first = sender.async_serialize_properties(entity)
+    sender.async_schedule(entity, first)
+    # Unchanged properties keep their serialized form
+    second = sender.async_serialize_properties(entity)
+    assert second[0] is first[0]
+    sender.async_schedule(entity, second)
+
+    with patch.object(state_report, "CHANGE_REPORT_BACKOFF", 0):
+        await async_quiet_window(hass)
+
+    assert len(aioclient_mock.mock_calls) == 2
+    assert sender.sent == 1
+    assert sender.suppressed == 1
+    assert sender.failed == 0
+
+
+async def test_change_report_sender_serialize_cache(hass):
+    """Test properties are only serialized again when what they read changed."""
+    sender = state_report.ChangeReportSender(hass, DEFAULT_CONFIG)
+
+    def serialize(state, attributes):
+        hass.states.async_set("light.kitchen", state, attributes)
+        entity = ENTITY_ADAPTERS["light"](
+            hass, DEFAULT_CONFIG, hass.states.get("light.kitchen")
+        )
+        return sender.async_serialize_properties(entity)
+
+    with patch.object(
+        AlexaEntity,
+        "serialize_properties",
+        autospec=True,
+        side_effect=AlexaEntity.serialize_properties,
+    ) as mock_serialize:
+        first = serialize("on", {"supported_features": 1, "brightness": 128})
+        assert mock_serialize.call_count == 1
+
+        # Attributes the properties don't read don't serialize them again
+        second = serialize(
+            "on", {"supported_features": 1, "brightness": 128, "unrelated": 1}
+        )
+        assert second is first
+        assert mock_serialize.call_count == 1
+
+        third = serialize("on", {"supported_features": 1, "brightness": 255})
+        assert mock_serialize.call_count == 2
+        assert third != first
+
+        serialize("off", {"supported_features": 1, "brightness": 255})
+        assert mock_serialize.call_count == 3
+
+        # Without attributes any attribute can change the properties
+        serialize("on", {})
+        serialize("on", {"supported_features": 1, "brightness": 128})
+        assert mock_serialize.call_count == 5
+
+    sender.async_remove("light.kitchen")
+    assert not sender._serialized
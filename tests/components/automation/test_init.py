@@ -1,5 +1,6 @@
 """The tests for the automation component."""
 import asyncio
+from copy import deepcopy
 import logging
 from unittest.mock import Mock, patch
 
@@ -627,7 +628,77 @@ async def test_reload_config_handles_load_fails(hass, calls):
     assert len(calls) == 2
 
 
-@pytest.mark.parametrize("service", ["turn_off_stop", "turn_off_no_stop", "reload"])
+async def test_reload_keeps_unchanged_automations(hass, calls):
+    """Test that reloading only replaces automations that changed."""
+    config = {
+        automation.DOMAIN: [
+            {
+                "id": "sun",
+                "alias": "sun",
+                "trigger": {"platform": "event", "event_type": "test_event"},
+                "action": {
+                    "service": "test.automation",
+                    "data_template": {"event": "{{ trigger.event.event_type }}"},
+                },
+            },
+            {
+                "alias": "moon",
+                "trigger": {"platform": "event", "event_type": "test_event"},
+                "action": {"service": "test.automation"},
+            },
+            {
+                "alias": "stars",
+                "trigger": {"platform": "event", "event_type": "test_event"},
+                "action": {"service": "test.automation"},
+            },
+        ]
+    }
+    assert await async_setup_component(hass, automation.DOMAIN, config)
+    component = hass.data[automation.DOMAIN]
+    sun = component.get_entity("automation.sun")
+    moon = component.get_entity("automation.moon")
+    assert sun is not None
+    assert moon is not None
+
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    assert len(calls) == 3
+
+    new_config = deepcopy(config)
+    new_config[automation.DOMAIN][1]["trigger"]["event_type"] = "test_event2"
+    del new_config[automation.DOMAIN][2]
+    new_config[automation.DOMAIN].append(
+        {
+            "alias": "comet",
+            "trigger": {"platform": "event", "event_type": "test_event"},
+            "action": {"service": "test.automation"},
+        }
+    )
+
+    with patch(
+        "homeassistant.config.load_yaml_config_file",
+        autospec=True,
+        return_value=new_config,
+    ):
+        await hass.services.async_call(automation.DOMAIN, SERVICE_RELOAD, blocking=True)
+
+    assert component.get_entity("automation.sun") is sun
+    assert component.get_entity("automation.moon") not in (None, moon)
+    assert hass.states.get("automation.stars") is None
+    assert hass.states.get("automation.comet") is not None
+
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+    assert len(calls) == 5
+
+    hass.bus.async_fire("test_event2")
+    await hass.async_block_till_done()
+    assert len(calls) == 6
+
+
+@pytest.mark.parametrize(
+    "service", ["turn_off_stop", "turn_off_no_stop", "reload", "reload_same_config"]
+)
 async def test_automation_stops(hass, calls, service):
     """Test that turning off / reloading stops any running actions as appropriate."""
     entity_id = "automation.hello"
@@ -673,6 +744,9 @@ async def test_automation_stops(hass, calls, service):
             blocking=True,
         )
     else:
+        if service == "reload":
+            config = deepcopy(config)
+            config[automation.DOMAIN]["trigger"]["event_type"] = "test_event2"
         with patch(
             "homeassistant.config.load_yaml_config_file",
             autospec=True,
@@ -685,7 +759,9 @@ async def test_automation_stops(hass, calls, service):
     hass.states.async_set(test_entity, "goodbye")
     await hass.async_block_till_done()
 
-    assert len(calls) == (1 if service == "turn_off_no_stop" else 0)
+    assert len(calls) == (
+        1 if service in ("turn_off_no_stop", "reload_same_config") else 0
+    )
 
 
 async def test_automation_restore_state(hass):
@@ -1131,6 +1207,43 @@ async def test_extraction_functions(hass):
     }
 
 
+async def test_extraction_functions_updated_on_reload(hass):
+    """Test the references of automations follow reloads."""
+    config = {
+        DOMAIN: {
+            "alias": "test1",
+            "trigger": {"platform": "state", "entity_id": "sensor.trigger_1"},
+            "action": {
+                "domain": "light",
+                "device_id": "device-1",
+                "entity_id": "light.bla",
+                "type": "turn_on",
+            },
+        }
+    }
+    assert await async_setup_component(hass, DOMAIN, config)
+    assert automation.automations_with_entity(hass, "sensor.trigger_1") == [
+        "automation.test1"
+    ]
+    assert automation.automations_with_device(hass, "device-1") == ["automation.test1"]
+
+    config[DOMAIN]["trigger"]["entity_id"] = "sensor.trigger_2"
+    config[DOMAIN]["action"]["device_id"] = "device-2"
+    with patch(
+        "homeassistant.config.load_yaml_config_file",
+        autospec=True,
+        return_value=config,
+    ):
+        await hass.services.async_call(DOMAIN, SERVICE_RELOAD, blocking=True)
+
+    assert automation.automations_with_entity(hass, "sensor.trigger_1") == []
+    assert automation.automations_with_entity(hass, "sensor.trigger_2") == [
+        "automation.test1"
+    ]
+    assert automation.automations_with_device(hass, "device-1") == []
+    assert automation.automations_with_device(hass, "device-2") == ["automation.test1"]
+
+
 async def test_logbook_humanify_automation_triggered_event(hass):
     """Test humanifying Automation Trigger event."""
     hass.config.components.add("recorder")
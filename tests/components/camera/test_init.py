@@ -2,12 +2,16 @@
 import asyncio
 import base64
 import io
-from unittest.mock import Mock, PropertyMock, mock_open, patch
+from unittest.mock import AsyncMock, Mock, PropertyMock, mock_open, patch
 
 import pytest
 
 from homeassistant.components import camera
-from homeassistant.components.camera.const import DOMAIN, PREF_PRELOAD_STREAM
+from homeassistant.components.camera.const import (
+    DATA_CAMERA_PREFS,
+    DOMAIN,
+    PREF_PRELOAD_STREAM,
+)
 from homeassistant.components.camera.prefs import CameraEntityPreferences
 from homeassistant.components.websocket_api.const import TYPE_RESULT
 from homeassistant.config import async_process_ha_core_config
@@ -354,3 +358,101 @@ async def test_record_service(hass, mock_camera, mock_stream):
         # So long as we call stream.record, the rest should be covered
         # by those tests.
         assert mock_record.called
+
+
+async def test_camera_proxy_shares_concurrent_fetches(
+    hass, aiohttp_client, mock_camera
+):
+    """Test concurrent proxy requests share a single fetch from the camera."""
+    await async_setup_component(hass, "http", {})
+    client = await aiohttp_client(hass.http.app)
+    entity = hass.data[DOMAIN].get_entity("camera.demo_camera")
+    release = asyncio.Event()
+    calls = 0
+
+    async def camera_image():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return b"Shared"
+
+    url = f"/api/camera_proxy/camera.demo_camera?token={entity.access_tokens[-1]}"
+    with patch.object(entity, "async_camera_image", camera_image):
+        requests = [asyncio.ensure_future(client.get(url)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        release.set()
+        responses = await asyncio.gather(*requests)
+
+        assert calls == 1
+        for response in responses:
+            assert response.status == 200
+            assert await response.read() == b"Shared"
+
+        # A later request fetches a fresh image
+        response = await client.get(url)
+        assert await response.read() == b"Shared"
+        assert calls == 2
+
+
+async def test_still_stream_frames_are_shared(hass, mock_camera):
+    """Test still stream viewers share fetches and only get changed frames."""
+    entity = hass.data[DOMAIN].get_entity("camera.demo_camera")
+    images = [b"one", b"one", b"two", b""]
+    calls = 0
+
+    async def camera_image():
+        nonlocal calls
+        calls += 1
+        return images.pop(0)
+
+    async def collect():
+        return [frame async for frame in entity.image_fetcher.async_frames(0)]
+
+    with patch.object(entity, "async_camera_image", camera_image):
+        first, second = await asyncio.gather(collect(), collect())
+
+    assert first == second == [b"one", b"two"]
+    assert calls == 4
+
+
+async def test_get_image_from_running_stream(hass, mock_camera):
+    """Test images are taken from the running stream of a camera."""
+    entity = hass.data[DOMAIN].get_entity("camera.demo_camera")
+    entity.stream = Mock(async_get_image=AsyncMock(return_value=b"Keyframe"))
+
+    # Disabled by default as the images can be as old as the last keyframe
+    image = await camera.async_get_image(hass, "camera.demo_camera")
+    assert image.content == b"Test"
+
+    await hass.data[DATA_CAMERA_PREFS].async_update(
+        "camera.demo_camera", stream_stills=True
+    )
+    image = await camera.async_get_image(hass, "camera.demo_camera")
+    assert image.content == b"Keyframe"
+
+    # Fall back to the camera when the stream has no image
+    entity.stream.async_get_image.return_value = None
+    image = await camera.async_get_image(hass, "camera.demo_camera")
+    assert image.content == b"Test"
+
+
+async def test_websocket_stream_metrics(hass, hass_ws_client, mock_camera):
+    """Test the metrics of the stream of a camera."""
+    client = await hass_ws_client(hass)
+    await client.send_json(
+        {"id": 1, "type": "camera/stream_metrics", "entity_id": "camera.demo_camera"}
+    )
+    msg = await client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == "not_found"
+
+    entity = hass.data[DOMAIN].get_entity("camera.demo_camera")
+    entity.stream = Mock(
+        metrics=Mock(return_value={"segments": 3, "bytes_held": 1024, "viewers": 2})
+    )
+    await client.send_json(
+        {"id": 2, "type": "camera/stream_metrics", "entity_id": "camera.demo_camera"}
+    )
+    msg = await client.receive_json()
+    assert msg["success"]
+    assert msg["result"] == {"segments": 3, "bytes_held": 1024, "viewers": 2}
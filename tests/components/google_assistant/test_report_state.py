@@ -1,13 +1,27 @@
 """Test Google report state."""
+from datetime import timedelta
 from unittest.mock import AsyncMock, patch
 
 from homeassistant.components.google_assistant import error, report_state
+from homeassistant.components.google_assistant.const import REPORT_STATE_BASE_URL
+from homeassistant.components.google_assistant.http import GoogleConfig
 from homeassistant.setup import async_setup_component
 from homeassistant.util.dt import utcnow
 
 from . import BASIC_CONFIG
 
 from tests.common import async_fire_time_changed
+from tests.components.google_assistant.test_http import DUMMY_CONFIG, MOCK_TOKEN
+from tests.test_util.aiohttp import AiohttpClientMockResponse
+
+
+async def async_close_window(hass):
+    """Pass the window that coalesces state changes."""
+    await hass.async_block_till_done()
+    async_fire_time_changed(
+        hass, utcnow() + timedelta(seconds=report_state.REPORT_STATE_WINDOW)
+    )
+    await hass.async_block_till_done()
 
 
 async def test_report_state(hass, caplog, legacy_patchable_time):
@@ -17,7 +31,7 @@ async def test_report_state(hass, caplog, legacy_patchable_time):
     hass.states.async_set("switch.ac", "on")
 
     with patch.object(
-        BASIC_CONFIG, "async_report_state_all", AsyncMock()
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value={})
     ) as mock_report, patch.object(report_state, "INITIAL_REPORT_DELAY", 0):
         unsub = report_state.async_enable_report_state(hass, BASIC_CONFIG)
 
@@ -36,10 +50,10 @@ async def test_report_state(hass, caplog, legacy_patchable_time):
     }
 
     with patch.object(
-        BASIC_CONFIG, "async_report_state_all", AsyncMock()
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value={})
     ) as mock_report:
         hass.states.async_set("light.kitchen", "on")
-        await hass.async_block_till_done()
+        await async_close_window(hass)
 
     assert len(mock_report.mock_calls) == 1
     assert mock_report.mock_calls[0][1][0] == {
@@ -50,14 +64,16 @@ async def test_report_state(hass, caplog, legacy_patchable_time):
     with patch(
         "homeassistant.components.google_assistant.report_state.GoogleEntity.query_serialize",
         return_value={"same": "info"},
-    ), patch.object(BASIC_CONFIG, "async_report_state_all", AsyncMock()) as mock_report:
+    ), patch.object(
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value={})
+    ) as mock_report:
         # New state, so reported
         hass.states.async_set("light.double_report", "on")
         await hass.async_block_till_done()
 
         # Changed, but serialize is same, so filtered out by extra check
         hass.states.async_set("light.double_report", "off")
-        await hass.async_block_till_done()
+        await async_close_window(hass)
 
         assert len(mock_report.mock_calls) == 1
         assert mock_report.mock_calls[0][1][0] == {
@@ -66,22 +82,22 @@ async def test_report_state(hass, caplog, legacy_patchable_time):
 
     # Test that only significant state changes are reported
     with patch.object(
-        BASIC_CONFIG, "async_report_state_all", AsyncMock()
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value={})
     ) as mock_report:
         hass.states.async_set("switch.ac", "on", {"something": "else"})
-        await hass.async_block_till_done()
+        await async_close_window(hass)
 
     assert len(mock_report.mock_calls) == 0
 
     # Test that entities that we can't query don't report a state
     with patch.object(
-        BASIC_CONFIG, "async_report_state_all", AsyncMock()
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value={})
     ) as mock_report, patch(
         "homeassistant.components.google_assistant.report_state.GoogleEntity.query_serialize",
         side_effect=error.SmartHomeError("mock-error", "mock-msg"),
     ):
         hass.states.async_set("light.kitchen", "off")
-        await hass.async_block_till_done()
+        await async_close_window(hass)
 
     assert "Not reporting state for light.kitchen: mock-error"
     assert len(mock_report.mock_calls) == 0
@@ -89,9 +105,162 @@ async def test_report_state(hass, caplog, legacy_patchable_time):
     unsub()
 
     with patch.object(
-        BASIC_CONFIG, "async_report_state_all", AsyncMock()
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value={})
     ) as mock_report:
         hass.states.async_set("light.kitchen", "on")
-        await hass.async_block_till_done()
+        await async_close_window(hass)
 
     assert len(mock_report.mock_calls) == 0
+
+
+async def test_report_state_coalesces_changes(hass, legacy_patchable_time):
+    """Test state changes within the window are reported together."""
+    hass.states.async_set("light.ceiling", "off")
+
+    with patch.object(
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value={})
+    ) as mock_report, patch.object(report_state, "INITIAL_REPORT_DELAY", 0):
+        unsub = report_state.async_enable_report_state(hass, BASIC_CONFIG)
+        async_fire_time_changed(hass, utcnow())
+        await hass.async_block_till_done()
+
+    with patch.object(
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value={})
+    ) as mock_report:
+        for index in range(40):
+            hass.states.async_set(f"light.scene_{index}", "on")
+        hass.states.async_set("light.ceiling", "on")
+        hass.states.async_set("light.ceiling", "off")
+        await hass.async_block_till_done()
+        assert len(mock_report.mock_calls) == 0
+
+        await async_close_window(hass)
+
+    assert len(mock_report.mock_calls) == 1
+    states = mock_report.mock_calls[0][1][0]["devices"]["states"]
+    assert len(states) == 41
+    # Only the latest state of an entity is reported
+    assert states["light.ceiling"] == {"on": False, "online": True}
+
+    unsub()
+
+
+async def async_pass_backoff(hass, attempt):
+    """Pass the backoff before a retry."""
+    await hass.async_block_till_done()
+    async_fire_time_changed(
+        hass,
+        utcnow()
+        + timedelta(seconds=report_state.REPORT_STATE_BACKOFF * 2 ** (attempt - 1)),
+    )
+    await hass.async_block_till_done()
+
+
+async def test_report_state_batcher(hass, aioclient_mock, hass_storage):
+    """Test the batcher splits and retries reports to the homegraph api."""
+    config = GoogleConfig(hass, DUMMY_CONFIG)
+    await config.async_initialize()
+    await config.async_connect_agent_user("user")
+
+    responses = [503, 200, 200]
+
+    async def homegraph(method, url, data):
+        """Stand in for the homegraph api."""
+        return AiohttpClientMockResponse(method, url, status=responses.pop(0))
+
+    aioclient_mock.post(REPORT_STATE_BASE_URL, side_effect=homegraph)
+    batcher = report_state.ReportStateBatcher(hass, config)
+
+    with patch(
+        "homeassistant.components.google_assistant.http._get_homegraph_token",
+        return_value=MOCK_TOKEN,
+    ), patch.object(report_state, "REPORT_STATE_MAX_ENTITIES", 2):
+        for index in range(3):
+            batcher.async_schedule(f"light.light_{index}", {"on": True})
+        await batcher.async_flush()
+        # The failed report waits for the backoff without blocking others
+        assert len(aioclient_mock.mock_calls) == 2
+
+        await async_pass_backoff(hass, 1)
+
+    sent = [
+        list(call[2]["payload"]["devices"]["states"])
+        for call in aioclient_mock.mock_calls
+    ]
+    assert sent == [
+        ["light.light_0", "light.light_1"],
+        ["light.light_2"],
+        ["light.light_0", "light.light_1"],
+    ]
+    assert list(batcher.batch_sizes) == [1, 2]
+    assert len(batcher.latencies) == 2
+    assert batcher.retries == 1
+    assert batcher.failures == 0
+
+
+async def test_report_state_batcher_retries_failed_users(
+    hass, aioclient_mock, hass_storage
+):
+    """Test the batcher only retries the agent users whose report failed."""
+    config = GoogleConfig(hass, DUMMY_CONFIG)
+    await config.async_initialize()
+    await config.async_connect_agent_user("ok")
+    await config.async_connect_agent_user("busy")
+
+    responses = {"ok": [200, 200], "busy": [429, 200, 200]}
+
+    async def homegraph(method, url, data):
+        """Stand in for the homegraph api."""
+        status = responses[data["agentUserId"]].pop(0)
+        return AiohttpClientMockResponse(method, url, status=status)
+
+    aioclient_mock.post(REPORT_STATE_BASE_URL, side_effect=homegraph)
+    batcher = report_state.ReportStateBatcher(hass, config)
+
+    with patch(
+        "homeassistant.components.google_assistant.http._get_homegraph_token",
+        return_value=MOCK_TOKEN,
+    ):
+        batcher.async_schedule("light.ceiling", {"on": True})
+        batcher.async_schedule("light.kitchen", {"on": True})
+        await batcher.async_flush()
+        # A newer state is reported with the next flush, not with the retry
+        batcher.async_schedule("light.kitchen", {"on": False})
+        await async_pass_backoff(hass, 1)
+
+    sent = [
+        (call[2]["agentUserId"], list(call[2]["payload"]["devices"]["states"]))
+        for call in aioclient_mock.mock_calls
+    ]
+    assert sorted(sent[:2]) == [
+        ("busy", ["light.ceiling", "light.kitchen"]),
+        ("ok", ["light.ceiling", "light.kitchen"]),
+    ]
+    assert sorted(sent[2:]) == [
+        ("busy", ["light.ceiling"]),
+        ("busy", ["light.kitchen"]),
+        ("ok", ["light.kitchen"]),
+    ]
+    assert batcher.retries == 1
+    assert batcher.failures == 0
+
+    batcher.async_cancel()
+
+
+async def test_report_state_batcher_gives_up(hass, caplog):
+    """Test the batcher stops retrying a report."""
+    batcher = report_state.ReportStateBatcher(hass, BASIC_CONFIG)
+
+    with patch.object(
+        BASIC_CONFIG, "async_report_state_all", AsyncMock(return_value={"user": 429})
+    ) as mock_report:
+        batcher.async_schedule("light.ceiling", {"on": True})
+        await batcher.async_flush()
+        for attempt in range(1, report_state.REPORT_STATE_RETRIES + 1):
+            await async_pass_backoff(hass, attempt)
+
+    assert len(mock_report.mock_calls) == report_state.REPORT_STATE_RETRIES + 1
+    assert mock_report.mock_calls[-1][1][1] == ["user"]
+    assert batcher.failures == 1
+    assert not batcher.batch_sizes
+    assert "Unable to report state of 1 entities" in caplog.text
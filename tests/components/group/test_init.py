@@ -6,6 +6,7 @@ from unittest.mock import patch
 import homeassistant.components.group as group
 from homeassistant.const import (
     ATTR_ASSUMED_STATE,
+    ATTR_ENTITY_ID,
     ATTR_FRIENDLY_NAME,
     ATTR_ICON,
     EVENT_HOMEASSISTANT_START,
@@ -223,6 +224,64 @@ async def test_expand_entity_ids_recursive(hass):
     )
 
 
+async def test_expand_entity_ids_nested_cycle(hass):
+    """Test expand_entity_ids with nested groups that contain each other."""
+    hass.states.async_set(
+        "group.first", STATE_ON, {ATTR_ENTITY_ID: ["light.bowl", "group.second"]}
+    )
+    hass.states.async_set(
+        "group.second",
+        STATE_ON,
+        {ATTR_ENTITY_ID: ["light.ceiling", "group.first", "light.bowl"]},
+    )
+
+    assert group.expand_entity_ids(hass, ["group.first"]) == [
+        "light.bowl",
+        "light.ceiling",
+    ]
+    assert group.expand_entity_ids(hass, ["group.second"]) == [
+        "light.ceiling",
+        "light.bowl",
+    ]
+
+
+async def test_expand_entity_ids_follows_membership_changes(hass):
+    """Test expand_entity_ids picks up changed members of nested groups."""
+    assert await async_setup_component(hass, "group", {})
+    expanded = hass.data[group.DATA_EXPANDED_GROUPS][0]
+
+    hass.states.async_set("group.outer", STATE_ON, {ATTR_ENTITY_ID: ["group.inner"]})
+    hass.states.async_set("group.inner", STATE_ON, {ATTR_ENTITY_ID: ["light.bowl"]})
+    await hass.async_block_till_done()
+    assert group.expand_entity_ids(hass, ["group.outer"]) == ["light.bowl"]
+    assert "group.outer" in expanded
+
+    # A state change that keeps the members keeps the cached expansion
+    hass.states.async_set("group.inner", STATE_OFF, {ATTR_ENTITY_ID: ["light.bowl"]})
+    await hass.async_block_till_done()
+    assert "group.outer" in expanded
+    assert group.expand_entity_ids(hass, ["group.outer"]) == ["light.bowl"]
+
+    hass.states.async_set(
+        "group.inner", STATE_ON, {ATTR_ENTITY_ID: ["light.bowl", "light.ceiling"]}
+    )
+    await hass.async_block_till_done()
+    assert "group.outer" not in expanded
+    assert group.expand_entity_ids(hass, ["group.outer"]) == [
+        "light.bowl",
+        "light.ceiling",
+    ]
+
+    hass.states.async_remove("group.inner")
+    await hass.async_block_till_done()
+    assert group.expand_entity_ids(hass, ["group.outer"]) == []
+
+    # The expansion of a removed group is dropped
+    hass.states.async_remove("group.outer")
+    await hass.async_block_till_done()
+    assert "group.outer" not in expanded
+
+
 async def test_expand_entity_ids_ignores_non_strings(hass):
     """Test that non string elements in lists are ignored."""
     assert [] == group.expand_entity_ids(hass, [5, True])
@@ -439,7 +498,8 @@ async def test_reloading_groups(hass):
         "group.second_group",
         "group.test_group",
     ]
-    assert hass.bus.async_listeners()["state_changed"] == 1
+    # The group state trackers and the expansion cache
+    assert hass.bus.async_listeners()["state_changed"] == 2
     assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["hello.world"]) == 1
     assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["light.bowl"]) == 1
     assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.one"]) == 1
@@ -458,12 +518,110 @@ async def test_reloading_groups(hass):
         "group.all_tests",
         "group.hello",
     ]
-    assert hass.bus.async_listeners()["state_changed"] == 1
+    assert hass.bus.async_listeners()["state_changed"] == 2
     assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["light.bowl"]) == 1
     assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.one"]) == 1
     assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.two"]) == 1
 
 
+async def test_reloading_keeps_unchanged_groups(hass):
+    """Test reloading only replaces the groups that changed."""
+    assert await async_setup_component(
+        hass,
+        "group",
+        {
+            "group": {
+                "second_group": {"entities": "light.Bowl", "icon": "mdi:work"},
+                "test_group": "hello.world,sensor.happy",
+                "modified_group": "hello.world",
+            }
+        },
+    )
+    await hass.async_block_till_done()
+    component = hass.data[group.DOMAIN]
+    second_group = component.get_entity("group.second_group")
+    test_group = component.get_entity("group.test_group")
+
+    await hass.services.async_call(
+        group.DOMAIN,
+        group.SERVICE_SET,
+        {"object_id": "modified_group", "entities": "sensor.happy"},
+        blocking=True,
+    )
+
+    with patch(
+        "homeassistant.config.load_yaml_config_file",
+        return_value={
+            "group": {
+                "second_group": {"entities": "light.Bowl", "icon": "mdi:work"},
+                "test_group": "hello.world",
+                "modified_group": "hello.world",
+            }
+        },
+    ):
+        await hass.services.async_call(group.DOMAIN, SERVICE_RELOAD, blocking=True)
+        await hass.async_block_till_done()
+
+    assert sorted(hass.states.async_entity_ids()) == [
+        "group.modified_group",
+        "group.second_group",
+        "group.test_group",
+    ]
+    assert component.get_entity("group.second_group") is second_group
+    assert component.get_entity("group.test_group") is not test_group
+    assert hass.states.get("group.test_group").attributes["entity_id"] == (
+        "hello.world",
+    )
+    assert hass.states.get("group.modified_group").attributes["entity_id"] == (
+        "hello.world",
+    )
+    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["light.bowl"]) == 1
+    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["hello.world"]) == 2
+    assert "sensor.happy" not in hass.data[TRACK_STATE_CHANGE_CALLBACKS]
+
+
+async def test_groups_with_entity(hass):
+    """Test looking up the groups containing an entity."""
+    assert await async_setup_component(
+        hass,
+        "group",
+        {
+            "group": {
+                "first_group": "light.bowl,light.ceiling",
+                "second_group": "light.bowl",
+            }
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert group.groups_with_entity(hass, "light.bowl") == [
+        "group.first_group",
+        "group.second_group",
+    ]
+    assert group.groups_with_entity(hass, "light.ceiling") == ["group.first_group"]
+
+    await hass.services.async_call(
+        group.DOMAIN,
+        group.SERVICE_SET,
+        {"object_id": "second_group", "entities": "light.ceiling"},
+        blocking=True,
+    )
+    assert group.groups_with_entity(hass, "light.bowl") == ["group.first_group"]
+    assert group.groups_with_entity(hass, "light.ceiling") == [
+        "group.first_group",
+        "group.second_group",
+    ]
+
+    await hass.services.async_call(
+        group.DOMAIN,
+        group.SERVICE_REMOVE,
+        {"object_id": "first_group"},
+        blocking=True,
+    )
+    assert group.groups_with_entity(hass, "light.bowl") == []
+    assert group.groups_with_entity(hass, "light.ceiling") == ["group.second_group"]
+
+
 async def test_modify_group(hass):
     """Test modifying a group."""
     group_conf = OrderedDict()
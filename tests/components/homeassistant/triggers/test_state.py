@@ -1357,3 +1357,63 @@ async def test_variables_priority(hass, calls):
         await hass.async_block_till_done()
         assert len(calls) == 2
         assert calls[1].data["some"] == "test.entity_2 - 0:00:10"
+
+
+async def test_shared_trigger_index(hass):
+    """Test state triggers sharing an entity only run when they can match."""
+    fired = []
+
+    def _action(name):
+        async def action(variables, context=None):
+            fired.append((name, variables["trigger"]["to_state"].state))
+
+        return action
+
+    unsubs = []
+    for name, config in (
+        ("any", {"platform": "state", "entity_id": "test.entity"}),
+        ("to_on", {"platform": "state", "entity_id": "test.entity", "to": "on"}),
+        (
+            "to_off_or_on",
+            {"platform": "state", "entity_id": "test.entity", "to": ["off", "on"]},
+        ),
+        (
+            "attr_to_5",
+            {
+                "platform": "state",
+                "entity_id": "TEST.ENTITY",
+                "attribute": "level",
+                "to": 5,
+            },
+        ),
+    ):
+        unsubs.append(
+            await state_trigger.async_attach_trigger(
+                hass, state_trigger.TRIGGER_SCHEMA(config), _action(name), {}
+            )
+        )
+
+    index = hass.data[state_trigger.DATA_STATE_TRIGGER_INDEX]
+
+    hass.states.async_set("test.entity", "on")
+    await hass.async_block_till_done()
+    assert fired == [("any", "on"), ("to_on", "on"), ("to_off_or_on", "on")]
+
+    fired.clear()
+    hass.states.async_set("test.entity", "off", {"level": 5})
+    await hass.async_block_till_done()
+    assert fired == [("any", "off"), ("to_off_or_on", "off"), ("attr_to_5", "off")]
+
+    fired.clear()
+    hass.states.async_set("test.entity", "off", {"level": [1, 2]})
+    await hass.async_block_till_done()
+    assert fired == [("any", "off")]
+
+    for unsub in unsubs:
+        unsub()
+
+    assert not index._entities
+    fired.clear()
+    hass.states.async_set("test.entity", "on")
+    await hass.async_block_till_done()
+    assert fired == []
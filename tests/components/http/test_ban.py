@@ -16,6 +16,8 @@ from homeassistant.components.http.ban import (
     KEY_BANNED_IPS,
     KEY_FAILED_LOGIN_ATTEMPTS,
     IpBan,
+    IpBans,
+    async_load_ip_bans_config,
     setup_bans,
 )
 from homeassistant.components.http.view import request_handler_factory
@@ -70,6 +72,67 @@ async def test_access_from_banned_ip(hass, aiohttp_client):
         assert resp.status == HTTP_FORBIDDEN
 
 
+def test_ip_bans():
+    """Test checking addresses against banned addresses and networks."""
+    ip_bans = IpBans(
+        [IpBan("200.201.202.203"), IpBan("10.0.0.0/8"), IpBan("2001:db8::/32")]
+    )
+    assert len(ip_bans) == 3
+
+    assert ip_bans.is_banned(ip_address("200.201.202.203"))
+    assert not ip_bans.is_banned(ip_address("200.201.202.204"))
+    assert ip_bans.is_banned(ip_address("10.1.2.3"))
+    assert not ip_bans.is_banned(ip_address("11.0.0.1"))
+    assert ip_bans.is_banned(ip_address("2001:db8::1"))
+    assert not ip_bans.is_banned(ip_address("2001:db9::1"))
+
+    ip_bans.add(IpBan(ip_address("11.0.0.1")))
+    assert ip_bans.is_banned(ip_address("11.0.0.1"))
+    assert [str(ip_ban) for ip_ban in ip_bans] == [
+        "200.201.202.203",
+        "10.0.0.0/8",
+        "2001:db8::/32",
+        "11.0.0.1",
+    ]
+
+
+async def test_load_ip_bans_config(hass):
+    """Test loading banned addresses and networks from the config file."""
+    with patch(
+        "homeassistant.components.http.ban.load_yaml_config_file",
+        return_value={
+            "200.201.202.203": {"banned_at": "2021-03-01T12:00:00+00:00"},
+            "100.64.0.0/10": {},
+            "10.0.0.1/8": {},
+        },
+    ):
+        ip_bans = await async_load_ip_bans_config(hass, "ip_bans.yaml")
+
+    assert [str(ip_ban) for ip_ban in ip_bans] == ["200.201.202.203", "100.64.0.0/10"]
+
+
+async def test_access_from_banned_network(hass, aiohttp_client):
+    """Test accessing to server from an IP in a banned network."""
+    app = web.Application()
+    app["hass"] = hass
+    setup_bans(hass, app, 5)
+    set_real_ip = mock_real_ip(app)
+
+    with patch(
+        "homeassistant.components.http.ban.async_load_ip_bans_config",
+        return_value=[IpBan("100.64.0.0/10")],
+    ):
+        client = await aiohttp_client(app)
+
+    set_real_ip("100.64.10.20")
+    resp = await client.get("/")
+    assert resp.status == HTTP_FORBIDDEN
+
+    set_real_ip("100.128.0.1")
+    resp = await client.get("/")
+    assert resp.status == 404
+
+
 @pytest.mark.parametrize(
     "remote_addr, bans, status",
     list(
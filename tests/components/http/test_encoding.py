@@ -0,0 +1,33 @@
+"""Test the content encoding negotiation."""
+from homeassistant.components.http.encoding import (
+    encoding_quality,
+    parse_accept_encoding,
+)
+
+
+def test_parse_accept_encoding():
+    """Test parsing the encodings and quality values of Accept-Encoding."""
+    assert parse_accept_encoding(None) == {}
+    assert parse_accept_encoding("") == {}
+    assert parse_accept_encoding("gzip, deflate, br") == {
+        "gzip": 1.0,
+        "deflate": 1.0,
+        "br": 1.0,
+    }
+    assert parse_accept_encoding(" BR;q=0 , gzip ; Q=0.5, *;q=invalid") == {
+        "br": 0.0,
+        "gzip": 0.5,
+        "*": 0.0,
+    }
+
+
+def test_encoding_quality():
+    """Test the quality value of an encoding."""
+    encodings = parse_accept_encoding("br;q=0, x-gzip, deflate;q=0.5")
+    assert encoding_quality(encodings, "br") == 0
+    assert encoding_quality(encodings, "gzip") == 0
+    assert encoding_quality(encodings, "deflate") == 0.5
+
+    encodings = parse_accept_encoding("br;q=0, *;q=0.1")
+    assert encoding_quality(encodings, "br") == 0
+    assert encoding_quality(encodings, "gzip") == 0.1
@@ -0,0 +1,130 @@
+"""The tests for the static file handling of the HTTP component."""
+import gzip
+from unittest.mock import patch
+
+from aiohttp import hdrs, web
+import pytest
+
+from homeassistant.components.http.static import CachingStaticResource
+
+GZIP_BODY = gzip.compress(b"gzipped", mtime=0)
+
+
+@pytest.fixture(name="static_dir")
+def static_dir_fixture(tmp_path):
+    """Return a static directory with a precompressed file."""
+    static_dir = tmp_path / "static"
+    static_dir.mkdir()
+    (static_dir / "app.js").write_bytes(b"plain")
+    (static_dir / "app.js.gz").write_bytes(GZIP_BODY)
+    (static_dir / "app.js.br").write_bytes(b"brotli")
+    (static_dir / "sub").mkdir()
+    (static_dir / "sub" / "style.css").write_bytes(b"body {}")
+    return static_dir
+
+
+@pytest.fixture(name="client")
+async def client_fixture(aiohttp_client, static_dir):
+    """Return a client of an app serving the static directory."""
+    app = web.Application()
+    app.router.register_resource(CachingStaticResource("/static", str(static_dir)))
+    return await aiohttp_client(app, auto_decompress=False)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, encoding, body",
+    [
+        ("gzip, deflate, br", "br", b"brotli"),
+        ("gzip, deflate", "gzip", GZIP_BODY),
+        ("br;q=0, gzip", "gzip", GZIP_BODY),
+        ("br;q=0.5, gzip", "gzip", GZIP_BODY),
+        ("*;q=0.1", "br", b"brotli"),
+        ("x-gzip, gzip;q=0", None, b"plain"),
+        ("identity", None, b"plain"),
+    ],
+)
+async def test_precompressed_variants(client, accept_encoding, encoding, body):
+    """Test the variant of a file is chosen by the accepted encodings."""
+    resp = await client.get(
+        "/static/app.js", headers={hdrs.ACCEPT_ENCODING: accept_encoding}
+    )
+    assert resp.status == 200
+    assert await resp.read() == body
+    assert resp.headers.get(hdrs.CONTENT_ENCODING) == encoding
+    assert "javascript" in resp.headers[hdrs.CONTENT_TYPE]
+    assert resp.headers[hdrs.VARY] == hdrs.ACCEPT_ENCODING
+    assert resp.headers[hdrs.CACHE_CONTROL] == "public, max-age=2678400"
+
+
+async def test_etag(client):
+    """Test a client with a fresh copy of a file gets a not modified response."""
+    resp = await client.get(
+        "/static/sub/style.css", headers={hdrs.ACCEPT_ENCODING: "identity"}
+    )
+    assert resp.status == 200
+    assert await resp.read() == b"body {}"
+    assert hdrs.VARY not in resp.headers
+    etag = resp.headers[hdrs.ETAG]
+
+    resp = await client.get(
+        "/static/sub/style.css",
+        headers={hdrs.ACCEPT_ENCODING: "identity", hdrs.IF_NONE_MATCH: etag},
+    )
+    assert resp.status == 304
+    assert resp.headers[hdrs.ETAG] == etag
+
+    resp = await client.get(
+        "/static/app.js",
+        headers={hdrs.ACCEPT_ENCODING: "br", hdrs.IF_NONE_MATCH: etag},
+    )
+    assert resp.status == 200
+
+
+async def test_files_added_and_changed(client, static_dir):
+    """Test files added or changed after the index was built are served."""
+    resp = await client.get("/static/new.js")
+    assert resp.status == 404
+
+    (static_dir / "new.js").write_bytes(b"new")
+    resp = await client.get("/static/new.js")
+    assert resp.status == 200
+    assert await resp.read() == b"new"
+
+    (static_dir / "new.js").write_bytes(b"changed")
+    resp = await client.get("/static/new.js")
+    assert await resp.read() == b"new"
+
+    with patch("homeassistant.components.http.static.CHECK_INTERVAL", -1):
+        resp = await client.get("/static/new.js")
+        assert await resp.read() == b"changed"
+
+        (static_dir / "new.js").unlink()
+        resp = await client.get("/static/new.js")
+        assert resp.status == 404
+
+
+async def test_large_files_streamed(client):
+    """Test files too large for the memory cache are served from disk."""
+    with patch(
+        "homeassistant.components.http.static.MEMORY_CACHE_MAX_FILE_SIZE", 2
+    ), patch("homeassistant.components.http.static.Response") as mock_response:
+        resp = await client.get("/static/app.js", headers={hdrs.ACCEPT_ENCODING: "br"})
+        assert resp.status == 200
+        assert await resp.read() == b"brotli"
+        assert resp.headers[hdrs.CONTENT_ENCODING] == "br"
+    assert not mock_response.called
+
+
+async def test_symlink_outside_directory(client, static_dir, tmp_path):
+    """Test files linked from outside the directory are not served."""
+    (tmp_path / "secret.txt").write_bytes(b"secret")
+    (static_dir / "secret.txt").symlink_to(tmp_path / "secret.txt")
+
+    resp = await client.get("/static/secret.txt")
+    assert resp.status == 404
+
+
+async def test_directory(client):
+    """Test directories are not listed."""
+    resp = await client.get("/static/sub")
+    assert resp.status == 403
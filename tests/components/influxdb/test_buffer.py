@@ -0,0 +1,64 @@
+"""The tests for the InfluxDB write buffer."""
+import os
+
+from homeassistant.components.influxdb.buffer import WriteBuffer
+
+
+def test_buffer_segments(tmpdir):
+    """Test batches are taken in order across segment files."""
+    buffer = WriteBuffer(str(tmpdir), 1024 ** 2, segment_size=64)
+    buffer.load()
+    for value in range(5):
+        buffer.append([f"test value={value} {value}", f"test other={value} {value}"])
+    assert buffer.points == 10
+    assert len(os.listdir(tmpdir)) > 1
+
+    for value in range(3):
+        assert buffer.peek() == [
+            f"test value={value} {value}",
+            f"test other={value} {value}",
+        ]
+        buffer.pop()
+
+    # The position of the oldest batch is kept across restarts
+    buffer = WriteBuffer(str(tmpdir), 1024 ** 2, segment_size=64)
+    buffer.load()
+    assert buffer.points == 4
+    assert buffer.peek() == ["test value=3 3", "test other=3 3"]
+    buffer.pop()
+    buffer.pop()
+    assert buffer.peek() is None
+    assert buffer.size == 0
+    assert os.listdir(tmpdir) == ["position"]
+
+    buffer.append(["test value=5 5"])
+    assert buffer.peek() == ["test value=5 5"]
+
+
+def test_buffer_max_size(tmpdir):
+    """Test the oldest batches are dropped when the buffer is full."""
+    buffer = WriteBuffer(str(tmpdir), 100, segment_size=40)
+    buffer.load()
+    for value in range(10):
+        buffer.append([f"test value={value} {value}"], created=value)
+    assert buffer.size <= 100
+    assert buffer.dropped == 10 - buffer.points
+    assert buffer.peek() == [f"test value={buffer.dropped} {buffer.dropped}"]
+    assert buffer.age > 0
+
+
+def test_buffer_incomplete_write(tmpdir):
+    """Test a batch cut short by a crash is discarded on load."""
+    buffer = WriteBuffer(str(tmpdir), 1024 ** 2)
+    buffer.load()
+    buffer.append(["test value=1 1"])
+    with open(tmpdir / "00000000.lp", "a") as segment:
+        segment.write("#1234 2\ntest value=2 2\ntest val")
+
+    buffer = WriteBuffer(str(tmpdir), 1024 ** 2)
+    buffer.load()
+    assert buffer.points == 1
+    buffer.append(["test value=3 3"])
+    assert buffer.peek() == ["test value=1 1"]
+    buffer.pop()
+    assert buffer.peek() == ["test value=3 3"]
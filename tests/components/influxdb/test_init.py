@@ -1,12 +1,20 @@
 """The tests for the InfluxDB component."""
 from dataclasses import dataclass
 import datetime
+import gzip
+import os
+import time
 from unittest.mock import MagicMock, Mock, call, patch
 
+from influxdb.line_protocol import make_lines
 import pytest
 
 import homeassistant.components.influxdb as influxdb
-from homeassistant.components.influxdb.const import DEFAULT_BUCKET
+from homeassistant.components.influxdb.const import (
+    DEFAULT_BUCKET,
+    DEFAULT_DATABASE,
+    PRECISIONS_V1,
+)
 from homeassistant.const import (
     EVENT_STATE_CHANGED,
     PERCENTAGE,
@@ -57,12 +65,61 @@ def mock_client_fixture(request):
         yield client
 
 
+class GzipBody:
+    """Match gzip compressed data by its decompressed text."""
+
+    def __init__(self, text):
+        """Initialize the matcher."""
+        self.text = text
+
+    def __eq__(self, other):
+        """Return whether data decompresses to the text."""
+        return isinstance(other, bytes) and gzip.decompress(other).decode() == self.text
+
+    def __repr__(self):
+        """Return the representation of the matcher."""
+        return f"GzipBody({self.text!r})"
+
+
+def _line_protocol(body):
+    """Return the line protocol the client library makes of points.
+
+    Numbers are always written as float fields.
+    """
+    points = [
+        {
+            **point,
+            "fields": {
+                key: float(value) if isinstance(value, int) else value
+                for key, value in point["fields"].items()
+            },
+        }
+        for point in body
+    ]
+    return make_lines({"points": points}).rstrip("\n")
+
+
 @pytest.fixture(name="get_mock_call")
 def get_mock_call_fixture(request):
     """Get version specific lambda to make write API call mock."""
 
+    def v1_call(body, precision):
+        params = {"db": DEFAULT_DATABASE}
+
+        if precision is not None:
+            params["precision"] = PRECISIONS_V1[precision]
+
+        return call(
+            url="write",
+            method="POST",
+            params=params,
+            data=GzipBody(_line_protocol(body)),
+            expected_response_code=204,
+            headers=influxdb.WRITE_HEADERS_V1,
+        )
+
     def v2_call(body, precision):
-        data = {"bucket": DEFAULT_BUCKET, "record": body}
+        data = {"bucket": DEFAULT_BUCKET, "record": _line_protocol(body)}
 
         if precision is not None:
             data["write_precision"] = precision
@@ -71,13 +128,12 @@ def get_mock_call_fixture(request):
 
     if request.param == influxdb.API_VERSION_2:
         return lambda body, precision=None: v2_call(body, precision)
-    # pylint: disable=unnecessary-lambda
-    return lambda body, precision=None: call(body, time_precision=precision)
+    return lambda body, precision=None: v1_call(body, precision)
 
 
 def _get_write_api_mock_v1(mock_influx_client):
     """Return the write api mock for the V1 client."""
-    return mock_influx_client.return_value.write_points
+    return mock_influx_client.return_value.request
 
 
 def _get_write_api_mock_v2(mock_influx_client):
@@ -1789,3 +1845,123 @@ async def test_precision(
     assert write_api.call_count == 1
     assert write_api.call_args == get_mock_call(body, precision)
     write_api.reset_mock()
+
+
+def _wait_for_replay(buffer):
+    """Wait for the influx thread to replay the write buffer."""
+    for _ in range(100):
+        if not buffer.points:
+            return
+        time.sleep(0.05)
+    raise AssertionError("Write buffer was not replayed")
+
+
+async def test_write_buffer(hass, tmpdir, requests_mock):
+    """Test events are buffered on disk while influx is down and replayed."""
+    hass.config.config_dir = str(tmpdir)
+    write_url = "http://host:8086/write"
+    requests_mock.post(write_url, status_code=204)
+    config = {"influxdb": {"host": "host", "buffer": {"max_size": 1}}}
+    assert await async_setup_component(hass, influxdb.DOMAIN, config)
+    await hass.async_block_till_done()
+    instance = hass.data[influxdb.DOMAIN]
+    handler_method = hass.bus.listen.call_args_list[0][0][1]
+
+    def event(value):
+        state = MagicMock(
+            state=value,
+            domain="sensor",
+            entity_id="sensor.temperature",
+            object_id="temperature",
+            attributes={},
+        )
+        return MagicMock(data={"new_state": state}, time_fired=value)
+
+    # Influx is down, the events are kept in segment files
+    requests_mock.post(write_url, status_code=503)
+    for value in (1, 2, 3):
+        handler_method(event(value))
+        instance.block_till_done()
+    assert instance.buffer.points == 3
+    assert instance.buffer.size > 0
+    assert 0 <= instance.buffer.age < 60
+    assert os.listdir(tmpdir / influxdb.BUFFER_DIR)
+
+    instance.queue.put(None)
+    instance.join()
+
+    # The backlog survives a restart and is written first once influx is back
+    requests_mock.reset_mock()
+    requests_mock.post(write_url, status_code=204)
+    buffer = influxdb.WriteBuffer(str(tmpdir / influxdb.BUFFER_DIR), 1024 ** 2)
+    buffer.load()
+    assert buffer.points == 3
+    instance = influxdb.InfluxThread(
+        hass, instance.influx, instance.event_to_line, 0, buffer, 1000
+    )
+    instance.start()
+    await hass.async_add_executor_job(_wait_for_replay, buffer)
+    handler_method = hass.bus.listen.call_args_list[-1][0][1]
+    handler_method(event(4))
+    instance.block_till_done()
+    instance.queue.put(None)
+    instance.join()
+
+    assert [
+        gzip.decompress(request.body).decode()
+        for request in requests_mock.request_history
+    ] == [
+        "sensor.temperature,domain=sensor,entity_id=temperature value=1.0 1",
+        "sensor.temperature,domain=sensor,entity_id=temperature value=2.0 2",
+        "sensor.temperature,domain=sensor,entity_id=temperature value=3.0 3",
+        "sensor.temperature,domain=sensor,entity_id=temperature value=4.0 4",
+    ]
+    assert buffer.size == 0
+    assert buffer.age == 0
+
+
+def test_event_to_line_escaping():
+    """Test the encoder escapes like the client library and converts times."""
+    conf = influxdb.INFLUX_SCHEMA(
+        {"precision": "s", "tags_attributes": ["room"], "tags": {"home": "my home"}}
+    )
+    event_to_line = influxdb._generate_event_to_line(conf)
+    time_fired = datetime.datetime(2021, 3, 1, 12, 0, 30, tzinfo=datetime.timezone.utc)
+    attrs = {
+        "unit_of_measurement": "m=s, ok",
+        "room": "living room,\\",
+        "note": 'say "hi"\nbye',
+        "count": 3,
+        "enabled": True,
+    }
+    state = MagicMock(
+        state="on",
+        domain="fake",
+        entity_id="fake.entity_id",
+        object_id="entity_id",
+        attributes=attrs,
+    )
+    event = MagicMock(data={"new_state": state}, time_fired=time_fired)
+    body = {
+        "measurement": "m=s, ok",
+        "tags": {
+            "domain": "fake",
+            "entity_id": "entity_id",
+            "room": "living room,\\",
+            "home": "my home",
+        },
+        "time": time_fired,
+        "fields": {
+            "state": "on",
+            "value": 1.0,
+            "note_str": 'say "hi"\nbye',
+            "count": 3.0,
+            "enabled": 1.0,
+        },
+    }
+    expected = make_lines({"points": [body]}, "s").rstrip("\n")
+
+    assert event_to_line(event) == expected
+    # The cached series key is used for the next event of the entity
+    assert event_to_line(event) == expected
+    assert expected.endswith(f" {int(time_fired.timestamp())}")
@@ -0,0 +1,29 @@
+"""Test influxdb system health."""
+from unittest.mock import Mock
+
+from homeassistant.components.influxdb import WriteBuffer
+from homeassistant.components.influxdb.const import DOMAIN
+from homeassistant.setup import async_setup_component
+
+from tests.common import get_system_health_info
+
+
+async def test_influxdb_system_health(hass, tmpdir):
+    """Test the backlog of the write buffer is reported."""
+    hass.config.components.add(DOMAIN)
+    assert await async_setup_component(hass, "system_health", {})
+
+    hass.data[DOMAIN] = Mock(buffer=None)
+    info = await get_system_health_info(hass, DOMAIN)
+    assert info == {"write_buffer": False}
+
+    buffer = WriteBuffer(str(tmpdir), 1024 ** 2)
+    buffer.load()
+    buffer.append(["measurement value=1", "measurement value=2"], created=0)
+    hass.data[DOMAIN] = Mock(buffer=buffer)
+    info = await get_system_health_info(hass, DOMAIN)
+    assert info["write_buffer"] is True
+    assert info["buffered_events"] == 2
+    assert info["buffer_size"] == "0.0 MiB"
+    assert info["buffer_age"].endswith(" s")
+    assert info["dropped_events"] == 0
@@ -1,20 +1,29 @@
 """Test the Profiler config flow."""
+import asyncio
 from datetime import timedelta
 import os
+import time
 from unittest.mock import patch
 
 from homeassistant import setup
 from homeassistant.components.profiler import (
     CONF_SCAN_INTERVAL,
     CONF_SECONDS,
+    CONF_SLOW_THRESHOLD,
     CONF_TYPE,
     SERVICE_DUMP_LOG_OBJECTS,
     SERVICE_MEMORY,
     SERVICE_START,
+    SERVICE_START_JOB_ACCOUNTING,
     SERVICE_START_LOG_OBJECTS,
+    SERVICE_START_LOOP_MONITOR,
+    SERVICE_STOP_JOB_ACCOUNTING,
     SERVICE_STOP_LOG_OBJECTS,
+    SERVICE_STOP_LOOP_MONITOR,
 )
 from homeassistant.components.profiler.const import DOMAIN
+from homeassistant.components.profiler.loop_monitor import LoopMonitor, SlowCallback
+from homeassistant.helpers import condition, storage
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
@@ -147,3 +156,196 @@ async def test_dump_log_object(hass, caplog):
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_loop_monitor(hass, hass_ws_client, caplog):
+    """Test the loop monitor records lag and attributes blocking code."""
+    await setup.async_setup_component(hass, "persistent_notification", {})
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 1, "type": "profiler/loop_monitor"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {"running": False}
+
+    def _block_the_loop():
+        time.sleep(0.3)
+
+    with patch(
+        "homeassistant.components.profiler.loop_monitor.HEARTBEAT_INTERVAL", 0.01
+    ):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_START_LOOP_MONITOR, {CONF_SLOW_THRESHOLD: 0.05}
+        )
+        await hass.async_block_till_done()
+        await asyncio.sleep(0.05)
+        _block_the_loop()
+        await asyncio.sleep(0.05)
+
+    await client.send_json({"id": 2, "type": "profiler/loop_monitor"})
+    response = await client.receive_json()
+    assert response["success"]
+    result = response["result"]
+    assert result["running"]
+    assert result["slow_threshold"] == 0.05
+    assert result["max_lag"] >= 0.2
+    assert sum(bucket["count"] for bucket in result["lag_histogram"]) > 1
+    assert len(result["slow_callbacks"]) == 1
+    slow_callback = result["slow_callbacks"][0]
+    assert slow_callback["function"].endswith("_block_the_loop")
+    assert slow_callback["count"] == 1
+    assert "Event loop blocked" in caplog.text
+
+    await hass.services.async_call(DOMAIN, SERVICE_STOP_LOOP_MONITOR, {})
+    await hass.async_block_till_done()
+
+    await client.send_json({"id": 3, "type": "profiler/loop_monitor"})
+    response = await client.receive_json()
+    assert response["result"] == {"running": False}
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_loop_monitor_culprit_of_other_stall(hass):
+    """Test a sample is only charged to the lag of the beat it was taken for."""
+    monitor = LoopMonitor(hass, 0.05)
+    culprit = monitor.slow_callbacks[("demo", "slow")] = SlowCallback("demo", "slow")
+
+    # Sampled after an earlier beat, the stall it saw was already recorded
+    monitor._culprit = (1.0, culprit)
+    monitor.async_record_lag(0.1, 2.0)
+    assert culprit.count == 0
+    assert monitor._culprit is None
+
+    monitor._culprit = (2.0, culprit)
+    monitor.async_record_lag(0.1, 2.0)
+    assert culprit.count == 1
+    assert culprit.max == 0.1
+
+
+async def test_job_accounting(hass, hass_ws_client):
+    """Test job accounting can be started, queried and stopped."""
+    await setup.async_setup_component(hass, "persistent_notification", {})
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(DOMAIN, SERVICE_START_JOB_ACCOUNTING, {})
+    await hass.async_block_till_done()
+    assert hass.job_accounting is not None
+
+    for state in ("on", "off", "on"):
+        hass.states.async_set("sensor.spammy", state)
+    hass.states.async_set("sensor.quiet", "on")
+    await hass.async_block_till_done()
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 1, "type": "profiler/job_accounting", "limit": 1})
+    response = await client.receive_json()
+    assert response["success"]
+    result = response["result"]
+    assert result["running"]
+    assert list(result["state_writes_per_minute"]) == ["sensor.spammy"]
+
+    await hass.services.async_call(DOMAIN, SERVICE_STOP_JOB_ACCOUNTING, {})
+    await hass.async_block_till_done()
+    assert hass.job_accounting is None
+
+    await client.send_json({"id": 2, "type": "profiler/job_accounting"})
+    response = await client.receive_json()
+    assert response["result"] == {"running": False}
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_condition_stats(hass, hass_ws_client):
+    """Test the evaluation statistics of conditions are returned."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    check = await condition.async_from_config(
+        hass,
+        {"condition": "state", "entity_id": "light.kitchen", "state": "on"},
+    )
+    hass.states.async_set("light.kitchen", "on")
+    assert check(hass)
+    assert check(hass)
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 1, "type": "profiler/condition_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert len(response["result"]) == 1
+    stats = response["result"][0]
+    assert stats["condition"] == "state"
+    assert stats["description"] == "state light.kitchen"
+    assert stats["count"] == 2
+    assert stats["total_time"] >= stats["max_time"] > 0
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_storage_writes(hass, hass_ws_client):
+    """Test the write statistics of the stores are returned."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    with patch("homeassistant.helpers.storage.Store._write_data", return_value=10):
+        await storage.Store(hass, 1, "small").async_save({})
+    with patch("homeassistant.helpers.storage.Store._write_data", return_value=20):
+        await storage.Store(hass, 1, "large").async_save({})
+
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 1, "type": "profiler/storage_writes"})
+    response = await client.receive_json()
+    assert response["success"]
+    keys = [stats["key"] for stats in response["result"]]
+    assert keys.index("large") < keys.index("small")
+    large = response["result"][keys.index("large")]
+    assert large["write_count"] == 1
+    assert large["write_bytes"] == 20
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def test_poll_durations(hass, hass_ws_client):
+    """Test the poll duration histograms of the platforms are returned."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    durations = [
+        {"domain": "sensor", "platform": "fast", "total": 1.0},
+        {"domain": "sensor", "platform": "slow", "total": 30.0},
+    ]
+    client = await hass_ws_client(hass)
+    with patch(
+        "homeassistant.components.profiler.async_get_poll_durations",
+        return_value=durations,
+    ):
+        await client.send_json({"id": 1, "type": "profiler/poll_durations"})
+        response = await client.receive_json()
+    assert response["success"]
+    assert [stats["platform"] for stats in response["result"]] == ["slow", "fast"]
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
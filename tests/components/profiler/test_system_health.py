@@ -0,0 +1,51 @@
+"""Tests for profiler system health."""
+from unittest.mock import patch
+
+from homeassistant.components.profiler import SERVICE_START_JOB_ACCOUNTING
+from homeassistant.components.profiler.const import DOMAIN
+from homeassistant.helpers import storage
+from homeassistant.setup import async_setup_component
+
+from tests.common import MockConfigEntry, get_system_health_info
+
+
+async def test_system_health_info(hass):
+    """Test system health info endpoint."""
+    assert await async_setup_component(hass, "system_health", {})
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    info = await get_system_health_info(hass, DOMAIN)
+    assert info["loop_monitor"] is False
+    assert info["job_accounting"] is False
+
+    with patch("homeassistant.helpers.storage.Store._write_data", return_value=20):
+        await storage.Store(hass, 1, "large").async_save({})
+    info = await get_system_health_info(hass, DOMAIN)
+    assert "large (1 writes, 20 bytes)" in info["top_storage_writes"]
+    assert "slowest_polls" not in info
+
+    with patch(
+        "homeassistant.components.profiler.system_health.async_get_poll_durations",
+        return_value=[
+            {"domain": "sensor", "platform": "slow", "count": 2, "total": 9, "max": 6}
+        ],
+    ):
+        info = await get_system_health_info(hass, DOMAIN)
+    assert info["slowest_polls"] == "sensor.slow (max 6.0 s, mean 4.5 s)"
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_JOB_ACCOUNTING, {}, blocking=True
+    )
+    hass.states.async_set("sensor.spammy", "on")
+    await hass.async_block_till_done()
+
+    info = await get_system_health_info(hass, DOMAIN)
+    assert info["job_accounting"] is True
+    assert "state_changed (1)" in info["top_events"]
+    assert info["top_state_writes_per_minute"].startswith("sensor.spammy (")
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
@@ -3,6 +3,7 @@ from dataclasses import dataclass
 import datetime
 import unittest.mock as mock
 
+from prometheus_client import REGISTRY
 import pytest
 
 from homeassistant.components import climate, humidifier, sensor
@@ -31,6 +32,16 @@ class FilterTest:
     should_pass: bool
 
 
+@pytest.fixture(autouse=True)
+def prometheus_registry():
+    """Unregister the metrics a test registered."""
+    # pylint: disable=protected-access
+    registered = set(REGISTRY._collector_to_names)
+    yield
+    for collector in set(REGISTRY._collector_to_names) - registered:
+        REGISTRY.unregister(collector)
+
+
 async def prometheus_client(hass, hass_client):
     """Initialize an hass_client with Prometheus component."""
     await async_setup_component(hass, prometheus.DOMAIN, {prometheus.DOMAIN: {}})
@@ -201,6 +212,65 @@ async def test_view(hass, hass_client):
     )
 
 
+async def test_view_formats(hass, hass_client):
+    """Test the metrics can be compressed or rendered as OpenMetrics."""
+    client = await prometheus_client(hass, hass_client)
+
+    resp = await client.get(
+        prometheus.API_ENDPOINT, headers={"Accept-Encoding": "gzip"}
+    )
+    assert resp.status == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert resp.headers["content-type"] == CONTENT_TYPE_TEXT_PLAIN
+    assert "# HELP python_info Python platform information" in await resp.text()
+
+    # Refused or other encodings are not mistaken for gzip
+    for accept_encoding in ("gzip;q=0", "x-gzip", "deflate, *;q=0"):
+        resp = await client.get(
+            prometheus.API_ENDPOINT, headers={"Accept-Encoding": accept_encoding}
+        )
+        assert resp.status == 200
+        assert "content-encoding" not in resp.headers
+
+    resp = await client.get(
+        prometheus.API_ENDPOINT,
+        headers={"Accept": "application/openmetrics-text; version=0.0.1"},
+    )
+    assert resp.status == 200
+    assert resp.headers["content-type"].startswith("application/openmetrics-text")
+    body = (await resp.text()).split("\n")
+    assert "# EOF" in body
+    assert (
+        'entity_available{domain="sensor",'
+        'entity="sensor.radio_energy",'
+        'friendly_name="Radio Energy"} 1.0' in body
+    )
+
+
+async def test_friendly_name_change(hass, hass_client):
+    """Test the samples of an entity follow a change of its friendly name."""
+    client = await prometheus_client(hass, hass_client)
+
+    hass.states.async_set(
+        "sensor.radio_energy",
+        "15",
+        {
+            "friendly_name": "Kitchen Radio Energy",
+            "unit_of_measurement": ENERGY_KILO_WATT_HOUR,
+            "device_class": DEVICE_CLASS_POWER,
+        },
+    )
+    await hass.async_block_till_done()
+
+    resp = await client.get(prometheus.API_ENDPOINT)
+    body = (await resp.text()).split("\n")
+    assert (
+        'power_kwh{domain="sensor",'
+        'entity="sensor.radio_energy",'
+        'friendly_name="Kitchen Radio Energy"} 15.0' in body
+    )
+
+
 @pytest.fixture(name="mock_client")
 def mock_client_fixture():
     """Mock the prometheus client."""
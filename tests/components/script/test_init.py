@@ -1,6 +1,7 @@
 """The tests for the Script component."""
 # pylint: disable=protected-access
 import asyncio
+from copy import deepcopy
 import unittest
 from unittest.mock import Mock, patch
 
@@ -251,6 +252,49 @@ async def test_reload_service(hass, running):
         assert hass.services.has_service(script.DOMAIN, "test")
 
 
+async def test_reload_keeps_unchanged_scripts(hass):
+    """Verify reloading keeps running scripts whose config did not change."""
+    event_flag = asyncio.Event()
+
+    @callback
+    def event_handler(event):
+        event_flag.set()
+
+    hass.bus.async_listen_once("test_event", event_handler)
+    hass.states.async_set("test.script", "off")
+
+    config = {
+        "script": {
+            "test": {
+                "sequence": [
+                    {"event": "test_event"},
+                    {"wait_template": "{{ is_state('test.script', 'on') }}"},
+                ]
+            },
+            "other": {"sequence": [{"delay": {"seconds": 5}}]},
+        }
+    }
+    assert await async_setup_component(hass, "script", deepcopy(config))
+    component = hass.data[DOMAIN]
+    test_entity = component.get_entity(ENTITY_ID)
+    other_entity = component.get_entity("script.other")
+
+    await hass.services.async_call(DOMAIN, "test")
+    await asyncio.wait_for(event_flag.wait(), 1)
+    assert script.is_on(hass, ENTITY_ID)
+
+    new_config = deepcopy(config)
+    new_config["script"]["other"]["sequence"][0]["delay"]["seconds"] = 10
+    with patch("homeassistant.config.load_yaml_config_file", return_value=new_config):
+        await hass.services.async_call(DOMAIN, SERVICE_RELOAD, blocking=True)
+
+    assert component.get_entity(ENTITY_ID) is test_entity
+    assert script.is_on(hass, ENTITY_ID)
+    assert component.get_entity("script.other") not in (None, other_entity)
+    assert hass.services.has_service(script.DOMAIN, "test")
+    assert hass.services.has_service(script.DOMAIN, "other")
+
+
 async def test_service_descriptions(hass):
     """Test that service descriptions are loaded and reloaded correctly."""
     # Test 1: has "description" but no "fields"
@@ -12,6 +12,7 @@ so that it can inspect the output.
 import logging
 import threading
 from unittest.mock import patch
+from urllib.parse import urlparse
 
 import pytest
 
@@ -57,3 +58,32 @@ def stream_worker_sync(hass):
         autospec=True,
     ):
         yield sync
+
+
+class HlsClient:
+    """Test fixture for fetching the hls stream."""
+
+    def __init__(self, http_client, parsed_url):
+        """Initialize HlsClient."""
+        self.http_client = http_client
+        self.parsed_url = parsed_url
+
+    async def get(self, path=None, **kwargs):
+        """Fetch the hls stream for the specified path."""
+        url = self.parsed_url.path
+        if path:
+            # Strip off the master playlist suffix and replace with path
+            url = "/".join(self.parsed_url.path.split("/")[:-1]) + path
+        return await self.http_client.get(url, **kwargs)
+
+
+@pytest.fixture
+def hls_stream(hass, hass_client):
+    """Create test fixture for creating an HLS client for a stream."""
+
+    async def create_client_for_stream(stream):
+        http_client = await hass_client()
+        parsed_url = urlparse(stream.endpoint_url("hls"))
+        return HlsClient(http_client, parsed_url)
+
+    return create_client_for_stream
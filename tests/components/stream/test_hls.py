@@ -5,10 +5,14 @@ from unittest.mock import patch
 from urllib.parse import urlparse
 
 import av
-import pytest
 
 from homeassistant.components.stream import create_stream
-from homeassistant.components.stream.const import MAX_SEGMENTS, NUM_PLAYLIST_SEGMENTS
+from homeassistant.components.stream.const import (
+    ATTR_SEGMENT_STORE,
+    DOMAIN,
+    MAX_SEGMENTS,
+    NUM_PLAYLIST_SEGMENTS,
+)
 from homeassistant.components.stream.core import Segment
 from homeassistant.const import HTTP_NOT_FOUND
 from homeassistant.setup import async_setup_component
@@ -22,35 +26,6 @@ SEQUENCE_BYTES = io.BytesIO(b"some-bytes")
 DURATION = 10
 
 
-class HlsClient:
-    """Test fixture for fetching the hls stream."""
-
-    def __init__(self, http_client, parsed_url):
-        """Initialize HlsClient."""
-        self.http_client = http_client
-        self.parsed_url = parsed_url
-
-    async def get(self, path=None):
-        """Fetch the hls stream for the specified path."""
-        url = self.parsed_url.path
-        if path:
-            # Strip off the master playlist suffix and replace with path
-            url = "/".join(self.parsed_url.path.split("/")[:-1]) + path
-        return await self.http_client.get(url)
-
-
-@pytest.fixture
-def hls_stream(hass, hass_client):
-    """Create test fixture for creating an HLS client for a stream."""
-
-    async def create_client_for_stream(stream):
-        http_client = await hass_client()
-        parsed_url = urlparse(stream.endpoint_url("hls"))
-        return HlsClient(http_client, parsed_url)
-
-    return create_client_for_stream
-
-
 def make_segment(segment, discontinuity=False):
     """Create a playlist response for a segment."""
     response = []
@@ -411,3 +386,85 @@ async def test_hls_max_segments_discontinuity(hass, hls_stream, stream_worker_sy
 
     stream_worker_sync.resume()
     stream.stop()
+
+
+async def test_hls_segment_memory_budget(hass, stream_worker_sync):
+    """Test the oldest segments of all streams are evicted over budget."""
+    await async_setup_component(hass, "stream", {"stream": {"segment_memory": 1}})
+    store = hass.data[DOMAIN][ATTR_SEGMENT_STORE]
+
+    stream_worker_sync.pause()
+    stream_1 = create_stream(hass, STREAM_SOURCE)
+    stream_2 = create_stream(hass, STREAM_SOURCE)
+    hls_1 = stream_1.add_provider("hls")
+    hls_2 = stream_2.add_provider("hls")
+
+    def make_large_segment(sequence):
+        return Segment(sequence, io.BytesIO(b"\x00" * 300 * 1024), DURATION)
+
+    hls_1.put(make_large_segment(1))
+    await hass.async_block_till_done()
+    hls_2.put(make_large_segment(1))
+    await hass.async_block_till_done()
+    hls_1.put(make_large_segment(2))
+    await hass.async_block_till_done()
+    assert store.bytes_held == 900 * 1024
+    assert store.evicted == 0
+
+    # The oldest segment of any stream goes first
+    hls_2.put(make_large_segment(2))
+    await hass.async_block_till_done()
+    assert hls_1.segments == [2]
+    assert hls_2.segments == [1, 2]
+    assert store.bytes_held == 900 * 1024
+
+    # The latest segment of a stream is kept
+    hls_1.put(make_large_segment(3))
+    await hass.async_block_till_done()
+    assert hls_1.segments == [2, 3]
+    assert hls_2.segments == [2]
+    assert store.evicted == 2
+    assert stream_1.metrics() == {
+        "segments": 2,
+        "bytes_held": 600 * 1024,
+        "viewers": 0,
+    }
+
+    # Segments of a stream that stops are released
+    stream_worker_sync.resume()
+    stream_1.stop()
+    assert store.bytes_held == 300 * 1024
+    stream_2.stop()
+    assert store.bytes_held == 0
+
+
+async def test_hls_init_and_viewers(hass, hls_stream, stream_worker_sync):
+    """Test the init section is extracted once and viewers are counted."""
+    await async_setup_component(hass, "stream", {"stream": {}})
+
+    stream = create_stream(hass, STREAM_SOURCE)
+    stream_worker_sync.pause()
+    hls = stream.add_provider("hls")
+    hls.put(Segment(1, SEQUENCE_BYTES, DURATION))
+    await hass.async_block_till_done()
+
+    hls_client = await hls_stream(stream)
+
+    with patch(
+        "homeassistant.components.stream.hls.get_init", return_value=b"init"
+    ) as mock_get_init:
+        for _ in range(2):
+            resp = await hls_client.get("/init.mp4")
+            assert resp.status == 200
+            assert await resp.read() == b"init"
+    assert mock_get_init.call_count == 1
+
+    assert stream.metrics()["viewers"] == 0
+    resp = await hls_client.get("/playlist.m3u8")
+    assert resp.status == 200
+    resp = await hls_client.get("/playlist.m3u8")
+    assert resp.status == 200
+    assert stream.metrics() == {"segments": 1, "bytes_held": 10, "viewers": 1}
+
+    stream_worker_sync.resume()
+    stream.stop()
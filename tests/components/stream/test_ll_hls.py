@@ -0,0 +1,291 @@
+"""The tests for low latency hls streams."""
+import asyncio
+import io
+import re
+import statistics
+import time
+from unittest.mock import patch
+
+import av
+
+from homeassistant.components.stream import create_stream
+from homeassistant.components.stream.core import Part, Segment
+from homeassistant.setup import async_setup_component
+
+from tests.components.stream.common import generate_h264_video
+
+STREAM_SOURCE = "some-stream-source"
+SEQUENCE_BYTES = io.BytesIO(b"some-bytes")
+PART_DURATION = 0.5
+DURATION = 2
+LL_HLS_CONFIG = {"stream": {"ll_hls": True, "part_duration": PART_DURATION}}
+
+PART_RE = re.compile(r"#EXT-X-PART:DURATION=([\d.]+),URI=\"\./part/(\d+)\.(\d+)\.m4s\"")
+HINT_RE = re.compile(r"#EXT-X-PRELOAD-HINT:TYPE=PART,URI=\"\./part/(\d+)\.(\d+)\.m4s\"")
+
+
+def make_part(data=b"part", has_keyframe=False):
+    """Create a part of a segment."""
+    return Part(PART_DURATION, has_keyframe, data)
+
+
+def make_segment(sequence, parts=4, complete=True):
+    """Create a segment made of parts."""
+    segment = Segment(
+        sequence, SEQUENCE_BYTES, DURATION if complete else 0, complete=complete
+    )
+    segment.parts.extend(make_part(has_keyframe=index == 0) for index in range(parts))
+    return segment
+
+
+async def test_ll_hls_playlist_view(hass, hls_stream, stream_worker_sync):
+    """Test the playlist lists the parts of the latest segments."""
+    await async_setup_component(hass, "stream", LL_HLS_CONFIG)
+
+    stream = create_stream(hass, STREAM_SOURCE)
+    stream_worker_sync.pause()
+    hls = stream.add_provider("hls")
+    hls_client = await hls_stream(stream)
+
+    for sequence in range(1, 4):
+        hls.put(make_segment(sequence))
+    current = make_segment(4, parts=1, complete=False)
+    hls.part_added(current)
+    await hass.async_block_till_done()
+
+    resp = await hls_client.get("/playlist.m3u8")
+    assert resp.status == 200
+    lines = (await resp.text()).splitlines()
+
+    assert "#EXT-X-PART-INF:PART-TARGET=0.500" in lines
+    assert "#EXT-X-SERVER-CONTROL:CAN-BLOCK-RELOAD=YES,PART-HOLD-BACK=1.500" in lines
+    assert "#EXT-X-MEDIA-SEQUENCE:1" in lines
+    # Parts are only listed for the latest segments
+    assert [
+        (int(sequence), int(index))
+        for _, sequence, index in PART_RE.findall("\n".join(lines))
+    ] == [(2, 0), (2, 1), (2, 2), (2, 3), (3, 0), (3, 1), (3, 2), (3, 3), (4, 0)]
+    assert '#EXT-X-PART:DURATION=0.500,URI="./part/4.0.m4s",INDEPENDENT=YES' in lines
+    # The incomplete segment is not listed as a segment
+    assert "./segment/3.m4s" in lines
+    assert "./segment/4.m4s" not in lines
+    assert lines[-1] == '#EXT-X-PRELOAD-HINT:TYPE=PART,URI="./part/4.1.m4s"'
+
+    resp = await hls_client.get("/part/4.0.m4s")
+    assert resp.status == 200
+    assert await resp.read() == b"part"
+    resp = await hls_client.get("/segment/4.m4s")
+    assert resp.status == 404
+
+    stream_worker_sync.resume()
+    stream.stop()
+
+
+async def test_ll_hls_init_of_incomplete_segment(hass, hls_stream, stream_worker_sync):
+    """Test the init section of a segment being muxed is the one the worker read."""
+    await async_setup_component(hass, "stream", LL_HLS_CONFIG)
+
+    stream = create_stream(hass, STREAM_SOURCE)
+    stream_worker_sync.pause()
+    hls = stream.add_provider("hls")
+    hls_client = await hls_stream(stream)
+
+    current = make_segment(1, parts=1, complete=False)
+    hls.part_added(current)
+    await hass.async_block_till_done()
+
+    with patch("homeassistant.components.stream.hls.get_init") as mock_get_init:
+        # Not available until the worker read it
+        resp = await hls_client.get("/init.mp4")
+        assert resp.status == 404
+
+        current.init = b"init"
+        resp = await hls_client.get("/init.mp4")
+        assert resp.status == 200
+        assert await resp.read() == b"init"
+    assert not mock_get_init.called
+
+    stream_worker_sync.resume()
+    stream.stop()
+
+
+async def test_ll_hls_blocking_playlist_reload(hass, hls_stream, stream_worker_sync):
+    """Test a playlist request for a part that isn't muxed yet waits for it."""
+    await async_setup_component(hass, "stream", LL_HLS_CONFIG)
+
+    stream = create_stream(hass, STREAM_SOURCE)
+    stream_worker_sync.pause()
+    hls = stream.add_provider("hls")
+    hls_client = await hls_stream(stream)
+
+    hls.put(make_segment(1))
+    current = make_segment(2, parts=1, complete=False)
+    hls.part_added(current)
+    await hass.async_block_till_done()
+
+    # Too far ahead of the latest segment
+    resp = await hls_client.get("/playlist.m3u8", params={"_HLS_msn": 5})
+    assert resp.status == 400
+
+    playlist_request = asyncio.ensure_future(
+        hls_client.get("/playlist.m3u8", params={"_HLS_msn": 2, "_HLS_part": 1})
+    )
+    part_request = asyncio.ensure_future(hls_client.get("/part/2.1.m4s"))
+    await asyncio.sleep(0.1)
+    assert not playlist_request.done()
+    assert not part_request.done()
+
+    current.parts.append(make_part(b"next-part"))
+    hls.part_added(current)
+
+    resp = await playlist_request
+    assert resp.status == 200
+    assert HINT_RE.search(await resp.text()).groups() == ("2", "2")
+    resp = await part_request
+    assert resp.status == 200
+    assert await resp.read() == b"next-part"
+
+    stream_worker_sync.resume()
+    stream.stop()
+
+
+async def test_ll_hls_disabled(hass, hls_stream, stream_worker_sync):
+    """Test parts aren't served without low latency HLS."""
+    await async_setup_component(hass, "stream", {"stream": {}})
+
+    stream = create_stream(hass, STREAM_SOURCE)
+    stream_worker_sync.pause()
+    hls = stream.add_provider("hls")
+    hls_client = await hls_stream(stream)
+
+    hls.put(make_segment(1))
+    await hass.async_block_till_done()
+
+    resp = await hls_client.get("/playlist.m3u8")
+    assert resp.status == 200
+    text = await resp.text()
+    assert "#EXT-X-PART" not in text
+    assert "#EXT-X-PRELOAD-HINT" not in text
+
+    resp = await hls_client.get("/part/1.0.m4s")
+    assert resp.status == 404
+
+    stream_worker_sync.resume()
+    stream.stop()
+
+
+class PacedContainer:
+    """Wrap a container to demux its packets as they would arrive live."""
+
+    def __init__(self, container):
+        """Initialize the container."""
+        self._container = container
+        self.streams = container.streams
+        self.format = container.format
+        # Presentation time of each frame, from the first frame, to the
+        # time it was demuxed
+        self.demuxed = {}
+
+    def demux(self, *args, **kwargs):
+        """Yield the packets of the container in real time."""
+        start = first_dts = first_pts = None
+        for packet in self._container.demux(*args, **kwargs):
+            if packet.dts is not None:
+                if first_dts is None:
+                    start = time.monotonic()
+                    first_dts = packet.dts
+                    first_pts = packet.pts
+                delay = (
+                    start
+                    + float((packet.dts - first_dts) * packet.time_base)
+                    - time.monotonic()
+                )
+                if delay > 0:
+                    time.sleep(delay)
+                pts = float((packet.pts - first_pts) * packet.time_base)
+                self.demuxed[pts] = time.monotonic()
+            yield packet
+
+    def glass_time(self, media_time):
+        """Return when the last frame before a media time was demuxed."""
+        return max(demuxed for pts, demuxed in self.demuxed.items() if pts < media_time)
+
+    def close(self):
+        """Close the container."""
+        self._container.close()
+
+
+async def test_ll_hls_latency(hass, hls_stream, stream_worker_sync):
+    """Measure how long a frame takes from the camera to a playlist.
+
+    The test video is demuxed in real time, as from a camera, and a client
+    follows the stream with blocking playlist reloads like a player does. The
+    latency of a part is the time from its last frame being demuxed until a
+    playlist lists it.
+    """
+    await async_setup_component(hass, "stream", LL_HLS_CONFIG)
+
+    source = generate_h264_video()
+    av_open = av.open
+    paced = None
+
+    def open_paced(file, *args, **kwargs):
+        nonlocal paced
+        container = av_open(file, *args, **kwargs)
+        if file is not source:
+            return container
+        paced = PacedContainer(container)
+        return paced
+
+    stream_worker_sync.pause()
+    stream = create_stream(hass, source)
+    stream.add_provider("hls")
+    hls_client = await hls_stream(stream)
+
+    latencies = []
+    with patch("av.open", new=open_paced):
+        stream.start()
+
+        resp = await hls_client.get("/playlist.m3u8")
+        assert resp.status == 200
+        # Served from the segment being muxed, as read by the worker
+        init_resp = await hls_client.get("/init.mp4")
+        assert init_resp.status == 200
+        assert (await init_resp.read())[4:8] == b"ftyp"
+        params = None
+        media_end = None
+        while len(latencies) < 4:
+            if params:
+                resp = await hls_client.get("/playlist.m3u8", params=params)
+                assert resp.status == 200
+            received = time.monotonic()
+            playlist = await resp.text()
+
+            # Media time of the end of every listed part
+            parts = PART_RE.findall(playlist)
+            if media_end is None:
+                media_end = {}
+                offset = 0.0
+                for duration, sequence, index in parts:
+                    offset += float(duration)
+                    media_end[(sequence, index)] = offset
+            else:
+                for duration, sequence, index in parts:
+                    if (sequence, index) in media_end:
+                        continue
+                    offset += float(duration)
+                    media_end[(sequence, index)] = offset
+                    latencies.append(received - paced.glass_time(offset))
+
+            sequence, index = HINT_RE.search(playlist).groups()
+            params = {"_HLS_msn": sequence, "_HLS_part": index}
+
+    stream_worker_sync.resume()
+    stream.stop()
+
+    print(
+        f"Glass to playlist latency: median {statistics.median(latencies):.3f}s, "
+        f"max {max(latencies):.3f}s"
+    )
+    # A part is published with the first frame of the next part
+    assert max(latencies) < PART_DURATION
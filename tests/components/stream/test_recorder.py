@@ -1,5 +1,8 @@
 """The tests for hls streams."""
+import asyncio
 from datetime import timedelta
+import io
+import json
 import logging
 import os
 import threading
@@ -8,9 +11,12 @@ from unittest.mock import patch
 import av
 import pytest
 
-from homeassistant.components.stream import create_stream
+from homeassistant.components.stream import create_stream, recorder
 from homeassistant.components.stream.core import Segment
-from homeassistant.components.stream.recorder import recorder_save_worker
+from homeassistant.components.stream.recorder import (
+    LookbackOutput,
+    recorder_save_worker,
+)
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.setup import async_setup_component
 import homeassistant.util.dt as dt_util
@@ -239,3 +245,143 @@ async def test_record_stream_audio(
         # Verify that the save worker was invoked, then block until its
         # thread completes and is shutdown completely to avoid thread leaks.
         record_worker_sync.join()
+
+
+def make_lookback_segment(sequence, duration=2):
+    """Create a segment for a lookback buffer."""
+    return Segment(sequence, io.BytesIO(f"segment-{sequence}".encode()), duration)
+
+
+async def test_lookback_buffer(hass, tmpdir):
+    """Test the lookback buffer keeps the latest segments on disk."""
+    await async_setup_component(hass, "stream", {"stream": {"lookback": 4}})
+
+    stream = create_stream(hass, "some-stream-source")
+    lookback = stream.add_provider("lookback", directory=str(tmpdir))
+    assert isinstance(lookback, LookbackOutput)
+
+    with patch.object(recorder, "LOOKBACK_INDEX_INTERVAL", 0):
+        for sequence in range(1, 4):
+            lookback.put(make_lookback_segment(sequence))
+        assert lookback.segments == [2, 3]
+        assert sorted(os.listdir(tmpdir)) == ["2.mp4", "3.mp4", "index.json"]
+        with open(tmpdir / "index.json") as index:
+            assert [entry["sequence"] for entry in json.load(index)] == [2, 3]
+
+        # Pinned segments are kept for the recording after they leave the buffer
+        pinned = lookback.pin(3)
+        assert [entry.sequence for entry in pinned] == [2, 3]
+        lookback.put(make_lookback_segment(4))
+        assert lookback.segments == [3, 4]
+        assert os.path.exists(tmpdir / "2.mp4")
+        assert lookback.load(pinned[0]).segment.getvalue() == b"segment-2"
+
+        lookback.unpin(pinned)
+        lookback.put(make_lookback_segment(5))
+        assert sorted(os.listdir(tmpdir)) == ["4.mp4", "5.mp4", "index.json"]
+
+    stream.remove_provider(lookback)
+    await hass.async_block_till_done()
+    assert not os.path.exists(tmpdir)
+
+
+async def test_lookback_buffer_index_interval(hass, tmpdir):
+    """Test the lookback buffer index is rewritten after an interval of segments."""
+    await async_setup_component(hass, "stream", {"stream": {"lookback": 4}})
+
+    stream = create_stream(hass, "some-stream-source")
+    lookback = stream.add_provider("lookback", directory=str(tmpdir))
+
+    def indexed():
+        with open(tmpdir / "index.json") as index:
+            return [entry["sequence"] for entry in json.load(index)]
+
+    with patch.object(recorder, "LOOKBACK_INDEX_INTERVAL", 4):
+        lookback.put(make_lookback_segment(1))
+        assert not os.path.exists(tmpdir / "index.json")
+        lookback.put(make_lookback_segment(2))
+        assert indexed() == [1, 2]
+
+        # Segments that left the buffer are removed with the next index
+        lookback.put(make_lookback_segment(3))
+        assert lookback.segments == [2, 3]
+        assert indexed() == [1, 2]
+        assert os.path.exists(tmpdir / "1.mp4")
+        lookback.put(make_lookback_segment(4))
+        assert indexed() == [3, 4]
+        assert sorted(os.listdir(tmpdir)) == ["3.mp4", "4.mp4", "index.json"]
+
+    stream.stop()
+    await hass.async_block_till_done()
+
+
+async def test_lookback_buffer_not_in_idle_check(hass, tmpdir):
+    """Test the lookback buffer doesn't keep the access token of a stream."""
+    await async_setup_component(hass, "stream", {"stream": {"lookback": 4}})
+
+    stream = create_stream(hass, "some-stream-source")
+    stream.keepalive = True
+    stream.add_provider("lookback", directory=str(tmpdir))
+    stream.access_token = "token"
+
+    stream.check_idle()
+    assert stream.access_token is None
+
+    stream.stop()
+    await hass.async_block_till_done()
+
+
+async def test_lookback_buffer_removed_on_stop(hass, tmpdir):
+    """Test the lookback buffer is removed from disk when the stream stops."""
+    await async_setup_component(hass, "stream", {"stream": {"lookback": 4}})
+
+    stream = create_stream(hass, "some-stream-source")
+    lookback = stream.add_provider("lookback", directory=str(tmpdir))
+    lookback.put(make_lookback_segment(1))
+    assert os.path.exists(tmpdir / "1.mp4")
+
+    stream.stop()
+    await hass.async_block_till_done()
+    assert not os.path.exists(tmpdir)
+
+    # Segments the worker still hands over are not written
+    lookback.put(make_lookback_segment(2))
+    assert not os.path.exists(tmpdir)
+
+
+async def test_record_from_lookback_buffer(hass, tmpdir, stream_worker_sync):
+    """Test a recording includes the segments of the lookback buffer."""
+    await async_setup_component(hass, "stream", {"stream": {"lookback": 10}})
+
+    stream_worker_sync.pause()
+    source = generate_h264_video()
+    stream = create_stream(hass, source)
+    with patch.object(hass.config, "config_dir", str(tmpdir)):
+        # Streams that are kept alive are recorded to the lookback buffer
+        stream.keepalive = True
+        stream.start()
+        stream.keepalive = False
+    lookback = stream.outputs()["lookback"]
+    for _ in range(100):
+        if lookback.segments:
+            break
+        await asyncio.sleep(0.1)
+    assert lookback.segments
+
+    filename = f"{tmpdir}/recording.mp4"
+    with patch.object(hass.config, "is_allowed_path", return_value=True):
+        await stream.async_record(filename, lookback=10)
+    stream.remove_provider(stream.outputs()["recorder"])
+    for thread in threading.enumerate():
+        if thread.name == "recorder_save_worker":
+            thread.join(timeout=TEST_TIMEOUT)
+
+    # The segments of the stream are concatenated without remuxing
+    result = av.open(filename)
+    assert len(lookback.segments) > 1
+    assert float(result.duration / av.time_base) > 4
+    result.close()
+
+    stream_worker_sync.resume()
+    stream.stop()
+    await hass.async_block_till_done()
@@ -23,12 +23,16 @@ import av
 
 from homeassistant.components.stream import Stream
 from homeassistant.components.stream.const import (
+    KEYFRAME_MAX_AGE,
     MAX_MISSING_DTS,
     MIN_SEGMENT_DURATION,
     PACKETS_TO_WAIT_FOR_AUDIO,
 )
+from homeassistant.components.stream.core import KeyFrameConverter
 from homeassistant.components.stream.worker import SegmentBuffer, stream_worker
 
+from tests.components.stream.common import generate_h264_video
+
 STREAM_SOURCE = "some-stream-source"
 # Formats here are arbitrary, not exercised by tests
 STREAM_OUTPUT_FORMAT = "hls"
@@ -57,6 +61,12 @@ class FakePyAvStream:
         self.time_base = fractions.Fraction(1, rate)
         self.profile = "ignored-profile"
 
+        class FakeCodecContext:
+            extradata = None
+
+        self.codec_context = FakeCodecContext()
+        self.codec_context.name = name
+
 
 VIDEO_STREAM = FakePyAvStream(VIDEO_STREAM_FORMAT, VIDEO_FRAME_RATE)
 AUDIO_STREAM = FakePyAvStream(AUDIO_STREAM_FORMAT, AUDIO_SAMPLE_RATE)
@@ -95,6 +105,9 @@ class PacketSequence:
             stream = VIDEO_STREAM
             is_keyframe = True
 
+            def __bytes__(self):
+                return b"fake-packet"
+
         return FakePacket()
 
 
@@ -547,3 +560,40 @@ async def test_update_stream_source(hass):
 
         # Ccleanup
         stream.stop()
+
+
+async def test_keyframe_converter(hass):
+    """Test the latest keyframe is converted to a JPEG image on request."""
+    converter = KeyFrameConverter(hass)
+    assert await converter.async_get_image() is None
+
+    container = av.open(generate_h264_video())
+    video_stream = container.streams.video[0]
+    for packet in container.demux(video_stream):
+        if packet.is_keyframe:
+            converter.put(packet)
+    container.close()
+
+    with patch("av.Packet", wraps=av.Packet) as decoded_packet:
+        image = await converter.async_get_image()
+        assert image.startswith(b"\xff\xd8")
+        # The image is reused until a newer keyframe arrives
+        assert await converter.async_get_image() is image
+        assert decoded_packet.call_count == 1
+
+    # Old keyframes are not used
+    with patch(
+        "homeassistant.components.stream.core.time.monotonic",
+        return_value=converter._keyframe.received + KEYFRAME_MAX_AGE + 1,
+    ):
+        assert await converter.async_get_image() is None
+
+
+async def test_stream_image_requires_running_worker(hass):
+    """Test a stream only provides images while its worker runs."""
+    stream = Stream(hass, STREAM_SOURCE)
+    with patch(
+        "homeassistant.components.stream.core.KeyFrameConverter.async_get_image",
+        return_value=b"image",
+    ):
+        assert await stream.async_get_image() is None
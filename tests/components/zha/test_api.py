@@ -37,8 +37,12 @@ from homeassistant.components.zha.core.const import (
     GROUP_ID,
     GROUP_IDS,
     GROUP_NAME,
+    ZHA_GW_MSG,
+    ZHA_GW_MSG_REFRESH_PROGRESS,
+    ZHA_GW_MSG_REFRESH_STATUS,
 )
 from homeassistant.core import Context
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 
 from .conftest import FIXTURE_GRP_ID, FIXTURE_GRP_NAME
 
@@ -212,6 +216,26 @@ async def test_device_not_found(zha_client):
     assert msg["error"]["code"] == const.ERR_NOT_FOUND
 
 
+async def test_subscribe_device_refresh(hass, zha_client):
+    """Test subscribing to the progress of the device refresh."""
+    await zha_client.send_json({ID: 5, TYPE: "zha/devices/refresh"})
+
+    msg = await zha_client.receive_json()
+    assert msg["success"]
+
+    status = {"total": 2, "refreshed": 1, "pending": 1}
+    async_dispatcher_send(
+        hass,
+        ZHA_GW_MSG,
+        {TYPE: ZHA_GW_MSG_REFRESH_PROGRESS, ZHA_GW_MSG_REFRESH_STATUS: status},
+    )
+
+    msg = await zha_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["type"] == "event"
+    assert msg["event"] == status
+
+
 async def test_list_groups(zha_client):
     """Test getting zha zigbee groups."""
     await zha_client.send_json({ID: 7, TYPE: "zha/groups"})
@@ -44,10 +44,17 @@ from homeassistant.components.zha.climate import (
     HVAC_MODE_2_SYSTEM,
     SEQ_OF_OPERATION,
 )
-from homeassistant.const import ATTR_ENTITY_ID, ATTR_TEMPERATURE, STATE_UNKNOWN
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_TEMPERATURE,
+    EVENT_STATE_CHANGED,
+    STATE_UNKNOWN,
+)
 
 from .common import async_enable_traffic, find_entity_id, send_attributes_report
 
+from tests.common import async_capture_events
+
 CLIMATE = {
     1: {
         "device_type": zigpy.profiles.zha.DeviceType.THERMOSTAT,
@@ -206,6 +213,23 @@ async def test_climate_local_temp(hass, device_climate):
     assert state.attributes[ATTR_CURRENT_TEMPERATURE] == 21.0
 
 
+async def test_climate_multi_attribute_report(hass, device_climate):
+    """Test the attributes of a report are written in a single state."""
+
+    thrm_cluster = device_climate.device.endpoints[1].thermostat
+    entity_id = await find_entity_id(DOMAIN, device_climate, hass)
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    await send_attributes_report(
+        hass, thrm_cluster, {0: 2100, 0x001C: Thermostat.SystemMode.Heat}
+    )
+    assert len(events) == 1
+    state = events[0].data["new_state"]
+    assert state.entity_id == entity_id
+    assert state.state == HVAC_MODE_HEAT
+    assert state.attributes[ATTR_CURRENT_TEMPERATURE] == 21.0
+
+
 async def test_climate_hvac_action_running_state(hass, device_climate):
     """Test hvac action via running state."""
 
@@ -1,7 +1,7 @@
 """Test ZHA Gateway."""
 import asyncio
 import time
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pytest
 import zigpy.profiles.zha as zha
@@ -11,8 +11,15 @@ import zigpy.zcl.clusters.lighting as lighting
 from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
 from homeassistant.components.zha.core.group import GroupMember
 from homeassistant.components.zha.core.store import TOMBSTONE_LIFETIME
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
-from .common import async_enable_traffic, async_find_group_entity_id, get_zha_gateway
+from .common import (
+    async_enable_traffic,
+    async_find_group_entity_id,
+    find_entity_id,
+    get_zha_gateway,
+)
 
 IEEE_GROUPABLE_DEVICE = "01:2d:6f:00:0a:90:69:e8"
 IEEE_GROUPABLE_DEVICE2 = "02:2d:6f:00:0a:90:69:e8"
@@ -119,6 +126,61 @@ async def test_device_left(hass, zigpy_dev_basic, zha_dev_basic):
     assert zha_dev_basic.available is False
 
 
+async def test_entity_reference(hass, device_light_1):
+    """Test looking up the reference of an entity."""
+    zha_gateway = get_zha_gateway(hass)
+    entity_id = await find_entity_id(LIGHT_DOMAIN, device_light_1, hass)
+
+    entity_ref = zha_gateway.get_entity_reference(entity_id)
+    assert entity_ref.reference_id == entity_id
+    assert entity_ref.zha_device is device_light_1
+    assert zha_gateway.get_entity_reference("light.unknown") is None
+
+    zha_gateway.device_removed(device_light_1.device)
+    await hass.async_block_till_done()
+    assert zha_gateway.get_entity_reference(entity_id) is None
+
+
+async def test_channel_signals_in_order_with_attribute_updates(hass, device_light_1):
+    """Test channel signals are sent in order with the queued attribute updates."""
+    zha_gateway = get_zha_gateway(hass)
+    ieee = device_light_1.ieee
+    reports_key = (ieee, 1, general.OnOff.cluster_id)
+    entity = Mock()
+    calls = []
+    unsub = zha_gateway.async_add_attribute_listener(
+        reports_key, entity, lambda value: calls.append(("update", value))
+    )
+    async_dispatcher_connect(
+        hass, "test_signal", callback(lambda value: calls.append(("signal", value)))
+    )
+
+    zha_gateway.async_attribute_updated(reports_key, 1)
+    zha_gateway.async_send_channel_signal(ieee, "test_signal", 2)
+    zha_gateway.async_attribute_updated(reports_key, 3)
+    zha_gateway.async_attribute_updated(reports_key, 4)
+    # Signals of other devices are not queued behind the updates
+    zha_gateway.async_send_channel_signal("00:00:00:00:00:00:00:01", "test_signal", 5)
+    assert list(zha_gateway._attribute_updates) == [ieee]
+    await hass.async_block_till_done()
+
+    assert calls == [
+        ("update", 1),
+        ("signal", 2),
+        ("update", 3),
+        ("update", 4),
+        ("signal", 5),
+    ]
+    # State writes are held for the whole batch of the device
+    assert entity.async_release_state_writes.call_count == 1
+
+    # Without queued updates signals are sent right away
+    zha_gateway.async_send_channel_signal(ieee, "test_signal", 6)
+    await hass.async_block_till_done()
+    assert calls[-1] == ("signal", 6)
+    unsub()
+
+
 async def test_gateway_group_methods(hass, device_light_1, device_light_2, coordinator):
     """Test creating a group with 2 members."""
     zha_gateway = get_zha_gateway(hass)
@@ -0,0 +1,93 @@
+"""Test the background refresh of ZHA devices."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.components import automation
+from homeassistant.components.zha.core.refresh import AdaptiveConcurrency, DeviceRefresh
+from homeassistant.setup import async_setup_component
+
+
+def zha_device_mock(device_id, available=True):
+    """Return a mock ZHA device."""
+    device = MagicMock(device_id=device_id, available=available)
+    device.name = device_id
+    device.async_initialize = AsyncMock()
+    return device
+
+
+def test_adaptive_concurrency():
+    """Test the limit follows the response times."""
+    concurrency = AdaptiveConcurrency(initial=2, minimum=1, maximum=4)
+
+    for _ in range(5):
+        concurrency.async_record(0.1)
+    assert concurrency.limit == 4
+
+    for _ in range(20):
+        concurrency.async_record(1.0)
+    assert concurrency.limit == 1
+
+    concurrency.limit = 4
+    concurrency.async_record_failure()
+    assert concurrency.limit == 2
+    concurrency.async_record_failure()
+    concurrency.async_record_failure()
+    assert concurrency.limit == 1
+
+
+async def test_refresh_order(hass):
+    """Test devices referenced by automations are refreshed first."""
+    assert await async_setup_component(
+        hass,
+        automation.DOMAIN,
+        {
+            automation.DOMAIN: {
+                "trigger": {"platform": "event", "event_type": "test_event"},
+                "action": {
+                    "service": "test.automation",
+                    "entity_id": "light.referenced",
+                },
+            }
+        },
+    )
+    devices = [
+        zha_device_mock("first"),
+        zha_device_mock("unavailable", available=False),
+        zha_device_mock("referenced"),
+        zha_device_mock("failing"),
+    ]
+    refreshed = []
+
+    def initialized(device):
+        async def _initialize(from_cache):
+            if device.device_id == "failing":
+                raise asyncio.TimeoutError
+            refreshed.append(device.device_id)
+
+        return _initialize
+
+    for device in devices:
+        device.async_initialize.side_effect = initialized(device)
+    progress = []
+
+    refresh = DeviceRefresh(
+        hass,
+        devices,
+        lambda device: [f"light.{device.device_id}"],
+        progress.append,
+    )
+    refresh.concurrency.limit = 1
+    await refresh.async_run()
+
+    assert refreshed == ["referenced", "first"]
+    assert devices[1].async_initialize.call_count == 0
+    for device in (devices[0], devices[2], devices[3]):
+        device.async_initialize.assert_called_once_with(from_cache=False)
+    status = refresh.status
+    assert status["total"] == 4
+    assert status["refreshed"] == 2
+    assert status["failed"] == 1
+    assert status["skipped"] == 1
+    assert status["pending"] == 0
+    assert status["in_progress"] == 0
+    assert progress[-1] == status
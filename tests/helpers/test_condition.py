@@ -94,6 +94,111 @@ async def test_and_condition_with_template(hass):
     assert test(hass)
 
 
+async def test_and_condition_runs_cheap_checks_first(hass):
+    """Test nested and conditions are flattened with cheap checks first."""
+    test = await condition.async_from_config(
+        hass,
+        {
+            "condition": "and",
+            "conditions": [
+                {
+                    "condition": "template",
+                    "value_template": "{{ states.sensor.temperature.state == '100' }}",
+                },
+                {
+                    "condition": "and",
+                    "conditions": [
+                        {
+                            "condition": "state",
+                            "entity_id": "sensor.temperature",
+                            "state": "100",
+                        },
+                    ],
+                },
+            ],
+        },
+    )
+    stats = {item.condition: item for item in condition.async_get_condition_stats(hass)}
+
+    hass.states.async_set("sensor.temperature", 120)
+    assert not test(hass)
+    assert stats["state"].count == 1
+    assert stats["template"].count == 0
+
+    hass.states.async_set("sensor.temperature", 100)
+    assert test(hass)
+    assert stats["state"].count == 2
+    assert stats["template"].count == 1
+
+
+async def test_flattened_condition_errors(hass):
+    """Test errors of flattened conditions refer to the original condition."""
+    test = await condition.async_from_config(
+        hass,
+        {
+            "condition": "not",
+            "conditions": [
+                {
+                    "condition": "or",
+                    "conditions": [
+                        {
+                            "condition": "state",
+                            "entity_id": "sensor.missing",
+                            "state": "100",
+                        },
+                        {
+                            "condition": "state",
+                            "entity_id": "sensor.temperature",
+                            "state": "100",
+                        },
+                    ],
+                },
+            ],
+        },
+    )
+
+    hass.states.async_set("sensor.temperature", 100)
+    assert not test(hass)
+
+    hass.states.async_set("sensor.temperature", 120)
+    with pytest.raises(ConditionError, match="sensor.missing") as err:
+        test(hass)
+    assert [(error.index, error.total) for error in err.value.errors] == [(0, 1)]
+
+
+def test_condition_cost():
+    """Test the relative cost of conditions."""
+    state = {"condition": "state", "entity_id": ["light.kitchen"], "state": "on"}
+    template = {"condition": "template", "value_template": Template("{{ 1 }}")}
+    sun = {"condition": "sun", "after": "sunset"}
+
+    assert condition.condition_cost(state) < condition.condition_cost(sun)
+    assert condition.condition_cost(sun) < condition.condition_cost(template)
+    assert condition.condition_cost(Template("{{ 1 }}")) == condition.condition_cost(
+        template
+    )
+    assert condition.condition_cost(
+        {"condition": "or", "conditions": [state, sun]}
+    ) == condition.condition_cost(sun)
+
+
+async def test_sun_events_cached(hass):
+    """Test sun events are only calculated once per day."""
+    test = await condition.async_from_config(
+        hass, {"condition": "sun", "after": "sunrise", "before": "sunset"}
+    )
+    with patch(
+        "homeassistant.helpers.condition.get_astral_event_date",
+        wraps=condition.get_astral_event_date,
+    ) as mock_event_date:
+        test(hass)
+        calls = mock_event_date.call_count
+        assert calls > 0
+        test(hass)
+        test(hass)
+        assert mock_event_date.call_count == calls
+
+
 async def test_or_condition(hass):
     """Test the 'or' condition."""
     test = await condition.async_from_config(
@@ -100,8 +100,8 @@ async def test_setup_does_discovery(mock_setup_component, mock_setup, hass):
     assert ("platform_test", {}, {"msg": "discovery_info"}) == mock_setup.call_args[0]
 
 
-@patch("homeassistant.helpers.entity_platform.async_track_time_interval")
-async def test_set_scan_interval_via_config(mock_track, hass):
+@patch("homeassistant.helpers.poll_scheduler.PollScheduler.async_add")
+async def test_set_scan_interval_via_config(mock_add, hass):
     """Test the setting of the scan interval via configuration."""
 
     def platform_setup(hass, config, add_entities, discovery_info=None):
@@ -117,8 +117,8 @@ async def test_set_scan_interval_via_config(mock_track, hass):
     )
 
     await hass.async_block_till_done()
-    assert mock_track.called
-    assert timedelta(seconds=30) == mock_track.call_args[0][2]
+    assert mock_add.called
+    assert timedelta(seconds=30) == mock_add.call_args[0][0].scan_interval
 
 
 async def test_set_entity_namespace_via_config(hass):
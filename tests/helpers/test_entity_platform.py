@@ -135,8 +135,8 @@ async def test_update_state_adds_entities_with_update_before_add_false(hass):
     assert not ent.update.called
 
 
-@patch("homeassistant.helpers.entity_platform.async_track_time_interval")
-async def test_set_scan_interval_via_platform(mock_track, hass):
+@patch("homeassistant.helpers.poll_scheduler.PollScheduler.async_add")
+async def test_set_scan_interval_via_platform(mock_add, hass):
     """Test the setting of the scan interval via platform."""
 
     def platform_setup(hass, config, add_entities, discovery_info=None):
@@ -153,8 +153,8 @@ async def test_set_scan_interval_via_platform(mock_track, hass):
     component.setup({DOMAIN: {"platform": "platform"}})
 
     await hass.async_block_till_done()
-    assert mock_track.called
-    assert timedelta(seconds=30) == mock_track.call_args[0][2]
+    assert mock_add.called
+    assert timedelta(seconds=30) == mock_add.call_args[0][0].scan_interval
 
 
 async def test_adding_entities_with_generator_and_thread_callback(hass):
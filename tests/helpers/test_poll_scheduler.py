@@ -0,0 +1,204 @@
+"""Test the poll scheduler."""
+import asyncio
+from datetime import timedelta
+import logging
+from unittest.mock import Mock
+
+from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.helpers.entity_platform import async_get_poll_durations
+from homeassistant.helpers.poll_scheduler import (
+    PollDurationHistogram,
+    async_get_poll_scheduler,
+    poll_phase,
+)
+import homeassistant.util.dt as dt_util
+
+from tests.common import MockEntity, async_fire_time_changed
+
+_LOGGER = logging.getLogger(__name__)
+DOMAIN = "test_domain"
+SCAN_INTERVAL = timedelta(seconds=20)
+
+
+async def test_entities_polled_at_their_phase(hass):
+    """Test the polls of the entities are spread over the interval."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, SCAN_INTERVAL)
+    entities = [
+        MockEntity(should_poll=True, entity_id=f"{DOMAIN}.entity_{index}")
+        for index in range(4)
+    ]
+    for entity in entities:
+        entity.async_update = Mock()
+    entities.sort(key=lambda entity: poll_phase(entity.entity_id))
+    assert poll_phase(entities[0].entity_id) != poll_phase(entities[-1].entity_id)
+
+    now = dt_util.utcnow()
+    await component.async_add_entities(entities)
+
+    for entity in entities:
+        async_fire_time_changed(
+            hass,
+            now + SCAN_INTERVAL * poll_phase(entity.entity_id) + timedelta(seconds=0.1),
+        )
+        await hass.async_block_till_done()
+        assert entity.async_update.called
+        assert not entities[-1].async_update.called or entity is entities[-1]
+
+    # All entities are polled once per interval
+    for entity in entities:
+        entity.async_update.reset_mock()
+    async_fire_time_changed(hass, now + SCAN_INTERVAL * 2)
+    await hass.async_block_till_done()
+    assert all(entity.async_update.called for entity in entities)
+
+
+async def test_entity_not_polled_while_polling(hass):
+    """Test an entity isn't polled again while its previous poll runs."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, SCAN_INTERVAL)
+    update_started = asyncio.Event()
+    release_update = asyncio.Event()
+    calls = []
+
+    async def async_update():
+        calls.append(None)
+        update_started.set()
+        await release_update.wait()
+
+    entity = MockEntity(should_poll=True)
+    entity.async_update = async_update
+    await component.async_add_entities([entity])
+
+    now = dt_util.utcnow()
+    async_fire_time_changed(hass, now + SCAN_INTERVAL)
+    await update_started.wait()
+    async_fire_time_changed(hass, now + SCAN_INTERVAL * 2)
+    await asyncio.sleep(0)
+    assert len(calls) == 1
+
+    release_update.set()
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, now + SCAN_INTERVAL * 3)
+    await hass.async_block_till_done()
+    assert len(calls) == 2
+
+
+async def test_overrunning_entity_polled_less_often(hass, caplog):
+    """Test the interval of an entity is stretched while its polls overrun."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, SCAN_INTERVAL)
+    entity = MockEntity(should_poll=True, entity_id=f"{DOMAIN}.slow")
+    await component.async_add_entities([entity])
+
+    scheduler = async_get_poll_scheduler(hass)
+    poll = scheduler._polls[entity.entity_id]
+    start = hass.loop.time()
+
+    scheduler._async_adapt_interval(poll, start, 50)
+    assert poll.interval == 75
+    assert poll.due == start + 75
+    assert "Updating test_domain.slow took 50.0 seconds" in caplog.text
+
+    # Limited to a multiple of the scan interval
+    scheduler._async_adapt_interval(poll, start, 1000)
+    assert poll.interval == 200
+
+    # Restored step by step once the polls are fast again
+    scheduler._async_adapt_interval(poll, start, 1)
+    assert poll.interval == 100
+    scheduler._async_adapt_interval(poll, start, 1)
+    assert poll.interval == 50
+    scheduler._async_adapt_interval(poll, start, 1)
+    assert poll.interval == 25
+    scheduler._async_adapt_interval(poll, start, 1)
+    assert poll.interval == 20
+    scheduler._async_adapt_interval(poll, start, 1)
+    assert poll.interval == 20
+
+
+async def test_removed_entity_not_polled(hass):
+    """Test removed entities and platforms are no longer polled."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, SCAN_INTERVAL)
+    entity_1 = MockEntity(should_poll=True)
+    entity_1.async_update = Mock()
+    entity_2 = MockEntity(should_poll=True)
+    entity_2.async_update = Mock()
+    await component.async_add_entities([entity_1, entity_2])
+
+    scheduler = async_get_poll_scheduler(hass)
+    await entity_1.async_remove()
+    assert entity_1.entity_id not in scheduler._polls
+    assert entity_2.entity_id in scheduler._polls
+
+    now = dt_util.utcnow()
+    async_fire_time_changed(hass, now + SCAN_INTERVAL)
+    await hass.async_block_till_done()
+    assert not entity_1.async_update.called
+    assert entity_2.async_update.called
+
+    await component.async_remove_entity(entity_2.entity_id)
+    assert not scheduler._polls
+
+
+async def test_poll_durations(hass):
+    """Test the durations of the polls are recorded per platform."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, SCAN_INTERVAL)
+    entity = MockEntity(should_poll=True)
+    entity.async_update = Mock()
+    await component.async_add_entities([entity])
+    assert async_get_poll_durations(hass) == []
+
+    async_fire_time_changed(hass, dt_util.utcnow() + SCAN_INTERVAL)
+    await hass.async_block_till_done()
+
+    durations = async_get_poll_durations(hass)
+    assert len(durations) == 1
+    assert durations[0]["domain"] == DOMAIN
+    assert durations[0]["platform"] == DOMAIN
+    assert durations[0]["config_entry_id"] is None
+    assert durations[0]["count"] == 1
+    assert durations[0]["buckets"]["0.1"] == 1
+
+
+async def test_poll_duration_leaves_out_parallel_updates_wait(hass):
+    """Test the time an entity waits for its turn to update isn't counted."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass, SCAN_INTERVAL)
+    entity = MockEntity(should_poll=True)
+    entity.async_update = Mock()
+    await component.async_add_entities([entity])
+    entity.parallel_updates = asyncio.Semaphore(1)
+
+    # Another entity of the platform is updating
+    await entity.parallel_updates.acquire()
+    async_fire_time_changed(hass, dt_util.utcnow() + SCAN_INTERVAL)
+    await asyncio.sleep(0.2)
+    assert not entity.async_update.called
+    entity.parallel_updates.release()
+    await hass.async_block_till_done()
+
+    assert entity.async_update.called
+    durations = async_get_poll_durations(hass)
+    assert durations[0]["count"] == 1
+    assert durations[0]["max"] < 0.2
+
+
+def test_poll_duration_histogram():
+    """Test the buckets of the poll duration histogram."""
+    histogram = PollDurationHistogram()
+    for duration in (0.05, 0.1, 0.3, 7, 120):
+        histogram.add(duration)
+
+    assert histogram.as_dict() == {
+        "count": 5,
+        "total": 127.45,
+        "max": 120,
+        "buckets": {
+            "0.1": 2,
+            "0.5": 1,
+            "1.0": 0,
+            "2.5": 0,
+            "5.0": 0,
+            "10.0": 1,
+            "30.0": 0,
+            "60.0": 0,
+            "+Inf": 1,
+        },
+    }
@@ -0,0 +1,25 @@
+"""Test the reference index helper."""
+from homeassistant.helpers.reference_index import ReferenceIndex
+
+
+def test_reference_index():
+    """Test adding, replacing and removing references."""
+    index = ReferenceIndex()
+    index.async_set("automation.first", ["light.kitchen", "light.hallway"])
+    index.async_set("automation.second", ["light.kitchen"])
+
+    assert index.async_get("light.kitchen") == [
+        "automation.first",
+        "automation.second",
+    ]
+    assert index.async_get("light.hallway") == ["automation.first"]
+    assert index.async_get("light.unknown") == []
+
+    index.async_set("automation.first", ["light.attic"])
+    assert index.async_get("light.kitchen") == ["automation.second"]
+    assert index.async_get("light.hallway") == []
+    assert index.async_get("light.attic") == ["automation.first"]
+
+    index.async_remove("automation.second")
+    index.async_remove("automation.unknown")
+    assert index.async_get("light.kitchen") == []
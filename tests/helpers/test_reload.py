@@ -4,12 +4,15 @@ from os import path
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+import voluptuous as vol
 
 from homeassistant import config
 from homeassistant.const import SERVICE_RELOAD
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.helpers.entity_platform import async_get_platforms
 from homeassistant.helpers.reload import (
+    async_config_unchanged,
     async_get_platform_without_config_entry,
     async_integration_yaml_config,
     async_reload_integration_platforms,
@@ -244,5 +247,30 @@ async def test_async_integration_missing_yaml_config(hass):
         await async_integration_yaml_config(hass, DOMAIN)
 
 
+async def test_async_config_unchanged(hass):
+    """Test comparing validated config across reloads."""
+    schema = vol.Schema(
+        {
+            vol.Required("value_template"): cv.template,
+            vol.Optional("variables"): cv.SCRIPT_VARIABLES_SCHEMA,
+        }
+    )
+    raw = {"value_template": "{{ 1 }}", "variables": {"hello": "{{ 2 }}"}}
+    old = schema(raw)
+    # The old config is in use, so its templates are attached
+    old["value_template"].hass = hass
+    old["variables"].async_render(hass, None)
+
+    assert async_config_unchanged(hass, old, schema(raw))
+    assert not async_config_unchanged(
+        hass, old, schema({**raw, "value_template": "{{ 2 }}"})
+    )
+    assert not async_config_unchanged(
+        hass, old, schema({**raw, "variables": {"hello": "{{ 3 }}"}})
+    )
+    # Script variables stay hashable
+    assert hash(old["variables"])
+
+
 def _get_fixtures_base_path():
     return path.dirname(path.dirname(__file__))
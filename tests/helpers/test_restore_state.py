@@ -1,5 +1,5 @@
 """The tests for the Restore component."""
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest.mock import patch
 
 from homeassistant.const import EVENT_HOMEASSISTANT_START
@@ -12,6 +12,7 @@ from homeassistant.helpers.restore_state import (
     RestoreEntity,
     RestoreStateData,
     StoredState,
+    _append_journal,
 )
 from homeassistant.util import dt as dt_util
 
@@ -172,6 +173,137 @@ async def test_dump_data(hass):
     assert written_states[1]["state"]["state"] == "off"
 
 
+async def test_incremental_dump(hass):
+    """Test that periodic dumps only append the changed states."""
+    for entity_id in ("input_boolean.b1", "input_boolean.b2"):
+        entity = RestoreEntity()
+        entity.hass = hass
+        entity.entity_id = entity_id
+        await entity.async_internal_added_to_hass()
+        hass.states.async_set(entity_id, "on")
+
+    data = await RestoreStateData.async_get_instance(hass)
+
+    with patch(
+        "homeassistant.helpers.restore_state.Store.async_save"
+    ) as mock_write_data, patch(
+        "homeassistant.helpers.restore_state._append_journal"
+    ) as mock_append, patch(
+        "homeassistant.helpers.restore_state._remove_journal"
+    ) as mock_remove:
+        await data.async_dump_states()
+        assert len(mock_write_data.mock_calls) == 1
+        assert len(mock_remove.mock_calls) == 1
+
+        await data.async_dump_states(incremental=True)
+        assert len(mock_write_data.mock_calls) == 1
+        assert not mock_append.called
+
+        hass.states.async_set("input_boolean.b1", "off")
+        await data.async_dump_states(incremental=True)
+        assert len(mock_write_data.mock_calls) == 1
+        assert len(mock_append.mock_calls) == 1
+        entries = mock_append.mock_calls[0][1][1]
+        assert len(entries) == 1
+        assert entries[0]["state"]["entity_id"] == "input_boolean.b1"
+        assert entries[0]["state"]["state"] == "off"
+
+        # The journal is compacted once it holds as many entries as states
+        hass.states.async_set("input_boolean.b2", "off")
+        await data.async_dump_states(incremental=True)
+        assert len(mock_append.mock_calls) == 2
+        hass.states.async_set("input_boolean.b2", "on")
+        await data.async_dump_states(incremental=True)
+        assert len(mock_append.mock_calls) == 2
+        assert len(mock_write_data.mock_calls) == 2
+        assert len(mock_remove.mock_calls) == 2
+
+        # And once a day
+        hass.states.async_set("input_boolean.b2", "off")
+        with patch(
+            "homeassistant.util.dt.utcnow",
+            return_value=dt_util.utcnow() + timedelta(days=1),
+        ):
+            await data.async_dump_states(incremental=True)
+        assert len(mock_append.mock_calls) == 2
+        assert len(mock_write_data.mock_calls) == 3
+
+        # A full dump always writes
+        await data.async_dump_states()
+        assert len(mock_write_data.mock_calls) == 4
+
+
+async def test_load_journal(hass, hass_storage, tmp_path):
+    """Test the states appended to the journal are restored."""
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "key": STORAGE_KEY,
+        "data": [
+            StoredState(
+                State(
+                    "input_boolean.b1",
+                    "on",
+                    last_updated=datetime(2021, 3, 2, tzinfo=dt_util.UTC),
+                ),
+                datetime(2021, 3, 2, tzinfo=dt_util.UTC),
+            ).as_dict(),
+            StoredState(
+                State(
+                    "input_boolean.b2",
+                    "on",
+                    last_updated=datetime(2021, 3, 2, tzinfo=dt_util.UTC),
+                ),
+                datetime(2021, 3, 2, tzinfo=dt_util.UTC),
+            ).as_dict(),
+        ],
+    }
+    journal_path = str(tmp_path / "core.restore_state.journal")
+    _append_journal(
+        journal_path,
+        [
+            # Newer than the store
+            StoredState(
+                State(
+                    "input_boolean.b1",
+                    "off",
+                    last_updated=datetime(2021, 3, 3, tzinfo=dt_util.UTC),
+                ),
+                datetime(2021, 3, 3, tzinfo=dt_util.UTC),
+            ).as_dict(),
+            # Older than the store, left behind by a compaction
+            StoredState(
+                State(
+                    "input_boolean.b2",
+                    "off",
+                    last_updated=datetime(2021, 3, 1, tzinfo=dt_util.UTC),
+                ),
+                datetime(2021, 3, 1, tzinfo=dt_util.UTC),
+            ).as_dict(),
+            # Only in the journal
+            StoredState(
+                State(
+                    "input_boolean.b3",
+                    "off",
+                    last_updated=datetime(2021, 3, 3, tzinfo=dt_util.UTC),
+                ),
+                datetime(2021, 3, 3, tzinfo=dt_util.UTC),
+            ).as_dict(),
+        ],
+    )
+    with open(journal_path, "a") as journal:
+        journal.write('{"state": {"entity_id": "input_boo')
+
+    with patch(
+        "homeassistant.helpers.restore_state.RestoreStateData.journal_path",
+        journal_path,
+    ):
+        data = await RestoreStateData.async_get_instance(hass)
+
+    assert data.last_states["input_boolean.b1"].state.state == "off"
+    assert data.last_states["input_boolean.b2"].state.state == "on"
+    assert data.last_states["input_boolean.b3"].state.state == "off"
+
+
 async def test_dump_error(hass):
     """Test that we cache data."""
     states = [
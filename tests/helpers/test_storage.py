@@ -2,6 +2,7 @@
 import asyncio
 from datetime import timedelta
 import json
+import threading
 from unittest.mock import Mock, patch
 
 import pytest
@@ -83,6 +84,64 @@ async def test_saving_with_delay(hass, store, hass_storage):
     }
 
 
+async def test_repeated_delay_save_bounded(hass, store, hass_storage):
+    """Test repeated delayed saves cannot postpone a write forever."""
+    start = dt.utcnow()
+    for offset in range(0, storage.MAX_WRITE_DELAY, 5):
+        now = start + timedelta(seconds=offset)
+        with patch("homeassistant.util.dt.utcnow", return_value=now):
+            store.async_delay_save(lambda: MOCK_DATA, 10)
+            async_fire_time_changed(hass, now)
+            await hass.async_block_till_done()
+        assert store.key not in hass_storage
+
+    now = start + timedelta(seconds=storage.MAX_WRITE_DELAY + 1)
+    with patch("homeassistant.util.dt.utcnow", return_value=now):
+        async_fire_time_changed(hass, now)
+        await hass.async_block_till_done()
+    assert hass_storage[store.key]["data"] == MOCK_DATA
+
+
+async def test_delay_save_convert_in_executor(hass, store, hass_storage):
+    """Test a snapshot taken in the event loop is converted in the executor."""
+    loop_thread = threading.get_ident()
+    convert_threads = []
+
+    def convert(snapshot):
+        convert_threads.append(threading.get_ident())
+        return {"items": [item.upper() for item in snapshot]}
+
+    store.async_delay_save(lambda: ["a", "b"], 1, convert_func=convert)
+    assert store.key not in hass_storage
+
+    # Loading before the write converts the pending snapshot too
+    assert await store.async_load() == {"items": ["A", "B"]}
+
+    store.async_delay_save(lambda: ["c"], 1, convert_func=convert)
+    async_fire_time_changed(hass, dt.utcnow() + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert hass_storage[store.key]["data"] == {"items": ["C"]}
+    assert convert_threads and loop_thread not in convert_threads
+
+
+async def test_write_stats(hass, store):
+    """Test write statistics are recorded per store."""
+    assert MOCK_KEY not in storage.async_get_write_stats(hass)
+
+    with patch(
+        "homeassistant.helpers.storage.Store._write_data", return_value=42
+    ) as mock_write:
+        await store.async_save(MOCK_DATA)
+        await store.async_save(MOCK_DATA2)
+
+    assert len(mock_write.mock_calls) == 2
+    stats = storage.async_get_write_stats(hass)[MOCK_KEY]
+    assert stats.write_count == 2
+    assert stats.write_bytes == 84
+    assert stats.last_write_bytes == 42
+    assert stats.write_duration >= stats.last_write_duration >= 0
+
+
 async def test_saving_on_final_write(hass, hass_storage):
     """Test delayed saves trigger when we quit Home Assistant."""
     store = storage.Store(hass, MOCK_VERSION, MOCK_KEY)
@@ -1471,6 +1471,21 @@ async def test_expand(hass):
     )
     assert info.rate_limit is None
 
+    hass.states.async_set(
+        "group.first", "on", {"entity_id": ["sensor.power_1", "group.second"]}
+    )
+    hass.states.async_set(
+        "group.second", "on", {"entity_id": ["sensor.power_2", "group.first"]}
+    )
+    info = render_to_info(
+        hass, "{{ expand('group.first') | map(attribute='entity_id') | join(', ') }}"
+    )
+    assert_result_info(
+        info,
+        "sensor.power_1, sensor.power_2",
+        {"group.first", "group.second", "sensor.power_1", "sensor.power_2"},
+    )
+
 
 async def test_device_entities(hass):
     """Test expand function."""
@@ -281,6 +281,109 @@ async def test_async_add_job_pending_tasks_callback(hass):
     assert len(call_count) == 2
 
 
+async def test_async_add_pool_executor_job(hass):
+    """Test running jobs in a named executor pool."""
+    call_count = []
+
+    def test_executor(value):
+        """Test executor."""
+        call_count.append(value)
+        return value
+
+    assert (
+        await hass.async_add_pool_executor_job(ha.EXECUTOR_POOL_IO, test_executor, 1)
+        == 1
+    )
+    hass.async_add_pool_executor_job(ha.EXECUTOR_POOL_IO, test_executor, 2)
+    await hass.async_block_till_done()
+    assert call_count == [1, 2]
+
+    stats = hass.async_executor_pool_stats()
+    assert list(stats) == [ha.EXECUTOR_POOL_IO]
+    assert stats[ha.EXECUTOR_POOL_IO].completed == 2
+    assert stats[ha.EXECUTOR_POOL_IO].active == 0
+    assert stats[ha.EXECUTOR_POOL_IO].queued == 0
+
+    with pytest.raises(ValueError):
+        hass.async_add_pool_executor_job("unknown", test_executor, 3)
+
+
+async def test_executor_pool_max_workers_from_config(hass):
+    """Test the size of an executor pool can be configured."""
+    hass.config.executor_pools = {ha.EXECUTOR_POOL_POLLING: 2}
+    await hass.async_add_pool_executor_job(ha.EXECUTOR_POOL_POLLING, lambda: None)
+    await hass.async_add_pool_executor_job(ha.EXECUTOR_POOL_IO, lambda: None)
+
+    stats = hass.async_executor_pool_stats()
+    assert stats[ha.EXECUTOR_POOL_POLLING].max_workers == 2
+    assert (
+        stats[ha.EXECUTOR_POOL_IO].max_workers
+        == ha.EXECUTOR_POOL_MAX_WORKERS[ha.EXECUTOR_POOL_IO]
+    )
+
+
+async def test_executor_pools_refuse_jobs_after_stop(hass):
+    """Test no executor pool jobs are accepted once stopped."""
+    await hass.async_add_pool_executor_job(ha.EXECUTOR_POOL_IO, lambda: None)
+    executor = hass._executor_pools[ha.EXECUTOR_POOL_IO]
+    await hass.async_stop()
+
+    with pytest.raises(RuntimeError):
+        hass.async_add_pool_executor_job(ha.EXECUTOR_POOL_IO, lambda: None)
+    # Pools that weren't used before stopping aren't created
+    with pytest.raises(RuntimeError):
+        hass.async_add_pool_executor_job(ha.EXECUTOR_POOL_CPU, lambda: None)
+    assert list(hass.async_executor_pool_stats()) == [ha.EXECUTOR_POOL_IO]
+
+    await hass.async_add_executor_job(executor.shutdown)
+
+
+async def test_job_accounting(hass):
+    """Test events and callbacks are accounted per integration."""
+    calls = []
+
+    @ha.callback
+    def state_listener(event):
+        calls.append(event)
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, state_listener)
+    hass.job_accounting = ha.JobAccounting()
+
+    hass.states.async_set("light.kitchen", "on")
+    hass.states.async_set("light.kitchen", "off")
+    hass.states.async_set("light.hallway", "on")
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    assert len(calls) == 3
+    accounting = hass.job_accounting.as_dict()
+    assert accounting["events"] == {EVENT_STATE_CHANGED: 3, "test_event": 1}
+    assert list(accounting["state_writes_per_minute"]) == [
+        "light.kitchen",
+        "light.hallway",
+    ]
+    # The listener is defined in a module outside of homeassistant
+    assert accounting["jobs"] == {"tests.test_core": 3}
+    assert "tests.test_core" in accounting["callback_time"]
+
+    hass.job_accounting = None
+    hass.states.async_set("light.kitchen", "on")
+    await hass.async_block_till_done()
+    assert len(calls) == 4
+
+
+def test_job_accounting_integration():
+    """Test resolving the integration of a job target."""
+    accounting = ha.JobAccounting()
+    target = Mock(__module__="homeassistant.components.zha.core.gateway")
+    assert accounting.integration(target) == "zha"
+    assert accounting.integration(functools.partial(target, 1)) == "zha"
+    target = Mock(__module__="custom_components.my_sensor.sensor")
+    assert accounting.integration(target) == "my_sensor"
+    target = Mock(__module__="homeassistant.helpers.event")
+    assert accounting.integration(target) == ha.DOMAIN
+
+
 async def test_add_job_with_none(hass):
     """Try to add a job with None as function."""
     with pytest.raises(ValueError):
@@ -0,0 +1,40 @@
+"""Test Home Assistant executor util."""
+import threading
+
+from homeassistant.util.executor import InstrumentedThreadPoolExecutor
+
+
+def test_instrumented_executor_stats():
+    """Test the executor tracks running and finished jobs."""
+    executor = InstrumentedThreadPoolExecutor(max_workers=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def _blocking_job():
+        started.set()
+        release.wait()
+        return "done"
+
+    blocking = executor.submit(_blocking_job)
+    started.wait()
+    queued = executor.submit(lambda: "queued")
+
+    stats = executor.stats()
+    assert stats.max_workers == 1
+    assert stats.active == 1
+    assert stats.queued == 1
+    assert stats.longest_running_job.endswith("_blocking_job")
+
+    release.set()
+    assert blocking.result() == "done"
+    assert queued.result() == "queued"
+
+    stats = executor.stats()
+    assert stats.active == 0
+    assert stats.queued == 0
+    assert stats.completed == 2
+    assert stats.longest_running_job is None
+    assert stats.max_wait > 0
+    assert stats.as_dict()["completed"] == 2
+
+    executor.shutdown()